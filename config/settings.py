@@ -10,14 +10,73 @@ SMALL_EXCHANGES = ["coinmate"]
 
 ALL_EXCHANGES = LARGE_EXCHANGES + SMALL_EXCHANGES
 
+# Extra exchange adapters as "name=module:Class" pairs, comma separated.
+# Adapters are imported only when their exchange is monitored.
+EXCHANGE_ADAPTERS = os.getenv("EXCHANGE_ADAPTERS", "")
+
 # Default trading symbol
 TRADING_SYMBOL = "BTC/USDT"
 
 # Exchange-specific trading pairs
 EXCHANGE_TRADING_PAIRS = {"coinmate": "BTC/CZK", "kraken": "BTC/USD"}
 
+# All pairs monitored per exchange, comma separated. They are fetched together
+# (one batched ticker request on Kraken) and detection compares pairs with the
+# same base asset across exchanges. The EXCHANGE_TRADING_PAIRS pair is always
+# included and is the one kept in ExchangeMonitor.latest_prices.
+EXCHANGE_MONITORED_PAIRS = {
+    "kraken": os.getenv("KRAKEN_PAIRS", "BTC/USD").split(","),
+    "coinmate": os.getenv("COINMATE_PAIRS", "BTC/CZK").split(","),
+}
+
+# Price source per exchange: "rest" (poll the ticker endpoint) or "websocket"
+# (keep a streaming connection open and receive pushed updates)
+EXCHANGE_PRICE_SOURCES = {
+    "kraken": os.getenv("KRAKEN_PRICE_SOURCE", "rest").lower(),
+    "coinmate": os.getenv("COINMATE_PRICE_SOURCE", "rest").lower(),
+}
+
+# Order book levels kept from streaming feeds (0 disables book subscriptions)
+STREAM_BOOK_DEPTH = int(os.getenv("STREAM_BOOK_DEPTH", "10"))
+
 MIN_PROFIT_PERCENTAGE = float(os.getenv("MIN_PROFIT_PERCENTAGE", "0.1"))
 
+# Opportunity lifecycle hysteresis (percentage). An exchange pair's opportunity
+# opens once its net profit reaches MIN_PROFIT_PERCENTAGE and stays open until
+# it drops below OPPORTUNITY_EXIT_PERCENTAGE (capped at MIN_PROFIT_PERCENTAGE).
+# While open, an update is reported only when the peak profit grows by
+# OPPORTUNITY_UPDATE_STEP points; only opens, updates and closes are stored
+# and alerted.
+OPPORTUNITY_EXIT_PERCENTAGE = float(os.getenv("OPPORTUNITY_EXIT_PERCENTAGE", "0.05"))
+OPPORTUNITY_UPDATE_STEP = float(os.getenv("OPPORTUNITY_UPDATE_STEP", "0.1"))
+
+# Most conversions in a cross-currency cycle (e.g. USD -> BTC -> EUR -> USD is 3)
+# searched by the market graph over every monitored pair
+CYCLE_MAX_LENGTH = int(os.getenv("CYCLE_MAX_LENGTH", "4"))
+
+# Adaptive REST polling (seconds). Each polled exchange runs on its own
+# interval: it shortens towards POLL_MIN_INTERVAL as the net spread comes
+# within POLL_HOT_BAND percentage points of MIN_PROFIT_PERCENTAGE, and backs
+# off towards POLL_MAX_INTERVAL while the spread is idle or the exchange errors.
+POLL_BASE_INTERVAL = float(os.getenv("POLL_BASE_INTERVAL", "5"))
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "1"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "30"))
+POLL_REQUEST_DEADLINE = float(os.getenv("POLL_REQUEST_DEADLINE", "4"))
+POLL_JITTER = float(os.getenv("POLL_JITTER", "0.1"))
+POLL_HOT_BAND = float(os.getenv("POLL_HOT_BAND", "0.25"))
+
+# Maximum price polls per minute per exchange
+EXCHANGE_POLL_BUDGETS = {
+    "kraken": int(os.getenv("KRAKEN_POLL_BUDGET", "60")),
+    "coinmate": int(os.getenv("COINMATE_POLL_BUDGET", "60")),
+}
+
+# Trade sizes (BTC) priced by walking the order books when depth is available
+SLIPPAGE_SIZE_TIERS = [
+    float(size)
+    for size in os.getenv("SLIPPAGE_SIZE_TIERS", "0.01,0.1,0.5,1.0").split(",")
+]
+
 # Trading fee configuration (percentage)
 KRAKEN_TRADING_FEE = float(os.getenv("KRAKEN_TRADING_FEE", "0.26"))
 COINMATE_TRADING_FEE = float(os.getenv("COINMATE_TRADING_FEE", "0.35"))
@@ -25,6 +84,64 @@ DEFAULT_TRADING_FEE = float(os.getenv("DEFAULT_TRADING_FEE", "0.25"))
 
 # Enable dynamic fee fetching from exchange APIs
 DYNAMIC_FEES_ENABLED = os.getenv("DYNAMIC_FEES_ENABLED", "false").lower() == "true"
+# Seconds between background refreshes of dynamic fees
+FEE_REFRESH_INTERVAL = float(os.getenv("FEE_REFRESH_INTERVAL", "3600"))
+
+# HTTP connection pooling (shared keep-alive sessions per exchange)
+HTTP_REQUEST_TIMEOUT = float(os.getenv("HTTP_REQUEST_TIMEOUT", "10"))
+HTTP_CONNECTION_LIMIT_PER_HOST = int(os.getenv("HTTP_CONNECTION_LIMIT_PER_HOST", "4"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+
+# Exchange health: a circuit breaker opens after HEALTH_FAILURE_THRESHOLD
+# consecutive failures, or when at least HEALTH_MIN_CALLS calls in the last
+# HEALTH_WINDOW_SECONDS fail at HEALTH_ERROR_RATE_THRESHOLD (0-1) or more.
+# Open breakers skip requests for HEALTH_OPEN_SECONDS, then allow one probe.
+HEALTH_FAILURE_THRESHOLD = int(os.getenv("HEALTH_FAILURE_THRESHOLD", "3"))
+HEALTH_ERROR_RATE_THRESHOLD = float(os.getenv("HEALTH_ERROR_RATE_THRESHOLD", "0.5"))
+HEALTH_WINDOW_SECONDS = float(os.getenv("HEALTH_WINDOW_SECONDS", "60"))
+HEALTH_MIN_CALLS = int(os.getenv("HEALTH_MIN_CALLS", "5"))
+HEALTH_OPEN_SECONDS = float(os.getenv("HEALTH_OPEN_SECONDS", "30"))
+
+# Rows kept in the in-memory price and opportunity history. Both are fixed-size
+# ring buffers, so memory use does not grow with uptime.
+PRICE_HISTORY_CAPACITY = int(os.getenv("PRICE_HISTORY_CAPACITY", "50000"))
+OPPORTUNITY_HISTORY_CAPACITY = int(os.getenv("OPPORTUNITY_HISTORY_CAPACITY", "10000"))
+# Seconds of opportunities kept queryable for best-opportunity lookups
+OPPORTUNITY_INDEX_SECONDS = float(os.getenv("OPPORTUNITY_INDEX_SECONDS", "3600"))
+
+# Prices older than this (seconds) are dropped from detection. Keep it above
+# POLL_MAX_INTERVAL so idle-backed-off exchanges are not evicted.
+STALE_PRICE_SECONDS = float(os.getenv("STALE_PRICE_SECONDS", "60"))
+
+# Client-side API rate limits. Kraken private calls are limited by a call
+# counter whose size and decay depend on the verification tier
+# (starter, intermediate, pro); public calls by a per-second rate.
+# Coinmate allows a fixed number of requests per minute, split here between
+# public and private budgets.
+KRAKEN_RATE_TIER = os.getenv("KRAKEN_RATE_TIER", "starter").lower()
+KRAKEN_PUBLIC_REQUESTS_PER_SECOND = float(
+    os.getenv("KRAKEN_PUBLIC_REQUESTS_PER_SECOND", "1")
+)
+COINMATE_PUBLIC_REQUESTS_PER_MINUTE = int(
+    os.getenv("COINMATE_PUBLIC_REQUESTS_PER_MINUTE", "80")
+)
+COINMATE_PRIVATE_REQUESTS_PER_MINUTE = int(
+    os.getenv("COINMATE_PRIVATE_REQUESTS_PER_MINUTE", "20")
+)
+
+# Opt-in hedging of public ticker GETs: if a request has not answered by
+# this percentile of recent latencies, a duplicate is sent (within the
+# rate-limit budget) and the first response wins
+REQUEST_HEDGING_ENABLED = (
+    os.getenv("REQUEST_HEDGING_ENABLED", "false").lower() == "true"
+)
+REQUEST_HEDGE_PERCENTILE = float(os.getenv("REQUEST_HEDGE_PERCENTILE", "95"))
+REQUEST_HEDGE_MIN_SAMPLES = int(os.getenv("REQUEST_HEDGE_MIN_SAMPLES", "20"))
+# Share of each exchange's public rate limit set aside for duplicates (at
+# most half); primaries get the rest, so together they stay within the limit
+REQUEST_HEDGE_BURST = int(os.getenv("REQUEST_HEDGE_BURST", "1"))
+REQUEST_HEDGE_PER_MINUTE = float(os.getenv("REQUEST_HEDGE_PER_MINUTE", "6"))
 
 # Telegram notification settings
 TELEGRAM_ENABLED = os.getenv("TELEGRAM_ENABLED", "true").lower() == "true"
@@ -32,7 +149,7 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
 # Telegram notifications will use the same threshold as MIN_PROFIT_PERCENTAGE
-# No separate threshold needed - alert on every detected opportunity
+# No separate threshold needed - alert when an opportunity opens and closes
 
 # Database configuration
 # Can be overridden by DATABASE_ENABLED environment variable
@@ -58,6 +175,21 @@ DATABASE_URL = os.getenv("DATABASE_URL", _default_database_url)
 # Database settings
 DB_RETENTION_DAYS = int(os.getenv("DB_RETENTION_DAYS", "30"))
 DB_BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", "100"))
+# Rows are written by a background task: flushed once DB_BATCH_SIZE rows are
+# queued or every DB_FLUSH_INTERVAL seconds; the oldest rows are dropped once
+# DB_QUEUE_SIZE are waiting
+DB_FLUSH_INTERVAL = float(os.getenv("DB_FLUSH_INTERVAL", "1.0"))
+DB_QUEUE_SIZE = int(os.getenv("DB_QUEUE_SIZE", "10000"))
+# Rows that cannot be written while the database is unreachable are appended
+# to an on-disk spool and replayed in bulk once it is back (retried every
+# DB_RETRY_INTERVAL seconds). DB_SPOOL_FSYNC is "always" (every append),
+# "interval" (at most every DB_SPOOL_FSYNC_INTERVAL seconds) or "never"
+DB_SPOOL_ENABLED = os.getenv("DB_SPOOL_ENABLED", "true").lower() == "true"
+DB_SPOOL_DIR = os.getenv("DB_SPOOL_DIR", "spool")
+DB_SPOOL_SEGMENT_BYTES = int(os.getenv("DB_SPOOL_SEGMENT_BYTES", "8388608"))
+DB_SPOOL_FSYNC = os.getenv("DB_SPOOL_FSYNC", "interval").lower()
+DB_SPOOL_FSYNC_INTERVAL = float(os.getenv("DB_SPOOL_FSYNC_INTERVAL", "1.0"))
+DB_RETRY_INTERVAL = float(os.getenv("DB_RETRY_INTERVAL", "30"))
 
 # Timezone configuration for database timestamp display
 # Data is always stored in UTC, but this controls how timestamps are displayed in queries
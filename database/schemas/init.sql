@@ -69,6 +69,38 @@ CREATE INDEX IF NOT EXISTS idx_arbitrage_profit_percentage
 CREATE INDEX IF NOT EXISTS idx_arbitrage_exchanges 
     ON arbitrage_opportunities (buy_exchange, sell_exchange, timestamp DESC);
 
+-- Create opportunity_events table for opportunity lifecycle transitions
+-- ('open', 'update' when the peak grows, 'close'); durations give opportunity half-life
+CREATE TABLE IF NOT EXISTS opportunity_events (
+    id SERIAL,
+    event VARCHAR(10) NOT NULL,
+    buy_exchange VARCHAR(50) NOT NULL,
+    sell_exchange VARCHAR(50) NOT NULL,
+    asset VARCHAR(20) NOT NULL,
+    profit_percentage DECIMAL(8,4) NOT NULL,
+    peak_profit_percentage DECIMAL(8,4) NOT NULL,
+    opened_at TIMESTAMPTZ NOT NULL,
+    duration_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    observations INTEGER NOT NULL DEFAULT 1,
+    timestamp TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    -- Add constraints
+    CONSTRAINT opportunity_event_valid CHECK (event IN ('open', 'update', 'close')),
+    CONSTRAINT opportunity_duration_non_negative CHECK (duration_seconds >= 0)
+);
+
+-- Convert to hypertable
+SELECT create_hypertable('opportunity_events', 'timestamp',
+    chunk_time_interval => INTERVAL '1 day',
+    if_not_exists => TRUE
+);
+
+-- Create indexes for opportunity events
+CREATE INDEX IF NOT EXISTS idx_opportunity_events_exchanges
+    ON opportunity_events (buy_exchange, sell_exchange, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_opportunity_events_event
+    ON opportunity_events (event, timestamp DESC);
+
 -- Create exchange_status table for monitoring exchange health
 CREATE TABLE IF NOT EXISTS exchange_status (
     id SERIAL,
@@ -213,6 +245,7 @@ GROUP BY bucket, buy_exchange, sell_exchange;
 -- Uncomment these lines if you want automatic data cleanup:
 -- SELECT add_retention_policy('exchange_prices', INTERVAL '30 days');
 -- SELECT add_retention_policy('arbitrage_opportunities', INTERVAL '30 days');
+-- SELECT add_retention_policy('opportunity_events', INTERVAL '30 days');
 -- SELECT add_retention_policy('exchange_status', INTERVAL '7 days');
 
 -- Create helper functions
@@ -7,18 +7,34 @@ from config.settings import (
     COINMATE_TRADING_FEE,
     DATABASE_ENABLED,
     DATABASE_URL,
+    DB_SPOOL_DIR,
+    DB_SPOOL_ENABLED,
     DYNAMIC_FEES_ENABLED,
+    EXCHANGE_MONITORED_PAIRS,
+    EXCHANGE_POLL_BUDGETS,
+    EXCHANGE_PRICE_SOURCES,
     EXCHANGE_TRADING_PAIRS,
     KRAKEN_TRADING_FEE,
     MIN_PROFIT_PERCENTAGE,
+    POLL_BASE_INTERVAL,
+    POLL_HOT_BAND,
+    POLL_JITTER,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    POLL_REQUEST_DEADLINE,
+    STREAM_BOOK_DEPTH,
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_CHAT_ID,
     TELEGRAM_ENABLED,
     TRADING_SYMBOL,
 )
 from src.core.arbitrage_detector import ArbitrageDetector
+from src.core.detection_pipeline import DetectionPipeline, PriceUpdateBus
 from src.core.exchange_monitor import ExchangeMonitor
+from src.core.poll_scheduler import AdaptivePollScheduler
 from src.services.database_service import DatabaseService
+from src.services.database_writer import DatabaseWriter
+from src.services.fee_service import FeeService
 from src.services.telegram_service import TelegramService
 from src.utils.logging import log_with_timestamp
 
@@ -61,20 +77,52 @@ async def main():
     # Initialize database service
     database_service = DatabaseService(DATABASE_URL, DATABASE_ENABLED)
     if not await database_service.initialize():
-        log_with_timestamp(
-            "⚠ Database initialization failed - continuing without database"
+        if DB_SPOOL_ENABLED:
+            log_with_timestamp(
+                "⚠ Database initialization failed - spooling rows to disk "
+                "until it is reachable"
+            )
+        else:
+            log_with_timestamp(
+                "⚠ Database initialization failed - continuing without database"
+            )
+            database_service = None
+
+    # Rows are batched and written in the background, off the detection path;
+    # with the spool, rows the database cannot take are kept on disk
+    database_writer = None
+    if database_service and DATABASE_ENABLED:
+        database_writer = DatabaseWriter(
+            database_service, spool_dir=DB_SPOOL_DIR if DB_SPOOL_ENABLED else None
         )
-        database_service = None
+        database_writer.start()
 
     # Initialize services
+    update_bus = PriceUpdateBus()
     monitor = ExchangeMonitor(
         ALL_EXCHANGES,
         EXCHANGE_TRADING_PAIRS,
         API_KEYS,
         TRADING_SYMBOL,
-        database_service,
+        database_writer,
+        price_sources=EXCHANGE_PRICE_SOURCES,
+        book_depth=STREAM_BOOK_DEPTH or None,
+        update_bus=update_bus,
+        monitored_pairs=EXCHANGE_MONITORED_PAIRS,
+    )
+    await monitor.warm_up()
+    monitor.start_streams()
+    streamed_exchanges = monitor.get_streamed_exchanges()
+    if streamed_exchanges:
+        log_with_timestamp(f"📡 Streaming prices: {', '.join(streamed_exchanges)}")
+
+    # Fees are loaded before detection starts and refreshed in the background
+    fee_service = FeeService(monitor.get_exchange_api, monitor.monitored_pairs)
+    await fee_service.refresh()
+    fee_service.start()
+    detector = ArbitrageDetector(
+        monitor, MIN_PROFIT_PERCENTAGE, database_writer, fee_service
     )
-    detector = ArbitrageDetector(monitor, MIN_PROFIT_PERCENTAGE, database_service)
     telegram = TelegramService(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_ENABLED)
 
     # Test Telegram connection if enabled
@@ -83,55 +131,107 @@ async def main():
     elif TELEGRAM_ENABLED and (not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID):
         log_with_timestamp("⚠ Telegram enabled but missing BOT_TOKEN or CHAT_ID")
 
-    async def monitor_and_detect():
-        while True:
-            try:
-                tasks = []
-                for exchange_name in monitor.exchanges:
-                    tasks.append(monitor.fetch_price(exchange_name))
+    async def handle_events(events):
+        # Only lifecycle transitions arrive here, not every detection
+        opened = [event.opportunity for event in events if event.kind == "open"]
+        if opened:
+            log_with_timestamp(f"🚨 {len(opened)} arbitrage opportunities opened:")
 
-                if tasks:
-                    await asyncio.gather(*tasks, return_exceptions=True)
+        # Send Telegram alerts for newly opened opportunities
+        if telegram.enabled:
+            for opp in opened:
+                await telegram.send_arbitrage_alert(opp)
 
-                opportunities = await detector.detect_opportunities()
+        # Log opportunities to console
+        for i, opp in enumerate(opened[:3], 1):
+            gross_profit = ((opp.sell_price - opp.buy_price) / opp.buy_price) * 100
+            trading_fees = gross_profit - opp.profit_percentage
 
-                if opportunities:
-                    log_with_timestamp(
-                        f"🚨 Found {len(opportunities)} arbitrage opportunities:"
-                    )
+            log_with_timestamp(
+                f"{i}. Buy {opp.asset or 'BTC'} on {opp.buy_exchange} "
+                f"at ${opp.buy_price:.2f}"
+            )
+            log_with_timestamp(
+                f"   Sell on {opp.sell_exchange} at ${opp.sell_price:.2f}"
+            )
+            log_with_timestamp(
+                f"   Gross profit: {gross_profit:.2f}% | Trading fees: {trading_fees:.2f}%"  # noqa: E501
+            )
+            log_with_timestamp(
+                f"   Net profit: ${opp.profit_usd:.2f} ({opp.profit_percentage:.2f}%)"
+            )
+            log_with_timestamp(f"   Volume limit: {opp.volume_limit:.4f} BTC")
+            for tier in opp.size_tiers:
+                log_with_timestamp(
+                    f"   {tier.size:g} BTC: buy ${tier.buy_vwap:.2f} / "
+                    f"sell ${tier.sell_vwap:.2f} → "
+                    f"{tier.profit_percentage:.2f}% (${tier.profit_usd:.2f})"
+                )
+            if telegram.enabled:
+                log_with_timestamp("   📱 Telegram alert sent!")
+            else:
+                log_with_timestamp("   📱 Telegram alerts disabled")
+            print()
 
-                    # Send Telegram alerts for all detected opportunities
-                    if telegram.enabled:
-                        for opp in opportunities:
-                            await telegram.send_arbitrage_alert(opp)
+        for event in events:
+            tracked = event.tracked
+            name = (
+                f"{tracked.asset or 'BTC'} {tracked.buy_exchange} → "
+                f"{tracked.sell_exchange}"
+            )
+            if event.kind == "update":
+                log_with_timestamp(
+                    f"📈 {name}: new peak {tracked.peak_profit_percentage:.2f}% "
+                    f"(open {tracked.duration:.0f}s)"
+                )
+            elif event.kind == "close":
+                summary = (
+                    f"{name} closed after {tracked.duration:.1f}s "
+                    f"(peak {tracked.peak_profit_percentage:.2f}%)"
+                )
+                log_with_timestamp(f"✅ {summary}")
+                if telegram.enabled:
+                    await telegram.send_system_alert(f"✅ {summary}")
 
-                    # Log opportunities to console
-                    for i, opp in enumerate(opportunities[:3], 1):
-                        gross_profit = (
-                            (opp.sell_price - opp.buy_price) / opp.buy_price
-                        ) * 100
-                        trading_fees = gross_profit - opp.profit_percentage
+    async def handle_cycles(cycles):
+        for cycle in cycles[:3]:
+            route = " → ".join(f"{leg.target} ({leg.exchange})" for leg in cycle.legs)
+            log_with_timestamp(
+                f"🚨 Cycle {cycle.legs[0].source} → {route}: "
+                f"{cycle.profit_percentage:.2f}% net"
+            )
 
-                        log_with_timestamp(
-                            f"{i}. Buy on {opp.buy_exchange} at ${opp.buy_price:.2f}"
-                        )
-                        log_with_timestamp(
-                            f"   Sell on {opp.sell_exchange} at ${opp.sell_price:.2f}"
-                        )
-                        log_with_timestamp(
-                            f"   Gross profit: {gross_profit:.2f}% | Trading fees: {trading_fees:.2f}%"  # noqa: E501
-                        )
-                        log_with_timestamp(
-                            f"   Net profit: ${opp.profit_usd:.2f} ({opp.profit_percentage:.2f}%)"
-                        )
-                        log_with_timestamp(
-                            f"   Volume limit: {opp.volume_limit:.4f} BTC"
-                        )
-                        if telegram.enabled:
-                            log_with_timestamp("   📱 Telegram alert sent!")
-                        else:
-                            log_with_timestamp("   📱 Telegram alerts disabled")
-                        print()
+    # Detection runs on every price update instead of once per polling cycle
+    pipeline = DetectionPipeline(
+        detector, update_bus, on_cycles=handle_cycles, on_events=handle_events
+    )
+    pipeline_task = asyncio.create_task(pipeline.run())
+
+    # Each REST exchange is polled on its own adaptive interval
+    scheduler = AdaptivePollScheduler(
+        monitor,
+        MIN_PROFIT_PERCENTAGE,
+        base_interval=POLL_BASE_INTERVAL,
+        min_interval=POLL_MIN_INTERVAL,
+        max_interval=POLL_MAX_INTERVAL,
+        request_deadline=POLL_REQUEST_DEADLINE,
+        jitter=POLL_JITTER,
+        hot_band=POLL_HOT_BAND,
+        budgets=EXCHANGE_POLL_BUDGETS,
+        fee_percentage=KRAKEN_TRADING_FEE + COINMATE_TRADING_FEE,
+        rate_limiters=monitor.rate_limiters,
+    )
+    scheduler.start(monitor.get_polled_exchanges())
+
+    async def monitor_and_detect():
+        while True:
+            try:
+                # Streams can go quiet without erroring; drop their old prices
+                monitor.evict_stale_prices()
+                # Opportunities on pairs that stopped updating are closed too
+                expired = await detector.expire_opportunities(monitor.stale_after)
+                if expired:
+                    await handle_events(expired)
 
                 spread_data = monitor.get_price_spread()
                 if spread_data:
@@ -176,7 +276,65 @@ async def main():
                         )
                     log_with_timestamp("No spread data available yet...")
 
-                await asyncio.sleep(5)
+                latency = pipeline.get_latency_stats()["detection"]
+                if latency["count"]:
+                    log_with_timestamp(
+                        f"Tick-to-signal: p50 {latency['p50_ms']:.1f}ms | "
+                        f"p99 {latency['p99_ms']:.1f}ms "
+                        f"({latency['count']} detections)"
+                    )
+
+                tracked = detector.tracker.get_stats()
+                if tracked["opened"]:
+                    duration = tracked["duration"]
+                    median = (
+                        f", median duration {duration['p50_ms'] / 1000:.1f}s"
+                        if duration["count"]
+                        else ""
+                    )
+                    log_with_timestamp(
+                        f"Opportunities: {tracked['open']} open, "
+                        f"{tracked['opened']} opened, {tracked['closed']} closed"
+                        f"{median}"
+                    )
+
+                if database_writer:
+                    written = database_writer.get_stats()
+                    if written["dropped"] or written["failed"]:
+                        log_with_timestamp(
+                            f"⚠ Database writer: {written['dropped']} rows dropped, "
+                            f"{written['failed']} failed, {written['queued']} queued"
+                        )
+                    if database_writer.spooling:
+                        log_with_timestamp(
+                            f"⚠ Database writer: {written['spooled']} rows spooled "
+                            f"({written['spool_bytes'] / 1e6:.1f} MB on disk), "
+                            f"{written['replayed']} replayed"
+                        )
+
+                for exchange_name, status in scheduler.get_status().items():
+                    log_with_timestamp(
+                        f"Polling {exchange_name} every {status['interval']:.1f}s "
+                        f"({status['errors']} errors, {status['timeouts']} timeouts)"
+                    )
+
+                for exchange_name, hedger in monitor.hedgers.items():
+                    stats = hedger.get_stats()
+                    if stats["hedged"]:
+                        log_with_timestamp(
+                            f"Hedging {exchange_name}: {stats['hedge_rate']:.1%} hedged, "
+                            f"{stats['hedge_wins']} wins, "
+                            f"~{stats['latency_saved_ms']:.0f}ms saved"
+                        )
+
+                for exchange_name, health in monitor.health.get_status().items():
+                    if health["state"] != "closed":
+                        log_with_timestamp(
+                            f"⚠ {exchange_name} circuit {health['state']} "
+                            f"(error rate {health['error_rate']:.0%})"
+                        )
+
+                await asyncio.sleep(POLL_BASE_INTERVAL)
 
             except KeyboardInterrupt:
                 log_with_timestamp("Stopping arbitrage monitor...")
@@ -188,7 +346,17 @@ async def main():
     try:
         await monitor_and_detect()
     finally:
-        # Cleanup database connection
+        await scheduler.stop()
+        await fee_service.stop()
+        pipeline.stop()
+        pipeline_task.cancel()
+
+        # Close pooled exchange connections
+        await monitor.close()
+
+        # Write what is still queued, then close the database connection
+        if database_writer:
+            await database_writer.stop()
         if database_service:
             await database_service.close()
 
@@ -1,7 +1,29 @@
 """Exchange API clients for cryptocurrency arbitrage monitoring."""
 
 from .base_exchange import BaseExchangeAPI, create_exchange_api
-from .coinmate.api import CoinmateAPI
-from .kraken.api import KrakenAPI
+from .registry import ExchangeRegistry, get_default_registry
 
-__all__ = ["BaseExchangeAPI", "create_exchange_api", "CoinmateAPI", "KrakenAPI"]
\ No newline at end of file
+# Exchange clients are imported on first access so unused venues (and their
+# HTTP dependencies) are not loaded with the package
+_LAZY_CLIENTS = {
+    "CoinmateAPI": ".coinmate.api",
+    "KrakenAPI": ".kraken.api",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CLIENTS:
+        import importlib
+
+        return getattr(importlib.import_module(_LAZY_CLIENTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "BaseExchangeAPI",
+    "create_exchange_api",
+    "ExchangeRegistry",
+    "get_default_registry",
+    "CoinmateAPI",
+    "KrakenAPI",
+]
@@ -5,8 +5,11 @@ This module defines the interface that all exchange API implementations must fol
 ensuring consistency and making it easy to add new exchanges.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from .payloads import FeeSchedule, Ticker
 
 
 class BaseExchangeAPI(ABC):
@@ -17,6 +20,9 @@ class BaseExchangeAPI(ABC):
     must inherit from this class and implement the required methods.
     """
 
+    # Constructor credentials beyond api_key/api_secret (e.g. Coinmate's client_id)
+    extra_credentials: Tuple[str, ...] = ()
+
     def __init__(
         self, api_key: Optional[str] = None, api_secret: Optional[str] = None, **kwargs
     ):
@@ -26,11 +32,19 @@ class BaseExchangeAPI(ABC):
         Args:
             api_key: API key for authenticated requests
             api_secret: API secret for authenticated requests
-            **kwargs: Additional exchange-specific parameters (e.g., client_id for Coinmate)
+            **kwargs: Additional exchange-specific parameters (e.g., client_id for Coinmate,
+                session_manager for borrowing a shared pooled HTTP session,
+                rate_limiter for the exchange's shared request budget,
+                hedger for hedging slow public GETs)
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.session = None
+        self.session_manager = kwargs.get("session_manager")
+        self._owns_session = False
+        self._session_users = 0
+        self.rate_limiter = kwargs.get("rate_limiter")
+        self.hedger = kwargs.get("hedger")
 
     @abstractmethod
     async def __aenter__(self):
@@ -40,6 +54,87 @@ class BaseExchangeAPI(ABC):
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit - cleanup session"""
 
+    async def _open_session(self):
+        """
+        Borrow the shared session for this exchange from the session manager,
+        or open a private session when no manager was provided.
+
+        Clients are cached and shared, so nested or concurrent ``async with``
+        blocks reuse the session opened by the first one.
+        """
+        from ..services.session_manager import borrow_or_create_session
+
+        self._session_users += 1
+        if self.session is not None:
+            return
+        self._owns_session = self.session_manager is None
+        self.session = borrow_or_create_session(
+            self.session_manager, self.get_exchange_name()
+        )
+
+    async def _close_session(self):
+        """Close the session only if this client created it and nobody else uses it"""
+        self._session_users = max(0, self._session_users - 1)
+        if self._session_users:
+            return
+        if self.session and self._owns_session:
+            await self.session.close()
+        self.session = None
+        self._owns_session = False
+
+    def _request_cost(self, endpoint: str) -> float:
+        """
+        Rate-limit cost of a request to an endpoint.
+
+        Args:
+            endpoint: API endpoint path
+
+        Returns:
+            Number of tokens the request consumes (0 for unmetered endpoints)
+        """
+        return 1.0
+
+    async def _throttle(self, endpoint: str, private: bool = False):
+        """
+        Wait for the exchange's request budget before sending a request.
+
+        Requests queue on the shared rate limiter instead of failing; clients
+        created without a rate limiter are not throttled.
+        """
+        cost = self._request_cost(endpoint)
+        if self.rate_limiter is not None and cost > 0:
+            await self.rate_limiter.acquire(private, cost)
+
+    def _on_rate_limited(self, private: bool = False):
+        """Drain the budget after the exchange rejected a request as over the limit"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.penalize(private)
+
+    async def _send_public_get(
+        self, endpoint: str, send: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Send a public GET, hedging it when a hedger is configured.
+
+        A duplicate is only sent if the rate limiter's hedge allowance has a
+        token free right now, so hedging stays within a fixed extra budget.
+
+        Args:
+            endpoint: API endpoint path, used for the request cost
+            send: Factory performing one attempt of the request
+        """
+        if self.hedger is None:
+            return await send()
+
+        cost = self._request_cost(endpoint)
+
+        def reserve_hedge() -> bool:
+            return self.rate_limiter is None or self.rate_limiter.try_acquire_hedge(
+                cost
+            )
+
+        return await self.hedger.run(send, reserve_hedge)
+
     # Core price/market data methods (required for arbitrage detection)
 
     @abstractmethod
@@ -66,6 +161,117 @@ class BaseExchangeAPI(ABC):
             Trading fee as percentage (e.g., 0.26 for 0.26%) or None if error
         """
 
+    @abstractmethod
+    def parse_ticker(self, payload: Any, pair: str) -> Ticker:
+        """
+        Decode a get_ticker response for one pair.
+
+        Args:
+            payload: Response returned by get_ticker
+            pair: Exchange-specific pair that was requested
+
+        Returns:
+            Normalized ticker whose pair is the requested pair
+
+        Raises:
+            PayloadError: If the exchange reported an error or sent no price
+        """
+
+    def parse_tickers(self, payload: Any, pairs: Iterable[str]) -> Dict[str, Ticker]:
+        """
+        Decode a multi-pair ticker response.
+
+        The default decodes each requested pair with parse_ticker; exchanges
+        whose multi-pair responses are laid out differently override this.
+
+        Args:
+            payload: Response returned by get_ticker
+            pairs: Exchange-specific pairs that were requested
+
+        Returns:
+            Normalized ticker per requested pair
+
+        Raises:
+            PayloadError: If the exchange reported an error or sent no price
+        """
+        return {pair: self.parse_ticker(payload, pair) for pair in pairs}
+
+    async def fetch_normalized_ticker(self, pair: str) -> Optional[Ticker]:
+        """
+        Fetch and decode the ticker for a trading pair.
+
+        Args:
+            pair: Trading pair in standard format (e.g., "BTC/USD")
+
+        Returns:
+            Normalized ticker, or None if the exchange did not respond
+
+        Raises:
+            PayloadError: If the exchange reported an error or sent no price
+        """
+        normalized_pair = self.normalize_pair(pair)
+        payload = await self.get_ticker(normalized_pair)
+        if payload is None:
+            return None
+        return self.parse_ticker(payload, normalized_pair)
+
+    async def fetch_normalized_tickers(self, pairs: Iterable[str]) -> Dict[str, Ticker]:
+        """
+        Fetch and decode tickers for several trading pairs.
+
+        The default sends one request per pair concurrently; exchanges with a
+        multi-pair ticker endpoint override this to use a single request.
+        Pairs that fail or are missing are left out of the result.
+
+        Args:
+            pairs: Trading pairs in standard format (e.g., "BTC/USD")
+
+        Returns:
+            Normalized ticker per standard-format pair
+
+        Raises:
+            PayloadError: If every pair failed, the first pair's error
+        """
+        pairs = list(pairs)
+        results = await asyncio.gather(
+            *(self.fetch_normalized_ticker(pair) for pair in pairs),
+            return_exceptions=True,
+        )
+        tickers = {
+            pair: result
+            for pair, result in zip(pairs, results)
+            if isinstance(result, Ticker)
+        }
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors and not tickers:
+            raise errors[0]
+        return tickers
+
+    async def fetch_fee_schedules(self, pairs: Iterable[str]) -> Dict[str, FeeSchedule]:
+        """
+        Fetch maker and taker fees for several trading pairs.
+
+        The default calls get_trading_fees per pair and uses its single fee
+        for both sides; exchanges that report maker and taker fees override
+        this. Pairs whose fee could not be fetched are left out.
+
+        Args:
+            pairs: Trading pairs in standard format (e.g., "BTC/USD")
+
+        Returns:
+            Fee schedule per standard-format pair
+        """
+        pairs = list(pairs)
+        fees = await asyncio.gather(
+            *(self.get_trading_fees(self.normalize_pair(pair)) for pair in pairs),
+            return_exceptions=True,
+        )
+        return {
+            pair: FeeSchedule(maker=float(fee), taker=float(fee))
+            for pair, fee in zip(pairs, fees)
+            if isinstance(fee, (int, float))
+        }
+
     # Optional market data methods
 
     async def get_orderbook(self, pair: str, **kwargs) -> Optional[Dict]:
@@ -161,6 +367,10 @@ def create_exchange_api(exchange_name: str, **kwargs) -> BaseExchangeAPI:
     """
     Factory function to create exchange API instances.
 
+    Adapters are looked up in the default ExchangeRegistry and imported on
+    first use. Each call builds a new client; use the registry's get() to
+    reuse one per credentials.
+
     Args:
         exchange_name: Name of the exchange ("kraken", "coinmate", etc.)
         **kwargs: API credentials and other parameters
@@ -171,15 +381,6 @@ def create_exchange_api(exchange_name: str, **kwargs) -> BaseExchangeAPI:
     Raises:
         ValueError: If exchange_name is not supported
     """
-    if exchange_name.lower() == "kraken":
-        from .kraken.api import KrakenAPI
+    from .registry import get_default_registry
 
-        return KrakenAPI(kwargs.get("api_key"), kwargs.get("api_secret"))
-    elif exchange_name.lower() == "coinmate":
-        from .coinmate.api import CoinmateAPI
-
-        return CoinmateAPI(
-            kwargs.get("api_key"), kwargs.get("api_secret"), kwargs.get("client_id")
-        )
-    else:
-        raise ValueError(f"Unsupported exchange: {exchange_name}")
+    return get_default_registry().create(exchange_name, **kwargs)
@@ -0,0 +1,299 @@
+"""
+Abstract base class for push-based exchange market data streams.
+
+Streams keep one WebSocket connection open per exchange, subscribe to the
+configured channels and push normalized updates to callbacks supplied by the
+caller (usually ExchangeMonitor). Reconnection and resubscription are handled
+here so exchange implementations only describe their wire protocol.
+"""
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from ..services.session_manager import borrow_or_create_session
+from ..utils.json_codec import loads
+from ..utils.logging import log_with_timestamp
+
+if TYPE_CHECKING:
+    from ..services.session_manager import SessionManager
+
+# (exchange, symbol, last_price, volume) plus keyword arguments bid, ask,
+# bid_size and ask_size (None when the channel does not carry a quote)
+TickerCallback = Callable[..., Awaitable[None]]
+# (exchange, symbol, bids, asks, is_snapshot, checksum) with levels as
+# (price, quantity); checksum is None when the exchange does not send one
+BookCallback = Callable[
+    [
+        str,
+        str,
+        List[Tuple[float, float]],
+        List[Tuple[float, float]],
+        bool,
+        Optional[int],
+    ],
+    Awaitable[None],
+]
+# (exchange, symbol, price, amount, timestamp)
+TradeCallback = Callable[[str, str, float, float, float], Awaitable[None]]
+
+
+class BaseExchangeStream(ABC):
+    """
+    Abstract base class for exchange WebSocket streams.
+
+    Subclasses implement the exchange-specific subscribe messages and message
+    parsing; the base class owns the connection lifecycle.
+    """
+
+    default_url: str = ""
+
+    def __init__(
+        self,
+        symbols: List[str],
+        on_ticker: Optional[TickerCallback] = None,
+        on_book: Optional[BookCallback] = None,
+        on_trade: Optional[TradeCallback] = None,
+        book_depth: Optional[int] = None,
+        url: Optional[str] = None,
+        session_manager: Optional["SessionManager"] = None,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        receive_timeout: float = 30.0,
+    ):
+        """
+        Initialize the stream.
+
+        Args:
+            symbols: Trading pairs in standard format (e.g., "BTC/USD")
+            on_ticker: Coroutine called for every ticker update
+            on_book: Coroutine called for every order book snapshot or delta
+            on_trade: Coroutine called for every public trade
+            book_depth: Number of book levels to track (book disabled if None)
+            url: WebSocket URL override (e.g., a local fake server in tests)
+            session_manager: Optional shared session registry
+            reconnect_delay: Initial delay before reconnecting in seconds
+            max_reconnect_delay: Upper bound for the exponential backoff
+            receive_timeout: Reconnect if no message arrives within this time
+        """
+        self.symbols = symbols
+        self.on_ticker = on_ticker
+        self.on_book = on_book
+        self.on_trade = on_trade
+        self.book_depth = book_depth
+        self.url = url or self.default_url
+        self.session_manager = session_manager
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.receive_timeout = receive_timeout
+        self.connected = False
+        self.connection_count = 0
+        self.message_count = 0
+        self._running = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+
+    @property
+    def book_enabled(self) -> bool:
+        """Whether order book updates were requested"""
+        return bool(self.book_depth) and self.on_book is not None
+
+    @abstractmethod
+    def get_exchange_name(self) -> str:
+        """
+        Get the name of this exchange.
+
+        Returns:
+            Exchange name (e.g., "kraken", "coinmate")
+        """
+
+    @abstractmethod
+    def build_subscribe_messages(self) -> List[Dict]:
+        """
+        Build the messages sent right after (re)connecting.
+
+        Returns:
+            List of JSON-serializable subscribe requests
+        """
+
+    @abstractmethod
+    async def handle_message(self, message: Dict):
+        """
+        Parse one decoded message and dispatch it to the callbacks.
+
+        Args:
+            message: Decoded JSON message from the socket
+        """
+
+    async def run(self):
+        """Connect and keep the stream alive until stop() is called"""
+        self._running = True
+        self._session = borrow_or_create_session(
+            self.session_manager, self.get_exchange_name()
+        )
+        delay = self.reconnect_delay
+        name = self.get_exchange_name().title()
+
+        try:
+            while self._running:
+                try:
+                    await self._connect_and_listen()
+                    # Clean close from the server - reset the backoff
+                    delay = self.reconnect_delay
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    log_with_timestamp(f"✗ {name} stream error: {e}")
+
+                if not self._running:
+                    break
+
+                log_with_timestamp(
+                    f"⚠ {name} stream disconnected, reconnecting in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+        finally:
+            self.connected = False
+            if self.session_manager is None and self._session:
+                await self._session.close()
+            self._session = None
+
+    async def stop(self):
+        """Stop the stream and close the socket"""
+        self._running = False
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+
+    def book_precision(self, symbol: str) -> Optional[Tuple[int, int]]:
+        """
+        Price and quantity decimals the exchange uses for a symbol's book.
+
+        Returns:
+            (price_precision, qty_precision) or None if checksums are not supported
+        """
+        return None
+
+    async def resync_book(self):
+        """
+        Drop the connection so the stream reconnects with a fresh snapshot.
+
+        Used when a local book fails checksum validation.
+        """
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+
+    async def send_json(self, message: Dict):
+        """Send a JSON message on the open socket"""
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.send_str(json.dumps(message))
+
+    async def _connect_and_listen(self):
+        """Open one connection, subscribe and process messages until it closes"""
+        async with self._session.ws_connect(self.url) as ws:
+            self._ws = ws
+            self.connected = True
+            self.connection_count += 1
+            log_with_timestamp(
+                f"✓ {self.get_exchange_name().title()} stream connected: "
+                f"{', '.join(self.symbols)}"
+            )
+
+            for message in self.build_subscribe_messages():
+                await self.send_json(message)
+
+            try:
+                while self._running:
+                    msg = await ws.receive(timeout=self.receive_timeout)
+                    if msg.type == aiohttp.WSMsgType.TEXT:
+                        self.message_count += 1
+                        await self.handle_message(loads(msg.data))
+                    elif msg.type in (
+                        aiohttp.WSMsgType.CLOSE,
+                        aiohttp.WSMsgType.CLOSING,
+                        aiohttp.WSMsgType.CLOSED,
+                        aiohttp.WSMsgType.ERROR,
+                    ):
+                        break
+            finally:
+                self.connected = False
+                self._ws = None
+
+    async def _emit_ticker(
+        self,
+        symbol: str,
+        price: float,
+        volume: float,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        bid_size: Optional[float] = None,
+        ask_size: Optional[float] = None,
+    ):
+        """Forward a normalized ticker update to the callback"""
+        if self.on_ticker is not None:
+            await self.on_ticker(
+                self.get_exchange_name(),
+                symbol,
+                price,
+                volume,
+                bid=bid,
+                ask=ask,
+                bid_size=bid_size,
+                ask_size=ask_size,
+            )
+
+    async def _emit_trade(
+        self, symbol: str, price: float, amount: float, timestamp: float
+    ):
+        """Forward a normalized public trade to the callback"""
+        if self.on_trade is not None:
+            await self.on_trade(
+                self.get_exchange_name(), symbol, price, amount, timestamp
+            )
+
+    async def _emit_book(
+        self,
+        symbol: str,
+        bids: List[Tuple[float, float]],
+        asks: List[Tuple[float, float]],
+        is_snapshot: bool,
+        checksum: Optional[int] = None,
+    ):
+        """Forward a normalized order book update to the callback"""
+        if self.on_book is not None:
+            await self.on_book(
+                self.get_exchange_name(), symbol, bids, asks, is_snapshot, checksum
+            )
+
+
+# Factory function for creating exchange stream instances
+def create_exchange_stream(
+    exchange_name: str, symbols: List[str], **kwargs
+) -> BaseExchangeStream:
+    """
+    Factory function to create exchange stream instances.
+
+    Args:
+        exchange_name: Name of the exchange ("kraken", "coinmate", etc.)
+        symbols: Trading pairs to subscribe to
+        **kwargs: Callbacks, URL override and connection parameters
+
+    Returns:
+        Exchange stream instance
+
+    Raises:
+        ValueError: If the exchange has no streaming implementation
+    """
+    if exchange_name.lower() == "kraken":
+        from .kraken.websocket import KrakenWebSocketStream
+
+        return KrakenWebSocketStream(symbols, **kwargs)
+    elif exchange_name.lower() == "coinmate":
+        from .coinmate.websocket import CoinmateWebSocketStream
+
+        return CoinmateWebSocketStream(symbols, **kwargs)
+    else:
+        raise ValueError(f"Streaming not supported for exchange: {exchange_name}")
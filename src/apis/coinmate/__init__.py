@@ -1,5 +1,13 @@
 """Coinmate exchange API implementation."""
 
-from .api import CoinmateAPI
 
-__all__ = ['CoinmateAPI']
\ No newline at end of file
+def __getattr__(name):
+    # Imported lazily so the decoders can be used without the HTTP client
+    if name == "CoinmateAPI":
+        from .api import CoinmateAPI
+
+        return CoinmateAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["CoinmateAPI"]
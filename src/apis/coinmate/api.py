@@ -1,12 +1,18 @@
 import hashlib
 import hmac
 import time
-from typing import Dict, Optional
-
-import aiohttp
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
 
+from ...utils.json_codec import loads
 from ...utils.logging import log_with_timestamp
 from ..base_exchange import BaseExchangeAPI
+from ..payloads import FeeSchedule, PayloadError, Ticker
+from .decoding import decode_ticker, decode_trader_fees
+
+if TYPE_CHECKING:
+    from ...services.rate_limiter import ExchangeRateLimiter
+    from ...services.request_hedger import RequestHedger
+    from ...services.session_manager import SessionManager
 
 
 class CoinmateAPI(BaseExchangeAPI):
@@ -18,25 +24,37 @@ class CoinmateAPI(BaseExchangeAPI):
         api_key: Public key (publicKey in Coinmate terms)
         api_secret: Private key (privateKey in Coinmate terms)
         client_id: Client ID from account settings
+        session_manager: Optional shared session registry to borrow connections from
     """
 
+    extra_credentials = ("client_id",)
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         api_secret: Optional[str] = None,
         client_id: Optional[str] = None,
+        session_manager: Optional["SessionManager"] = None,
+        rate_limiter: Optional["ExchangeRateLimiter"] = None,
+        hedger: Optional["RequestHedger"] = None,
     ):
-        super().__init__(api_key, api_secret, client_id=client_id)
+        super().__init__(
+            api_key,
+            api_secret,
+            client_id=client_id,
+            session_manager=session_manager,
+            rate_limiter=rate_limiter,
+            hedger=hedger,
+        )
         self.base_url = "https://coinmate.io/api"
         self.client_id = client_id
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        await self._open_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self._close_session()
 
     def _generate_signature(self, nonce: str) -> str:
         """Generate HMAC-SHA256 signature for authenticated requests"""
@@ -87,19 +105,31 @@ class CoinmateAPI(BaseExchangeAPI):
                 }
             )
 
+        await self._throttle(endpoint, auth_required)
+
         try:
             if method == "GET":
-                async with self.session.get(url, params=data) as response:
-                    if response.status == 200:
-                        return await response.json()
+
+                async def send():
+                    async with self.session.get(url, params=data) as response:
+                        if response.status == 429:
+                            self._on_rate_limited(auth_required)
+                        if response.status == 200:
+                            return loads(await response.read())
+
+                if auth_required:
+                    return await send()
+                return await self._send_public_get(endpoint, send)
             elif method == "POST":
                 # Use proper headers for form data as in working implementation
                 headers = {"Content-Type": "application/x-www-form-urlencoded"}
                 async with self.session.post(
                     url, data=data, headers=headers
                 ) as response:
+                    if response.status == 429:
+                        self._on_rate_limited(auth_required)
                     if response.status == 200:
-                        return await response.json()
+                        return loads(await response.read())
 
         except Exception as e:
             log_with_timestamp(f"✗ Coinmate API error: {e}")
@@ -114,6 +144,10 @@ class CoinmateAPI(BaseExchangeAPI):
         data = {"currencyPair": currency_pair}
         return await self._make_request(endpoint, "GET", data, auth_required=False)
 
+    def parse_ticker(self, payload: Any, pair: str) -> Ticker:
+        """Decode a ticker response; Coinmate sends best prices but no sizes"""
+        return decode_ticker(payload, pair)
+
     async def get_orderbook(self, currency_pair: str = "BTC_CZK") -> Optional[Dict]:
         """
         Get order book for a currency pair
@@ -200,6 +234,33 @@ class CoinmateAPI(BaseExchangeAPI):
             log_with_timestamp(f"✗ Coinmate fee fetch error: {e}")
         return None
 
+    async def fetch_fee_schedules(self, pairs: Iterable[str]) -> Dict[str, FeeSchedule]:
+        """
+        Fetch maker and taker fees per pair from the private traderFees endpoint.
+
+        Requires credentials; without them no fees are returned so configured
+        fees stay in use.
+        """
+        if not all([self.api_key, self.api_secret, self.client_id]):
+            return {}
+
+        fees = {}
+        for pair in pairs:
+            currency_pair = self.normalize_pair(pair)
+            payload = await self._make_request(
+                "traderFees",
+                "POST",
+                {"currencyPair": currency_pair},
+                auth_required=True,
+            )
+            if payload is None:
+                continue
+            try:
+                fees[pair] = decode_trader_fees(payload, currency_pair)
+            except PayloadError as e:
+                log_with_timestamp(f"⚠ {e}")
+        return fees
+
     # Authenticated endpoints (require API credentials)
 
     async def get_balance(self) -> Optional[Dict]:
@@ -257,8 +318,8 @@ class CoinmateAPI(BaseExchangeAPI):
 async def get_coinmate_btc_czk_price() -> Optional[float]:
     """Get current BTC/CZK price from Coinmate"""
     async with CoinmateAPI() as api:
-        ticker_data = await api.get_ticker("BTC_CZK")
-        if ticker_data and not ticker_data.get("error", True):
-            data = ticker_data.get("data", {})
-            return float(data.get("last", 0))
-    return None
+        try:
+            ticker = await api.fetch_normalized_ticker("BTC/CZK")
+        except PayloadError:
+            return None
+    return ticker.last if ticker else None
@@ -0,0 +1,97 @@
+"""
+Decoders for Coinmate REST market data payloads.
+
+Coinmate wraps every response as {"error": bool, "errorMessage": str,
+"data": ...}. Order book levels are {"price", "amount"} objects and trade
+timestamps are in milliseconds.
+"""
+
+from typing import Dict, List, Union
+
+from ...utils.json_codec import loads
+from ..payloads import (
+    Depth,
+    FeeSchedule,
+    PayloadError,
+    Ticker,
+    Trade,
+    optional_float,
+)
+
+Payload = Union[bytes, str, Dict]
+
+
+def _data(payload: Payload):
+    data = payload if isinstance(payload, dict) else loads(payload)
+    if data.get("error", True):
+        raise PayloadError(
+            f"Coinmate API error: {data.get('errorMessage') or 'Unknown error'}"
+        )
+    return data.get("data") or {}
+
+
+def decode_ticker(payload: Payload, pair: str) -> Ticker:
+    """
+    Decode a /ticker response.
+
+    Coinmate's ticker carries best bid/ask prices but no sizes; "amount" is
+    the 24h volume.
+
+    Raises:
+        PayloadError: If Coinmate reported an error or sent no last price
+    """
+    data = _data(payload)
+    price = optional_float(data.get("last"))
+    if not price:
+        raise PayloadError(f"No price data in Coinmate ticker for {pair}")
+    return Ticker(
+        pair=pair,
+        last=price,
+        volume=optional_float(data.get("amount")) or 0.0,
+        bid=optional_float(data.get("bid")) or None,
+        ask=optional_float(data.get("ask")) or None,
+    )
+
+
+def decode_trader_fees(payload: Payload, pair: str) -> FeeSchedule:
+    """
+    Decode a /traderFees response ({"maker", "taker", "timestamp"}).
+
+    Raises:
+        PayloadError: If Coinmate reported an error or sent no taker fee
+    """
+    data = _data(payload)
+    taker = optional_float(data.get("taker"))
+    if taker is None:
+        raise PayloadError(f"No taker fee in Coinmate traderFees for {pair}")
+    maker = optional_float(data.get("maker"))
+    return FeeSchedule(maker=taker if maker is None else maker, taker=taker)
+
+
+def decode_order_book(payload: Payload, pair: str) -> Depth:
+    """Decode an /orderBook response"""
+    data = _data(payload)
+    return Depth(
+        pair=pair,
+        bids=[
+            (float(level["price"]), float(level["amount"]))
+            for level in data.get("bids", [])
+        ],
+        asks=[
+            (float(level["price"]), float(level["amount"]))
+            for level in data.get("asks", [])
+        ],
+    )
+
+
+def decode_transactions(payload: Payload) -> List[Trade]:
+    """Decode a /transactions response; timestamps are converted to seconds"""
+    return [
+        Trade(
+            price=float(entry["price"]),
+            amount=float(entry["amount"]),
+            timestamp=float(entry["timestamp"]) / 1000,
+            side=(entry.get("tradeType") or "").lower() or None,
+        )
+        for entry in _data(payload) or []
+    ]
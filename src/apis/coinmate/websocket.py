@@ -0,0 +1,124 @@
+from typing import Dict, List, Tuple
+
+from ...utils.logging import log_with_timestamp
+from ..base_stream import BaseExchangeStream
+
+
+class CoinmateWebSocketStream(BaseExchangeStream):
+    """
+    Coinmate public WebSocket client for statistics, trades and order book
+    Based on https://coinmate.docs.apiary.io/#reference/websocket
+
+    Channels are named "<type>-<PAIR>" (e.g., "order_book-BTC_CZK"). The
+    order_book channel pushes the full top of book on every change, so this
+    client keeps the previous levels and emits only the changed levels as a
+    delta (quantity 0 means the level was removed) after the first snapshot.
+    """
+
+    default_url = "wss://coinmate.io/api/websocket"
+
+    def __init__(self, symbols: List[str], **kwargs):
+        super().__init__(symbols, **kwargs)
+        self._pair_to_symbol = {self.normalize_pair(s): s for s in symbols}
+        self._books: Dict[str, Tuple[Dict[float, float], Dict[float, float]]] = {}
+        self._volumes: Dict[str, float] = {}
+
+    def get_exchange_name(self) -> str:
+        """Get the name of this exchange"""
+        return "coinmate"
+
+    def normalize_pair(self, pair: str) -> str:
+        """Convert BTC/CZK to BTC_CZK format for Coinmate"""
+        return pair.replace("/", "_")
+
+    def build_subscribe_messages(self) -> List[Dict]:
+        """Subscribe to statistics and trades (and optionally order book)"""
+        channel_types = ["statistics", "trades"]
+        if self.book_enabled:
+            channel_types.append("order_book")
+
+        # A fresh connection needs a fresh snapshot before deltas make sense
+        self._books = {}
+
+        return [
+            {"event": "subscribe", "data": {"channel": f"{channel}-{pair}"}}
+            for pair in self._pair_to_symbol
+            for channel in channel_types
+        ]
+
+    async def handle_message(self, message: Dict):
+        """Dispatch statistics, trades and order book payloads"""
+        event = message.get("event")
+        if event == "ping":
+            await self.send_json({"event": "pong"})
+            return
+        if event == "error":
+            log_with_timestamp(f"✗ Coinmate stream error: {message.get('message')}")
+            return
+        if event != "data":
+            return
+
+        channel_type, _, pair = message.get("channel", "").rpartition("-")
+        symbol = self._pair_to_symbol.get(pair)
+        if symbol is None:
+            return
+        payload = message.get("payload") or {}
+
+        if channel_type == "statistics":
+            last = payload.get("lastRealizedTrade")
+            if last is not None:
+                volume = float(payload.get("volume", 0.0))
+                self._volumes[symbol] = volume
+                await self._emit_ticker(symbol, float(last), volume)
+
+        elif channel_type == "trades":
+            trades = payload if isinstance(payload, list) else [payload]
+            latest = None
+            for trade in trades:
+                price = float(trade["price"])
+                timestamp = float(trade.get("date", 0)) / 1000
+                await self._emit_trade(symbol, price, float(trade["amount"]), timestamp)
+                if latest is None or timestamp >= latest[1]:
+                    latest = (price, timestamp)
+            if latest is not None:
+                await self._emit_ticker(
+                    symbol, latest[0], self._volumes.get(symbol, 0.0)
+                )
+
+        elif channel_type == "order_book":
+            await self._handle_book(symbol, payload)
+
+    async def _handle_book(self, symbol: str, payload: Dict):
+        """Turn a full order book push into a snapshot or a delta"""
+        bids = self._levels(payload.get("bids", []), reverse=True)
+        asks = self._levels(payload.get("asks", []), reverse=False)
+
+        previous = self._books.get(symbol)
+        self._books[symbol] = (bids, asks)
+
+        if previous is None:
+            await self._emit_book(symbol, list(bids.items()), list(asks.items()), True)
+            return
+
+        bid_changes = self._diff(previous[0], bids)
+        ask_changes = self._diff(previous[1], asks)
+        if bid_changes or ask_changes:
+            await self._emit_book(symbol, bid_changes, ask_changes, False)
+
+    def _levels(self, raw_levels: List[Dict], reverse: bool) -> Dict[float, float]:
+        """Parse levels best-first, trimmed to the configured depth"""
+        levels = sorted(
+            ((float(lvl["price"]), float(lvl["amount"])) for lvl in raw_levels),
+            key=lambda level: level[0],
+            reverse=reverse,
+        )
+        return dict(levels[: self.book_depth])
+
+    @staticmethod
+    def _diff(
+        old: Dict[float, float], new: Dict[float, float]
+    ) -> List[Tuple[float, float]]:
+        """Changed levels between two books; removed levels get quantity 0"""
+        changes = [(price, qty) for price, qty in new.items() if old.get(price) != qty]
+        changes.extend((price, 0.0) for price in old if price not in new)
+        return changes
@@ -1,5 +1,13 @@
 """Kraken exchange API implementation."""
 
-from .api import KrakenAPI
 
-__all__ = ['KrakenAPI']
\ No newline at end of file
+def __getattr__(name):
+    # Imported lazily so the decoders can be used without the HTTP client
+    if name == "KrakenAPI":
+        from .api import KrakenAPI
+
+        return KrakenAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["KrakenAPI"]
@@ -3,14 +3,31 @@ import hashlib
 import hmac
 import time
 import urllib.parse
-from typing import Any, Dict, Optional
-
-import aiohttp
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Set
 
 from config.settings import KRAKEN_TRADING_FEE
 
+from ...utils.json_codec import loads
 from ...utils.logging import log_with_timestamp
 from ..base_exchange import BaseExchangeAPI
+from ..payloads import FeeSchedule, PayloadError, Ticker
+from .decoding import (
+    decode_asset_pairs,
+    decode_fee_schedules,
+    decode_ticker,
+    find_pair,
+    pair_aliases,
+)
+
+if TYPE_CHECKING:
+    from ...services.rate_limiter import ExchangeRateLimiter
+    from ...services.request_hedger import RequestHedger
+    from ...services.session_manager import SessionManager
+
+# Private endpoints that add 2 to Kraken's call counter instead of 1
+HEAVY_PRIVATE_ENDPOINTS = {"Ledgers", "QueryLedgers", "TradesHistory", "QueryTrades"}
+# Order placement is metered by the separate matching-engine limit
+UNMETERED_PRIVATE_ENDPOINTS = {"AddOrder", "CancelOrder"}
 
 
 class KrakenAPI(BaseExchangeAPI):
@@ -19,17 +36,32 @@ class KrakenAPI(BaseExchangeAPI):
     Based on https://docs.kraken.com/api/
     """
 
-    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None):
-        super().__init__(api_key, api_secret)
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        session_manager: Optional["SessionManager"] = None,
+        rate_limiter: Optional["ExchangeRateLimiter"] = None,
+        hedger: Optional["RequestHedger"] = None,
+    ):
+        super().__init__(
+            api_key,
+            api_secret,
+            session_manager=session_manager,
+            rate_limiter=rate_limiter,
+            hedger=hedger,
+        )
         self.base_url = "https://api.kraken.com"
+        # Requested pair name -> Kraken's result key, loaded once from AssetPairs
+        self._pair_names: Optional[Dict[str, str]] = None
+        self._unknown_pairs: Set[str] = set()
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        await self._open_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self._close_session()
 
     def _generate_signature(
         self, url_path: str, data: Dict[str, Any], nonce: str
@@ -56,6 +88,27 @@ class KrakenAPI(BaseExchangeAPI):
         """Convert BTC/USD to BTCUSD format for Kraken"""
         return pair.replace("/", "")
 
+    def _request_cost(self, endpoint: str) -> float:
+        """Call-counter cost of a Kraken endpoint"""
+        method = endpoint.rsplit("/", 1)[-1]
+        if method in UNMETERED_PRIVATE_ENDPOINTS:
+            return 0.0
+        if method in HEAVY_PRIVATE_ENDPOINTS:
+            return 2.0
+        return 1.0
+
+    async def _read_response(self, response, private: bool) -> Optional[Dict]:
+        """Return the JSON body of a successful response and note rate-limit errors"""
+        if response.status == 429:
+            self._on_rate_limited(private)
+        if response.status != 200:
+            return None
+
+        result = loads(await response.read())
+        if "EAPI:Rate limit exceeded" in (result.get("error") or []):
+            self._on_rate_limited(private)
+        return result
+
     async def _make_request(
         self,
         endpoint: str,
@@ -87,23 +140,28 @@ class KrakenAPI(BaseExchangeAPI):
                 }
             )
 
+        await self._throttle(endpoint, auth_required)
+
         try:
             if method == "GET":
-                async with self.session.get(url, params=data) as response:
-                    if response.status == 200:
-                        return await response.json()
+
+                async def send():
+                    async with self.session.get(url, params=data) as response:
+                        return await self._read_response(response, auth_required)
+
+                if auth_required:
+                    return await send()
+                return await self._send_public_get(endpoint, send)
             elif method == "POST":
                 if auth_required:
                     post_data = urllib.parse.urlencode(data)
                     async with self.session.post(
                         url, data=post_data, headers=headers
                     ) as response:
-                        if response.status == 200:
-                            return await response.json()
+                        return await self._read_response(response, auth_required)
                 else:
                     async with self.session.post(url, json=data) as response:
-                        if response.status == 200:
-                            return await response.json()
+                        return await self._read_response(response, auth_required)
 
         except Exception as e:
             log_with_timestamp(f"✗ Kraken API error: {e}")
@@ -118,6 +176,80 @@ class KrakenAPI(BaseExchangeAPI):
         data = {"pair": pair} if pair else None
         return await self._make_request(endpoint, "GET", data, auth_required=False)
 
+    def parse_ticker(self, payload: Any, pair: str) -> Ticker:
+        """Decode a Ticker response, resolving Kraken's pair names (e.g. XXBTZUSD)"""
+        ticker = find_pair(decode_ticker(payload), pair)
+        if ticker is None:
+            raise PayloadError(f"No pair data found for {pair} in kraken")
+        ticker.pair = pair
+        return ticker
+
+    def _result_key(self, pair: str, decoded: Dict[str, Ticker]) -> Optional[str]:
+        """Kraken's name for a requested pair in a decoded response"""
+        if self._pair_names and self._pair_names.get(pair) in decoded:
+            return self._pair_names[pair]
+        for alias in pair_aliases(pair):
+            if alias in decoded:
+                return alias
+        return None
+
+    def parse_tickers(self, payload: Any, pairs: Iterable[str]) -> Dict[str, Ticker]:
+        """Decode a multi-pair Ticker response, keyed by the requested pairs"""
+        decoded = decode_ticker(payload)
+        tickers = {}
+        for pair in pairs:
+            key = self._result_key(pair, decoded)
+            if key is not None:
+                ticker = decoded[key]
+                ticker.pair = pair
+                tickers[pair] = ticker
+        return tickers
+
+    async def load_pair_names(self) -> Dict[str, str]:
+        """
+        Resolve Kraken's pair names once from AssetPairs and cache them.
+
+        Returns:
+            Name lookup from decode_asset_pairs, or an empty dict if AssetPairs
+            could not be fetched (retried on the next call)
+        """
+        if self._pair_names is None:
+            payload = await self.get_asset_pairs()
+            if payload is None:
+                return {}
+            try:
+                self._pair_names = decode_asset_pairs(payload)
+            except PayloadError as e:
+                log_with_timestamp(f"✗ {e}")
+                return {}
+        return self._pair_names
+
+    async def fetch_normalized_tickers(self, pairs: Iterable[str]) -> Dict[str, Ticker]:
+        """
+        Fetch tickers for several pairs with a single comma-separated request.
+
+        Kraken rejects the whole request if any pair is unknown, so pairs not
+        listed in AssetPairs are dropped (and logged once) before sending.
+        """
+        requested = {self.normalize_pair(pair): pair for pair in pairs}
+        pair_names = await self.load_pair_names()
+        if pair_names:
+            for pair in [pair for pair in requested if pair not in pair_names]:
+                if pair not in self._unknown_pairs:
+                    self._unknown_pairs.add(pair)
+                    log_with_timestamp(f"⚠ Kraken does not list {requested[pair]}")
+                del requested[pair]
+        if not requested:
+            return {}
+
+        # Ask for Kraken's own names when known so no aliasing is needed
+        names = [pair_names.get(pair, pair) for pair in requested]
+        payload = await self.get_ticker(",".join(names))
+        if payload is None:
+            return {}
+        tickers = self.parse_tickers(payload, requested)
+        return {requested[pair]: ticker for pair, ticker in tickers.items()}
+
     async def get_ohlc(self, pair: str = "BTCUSD", interval: int = 1) -> Optional[Dict]:
         """
         Get OHLC (Open, High, Low, Close) data
@@ -192,6 +324,31 @@ class KrakenAPI(BaseExchangeAPI):
             log_with_timestamp(f"✗ Kraken fee fetch error: {e}")
         return None
 
+    async def fetch_fee_schedules(self, pairs: Iterable[str]) -> Dict[str, FeeSchedule]:
+        """
+        Fetch the lowest-tier maker and taker fees of several pairs with a
+        single AssetPairs request.
+        """
+        payload = await self.get_asset_pairs()
+        if payload is None:
+            return {}
+        try:
+            pair_names = decode_asset_pairs(payload)
+            schedules = decode_fee_schedules(payload)
+        except PayloadError as e:
+            log_with_timestamp(f"✗ {e}")
+            return {}
+        # The same response resolves pair names for ticker requests
+        if self._pair_names is None:
+            self._pair_names = pair_names
+
+        fees = {}
+        for pair in pairs:
+            key = pair_names.get(self.normalize_pair(pair))
+            if key in schedules:
+                fees[pair] = schedules[key]
+        return fees
+
     # Authenticated endpoints (require API credentials)
 
     async def get_account_balance(self) -> Optional[Dict]:
@@ -269,15 +426,8 @@ class KrakenAPI(BaseExchangeAPI):
 async def get_kraken_btc_usd_price() -> Optional[float]:
     """Get current BTC/USD price from Kraken"""
     async with KrakenAPI() as api:
-        ticker_data = await api.get_ticker("BTCUSD")
-        if ticker_data and not ticker_data.get("error"):
-            result = ticker_data.get("result", {})
-            # Kraken returns different pair names, try both
-            # BTCUSD and XBTUSD
-            btc_data = result.get("BTCUSD") or result.get("XBTUSD")
-            if btc_data:
-                # 'c' contains [price, volume] for last trade
-                last_price = btc_data.get("c", [None])[0]
-                if last_price:
-                    return float(last_price)
-    return None
+        try:
+            ticker = await api.fetch_normalized_ticker("BTC/USD")
+        except PayloadError:
+            return None
+    return ticker.last if ticker else None
@@ -0,0 +1,177 @@
+"""
+Decoders for Kraken REST market data payloads.
+
+Kraken wraps every response as {"error": [...], "result": {pair: ...}} and
+sends numbers as strings. Pairs come back under Kraken's own names (e.g.
+XXBTZUSD for BTCUSD); find_pair resolves a requested pair against them.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, TypeVar, Union
+
+from ...utils.json_codec import loads
+from ..payloads import (
+    Depth,
+    FeeSchedule,
+    PayloadError,
+    Ticker,
+    Trade,
+    optional_float,
+)
+
+T = TypeVar("T")
+
+Payload = Union[bytes, str, Dict]
+
+# Kraken's asset codes where they differ from the common ones
+ASSET_ALIASES = {"BTC": "XBT", "DOGE": "XDG"}
+
+
+def _result(payload: Payload) -> Dict:
+    data = payload if isinstance(payload, dict) else loads(payload)
+    errors = data.get("error")
+    if errors:
+        raise PayloadError(f"Kraken API error: {errors}")
+    return data.get("result") or {}
+
+
+def _level(level: Optional[List]) -> Tuple[Optional[float], Optional[float]]:
+    """Parse a ticker [price, whole lot volume, lot volume] entry"""
+    if not level or not level[0]:
+        return None, None
+    size = float(level[2]) if len(level) > 2 else None
+    return float(level[0]), size
+
+
+@lru_cache(maxsize=256)
+def pair_aliases(pair: str) -> Tuple[str, ...]:
+    """
+    Names Kraken may use for a pair such as BTCUSD.
+
+    Returns:
+        The pair itself, its XBT form and the legacy X/Z-prefixed form
+    """
+    aliases = [pair]
+    if len(pair) == 6:
+        base, quote = pair[:3], pair[3:]
+        base = ASSET_ALIASES.get(base, base)
+        for alias in (f"{base}{quote}", f"X{base}Z{quote}"):
+            if alias not in aliases:
+                aliases.append(alias)
+    return tuple(aliases)
+
+
+def find_pair(decoded: Dict[str, T], pair: str) -> Optional[T]:
+    """Look up a requested pair in a decoded result keyed by Kraken's names"""
+    for alias in pair_aliases(pair):
+        if alias in decoded:
+            return decoded[alias]
+    if len(decoded) == 1:
+        return next(iter(decoded.values()))
+    return None
+
+
+def decode_asset_pairs(payload: Payload) -> Dict[str, str]:
+    """
+    Decode a /0/public/AssetPairs response into a pair name lookup.
+
+    Returns:
+        Every name a pair is known by (result key, altname, wsname without
+        the slash and its BTC/DOGE form) mapped to the result key Kraken uses
+        in Ticker, Depth and Trades responses
+    """
+    common_codes = {kraken: common for common, kraken in ASSET_ALIASES.items()}
+    names = {}
+    for key, info in _result(payload).items():
+        names[key] = key
+        if info.get("altname"):
+            names[info["altname"]] = key
+        base, _, quote = (info.get("wsname") or "").partition("/")
+        if base and quote:
+            names[f"{base}{quote}"] = key
+            names[f"{common_codes.get(base, base)}{quote}"] = key
+    return names
+
+
+def decode_fee_schedules(payload: Payload) -> Dict[str, FeeSchedule]:
+    """
+    Decode the fee schedules in a /0/public/AssetPairs response.
+
+    "fees" is the taker schedule and "fees_maker" the maker one, both as
+    [[30-day volume, percent], ...]; the lowest volume tier is used.
+
+    Returns:
+        Fees per Kraken pair key; pairs without a schedule are skipped
+    """
+    schedules = {}
+    for key, info in _result(payload).items():
+        taker = info.get("fees")
+        if not taker:
+            continue
+        maker = info.get("fees_maker") or taker
+        schedules[key] = FeeSchedule(maker=float(maker[0][1]), taker=float(taker[0][1]))
+    return schedules
+
+
+def decode_ticker(payload: Payload) -> Dict[str, Ticker]:
+    """
+    Decode a /0/public/Ticker response.
+
+    Returns:
+        Ticker per Kraken pair name; pairs without a last trade are skipped
+
+    Raises:
+        PayloadError: If Kraken reported an error
+    """
+    tickers = {}
+    for name, data in _result(payload).items():
+        last = data.get("c") or [None, None]
+        price = optional_float(last[0])
+        if not price:
+            continue
+        bid, bid_size = _level(data.get("b"))
+        ask, ask_size = _level(data.get("a"))
+        tickers[name] = Ticker(
+            pair=name,
+            last=price,
+            volume=optional_float(last[1]) if len(last) > 1 else 0.0,
+            bid=bid,
+            ask=ask,
+            bid_size=bid_size,
+            ask_size=ask_size,
+        )
+    return tickers
+
+
+def decode_depth(payload: Payload) -> Dict[str, Depth]:
+    """Decode a /0/public/Depth response into levels per Kraken pair name"""
+    return {
+        name: Depth(
+            pair=name,
+            bids=[(float(level[0]), float(level[1])) for level in data.get("bids", [])],
+            asks=[(float(level[0]), float(level[1])) for level in data.get("asks", [])],
+        )
+        for name, data in _result(payload).items()
+    }
+
+
+def decode_trades(payload: Payload) -> Dict[str, List[Trade]]:
+    """
+    Decode a /0/public/Trades response.
+
+    Entries are [price, volume, time, side, order type, misc, trade id]; side
+    is "b" or "s". The "last" cursor is dropped.
+    """
+    return {
+        name: [
+            Trade(
+                price=float(entry[0]),
+                amount=float(entry[1]),
+                timestamp=float(entry[2]),
+                side="buy" if entry[3] == "b" else "sell",
+            )
+            for entry in entries
+        ]
+        for name, entries in _result(payload).items()
+        if name != "last"
+    }
@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional, Tuple
+
+from ...utils.logging import log_with_timestamp
+from ..base_stream import BaseExchangeStream
+
+
+class KrakenWebSocketStream(BaseExchangeStream):
+    """
+    Kraken WebSocket v2 client for ticker and order book channels
+    Based on https://docs.kraken.com/api/docs/websocket-v2/ticker
+
+    Symbols use the v2 format, which matches ours (e.g., "BTC/USD"). The book
+    channel is subscribed at book_depth (10, 25, 100, ...) when requested.
+    """
+
+    default_url = "wss://ws.kraken.com/v2"
+
+    # (price_precision, qty_precision) from AssetPairs pair_decimals/lot_decimals,
+    # needed to reproduce the book checksum from JSON floats
+    BOOK_PRECISION = {
+        "BTC/USD": (1, 8),
+        "BTC/EUR": (1, 8),
+        "ETH/USD": (2, 8),
+        "ETH/EUR": (2, 8),
+    }
+
+    def get_exchange_name(self) -> str:
+        """Get the name of this exchange"""
+        return "kraken"
+
+    def book_precision(self, symbol: str) -> Optional[Tuple[int, int]]:
+        """Price and quantity decimals used by the book checksum"""
+        return self.BOOK_PRECISION.get(symbol)
+
+    def build_subscribe_messages(self) -> List[Dict]:
+        """Subscribe to ticker (and optionally book) for all symbols"""
+        messages = [
+            {
+                "method": "subscribe",
+                "params": {"channel": "ticker", "symbol": list(self.symbols)},
+            }
+        ]
+        if self.book_enabled:
+            messages.append(
+                {
+                    "method": "subscribe",
+                    "params": {
+                        "channel": "book",
+                        "symbol": list(self.symbols),
+                        "depth": self.book_depth,
+                    },
+                }
+            )
+        return messages
+
+    @staticmethod
+    def _optional_float(value) -> Optional[float]:
+        return float(value) if value is not None else None
+
+    async def handle_message(self, message: Dict):
+        """Dispatch ticker/book data, log subscription failures"""
+        channel = message.get("channel")
+
+        if channel == "ticker":
+            for entry in message.get("data", []):
+                last = entry.get("last")
+                if last is None:
+                    continue
+                await self._emit_ticker(
+                    entry.get("symbol"),
+                    float(last),
+                    float(entry.get("volume", 0.0)),
+                    bid=self._optional_float(entry.get("bid")),
+                    ask=self._optional_float(entry.get("ask")),
+                    bid_size=self._optional_float(entry.get("bid_qty")),
+                    ask_size=self._optional_float(entry.get("ask_qty")),
+                )
+
+        elif channel == "book":
+            is_snapshot = message.get("type") == "snapshot"
+            for entry in message.get("data", []):
+                bids = [
+                    (float(lvl["price"]), float(lvl["qty"]))
+                    for lvl in entry.get("bids", [])
+                ]
+                asks = [
+                    (float(lvl["price"]), float(lvl["qty"]))
+                    for lvl in entry.get("asks", [])
+                ]
+                await self._emit_book(
+                    entry.get("symbol"), bids, asks, is_snapshot, entry.get("checksum")
+                )
+
+        elif message.get("method") == "subscribe" and not message.get("success", True):
+            log_with_timestamp(
+                f"✗ Kraken stream subscribe error: {message.get('error')}"
+            )
@@ -0,0 +1,61 @@
+"""
+Compact typed structs for decoded exchange market data.
+
+Exchange decoders turn raw response bytes into these slotted records once,
+converting every numeric string to float at decode time, so the rest of the
+pipeline works with attributes instead of probing nested dicts.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+class PayloadError(ValueError):
+    """Raised when an exchange payload reports an error or is malformed"""
+
+
+@dataclass(slots=True)
+class Ticker:
+    """Top of book and last trade for one pair, in the pair's quote currency"""
+
+    pair: str
+    last: float
+    volume: float = 0.0
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    bid_size: Optional[float] = None
+    ask_size: Optional[float] = None
+
+
+@dataclass(slots=True)
+class Depth:
+    """Order book levels as (price, quantity), best first"""
+
+    pair: str
+    bids: List[Tuple[float, float]]
+    asks: List[Tuple[float, float]]
+
+
+@dataclass(slots=True)
+class Trade:
+    """One public trade; timestamp in seconds"""
+
+    price: float
+    amount: float
+    timestamp: float
+    side: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class FeeSchedule:
+    """Maker and taker fee for one pair, in percent"""
+
+    maker: float
+    taker: float
+
+
+def optional_float(value) -> Optional[float]:
+    """Convert a numeric string or number to float, keeping missing values as None"""
+    if value is None or value == "":
+        return None
+    return float(value)
@@ -0,0 +1,182 @@
+"""
+Registry of exchange API adapters.
+
+Adapters are declared as "module:Class" import paths and only imported the
+first time an exchange is used, so configured-but-disabled venues cost
+nothing at startup. Built-in adapters are always known; more can be added
+through the EXCHANGE_ADAPTERS setting or by installed packages publishing an
+entry point in the "arbitrage.exchanges" group.
+
+Constructed clients are cached per exchange and credentials, so the monitor
+and detector reuse one client instead of rebuilding it for every request.
+"""
+
+import importlib
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type, Union
+
+from config.settings import EXCHANGE_ADAPTERS
+
+if TYPE_CHECKING:
+    from .base_exchange import BaseExchangeAPI
+
+ENTRY_POINT_GROUP = "arbitrage.exchanges"
+
+# Import paths are relative to this package unless fully qualified
+BUILTIN_ADAPTERS = {
+    "kraken": ".kraken.api:KrakenAPI",
+    "coinmate": ".coinmate.api:CoinmateAPI",
+}
+
+AdapterTarget = Union[str, Type["BaseExchangeAPI"]]
+CacheKey = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+
+def _import_target(target: str) -> Type["BaseExchangeAPI"]:
+    module_name, _, attribute = target.partition(":")
+    module = importlib.import_module(module_name, package=__package__)
+    return getattr(module, attribute)
+
+
+class ExchangeRegistry:
+    """
+    Lazily imported exchange adapters with per-credential client caching.
+
+    Args:
+        adapters: Extra name -> "module:Class" (or class) mappings; these
+            override built-ins and entry points of the same name
+        entry_point_group: Entry point group scanned for third-party
+            adapters, or None to skip discovery
+    """
+
+    def __init__(
+        self,
+        adapters: Optional[Dict[str, AdapterTarget]] = None,
+        entry_point_group: Optional[str] = ENTRY_POINT_GROUP,
+    ):
+        self._targets: Dict[str, object] = dict(BUILTIN_ADAPTERS)
+        self._classes: Dict[str, Type["BaseExchangeAPI"]] = {}
+        self._clients: Dict[CacheKey, "BaseExchangeAPI"] = {}
+        if entry_point_group:
+            # EntryPoint objects are only loaded when their exchange is used
+            for entry_point in entry_points(group=entry_point_group):
+                self._targets.setdefault(entry_point.name.lower(), entry_point)
+        for name, target in (adapters or {}).items():
+            self.register(name, target)
+
+    def register(self, name: str, target: AdapterTarget):
+        """Register an adapter class or "module:Class" path under a name"""
+        name = name.lower()
+        self._targets[name] = target
+        self._classes.pop(name, None)
+
+    def available(self) -> List[str]:
+        """Names of all known exchanges, imported or not"""
+        return sorted(self._targets)
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether an exchange's adapter module has been imported"""
+        return name.lower() in self._classes
+
+    def adapter_class(self, name: str) -> Type["BaseExchangeAPI"]:
+        """
+        Import and return the adapter class for an exchange.
+
+        Raises:
+            ValueError: If no adapter is registered under the name
+        """
+        name = name.lower()
+        if name in self._classes:
+            return self._classes[name]
+
+        target = self._targets.get(name)
+        if target is None:
+            raise ValueError(f"Unsupported exchange: {name}")
+        if isinstance(target, str):
+            adapter = _import_target(target)
+        elif hasattr(target, "load"):
+            adapter = target.load()
+        else:
+            adapter = target
+
+        self._classes[name] = adapter
+        return adapter
+
+    def create(
+        self,
+        name: str,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        client_id: Optional[str] = None,
+        **options,
+    ) -> "BaseExchangeAPI":
+        """
+        Build a new client for an exchange.
+
+        Args:
+            name: Exchange name (case insensitive)
+            api_key: API key for authenticated requests
+            api_secret: API secret for authenticated requests
+            client_id: Extra credential, passed only to adapters that declare it
+            **options: Collaborators such as session_manager, rate_limiter, hedger
+
+        Returns:
+            Exchange API instance
+
+        Raises:
+            ValueError: If the exchange is not supported
+        """
+        adapter = self.adapter_class(name)
+        if "client_id" in adapter.extra_credentials:
+            options["client_id"] = client_id
+        return adapter(api_key, api_secret, **options)
+
+    def get(
+        self,
+        name: str,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        client_id: Optional[str] = None,
+        **options,
+    ) -> "BaseExchangeAPI":
+        """
+        Return the cached client for an exchange and credentials, creating it
+        on first use. Options only apply when the client is created.
+        """
+        key = (name.lower(), api_key, api_secret, client_id)
+        client = self._clients.get(key)
+        if client is None:
+            client = self.create(name, api_key, api_secret, client_id, **options)
+            self._clients[key] = client
+        return client
+
+    def clear(self):
+        """Drop cached clients, e.g. after credentials change"""
+        self._clients.clear()
+
+
+def parse_adapter_list(value: str) -> Dict[str, str]:
+    """
+    Parse a "name=module:Class,name=module:Class" adapter list.
+
+    Raises:
+        ValueError: If an entry is not of the form name=module:Class
+    """
+    adapters = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        name, _, target = entry.partition("=")
+        if not name or ":" not in target:
+            raise ValueError(f"Invalid exchange adapter entry: {entry}")
+        adapters[name.strip().lower()] = target.strip()
+    return adapters
+
+
+_default_registry: Optional[ExchangeRegistry] = None
+
+
+def get_default_registry() -> ExchangeRegistry:
+    """Registry with the built-in, entry point and configured adapters"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ExchangeRegistry(parse_adapter_list(EXCHANGE_ADAPTERS))
+    return _default_registry
@@ -1,22 +1,31 @@
 import time
-from typing import TYPE_CHECKING, List, Optional
-
-from config.settings import (
-    COINMATE_TRADING_FEE,
-    DEFAULT_TRADING_FEE,
-    DYNAMIC_FEES_ENABLED,
-    KRAKEN_TRADING_FEE,
-    LARGE_EXCHANGES,
-    SMALL_EXCHANGES,
-)
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+import numpy as np
 
-from ..apis.base_exchange import create_exchange_api
-from ..utils.logging import log_with_timestamp
-from .data_models import ArbitrageOpportunity, PriceData
+from config.settings import LARGE_EXCHANGES, SLIPPAGE_SIZE_TIERS, SMALL_EXCHANGES
+
+from ..services.fee_service import FeeMatrix
+from .data_models import (
+    ArbitrageCycle,
+    ArbitrageOpportunity,
+    OpportunityEvent,
+    PriceData,
+    SizeTierProfit,
+)
+from .edge_engine import DetectionEngine
 from .exchange_monitor import ExchangeMonitor
+from .market_graph import MarketGraph
+from .opportunity_index import OpportunityIndex
+from .opportunity_tracker import OpportunityTracker
+from .order_book import OrderBook
+from .price_matrix import PriceMatrix
+from .slippage import max_profitable_size, walk_book_many
+from .tick_store import OpportunityStore
 
 if TYPE_CHECKING:
-    from ..services.database_service import DatabaseService
+    from ..services.database_writer import DatabaseWriter
+    from ..services.fee_service import FeeService
 
 
 class ArbitrageDetector:
@@ -24,57 +33,157 @@ class ArbitrageDetector:
         self,
         monitor: ExchangeMonitor,
         min_profit_percentage: float = 0.1,
-        database_service: Optional["DatabaseService"] = None,
+        database_writer: Optional["DatabaseWriter"] = None,
+        fee_service: Optional["FeeService"] = None,
+        tracker: Optional[OpportunityTracker] = None,
     ):
         self.monitor = monitor
         self.min_profit_percentage = min_profit_percentage
-        self.opportunities = []
+        # Bounded columnar history of detected opportunities
+        self.opportunities = OpportunityStore()
+        # Recent opportunities indexed by time and profit for top-k queries
+        self.recent_opportunities = OpportunityIndex()
         self.large_exchanges = LARGE_EXCHANGES
         self.small_exchanges = SMALL_EXCHANGES
-        self._fee_cache = {}  # Cache for dynamic fees
-        self._fee_cache_timestamp = {}  # Cache timestamps
-        self.database_service = database_service
-
-    async def detect_opportunities(self) -> List[ArbitrageOpportunity]:
+        self.database_writer = database_writer
+        # Fees come from the service's snapshot; configured fees without one
+        self.fee_service = fee_service
+        self._config_fees = FeeMatrix.from_config()
+        self.engine = DetectionEngine(
+            self.large_exchanges, self.small_exchanges, self.fee_matrix
+        )
+        # Lifecycle of each opportunity, entering at the minimum profit
+        self.tracker = tracker or OpportunityTracker(min_profit_percentage)
+
+    @property
+    def fee_matrix(self) -> FeeMatrix:
+        """Current fee snapshot; reading it never waits on exchange I/O"""
+        if self.fee_service is not None:
+            return self.fee_service.matrix
+        return self._config_fees
+
+    async def detect_opportunities(
+        self, changed_exchanges: Optional[Iterable[str]] = None
+    ) -> List[ArbitrageOpportunity]:
         """
         Detect arbitrage opportunities from current prices
         Returns a list of profitable opportunities
+
+        Every base asset in the monitor's price matrix is scanned at once:
+        the detection engine computes net-of-fee edges for all eligible
+        exchange pairs in one vectorized pass, and only cells above the
+        threshold are turned into opportunities.
+
+        Args:
+            changed_exchanges: If given, only pairs that involve one of these
+                exchanges are evaluated (incremental detection)
+        """
+        current_opportunities = self._scan_opportunities(
+            self.min_profit_percentage, changed_exchanges
+        )
+        if self.database_writer:
+            # Queued for the background writer; detection never waits on it
+            for opportunity in current_opportunities:
+                self.database_writer.write_opportunity(opportunity)
+
+        self.record_opportunities(current_opportunities)
+
+        return current_opportunities
+
+    async def track_opportunities(
+        self, changed_exchanges: Optional[Iterable[str]] = None
+    ) -> List[OpportunityEvent]:
         """
-        if not self.monitor.latest_prices:
+        Detect opportunities and report only their lifecycle transitions.
+
+        Pairs are scanned down to the tracker's exit threshold so open
+        opportunities stay open until their profit falls below it. Only
+        transitions are stored; opened opportunities are kept in
+        self.opportunities.
+
+        Args:
+            changed_exchanges: If given, only pairs that involve one of these
+                exchanges are evaluated (incremental detection)
+
+        Returns:
+            Open, update and close events
+        """
+        current_opportunities = self._scan_opportunities(
+            self.tracker.exit_percentage, changed_exchanges
+        )
+        events = self.tracker.observe(current_opportunities, changed_exchanges)
+        await self._record_events(events)
+        return events
+
+    async def expire_opportunities(self, max_age: float) -> List[OpportunityEvent]:
+        """Close tracked opportunities not detected for max_age seconds"""
+        events = self.tracker.expire(max_age)
+        await self._record_events(events)
+        return events
+
+    async def _record_events(self, events: List[OpportunityEvent]):
+        for event in events:
+            if event.kind == "open":
+                self.record_opportunities([event.opportunity])
+            if self.database_writer:
+                self.database_writer.write_opportunity_event(event)
+
+    def _scan_opportunities(
+        self,
+        min_profit_percentage: float,
+        changed_exchanges: Optional[Iterable[str]] = None,
+    ) -> List[ArbitrageOpportunity]:
+        """Opportunities at or above a threshold, best first"""
+        matrix = self._price_matrix()
+        if not matrix.prices:
             return []
 
+        fees = self.fee_matrix
+        self.engine.set_fees(fees)
         current_opportunities = []
-        exchanges = list(self.monitor.latest_prices.keys())
-
-        # Check all valid exchange pairs
-        for i, buy_exchange in enumerate(exchanges):
-            for j, sell_exchange in enumerate(exchanges):
-                if i != j and self._is_valid_arbitrage_pair(
-                    buy_exchange, sell_exchange
-                ):
-                    buy_data = self.monitor.latest_prices[buy_exchange]
-                    sell_data = self.monitor.latest_prices[sell_exchange]
-
-                    opportunity = await self._calculate_opportunity_async(
-                        buy_exchange, buy_data, sell_exchange, sell_data
-                    )
-                    if (
-                        opportunity
-                        and opportunity.profit_percentage >= self.min_profit_percentage
-                    ):
-                        current_opportunities.append(opportunity)
-
-                        # Store opportunity in database asynchronously
-                        if self.database_service:
-                            await self.database_service.store_arbitrage_opportunity(
-                                opportunity
-                            )
+        for edge in self.engine.scan(matrix, min_profit_percentage, changed_exchanges):
+            buy_data = matrix.prices[(edge.row, edge.buy_col)]
+            sell_data = matrix.prices[(edge.row, edge.sell_col)]
+
+            opportunity = self._build_opportunity(
+                buy_data,
+                sell_data,
+                fees.taker(buy_data.exchange, buy_data.symbol),
+                fees.taker(sell_data.exchange, sell_data.symbol),
+            )
+            opportunity.asset = matrix.assets[edge.row]
+            current_opportunities.append(opportunity)
 
         current_opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
-        self.opportunities.extend(current_opportunities)
-
         return current_opportunities
 
+    def detect_cycles(self, changed_only: bool = True) -> List[ArbitrageCycle]:
+        """
+        Find profitable cross-currency cycles across all monitored pairs.
+
+        Two-leg cycles (buy and sell the same pair on two exchanges) are left
+        to detect_opportunities.
+
+        Args:
+            changed_only: Only search cycles through conversions whose quotes
+                changed since the last search
+        """
+        graph = getattr(self.monitor, "market_graph", None)
+        if not isinstance(graph, MarketGraph):
+            return []
+        graph.set_fees(self.fee_matrix)
+        return graph.find_cycles(
+            self.min_profit_percentage, min_length=3, changed_only=changed_only
+        )
+
+    def _price_matrix(self) -> PriceMatrix:
+        """The monitor's price matrix, or one built from its latest prices"""
+        matrix = getattr(self.monitor, "price_matrix", None)
+        if isinstance(matrix, PriceMatrix):
+            return matrix
+        # Monitors without a matrix (e.g. test doubles) only expose latest_prices
+        return PriceMatrix.from_prices(self.monitor.latest_prices.values())
+
     def _is_valid_arbitrage_pair(self, buy_exchange: str, sell_exchange: str) -> bool:
         return (
             buy_exchange in self.large_exchanges
@@ -84,151 +193,143 @@ class ArbitrageDetector:
             and sell_exchange in self.large_exchanges
         )
 
-    def _calculate_opportunity(
+    @staticmethod
+    def _top_of_book_volume_limit(buy_data: PriceData, sell_data: PriceData) -> float:
+        """Size available at the quoted prices, or 10% of volume without sizes"""
+        if buy_data.ask_size is not None and sell_data.bid_size is not None:
+            return min(buy_data.ask_size, sell_data.bid_size)
+        return min(buy_data.volume, sell_data.volume) * 0.1
+
+    def _build_opportunity(
         self,
-        buy_exchange: str,
         buy_data: PriceData,
-        sell_exchange: str,
         sell_data: PriceData,
-    ) -> Optional[ArbitrageOpportunity]:
-
-        # Use USD prices for comparison
-        if sell_data.price_usd <= buy_data.price_usd:
-            return None
-
-        profit_usd = sell_data.price_usd - buy_data.price_usd
-        profit_percentage = (profit_usd / buy_data.price_usd) * 100
-
-        # Note: This will be updated to async in detect_opportunities method
-        trading_fees = 0  # Placeholder, calculated in async context
-        net_profit_percentage = profit_percentage - trading_fees
-
-        if net_profit_percentage <= 0:
-            return None
-
-        volume_limit = min(buy_data.volume, sell_data.volume) * 0.1
+        buy_fee: float,
+        sell_fee: float,
+    ) -> ArbitrageOpportunity:
+        """
+        Opportunity for a crossed pair, priced at top of book and then depth.
 
-        return ArbitrageOpportunity(
-            buy_exchange=buy_exchange,
-            sell_exchange=sell_exchange,
-            buy_price=buy_data.price_usd,
-            sell_price=sell_data.price_usd,
+        Args:
+            buy_data: Latest price on the buy venue
+            sell_data: Latest price on the sell venue
+            buy_fee: Buy venue fee in percent
+            sell_fee: Sell venue fee in percent
+        """
+        buy_price = buy_data.buy_price_usd
+        sell_price = sell_data.sell_price_usd
+        profit_usd = sell_price - buy_price
+
+        opportunity = ArbitrageOpportunity(
+            buy_exchange=buy_data.exchange,
+            sell_exchange=sell_data.exchange,
+            buy_price=buy_price,
+            sell_price=sell_price,
             profit_usd=profit_usd,
-            profit_percentage=net_profit_percentage,
+            profit_percentage=(profit_usd / buy_price) * 100 - (buy_fee + sell_fee),
             timestamp=time.time(),
-            volume_limit=volume_limit,
+            volume_limit=self._top_of_book_volume_limit(buy_data, sell_data),
+        )
+        self._apply_depth_pricing(
+            opportunity, buy_data, sell_data, buy_fee / 100, sell_fee / 100
         )
+        return opportunity
 
-    async def _calculate_opportunity_async(
+    def _apply_depth_pricing(
         self,
-        buy_exchange: str,
-        buy_data,
-        sell_exchange: str,
-        sell_data,
-    ) -> Optional[ArbitrageOpportunity]:
-        """Async version of opportunity calculation with dynamic fees"""
-        # Use USD prices for comparison
-        if sell_data.price_usd <= buy_data.price_usd:
-            return None
-
-        profit_usd = sell_data.price_usd - buy_data.price_usd
-        profit_percentage = (profit_usd / buy_data.price_usd) * 100
-
-        trading_fees = await self._get_trading_fees(buy_exchange, sell_exchange)
-        net_profit_percentage = profit_percentage - trading_fees
-
-        if net_profit_percentage <= 0:
-            return None
-
-        volume_limit = min(buy_data.volume, sell_data.volume) * 0.1
-
-        # Log fee information for transparency
-        log_with_timestamp(
-            f"💰 Fee calculation: {buy_exchange}+{sell_exchange} = {trading_fees:.2f}% "
-            f"(gross: {profit_percentage:.2f}% → net: {net_profit_percentage:.2f}%)"
+        opportunity: ArbitrageOpportunity,
+        buy_data: PriceData,
+        sell_data: PriceData,
+        buy_fee: float,
+        sell_fee: float,
+    ):
+        """
+        Price the opportunity against streamed order book depth.
+
+        Walks the buy venue's asks and the sell venue's bids for each
+        configured size tier and finds the largest size that stays profitable
+        after fees, which then replaces the volume-based volume_limit.
+        Does nothing unless both books are available.
+
+        Args:
+            opportunity: Opportunity to enrich in place
+            buy_data: Latest price on the buy venue (for its USD rate)
+            sell_data: Latest price on the sell venue (for its USD rate)
+            buy_fee: Buy-side fee as a fraction
+            sell_fee: Sell-side fee as a fraction
+        """
+        books = getattr(self.monitor, "latest_books", None)
+        if not isinstance(books, dict):
+            return
+        buy_book = books.get(opportunity.buy_exchange)
+        sell_book = books.get(opportunity.sell_exchange)
+        if not isinstance(buy_book, OrderBook) or not isinstance(sell_book, OrderBook):
+            return
+        # Books are streamed for the trading pair only
+        if buy_book.symbol != buy_data.symbol or sell_book.symbol != sell_data.symbol:
+            return
+
+        # Books are in the quote currency; reuse each venue's current USD rate
+        buy_rate = buy_data.price_usd / buy_data.price if buy_data.price else 1.0
+        sell_rate = sell_data.price_usd / sell_data.price if sell_data.price else 1.0
+        ask_prices, ask_quantities = buy_book.asks.to_arrays()
+        bid_prices, bid_quantities = sell_book.bids.to_arrays()
+        ask_prices = ask_prices * buy_rate
+        bid_prices = bid_prices * sell_rate
+        if ask_prices.size == 0 or bid_prices.size == 0:
+            return
+
+        sizes = np.asarray(SLIPPAGE_SIZE_TIERS, dtype=np.float64)
+        buy_vwap, _, buy_filled, buy_notional = walk_book_many(
+            ask_prices, ask_quantities, sizes
         )
-
-        return ArbitrageOpportunity(
-            buy_exchange=buy_exchange,
-            sell_exchange=sell_exchange,
-            buy_price=buy_data.price_usd,
-            sell_price=sell_data.price_usd,
-            profit_usd=profit_usd,
-            profit_percentage=net_profit_percentage,
-            timestamp=time.time(),
-            volume_limit=volume_limit,
+        sell_vwap, _, sell_filled, sell_notional = walk_book_many(
+            bid_prices, bid_quantities, sizes
         )
-
-    async def _get_trading_fees(self, buy_exchange: str, sell_exchange: str) -> float:
-        """Get trading fees, either from cache, API, or config"""
-        buy_fee = await self._get_exchange_fee(buy_exchange)
-        sell_fee = await self._get_exchange_fee(sell_exchange)
-        return buy_fee + sell_fee
-
-    async def _get_exchange_fee(self, exchange: str) -> float:
-        """Get fee for a specific exchange"""
-        if DYNAMIC_FEES_ENABLED:
-            # Try to get from cache first (cache for 1 hour)
-            cache_key = f"{exchange}_fee"
-            cache_time = self._fee_cache_timestamp.get(cache_key, 0)
-            if time.time() - cache_time < 3600 and cache_key in self._fee_cache:
-                return self._fee_cache[cache_key]
-
-            # Fetch from API
-            dynamic_fee = await self._fetch_dynamic_fee(exchange)
-            if dynamic_fee is not None:
-                self._fee_cache[cache_key] = dynamic_fee
-                self._fee_cache_timestamp[cache_key] = time.time()
-                log_with_timestamp(
-                    f"📊 Dynamic fee: {exchange} = {dynamic_fee:.2f}% "
-                    f"(fetched from API, cached for 1h)"
+        fillable = np.minimum(buy_filled, sell_filled)
+
+        tiers = []
+        for i, size in enumerate(sizes):
+            if fillable[i] <= 0:
+                continue
+            # Re-walk at the common fillable size when one book runs out first
+            if fillable[i] < size:
+                _, _, _, buy_cost = walk_book_many(
+                    ask_prices, ask_quantities, [fillable[i]]
+                )
+                _, _, _, sell_proceeds = walk_book_many(
+                    bid_prices, bid_quantities, [fillable[i]]
+                )
+                buy_cost, sell_proceeds = buy_cost[0], sell_proceeds[0]
+            else:
+                buy_cost, sell_proceeds = buy_notional[i], sell_notional[i]
+
+            profit = sell_proceeds * (1 - sell_fee) - buy_cost * (1 + buy_fee)
+            tiers.append(
+                SizeTierProfit(
+                    size=float(size),
+                    fillable=float(fillable[i]),
+                    buy_vwap=float(buy_cost / fillable[i]),
+                    sell_vwap=float(sell_proceeds / fillable[i]),
+                    profit_usd=float(profit),
+                    profit_percentage=float(profit / buy_cost * 100),
                 )
-                return dynamic_fee
-
-        # Fallback to configured static fees
-        static_fees = {
-            "kraken": KRAKEN_TRADING_FEE,
-            "coinmate": COINMATE_TRADING_FEE,
-        }
-        fallback_fee = static_fees.get(exchange, DEFAULT_TRADING_FEE)
-        log_with_timestamp(
-            f"📊 Static fee: {exchange} = {fallback_fee:.2f}% (using configured value)"
-        )
-        return fallback_fee
-
-    async def _fetch_dynamic_fee(self, exchange: str) -> Optional[float]:
-        """Fetch current trading fee from exchange API"""
-        try:
-            # Get credentials from monitor
-            exchange_creds = self.monitor.api_keys.get(exchange, {})
-
-            # Create exchange API using factory
-            exchange_api = create_exchange_api(
-                exchange,
-                api_key=exchange_creds.get("apiKey"),
-                api_secret=exchange_creds.get("secret"),
-                client_id=exchange_creds.get("clientId"),  # Only used by Coinmate
             )
 
-            async with exchange_api as api:
-                # Use appropriate trading pair for each exchange
-                if exchange == "kraken":
-                    return await api.get_trading_fees("BTCUSD")
-                elif exchange == "coinmate":
-                    # Try BTC_EUR first (as shown in working curl), fallback to BTC_CZK
-                    fee = await api.get_trading_fees("BTC_EUR")
-                    if fee is None:
-                        fee = await api.get_trading_fees("BTC_CZK")
-                    return fee
-
-        except Exception as e:
-            log_with_timestamp(f"⚠ Failed to fetch {exchange} fees: {e}")
-        return None
-
-    def get_best_opportunities(self, limit: int = 5) -> List[ArbitrageOpportunity]:
-        recent_opportunities = [
-            opp for opp in self.opportunities if time.time() - opp.timestamp < 300
-        ]
-
-        recent_opportunities.sort(key=lambda x: x.profit_percentage, reverse=True)
-        return recent_opportunities[:limit]
+        max_size, _ = max_profitable_size(
+            ask_prices, ask_quantities, bid_prices, bid_quantities, buy_fee, sell_fee
+        )
+        opportunity.size_tiers = tiers
+        opportunity.max_profitable_size = max_size
+        opportunity.volume_limit = max_size
+
+    def record_opportunities(self, opportunities: List[ArbitrageOpportunity]):
+        """Add opportunities to the history and the recent-best index"""
+        self.opportunities.extend(opportunities)
+        self.recent_opportunities.extend(opportunities)
+
+    def get_best_opportunities(
+        self, limit: int = 5, max_age: float = 300
+    ) -> List[ArbitrageOpportunity]:
+        """Most profitable opportunities of the last max_age seconds (at most the index horizon)"""
+        return self.recent_opportunities.best(limit, max_age)
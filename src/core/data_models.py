@@ -2,27 +2,239 @@
 Data models for exchange monitoring and arbitrage detection.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from typing import List, Optional
 
+from .symbols import SYMBOLS
 
-@dataclass
+
+def _repr_with_names(instance, names: str, skip: int) -> str:
+    """Dataclass-style repr with leading id fields shown as names"""
+    values = ", ".join(
+        f"{f.name}={getattr(instance, f.name)!r}" for f in fields(instance)[skip:]
+    )
+    return f"{type(instance).__name__}({names}, {values})"
+
+
+@dataclass(slots=True, init=False)
 class PriceData:
-    exchange: str
-    symbol: str
+    """
+    One quote of an instrument.
+
+    Exchange and symbol are kept as ids in the process-wide symbol table;
+    the constructor takes names and the exchange and symbol properties
+    return them.
+    """
+
+    exchange_id: int
+    instrument_id: int
     price: float
     price_usd: float  # Price converted to USD
     original_currency: str  # Original quote currency
     timestamp: float
     volume: float = 0.0
+    # Best bid/ask in the original currency and USD, when the source provides them
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    bid_size: Optional[float] = None
+    ask_size: Optional[float] = None
+    bid_usd: Optional[float] = None
+    ask_usd: Optional[float] = None
+
+    def __init__(
+        self,
+        exchange: str,
+        symbol: str,
+        price: float,
+        price_usd: float,
+        original_currency: str,
+        timestamp: float,
+        volume: float = 0.0,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        bid_size: Optional[float] = None,
+        ask_size: Optional[float] = None,
+        bid_usd: Optional[float] = None,
+        ask_usd: Optional[float] = None,
+    ):
+        self.instrument_id = SYMBOLS.instrument_id(exchange, symbol)
+        self.exchange_id = SYMBOLS.instrument_exchanges[self.instrument_id]
+        self.price = price
+        self.price_usd = price_usd
+        self.original_currency = original_currency
+        self.timestamp = timestamp
+        self.volume = volume
+        self.bid = bid
+        self.ask = ask
+        self.bid_size = bid_size
+        self.ask_size = ask_size
+        self.bid_usd = bid_usd
+        self.ask_usd = ask_usd
+
+    def __repr__(self) -> str:
+        return _repr_with_names(
+            self, f"exchange={self.exchange!r}, symbol={self.symbol!r}", 2
+        )
+
+    @property
+    def exchange(self) -> str:
+        return SYMBOLS.exchanges[self.exchange_id]
+
+    @property
+    def symbol(self) -> str:
+        return SYMBOLS.symbols[self.instrument_id]
+
+    @property
+    def buy_price_usd(self) -> float:
+        """USD price a buyer pays now: best ask, or last trade if no quote"""
+        return self.ask_usd if self.ask_usd is not None else self.price_usd
 
+    @property
+    def sell_price_usd(self) -> float:
+        """USD price a seller receives now: best bid, or last trade if no quote"""
+        return self.bid_usd if self.bid_usd is not None else self.price_usd
 
-@dataclass
+
+@dataclass(slots=True)
+class SizeTierProfit:
+    """Executable profit for one trade size, priced by walking both books"""
+
+    size: float  # Requested BTC size
+    fillable: float  # BTC size both books can absorb
+    buy_vwap: float  # USD
+    sell_vwap: float  # USD
+    profit_usd: float  # Net of fees
+    profit_percentage: float  # Net of fees
+
+
+@dataclass(slots=True, init=False)
 class ArbitrageOpportunity:
-    buy_exchange: str
-    sell_exchange: str
+    """
+    Buying on one exchange and selling on another.
+
+    Exchanges are kept as ids in the process-wide symbol table; the
+    constructor takes names and the buy_exchange and sell_exchange
+    properties return them.
+    """
+
+    buy_exchange_id: int
+    sell_exchange_id: int
     buy_price: float
     sell_price: float
     profit_usd: float
     profit_percentage: float
     timestamp: float
     volume_limit: float
+    # Depth-aware pricing, only available when both order books are streamed
+    size_tiers: List[SizeTierProfit]
+    max_profitable_size: Optional[float] = None
+    # Base asset traded (e.g. "BTC"), set when detected from the price matrix
+    asset: Optional[str] = None
+
+    def __init__(
+        self,
+        buy_exchange: str,
+        sell_exchange: str,
+        buy_price: float,
+        sell_price: float,
+        profit_usd: float,
+        profit_percentage: float,
+        timestamp: float,
+        volume_limit: float,
+        size_tiers: Optional[List[SizeTierProfit]] = None,
+        max_profitable_size: Optional[float] = None,
+        asset: Optional[str] = None,
+    ):
+        self.buy_exchange_id = SYMBOLS.exchange_id(buy_exchange)
+        self.sell_exchange_id = SYMBOLS.exchange_id(sell_exchange)
+        self.buy_price = buy_price
+        self.sell_price = sell_price
+        self.profit_usd = profit_usd
+        self.profit_percentage = profit_percentage
+        self.timestamp = timestamp
+        self.volume_limit = volume_limit
+        self.size_tiers = [] if size_tiers is None else size_tiers
+        self.max_profitable_size = max_profitable_size
+        self.asset = asset
+
+    def __repr__(self) -> str:
+        return _repr_with_names(
+            self,
+            f"buy_exchange={self.buy_exchange!r}, "
+            f"sell_exchange={self.sell_exchange!r}",
+            2,
+        )
+
+    @property
+    def buy_exchange(self) -> str:
+        return SYMBOLS.exchanges[self.buy_exchange_id]
+
+    @property
+    def sell_exchange(self) -> str:
+        return SYMBOLS.exchanges[self.sell_exchange_id]
+
+
+@dataclass(slots=True)
+class CycleLeg:
+    """One conversion in a market graph: trading source currency for target"""
+
+    exchange: str
+    symbol: str
+    side: str  # "buy" or "sell" of the symbol's base asset
+    source: str
+    target: str
+    price: float  # Quote used, in the symbol's quote currency (ask or bid)
+    rate: float  # Target received per unit of source, net of the taker fee
+    timestamp: float
+
+
+@dataclass(slots=True)
+class ArbitrageCycle:
+    """Conversions that end with more of the starting currency than they spent"""
+
+    legs: List[CycleLeg]
+    profit_percentage: float  # Net of fees
+    timestamp: float
+
+    @property
+    def currencies(self) -> List[str]:
+        """Currencies visited, starting and ending with the same one"""
+        return [leg.source for leg in self.legs] + [self.legs[0].source]
+
+
+@dataclass(slots=True)
+class TrackedOpportunity:
+    """Lifecycle of the opportunity on one (buy, sell, asset) key while it lasts"""
+
+    buy_exchange: str
+    sell_exchange: str
+    asset: Optional[str]
+    opened_at: float
+    updated_at: float
+    last: ArbitrageOpportunity  # Most recent observation
+    peak: ArbitrageOpportunity  # Most profitable observation
+    observations: int = 1
+    closed_at: Optional[float] = None
+
+    @property
+    def peak_profit_percentage(self) -> float:
+        return self.peak.profit_percentage
+
+    @property
+    def duration(self) -> float:
+        """Seconds open so far, or in total once closed"""
+        end = self.closed_at if self.closed_at is not None else self.updated_at
+        return end - self.opened_at
+
+
+@dataclass(slots=True)
+class OpportunityEvent:
+    """A lifecycle transition of a tracked opportunity"""
+
+    kind: str  # "open", "update" (new peak) or "close"
+    tracked: TrackedOpportunity
+    timestamp: float
+
+    @property
+    def opportunity(self) -> ArbitrageOpportunity:
+        return self.tracked.last
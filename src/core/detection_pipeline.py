@@ -0,0 +1,171 @@
+"""
+Event-driven arbitrage detection.
+
+Every recorded price (polled or streamed) is published on a PriceUpdateBus.
+The DetectionPipeline consumes the bus, coalesces bursts of updates, and runs
+detection only for the exchange pairs touched by the exchanges that changed,
+instead of re-scanning everything on a fixed timer. With an event callback,
+detections go through the detector's opportunity tracker and only lifecycle
+transitions are signalled. Tick-to-signal latency is measured from the moment
+an update is published to the moment detection on it finishes.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional
+
+from ..utils.logging import log_with_timestamp
+from ..utils.metrics import LatencyTracker
+from .data_models import (
+    ArbitrageCycle,
+    ArbitrageOpportunity,
+    OpportunityEvent,
+    PriceData,
+)
+
+if TYPE_CHECKING:
+    from .arbitrage_detector import ArbitrageDetector
+
+OpportunityCallback = Callable[[List[ArbitrageOpportunity]], Awaitable[None]]
+CycleCallback = Callable[[List[ArbitrageCycle]], Awaitable[None]]
+EventCallback = Callable[[List[OpportunityEvent]], Awaitable[None]]
+
+
+@dataclass
+class PriceUpdate:
+    """A price published on the bus with its monotonic publish time"""
+
+    price_data: PriceData
+    published_at: float
+
+
+class PriceUpdateBus:
+    """Bounded asyncio queue of price updates; the oldest update is dropped when full."""
+
+    def __init__(self, maxsize: int = 1000):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, price_data: PriceData):
+        """Publish a price without blocking the producer"""
+        update = PriceUpdate(price_data, time.perf_counter())
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(update)
+        self.published += 1
+
+    async def get_batch(self) -> List[PriceUpdate]:
+        """Wait for at least one update, then drain everything already queued"""
+        batch = [await self._queue.get()]
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class DetectionPipeline:
+    """Runs incremental detection whenever prices change."""
+
+    def __init__(
+        self,
+        detector: "ArbitrageDetector",
+        bus: PriceUpdateBus,
+        on_opportunities: Optional[OpportunityCallback] = None,
+        on_cycles: Optional[CycleCallback] = None,
+        on_events: Optional[EventCallback] = None,
+    ):
+        """
+        Args:
+            detector: Detector to run on the affected exchange pairs
+            bus: Bus the monitor publishes price updates to
+            on_opportunities: Coroutine called with each non-empty result
+            on_cycles: Coroutine called with profitable cross-currency cycles
+                through the changed quotes; cycles are only searched if set
+            on_events: Coroutine called with opportunity lifecycle transitions.
+                If set, opportunities are tracked and on_opportunities only
+                receives the ones that opened or reached a new peak
+        """
+        self.detector = detector
+        self.bus = bus
+        self.on_opportunities = on_opportunities
+        self.on_cycles = on_cycles
+        self.on_events = on_events
+        self.detection_latency = LatencyTracker()
+        self.signal_latency = LatencyTracker()
+        self.batches = 0
+        self.updates = 0
+        self._running = False
+
+    async def process_batch(
+        self, batch: List[PriceUpdate]
+    ) -> List[ArbitrageOpportunity]:
+        """
+        Run detection for one batch of updates.
+
+        Updates are coalesced per exchange; latency is measured from the
+        oldest update in the batch.
+        """
+        earliest: Dict[str, float] = {}
+        for update in batch:
+            exchange = update.price_data.exchange
+            earliest[exchange] = min(
+                earliest.get(exchange, update.published_at), update.published_at
+            )
+
+        events = []
+        if self.on_events is not None:
+            events = await self.detector.track_opportunities(
+                changed_exchanges=list(earliest)
+            )
+            opportunities = [e.opportunity for e in events if e.kind != "close"]
+        else:
+            opportunities = await self.detector.detect_opportunities(
+                changed_exchanges=list(earliest)
+            )
+
+        latency = time.perf_counter() - min(earliest.values())
+        self.detection_latency.record(latency)
+        self.batches += 1
+        self.updates += len(batch)
+
+        if opportunities or events:
+            self.signal_latency.record(latency)
+        if events:
+            await self.on_events(events)
+        if opportunities and self.on_opportunities is not None:
+            await self.on_opportunities(opportunities)
+
+        if self.on_cycles is not None:
+            cycles = self.detector.detect_cycles(changed_only=True)
+            if cycles:
+                await self.on_cycles(cycles)
+
+        return opportunities
+
+    async def run(self):
+        """Consume the bus until stop() is called or the task is cancelled"""
+        self._running = True
+        while self._running:
+            batch = await self.bus.get_batch()
+            try:
+                await self.process_batch(batch)
+            except Exception as e:
+                log_with_timestamp(f"Error in detection pipeline: {e}")
+
+    def stop(self):
+        self._running = False
+
+    def get_latency_stats(self) -> Dict:
+        """Tick-to-detection and tick-to-signal latency summaries (ms)"""
+        return {
+            "detection": self.detection_latency.stats(),
+            "signal": self.signal_latency.stats(),
+            "batches": self.batches,
+            "updates": self.updates,
+            "dropped_updates": self.bus.dropped,
+        }
@@ -0,0 +1,146 @@
+"""
+Vectorized net-edge computation over a PriceMatrix.
+
+The engine keeps a taker fee grid (one fee per matrix cell, read from the
+FeeService's FeeMatrix snapshot) and a buy×sell eligibility mask (large
+venue on one side, small venue on the other) aligned with the matrix. One
+pass subtracts the combined fees from every asset's gross edge matrix, masks
+ineligible pairs and returns only the cells above the profit threshold, so
+no per-pair Python code or fee lookup runs for pairs that cannot trade.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..services.fee_service import FeeMatrix
+from .price_matrix import PriceMatrix
+
+
+@dataclass(slots=True)
+class Edge:
+    """A buy/sell cell of the net-edge matrix; percentages"""
+
+    row: int
+    buy_col: int
+    sell_col: int
+    gross: float
+    net: float
+
+
+class DetectionEngine:
+    """
+    Net-of-fee edges for every asset and eligible exchange pair at once.
+
+    Args:
+        large_exchanges: Exchanges treated as large venues
+        small_exchanges: Exchanges treated as small venues
+        fees: Fee snapshot to read taker fees from (configured fees by default)
+    """
+
+    def __init__(
+        self,
+        large_exchanges: Iterable[str],
+        small_exchanges: Iterable[str],
+        fees: Optional[FeeMatrix] = None,
+    ):
+        self.large_exchanges = frozenset(large_exchanges)
+        self.small_exchanges = frozenset(small_exchanges)
+        self.fees = fees or FeeMatrix.from_config()
+        # The grid is rebuilt only when the fees or the matrix's cells change
+        self._fee_grid: Optional[Tuple[PriceMatrix, tuple, np.ndarray]] = None
+        self._eligibility: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    def set_fees(self, fees: FeeMatrix):
+        """Switch to a new fee snapshot"""
+        if fees is not self.fees:
+            self.fees = fees
+            self._fee_grid = None
+
+    def fee_grid(self, matrix: PriceMatrix) -> np.ndarray:
+        """
+        Taker fee in percent per (asset, exchange) cell.
+
+        Cells use the fee of the instrument that owns them, or the exchange's
+        fee when no instrument does.
+        """
+        # Cells are only ever added, so the shape and cell count identify them
+        key = matrix.shape, len(matrix.symbols)
+        cached = self._fee_grid
+        if cached is not None and cached[0] is matrix and cached[1] == key:
+            return cached[2]
+
+        grid = np.empty(matrix.shape)
+        for col, exchange in enumerate(matrix.exchanges):
+            grid[:, col] = self.fees.taker(exchange)
+        for (row, col), symbol in matrix.symbols.items():
+            grid[row, col] = self.fees.taker(matrix.exchanges[col], symbol)
+        self._fee_grid = matrix, key, grid
+        return grid
+
+    def eligibility(self, exchanges: Sequence[str]) -> np.ndarray:
+        """[buy, sell] mask of pairs with a large venue on one side and a small on the other"""
+        key = tuple(exchanges)
+        mask = self._eligibility.get(key)
+        if mask is None:
+            large = np.array([name in self.large_exchanges for name in key], dtype=bool)
+            small = np.array([name in self.small_exchanges for name in key], dtype=bool)
+            mask = (large[:, None] & small[None, :]) | (small[:, None] & large[None, :])
+            self._eligibility[key] = mask
+        return mask
+
+    def net_edges(self, matrix: PriceMatrix) -> np.ndarray:
+        """
+        Net percentage edge of every buy/sell exchange pair for every asset.
+
+        Returns:
+            Array of shape (assets, exchanges, exchanges) where [a, i, j] is
+            the gross edge of buying at exchange i and selling at exchange j
+            minus both exchanges' fees; NaN where a quote is missing or the
+            pair is not eligible
+        """
+        fees = self.fee_grid(matrix)
+        net = matrix.gross_edges() - (fees[:, :, None] + fees[:, None, :])
+        net[:, ~self.eligibility(matrix.exchanges)] = np.nan
+        return net
+
+    def scan(
+        self,
+        matrix: PriceMatrix,
+        min_profit_percentage: float,
+        changed_exchanges: Optional[Iterable[str]] = None,
+    ) -> List[Edge]:
+        """
+        Cells whose net edge is positive and at least the threshold.
+
+        Args:
+            matrix: Current quotes
+            min_profit_percentage: Minimum net edge to report
+            changed_exchanges: If given, only pairs that involve one of these
+                exchanges are returned (incremental detection)
+
+        Returns:
+            Matching cells, best net edge first
+        """
+        if 0 in matrix.shape:
+            return []
+        gross = matrix.gross_edges()
+        fees = self.fee_grid(matrix)
+        net = gross - (fees[:, :, None] + fees[:, None, :])
+
+        mask = self.eligibility(matrix.exchanges)
+        if changed_exchanges is not None:
+            changed = set(changed_exchanges)
+            touched = np.array([name in changed for name in matrix.exchanges])
+            mask = mask & (touched[:, None] | touched[None, :])
+
+        # NaN edges (missing quotes) compare False
+        hits = (net > 0) & (net >= min_profit_percentage) & mask
+        cells = np.nonzero(hits)
+        order = np.argsort(-net[cells], kind="stable")
+        cells = tuple(axis[order] for axis in cells)
+        # Convert whole columns at once rather than element by element
+        columns = [axis.tolist() for axis in cells]
+        columns += [gross[cells].tolist(), net[cells].tolist()]
+        return [Edge(*values) for values in zip(*columns)]
@@ -0,0 +1,205 @@
+"""
+Per-exchange health tracking with a circuit breaker.
+
+Each exchange has a breaker with three states:
+
+- closed: requests flow normally while failures are counted
+- open: the exchange is considered down; requests are skipped until a
+  cool-down passes
+- half_open: one probe request is let through; success closes the breaker,
+  failure opens it again
+
+The breaker trips on a run of consecutive failures or on a high error rate
+over a sliding time window. Request latencies are tracked for percentiles.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from config.settings import (
+    HEALTH_ERROR_RATE_THRESHOLD,
+    HEALTH_FAILURE_THRESHOLD,
+    HEALTH_MIN_CALLS,
+    HEALTH_OPEN_SECONDS,
+    HEALTH_WINDOW_SECONDS,
+)
+
+from ..utils.metrics import LatencyTracker
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ExchangeHealth:
+    """Circuit breaker, error-rate window and latency stats for one exchange."""
+
+    def __init__(
+        self,
+        exchange: str,
+        failure_threshold: int = HEALTH_FAILURE_THRESHOLD,
+        error_rate_threshold: float = HEALTH_ERROR_RATE_THRESHOLD,
+        window_seconds: float = HEALTH_WINDOW_SECONDS,
+        min_calls: int = HEALTH_MIN_CALLS,
+        open_seconds: float = HEALTH_OPEN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            exchange: Exchange name
+            failure_threshold: Consecutive failures that open the breaker
+            error_rate_threshold: Error rate (0-1) over the window that opens it
+            window_seconds: Length of the error-rate window
+            min_calls: Calls needed in the window before the error rate counts
+            open_seconds: Cool-down before an open breaker lets a probe through
+            clock: Monotonic time source
+        """
+        self.exchange = exchange
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self._clock = clock
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.skipped = 0
+        self._probe_in_flight = False
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self.latency = LatencyTracker()
+
+    def _prune(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of failed calls in the window"""
+        self._prune(self._clock())
+        if not self._outcomes:
+            return 0.0
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return failures / len(self._outcomes)
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.state != OPEN
+
+    @property
+    def cooldown_remaining(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 unless open)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (self._clock() - self.opened_at))
+
+    def allow_request(self) -> bool:
+        """
+        Whether a request may be sent now.
+
+        An open breaker moves to half-open after the cool-down and then lets
+        exactly one probe through until its outcome is recorded.
+        """
+        if self.state == OPEN:
+            if self._clock() - self.opened_at < self.open_seconds:
+                self.skipped += 1
+                return False
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self.skipped += 1
+                return False
+            self._probe_in_flight = True
+
+        return True
+
+    def record_success(self, latency: float) -> Optional[str]:
+        """
+        Record a successful call.
+
+        Returns:
+            The new state if this call changed it, otherwise None
+        """
+        now = self._clock()
+        self._prune(now)
+        self._outcomes.append((now, True))
+        self.latency.record(latency)
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self.opened_at = None
+            # Failures from before the outage no longer describe the exchange
+            self._outcomes = deque([(now, True)])
+            return CLOSED
+        return None
+
+    def record_failure(self, latency: float, error: str) -> Optional[str]:
+        """
+        Record a failed call.
+
+        Returns:
+            The new state if this call changed it, otherwise None
+        """
+        now = self._clock()
+        self._prune(now)
+        self._outcomes.append((now, False))
+        self.latency.record(latency)
+        self.consecutive_failures += 1
+        self.last_error = error
+        self._probe_in_flight = False
+
+        if self.state == HALF_OPEN or self._should_trip():
+            self.state = OPEN
+            self.opened_at = now
+            return OPEN
+        return None
+
+    def _should_trip(self) -> bool:
+        if self.state != CLOSED:
+            return False
+        if self.consecutive_failures >= self.failure_threshold:
+            return True
+        return (
+            len(self._outcomes) >= self.min_calls
+            and self.error_rate >= self.error_rate_threshold
+        )
+
+    def get_status(self) -> Dict:
+        latency = self.latency.stats()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "error_rate": self.error_rate,
+            "skipped": self.skipped,
+            "last_error": self.last_error,
+            "latency_p50_ms": latency["p50_ms"],
+            "latency_p90_ms": latency["p90_ms"],
+            "latency_p99_ms": latency["p99_ms"],
+        }
+
+
+class HealthRegistry:
+    """ExchangeHealth per exchange, created on first use."""
+
+    def __init__(self, **options):
+        """
+        Args:
+            **options: ExchangeHealth keyword arguments applied to every exchange
+        """
+        self._options = options
+        self._health: Dict[str, ExchangeHealth] = {}
+
+    def get(self, exchange: str) -> ExchangeHealth:
+        if exchange not in self._health:
+            self._health[exchange] = ExchangeHealth(exchange, **self._options)
+        return self._health[exchange]
+
+    def get_status(self) -> Dict[str, Dict]:
+        return {name: health.get_status() for name, health in self._health.items()}
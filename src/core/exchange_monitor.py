@@ -1,13 +1,35 @@
+import asyncio
 import time
-from typing import TYPE_CHECKING, Dict, List, Optional
-
-from ..apis.base_exchange import BaseExchangeAPI, create_exchange_api
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+from config.settings import (
+    EXCHANGE_ADAPTERS,
+    REQUEST_HEDGE_MIN_SAMPLES,
+    REQUEST_HEDGE_PERCENTILE,
+    REQUEST_HEDGING_ENABLED,
+    STALE_PRICE_SECONDS,
+)
+
+from ..apis.base_exchange import BaseExchangeAPI
+from ..apis.base_stream import BaseExchangeStream, create_exchange_stream
+from ..apis.payloads import PayloadError
+from ..apis.registry import ExchangeRegistry, parse_adapter_list
 from ..services.currency_converter import CurrencyConverter
+from ..services.rate_limiter import RateLimiterRegistry
+from ..services.request_hedger import RequestHedger
+from ..services.session_manager import SessionManager
 from ..utils.logging import log_with_timestamp
 from .data_models import PriceData
+from .detection_pipeline import PriceUpdateBus
+from .exchange_health import CLOSED, OPEN, HealthRegistry
+from .market_graph import MarketGraph
+from .order_book import OrderBook
+from .price_matrix import PriceMatrix
+from .tick_store import TickStore
 
 if TYPE_CHECKING:
-    from ..services.database_service import DatabaseService
+    from ..services.database_writer import DatabaseWriter
 
 
 class ExchangeMonitor:
@@ -17,16 +39,71 @@ class ExchangeMonitor:
         trading_pairs: Dict[str, str],
         api_keys: Dict[str, Dict] = None,
         symbol: str = "BTC/USDT",
-        database_service: Optional["DatabaseService"] = None,
+        database_writer: Optional["DatabaseWriter"] = None,
+        session_manager: Optional[SessionManager] = None,
+        price_sources: Optional[Dict[str, str]] = None,
+        book_depth: Optional[int] = None,
+        update_bus: Optional[PriceUpdateBus] = None,
+        rate_limiters: Optional[RateLimiterRegistry] = None,
+        health: Optional[HealthRegistry] = None,
+        stale_after: float = STALE_PRICE_SECONDS,
+        hedging: bool = REQUEST_HEDGING_ENABLED,
+        exchange_registry: Optional[ExchangeRegistry] = None,
+        monitored_pairs: Optional[Dict[str, List[str]]] = None,
     ):
         self.exchanges = exchanges
         self.symbol = symbol
         self.trading_pairs = trading_pairs  # Exchange-specific trading pairs
         self.api_keys = api_keys or {}
         self.latest_prices = {}
-        self.price_history = []
-        self.currency_converter = CurrencyConverter()
-        self.database_service = database_service
+        # Bounded columnar history of trading-pair prices
+        self.price_history = TickStore()
+        # Every pair fetched per exchange; the trading pair comes first and is
+        # the one kept in latest_prices
+        self.monitored_pairs: Dict[str, List[str]] = {
+            name: self._pairs_for(name, (monitored_pairs or {}).get(name, []))
+            for name in exchanges
+        }
+        # Latest price of every monitored pair: exchange -> symbol -> PriceData
+        self.pair_prices: Dict[str, Dict[str, PriceData]] = {}
+        # The same quotes as a dense asset x exchange USD matrix for detection
+        self.price_matrix = PriceMatrix(exchanges, self.monitored_pairs)
+        # ...and as currency conversions for cross-currency cycle search
+        self.market_graph = MarketGraph()
+        # Long-lived HTTP sessions shared by all exchange clients and FX lookups
+        self.session_manager = session_manager or SessionManager()
+        self.currency_converter = CurrencyConverter(self.session_manager)
+        # Shared per-exchange request budgets; requests queue instead of failing
+        self.rate_limiters = rate_limiters or RateLimiterRegistry()
+        # Circuit breakers; unhealthy or stale exchanges drop out of latest_prices
+        self.health = health or HealthRegistry()
+        self.stale_after = stale_after
+        # Per-exchange hedging of slow ticker requests (opt-in)
+        self.hedgers: Dict[str, RequestHedger] = (
+            {
+                name: RequestHedger(REQUEST_HEDGE_PERCENTILE, REQUEST_HEDGE_MIN_SAMPLES)
+                for name in exchanges
+            }
+            if hedging
+            else {}
+        )
+        # Lazily imported adapters; one cached client per exchange and credentials
+        self.exchange_registry = exchange_registry or ExchangeRegistry(
+            parse_adapter_list(EXCHANGE_ADAPTERS)
+        )
+        # Rows are queued for a background writer, never awaited here
+        self.database_writer = database_writer
+        # Per-exchange price source: "rest" (polling) or "websocket" (push)
+        self.price_sources = dict(price_sources or {})
+        self.book_depth = book_depth
+        # Streamed L2 order books per exchange
+        self.latest_books: Dict[str, OrderBook] = {}
+        # Recent public trades per exchange as (price, amount, timestamp)
+        self.recent_trades: Dict[str, Deque[Tuple[float, float, float]]] = {}
+        self.streams: Dict[str, BaseExchangeStream] = {}
+        self._stream_tasks: List[asyncio.Task] = []
+        # Every recorded price is published here for event-driven detection
+        self.update_bus = update_bus
 
         for exchange_name in exchanges:
             try:
@@ -34,158 +111,417 @@ class ExchangeMonitor:
             except Exception as e:
                 log_with_timestamp(f"✗ Error initializing {exchange_name}: {e}")
 
+    def _pairs_for(self, exchange_name: str, extra_pairs: List[str]) -> List[str]:
+        """Trading pair first, then the other monitored pairs without duplicates"""
+        pairs = [self.trading_pairs.get(exchange_name, self.symbol)]
+        for pair in extra_pairs:
+            pair = pair.strip().upper()
+            if pair and pair not in pairs:
+                pairs.append(pair)
+        return pairs
+
+    def get_exchange_api(self, exchange_name: str) -> BaseExchangeAPI:
+        """
+        Cached client for an exchange, wired to this monitor's sessions,
+        request budgets and hedgers.
+
+        Raises:
+            ValueError: If the exchange is not supported
+        """
+        exchange_creds = self.api_keys.get(exchange_name, {})
+        return self.exchange_registry.get(
+            exchange_name,
+            api_key=exchange_creds.get("apiKey"),
+            api_secret=exchange_creds.get("secret"),
+            client_id=exchange_creds.get("clientId"),  # Only used by Coinmate
+            session_manager=self.session_manager,
+            rate_limiter=self.rate_limiters.get(exchange_name),
+            hedger=self.hedgers.get(exchange_name),
+        )
+
     async def fetch_price(self, exchange_name: str) -> Optional[PriceData]:
         """Fetch price using the abstract exchange API interface"""
+        # Skip exchanges whose circuit breaker is open
+        if not self.health.get(exchange_name).allow_request():
+            return None
+
         # Get the trading pair for this exchange
         trading_pair = self.trading_pairs.get(exchange_name, self.symbol)
+        pairs = self.monitored_pairs.get(exchange_name) or [trading_pair]
         start_time = time.time()
 
         try:
-            # Get API credentials if available
-            exchange_creds = self.api_keys.get(exchange_name, {})
+            exchange_api = self.get_exchange_api(exchange_name)
 
-            # Create exchange API using factory
-            exchange_api = create_exchange_api(
-                exchange_name,
-                api_key=exchange_creds.get("apiKey"),
-                api_secret=exchange_creds.get("secret"),
-                client_id=exchange_creds.get("clientId"),  # Only used by Coinmate
-            )
+            # All monitored pairs in one batched request where supported
+            prices = await self._fetch_prices_generic(exchange_api, pairs)
+            price_data = prices.get(trading_pair)
+            elapsed = time.time() - start_time
+            response_time_ms = int(elapsed * 1000)
 
-            price_data = await self._fetch_price_generic(exchange_api, trading_pair)
-            response_time_ms = int((time.time() - start_time) * 1000)
+            for symbol, other_data in prices.items():
+                if symbol != trading_pair:
+                    await self._record_price(other_data)
 
             if price_data:
-                self.latest_prices[exchange_name] = price_data
-                self.price_history.append(price_data)
+                if self.health.get(exchange_name).record_success(elapsed) == CLOSED:
+                    log_with_timestamp(f"✓ {exchange_name} recovered, circuit closed")
+                await self._record_price(price_data)
 
-                # Store in database asynchronously (non-blocking)
-                if self.database_service:
-                    await self.database_service.store_price_data(price_data)
-                    await self.database_service.store_exchange_status(
+                # Queued for the database writer (non-blocking)
+                if self.database_writer:
+                    self.database_writer.write_exchange_status(
                         exchange_name, "active", None, response_time_ms
                     )
+            else:
+                await self._report_failure(
+                    exchange_name, elapsed, "No price data returned"
+                )
 
             return price_data
 
+        except asyncio.CancelledError:
+            # Abandoned by a caller's deadline; count it so a stuck half-open
+            # probe cannot wedge the breaker
+            self._note_failure(
+                exchange_name, time.time() - start_time, "Request cancelled"
+            )
+            raise
         except ValueError as e:
-            response_time_ms = int((time.time() - start_time) * 1000)
-            if self.database_service:
-                await self.database_service.store_exchange_status(
-                    exchange_name, "error", str(e), response_time_ms
-                )
-            log_with_timestamp(f"✗ {e}")
+            await self._report_failure(
+                exchange_name, time.time() - start_time, str(e), f"✗ {e}"
+            )
             return None
         except Exception as e:
-            response_time_ms = int((time.time() - start_time) * 1000)
-            if self.database_service:
-                await self.database_service.store_exchange_status(
-                    exchange_name, "error", str(e), response_time_ms
-                )
-            log_with_timestamp(f"✗ Error fetching price from {exchange_name}: {e}")
+            await self._report_failure(
+                exchange_name,
+                time.time() - start_time,
+                str(e),
+                f"✗ Error fetching price from {exchange_name}: {e}",
+            )
             return None
 
-    async def _fetch_price_generic(
-        self, exchange_api: BaseExchangeAPI, trading_pair: str
-    ) -> Optional[PriceData]:
-        """Generic method to fetch price using any exchange API"""
+    def _note_failure(self, exchange_name: str, elapsed: float, error: str) -> bool:
+        """
+        Record a failed fetch in the exchange's health.
+
+        Returns:
+            True if the failure should be reported: the first of a streak, or
+            one that changed the breaker state
+        """
+        health = self.health.get(exchange_name)
+        transition = health.record_failure(elapsed, error)
+
+        if transition == OPEN:
+            # Its last prices no longer describe a reachable market
+            self.latest_prices.pop(exchange_name, None)
+            self.pair_prices.pop(exchange_name, None)
+            self.price_matrix.clear_exchange(exchange_name)
+            self.market_graph.remove_exchange(exchange_name)
+            log_with_timestamp(
+                f"⚠ {exchange_name} circuit open after "
+                f"{health.consecutive_failures} failures, "
+                f"skipping for {health.open_seconds:.0f}s"
+            )
+
+        return transition is not None or health.consecutive_failures == 1
+
+    async def _report_failure(
+        self,
+        exchange_name: str,
+        elapsed: float,
+        error: str,
+        message: Optional[str] = None,
+    ):
+        """Log and store a failed fetch, without repeating it on every retry"""
+        if not self._note_failure(exchange_name, elapsed, error):
+            return
+
+        if message:
+            log_with_timestamp(message)
+        if self.database_writer:
+            self.database_writer.write_exchange_status(
+                exchange_name, "error", error, int(elapsed * 1000)
+            )
+
+    def evict_stale_prices(self, keep: Optional[str] = None) -> List[str]:
+        """
+        Drop prices older than the stale threshold from detection.
+
+        Args:
+            keep: Exchange that must not be evicted (the one just updated)
+
+        Returns:
+            Names of the evicted exchanges
+        """
+        now = time.time()
+        evicted = [
+            name
+            for name, price_data in self.latest_prices.items()
+            if name != keep and now - price_data.timestamp > self.stale_after
+        ]
+        for name in evicted:
+            age = now - self.latest_prices.pop(name).timestamp
+            log_with_timestamp(f"⚠ Dropping stale {name} price ({age:.0f}s old)")
+
+        # Other monitored pairs age out of the matrix the same way
+        for name, symbol in self.price_matrix.evict_older_than(now - self.stale_after):
+            self.pair_prices.get(name, {}).pop(symbol, None)
+        self.market_graph.evict_older_than(now - self.stale_after)
+        return evicted
+
+    async def _fetch_prices_generic(
+        self, exchange_api: BaseExchangeAPI, trading_pairs: List[str]
+    ) -> Dict[str, PriceData]:
+        """Generic method to fetch prices of several pairs using any exchange API"""
         try:
             async with exchange_api as api:
-                # Normalize trading pair for this exchange
-                normalized_pair = api.normalize_pair(trading_pair)
-                ticker_data = await api.get_ticker(normalized_pair)
+                tickers = await api.fetch_normalized_tickers(trading_pairs)
 
-                if ticker_data:
-                    # Extract price data based on exchange type
+                if tickers:
                     exchange_name = api.get_exchange_name()
+                    prices = {}
+                    for trading_pair, ticker in tickers.items():
+                        price_data = await self._build_price_data(
+                            exchange_name,
+                            trading_pair,
+                            ticker.last,
+                            ticker.volume,
+                            ticker.bid,
+                            ticker.ask,
+                            ticker.bid_size,
+                            ticker.ask_size,
+                        )
 
-                    if exchange_name == "coinmate":
-                        if not ticker_data.get("error", True):
-                            data = ticker_data.get("data", {})
-                            price = float(data.get("last", 0))
-                            volume = float(data.get("amount", 0))
-                        else:
-                            error_msg = ticker_data.get("errorMessage", "Unknown error")
-                            log_with_timestamp(
-                                f"✗ {exchange_name.title()} API error: {error_msg}"
-                            )
-                            return None
-
-                    elif exchange_name == "kraken":
-                        if not ticker_data.get("error"):
-                            result = ticker_data.get("result", {})
-                            # Kraken uses different pair formats
-                            pair_data = (
-                                result.get(normalized_pair)
-                                or result.get("XXBTZUSD")
-                                or result.get("XBTUSD")
-                                or result.get("BTCUSD")
-                            )
-
-                            if pair_data:
-                                last_trade = pair_data.get("c", [None, None])
-                                price = float(last_trade[0]) if last_trade[0] else None
-                                volume = float(last_trade[1]) if last_trade[1] else 0.0
-
-                                if not price:
-                                    log_with_timestamp(
-                                        f"✗ No price data in {exchange_name} response"
-                                    )
-                                    return None
-                            else:
-                                log_with_timestamp(
-                                    f"✗ No pair data found for {normalized_pair} in {exchange_name}"
-                                )
-                                return None
-                        else:
-                            error_msg = ticker_data.get("error", "Unknown error")
-                            log_with_timestamp(
-                                f"✗ {exchange_name.title()} API error: {error_msg}"
-                            )
-                            return None
-                    else:
-                        log_with_timestamp(f"✗ Unsupported exchange: {exchange_name}")
-                        return None
-
-                    # Common processing for all exchanges
-                    quote_currency = trading_pair.split("/")[1]
-
-                    # Convert to USD if needed
-                    price_usd = await self.currency_converter.convert_to_usd(
-                        price, quote_currency
-                    )
-                    if price_usd is None:
                         log_with_timestamp(
-                            f"⚠ Could not convert {quote_currency} to USD for {exchange_name}"
+                            f"✓ {exchange_name.title()} API: {trading_pair} = {ticker.last} "
+                            f"{price_data.original_currency} (${price_data.price_usd:.2f} USD)"
                         )
-                        price_usd = price  # Fallback to original price
-
-                    price_data = PriceData(
-                        exchange=exchange_name,
-                        symbol=trading_pair,
-                        price=price,
-                        price_usd=price_usd,
-                        original_currency=quote_currency,
-                        timestamp=time.time(),
-                        volume=volume,
-                    )
-
-                    log_with_timestamp(
-                        f"✓ {exchange_name.title()} API: {trading_pair} = {price} "
-                        f"{quote_currency} (${price_usd:.2f} USD)"
-                    )
-                    return price_data
+                        prices[trading_pair] = price_data
+                    return prices
                 else:
                     log_with_timestamp(
                         f"✗ No response from {exchange_api.get_exchange_name()} API"
                     )
 
+        except PayloadError as e:
+            log_with_timestamp(f"✗ {e}")
         except Exception as e:
             log_with_timestamp(
                 f"✗ {exchange_api.get_exchange_name().title()} API error: {e}"
             )
 
-        return None
+        return {}
+
+    async def _build_price_data(
+        self,
+        exchange_name: str,
+        trading_pair: str,
+        price: float,
+        volume: float,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        bid_size: Optional[float] = None,
+        ask_size: Optional[float] = None,
+    ) -> PriceData:
+        """Convert a raw quote to USD and wrap it in PriceData"""
+        quote_currency = trading_pair.split("/")[1]
+
+        # Convert to USD if needed
+        price_usd = await self.currency_converter.convert_to_usd(price, quote_currency)
+        if price_usd is None:
+            log_with_timestamp(
+                f"⚠ Could not convert {quote_currency} to USD for {exchange_name}"
+            )
+            price_usd = price  # Fallback to original price
+
+        # Bid/ask use the same conversion rate as the last price
+        usd_rate = price_usd / price if price else 1.0
+
+        return PriceData(
+            exchange=exchange_name,
+            symbol=trading_pair,
+            price=price,
+            price_usd=price_usd,
+            original_currency=quote_currency,
+            timestamp=time.time(),
+            volume=volume,
+            bid=bid,
+            ask=ask,
+            bid_size=bid_size,
+            ask_size=ask_size,
+            bid_usd=bid * usd_rate if bid is not None else None,
+            ask_usd=ask * usd_rate if ask is not None else None,
+        )
+
+    async def _record_price(self, price_data: PriceData):
+        """Publish a fresh price to detection and persist it"""
+        exchange_name = price_data.exchange
+        self.pair_prices.setdefault(exchange_name, {})[price_data.symbol] = price_data
+        self.price_matrix.update(price_data)
+        self.market_graph.update_price(price_data)
+        if price_data.symbol == self.trading_pairs.get(exchange_name, self.symbol):
+            self.latest_prices[exchange_name] = price_data
+            self.price_history.append(price_data)
+        self.evict_stale_prices(keep=exchange_name)
+        if self.update_bus is not None:
+            self.update_bus.publish(price_data)
+
+        if self.database_writer:
+            self.database_writer.write_price(price_data)
+
+    async def ingest_ticker(
+        self,
+        exchange_name: str,
+        trading_pair: str,
+        price: float,
+        volume: float,
+        bid: Optional[float] = None,
+        ask: Optional[float] = None,
+        bid_size: Optional[float] = None,
+        ask_size: Optional[float] = None,
+    ) -> Optional[PriceData]:
+        """
+        Accept a pushed ticker update from a streaming feed.
+
+        Args:
+            exchange_name: Exchange that produced the update
+            trading_pair: Pair in standard format (e.g., "BTC/USD")
+            price: Last trade price in the quote currency
+            volume: Traded volume reported by the exchange
+            bid, ask, bid_size, ask_size: Best quote, if the feed carries one;
+                otherwise taken from the streamed order book when available
+
+        Returns:
+            The recorded PriceData, or None if the pair is not monitored
+        """
+        if self.trading_pairs.get(exchange_name, self.symbol) != trading_pair:
+            return None
+
+        book = self.latest_books.get(exchange_name)
+        if bid is None and book is not None and book.best_bid:
+            bid, bid_size = book.best_bid
+        if ask is None and book is not None and book.best_ask:
+            ask, ask_size = book.best_ask
+
+        price_data = await self._build_price_data(
+            exchange_name, trading_pair, price, volume, bid, ask, bid_size, ask_size
+        )
+        await self._record_price(price_data)
+        return price_data
+
+    async def ingest_book(
+        self,
+        exchange_name: str,
+        trading_pair: str,
+        bids: List[Tuple[float, float]],
+        asks: List[Tuple[float, float]],
+        is_snapshot: bool,
+        checksum: Optional[int] = None,
+    ):
+        """
+        Apply a pushed order book snapshot or delta.
+
+        Levels are (price, quantity) in the quote currency; a quantity of 0
+        in a delta removes the level. If the exchange sent a checksum and the
+        book no longer matches it, the book is dropped and the stream is asked
+        for a fresh snapshot.
+        """
+        if self.trading_pairs.get(exchange_name, self.symbol) != trading_pair:
+            return
+
+        book = self.latest_books.get(exchange_name)
+        if is_snapshot or book is None:
+            stream = self.streams.get(exchange_name)
+            precision = stream.book_precision(trading_pair) if stream else None
+            book = OrderBook(
+                trading_pair,
+                max_depth=self.book_depth,
+                price_precision=precision[0] if precision else None,
+                qty_precision=precision[1] if precision else None,
+            )
+            book.apply_snapshot(bids, asks)
+            self.latest_books[exchange_name] = book
+        else:
+            book.apply_delta(bids, asks)
+
+        if (
+            checksum is not None
+            and book.price_precision is not None
+            and not book.verify_checksum(checksum)
+        ):
+            log_with_timestamp(
+                f"⚠ {exchange_name.title()} book checksum mismatch for "
+                f"{trading_pair}, resyncing"
+            )
+            del self.latest_books[exchange_name]
+            stream = self.streams.get(exchange_name)
+            if stream:
+                await stream.resync_book()
+
+    async def ingest_trade(
+        self,
+        exchange_name: str,
+        trading_pair: str,
+        price: float,
+        amount: float,
+        timestamp: float,
+    ):
+        """Keep a short window of pushed public trades per exchange"""
+        if self.trading_pairs.get(exchange_name, self.symbol) != trading_pair:
+            return
+        trades = self.recent_trades.setdefault(exchange_name, deque(maxlen=100))
+        trades.append((price, amount, timestamp))
+
+    def get_streamed_exchanges(self) -> List[str]:
+        """Get exchanges configured to receive prices over a WebSocket"""
+        return [
+            name
+            for name in self.exchanges
+            if self.price_sources.get(name, "rest") == "websocket"
+        ]
+
+    def get_polled_exchanges(self) -> List[str]:
+        """Get exchanges whose prices are fetched by REST polling"""
+        streamed = self.get_streamed_exchanges()
+        return [name for name in self.exchanges if name not in streamed]
+
+    def start_streams(self) -> List[asyncio.Task]:
+        """Start WebSocket feeds for all exchanges configured for streaming"""
+        tasks = []
+        for exchange_name in self.get_streamed_exchanges():
+            trading_pair = self.trading_pairs.get(exchange_name, self.symbol)
+            try:
+                stream = create_exchange_stream(
+                    exchange_name,
+                    [trading_pair],
+                    on_ticker=self.ingest_ticker,
+                    on_book=self.ingest_book,
+                    on_trade=self.ingest_trade,
+                    book_depth=self.book_depth,
+                    session_manager=self.session_manager,
+                )
+            except ValueError as e:
+                log_with_timestamp(f"✗ {e} - falling back to REST polling")
+                self.price_sources[exchange_name] = "rest"
+                continue
+
+            self.streams[exchange_name] = stream
+            tasks.append(asyncio.create_task(stream.run()))
+
+        self._stream_tasks.extend(tasks)
+        return tasks
+
+    async def stop_streams(self):
+        """Stop all running WebSocket feeds"""
+        for stream in self.streams.values():
+            await stream.stop()
+        for task in self._stream_tasks:
+            task.cancel()
+        if self._stream_tasks:
+            await asyncio.gather(*self._stream_tasks, return_exceptions=True)
+        self._stream_tasks = []
+        self.streams = {}
 
     def get_price_spread(self) -> Dict:
         if len(self.latest_prices) < 2:
@@ -229,5 +565,18 @@ class ExchangeMonitor:
         """Get list of exchanges that have provided price data"""
         return list(self.latest_prices.keys())
 
+    async def warm_up(self) -> Dict[str, bool]:
+        """Open pooled HTTP connections to every monitored exchange at startup"""
+        endpoints = {}
+        for exchange_name in self.exchanges:
+            try:
+                exchange_api = self.get_exchange_api(exchange_name)
+                endpoints[exchange_name] = exchange_api.base_url
+            except ValueError as e:
+                log_with_timestamp(f"✗ {e}")
+        return await self.session_manager.warm_up(endpoints)
+
     async def close(self):
-        """Close all exchange connections (not needed for direct API calls)"""
+        """Stop streams and close all pooled exchange connections"""
+        await self.stop_streams()
+        await self.session_manager.close()
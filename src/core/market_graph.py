@@ -0,0 +1,311 @@
+"""
+Currency graph of every monitored market, searched for profitable cycles.
+
+Each quoted pair BASE/QUOTE on an exchange adds two conversions: selling
+BASE for QUOTE at the bid and buying BASE with QUOTE at the ask, both net of
+the exchange's taker fee. Nodes are currencies, so quotes from different
+exchanges meet (balances are assumed to be held on every venue), and each
+directed edge keeps the best rate any exchange offers. Edge weights are
+-log(rate), which turns a cycle that multiplies into more than it started
+with into a negative-weight cycle.
+
+A new quote only touches its pair's two edges. The edges whose best rate
+changed since the last search are remembered, and an incremental search
+looks only for the best cycle through each of them (hop-bounded Bellman-Ford
+from the edge's target back to its source); a full search runs Bellman-Ford
+over the whole graph.
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config.settings import CYCLE_MAX_LENGTH
+
+from ..services.fee_service import FeeMatrix
+from .data_models import ArbitrageCycle, CycleLeg, PriceData
+
+# Weight improvements below this are float noise, not arbitrage
+EPSILON = 1e-12
+
+QuoteKey = Tuple[str, str]  # (exchange, symbol)
+EdgeKey = Tuple[int, int]  # (source, target) currency index
+
+
+class MarketGraph:
+    """
+    Best conversion rate between every pair of quoted currencies.
+
+    Args:
+        fees: Fee snapshot for taker fees (configured fees by default)
+        max_length: Most legs an incremental search puts in a cycle
+    """
+
+    def __init__(
+        self, fees: Optional[FeeMatrix] = None, max_length: int = CYCLE_MAX_LENGTH
+    ):
+        self.fees = fees or FeeMatrix.from_config()
+        self.max_length = max_length
+        self.currencies: List[str] = []
+        self._index: Dict[str, int] = {}
+        # weights[i, j] = -log(best rate from currency i to j); inf if none
+        self.weights = np.empty((0, 0))
+        # Every quote's leg per edge, and the highest-rate leg per edge
+        self._legs: Dict[EdgeKey, Dict[QuoteKey, CycleLeg]] = {}
+        self.best: Dict[EdgeKey, CycleLeg] = {}
+        self._quotes: Dict[QuoteKey, Tuple[str, str]] = {}
+        self._changed: Set[EdgeKey] = set()
+
+    def _node(self, currency: str) -> int:
+        index = self._index.get(currency)
+        if index is None:
+            index = self._index[currency] = len(self.currencies)
+            self.currencies.append(currency)
+            grown = np.full((index + 1, index + 1), np.inf)
+            grown[:index, :index] = self.weights
+            self.weights = grown
+        return index
+
+    def _rate(self, leg: CycleLeg) -> float:
+        keep = 1 - self.fees.taker(leg.exchange, leg.symbol) / 100
+        return leg.price * keep if leg.side == "sell" else keep / leg.price
+
+    def _refresh_edge(self, edge: EdgeKey):
+        """Re-pick an edge's best leg after one of its legs changed"""
+        legs = self._legs.get(edge)
+        weight = self.weights[edge]
+        if legs:
+            best = max(legs.values(), key=lambda leg: leg.rate)
+            self.best[edge] = best
+            self.weights[edge] = -math.log(best.rate)
+        else:
+            self.best.pop(edge, None)
+            self.weights[edge] = np.inf
+        # An unchanged best rate cannot create a new cycle
+        if self.weights[edge] != weight:
+            self._changed.add(edge)
+
+    def _put_leg(self, quote: QuoteKey, leg: CycleLeg):
+        edge = self._node(leg.source), self._node(leg.target)
+        leg.rate = self._rate(leg)
+        self._legs.setdefault(edge, {})[quote] = leg
+        self._refresh_edge(edge)
+
+    def _drop_leg(self, quote: QuoteKey, source: str, target: str):
+        edge = self._index.get(source), self._index.get(target)
+        if self._legs.get(edge, {}).pop(quote, None) is not None:
+            self._refresh_edge(edge)
+
+    def update_quote(
+        self,
+        exchange: str,
+        symbol: str,
+        bid: Optional[float],
+        ask: Optional[float],
+        timestamp: Optional[float] = None,
+    ):
+        """
+        Set a pair's bid and ask, replacing its previous quote.
+
+        Args:
+            exchange: Exchange quoting the pair
+            symbol: "BASE/QUOTE" symbol
+            bid: Best bid in the quote currency, or None to drop the sell side
+            ask: Best ask in the quote currency, or None to drop the buy side
+
+        Raises:
+            ValueError: If the symbol is not of the form BASE/QUOTE
+        """
+        base, _, quote_currency = symbol.upper().partition("/")
+        if not base or not quote_currency:
+            raise ValueError(f"Invalid symbol: {symbol}")
+        quote = exchange, symbol
+        self._quotes[quote] = base, quote_currency
+        timestamp = timestamp if timestamp is not None else time.time()
+
+        for side, source, target, price in (
+            ("sell", base, quote_currency, bid),
+            ("buy", quote_currency, base, ask),
+        ):
+            if price:
+                leg = CycleLeg(
+                    exchange, symbol, side, source, target, price, 0.0, timestamp
+                )
+                self._put_leg(quote, leg)
+            else:
+                self._drop_leg(quote, source, target)
+
+    def update_price(self, price_data: PriceData):
+        """Add a monitored price; the last trade stands in for a missing bid or ask"""
+        self.update_quote(
+            price_data.exchange,
+            price_data.symbol,
+            price_data.bid if price_data.bid is not None else price_data.price,
+            price_data.ask if price_data.ask is not None else price_data.price,
+            price_data.timestamp,
+        )
+
+    def remove_quote(self, exchange: str, symbol: str):
+        """Drop both conversions of a pair"""
+        currencies = self._quotes.pop((exchange, symbol), None)
+        if currencies is not None:
+            base, quote_currency = currencies
+            self._drop_leg((exchange, symbol), base, quote_currency)
+            self._drop_leg((exchange, symbol), quote_currency, base)
+
+    def remove_exchange(self, exchange: str):
+        """Drop every quote of an exchange (e.g. when its circuit opens)"""
+        for name, symbol in [quote for quote in self._quotes if quote[0] == exchange]:
+            self.remove_quote(name, symbol)
+
+    def evict_older_than(self, cutoff: float) -> List[QuoteKey]:
+        """
+        Drop quotes last updated before a cutoff time.
+
+        Returns:
+            (exchange, symbol) of every evicted quote
+        """
+        stale = {
+            quote
+            for legs in self._legs.values()
+            for quote, leg in legs.items()
+            if leg.timestamp < cutoff
+        }
+        for exchange, symbol in stale:
+            self.remove_quote(exchange, symbol)
+        return sorted(stale)
+
+    def set_fees(self, fees: FeeMatrix):
+        """Switch to a new fee snapshot, re-pricing every edge if it changed"""
+        if fees is self.fees:
+            return
+        self.fees = fees
+        for edge, legs in self._legs.items():
+            for leg in legs.values():
+                leg.rate = self._rate(leg)
+            if legs:
+                self._refresh_edge(edge)
+
+    def _cycle(self, nodes: List[int]) -> Optional[ArbitrageCycle]:
+        """Cycle along the best legs between consecutive nodes"""
+        legs = [self.best.get((a, b)) for a, b in zip(nodes, nodes[1:] + nodes[:1])]
+        if None in legs:
+            return None
+        growth = math.prod(leg.rate for leg in legs)
+        return ArbitrageCycle(legs, (growth - 1) * 100, time.time())
+
+    def _negative_cycles(self) -> List[List[int]]:
+        """Node sequences of negative cycles found by a full Bellman-Ford pass"""
+        n = len(self.currencies)
+        columns = np.arange(n)
+        # A virtual source at distance 0 from every node reaches every cycle
+        dist = np.zeros(n)
+        pred = np.full(n, -1)
+        for _ in range(n):
+            candidates = dist[:, None] + self.weights
+            sources = candidates.argmin(axis=0)
+            best = candidates[sources, columns]
+            improved = best < dist - EPSILON
+            if not improved.any():
+                return []
+            dist[improved] = best[improved]
+            pred[improved] = sources[improved]
+
+        # Still improving after n rounds: walk back from those nodes into a cycle
+        cycles, seen = [], set()
+        for node in np.nonzero(improved)[0].tolist():
+            for _ in range(n):
+                node = int(pred[node])
+                if node < 0:
+                    break
+            if node < 0 or node in seen:
+                continue
+            backwards = [node]
+            current = int(pred[node])
+            while current != node and current >= 0 and len(backwards) <= n:
+                backwards.append(current)
+                current = int(pred[current])
+            if current != node:
+                continue
+            seen.update(backwards)
+            cycles.append([node] + backwards[:0:-1])
+        return cycles
+
+    def _cycles_through(self, edge: EdgeKey) -> List[List[int]]:
+        """
+        Negative cycles of up to max_length legs that use an edge.
+
+        Hop-bounded Bellman-Ford from the edge's target finds, for each path
+        length, the cheapest walk back to its source; walks that revisit a
+        currency are skipped.
+        """
+        source, target = edge
+        if not np.isfinite(self.weights[edge]):
+            return []
+        n = len(self.currencies)
+        columns = np.arange(n)
+        dist = np.full(n, np.inf)
+        dist[target] = 0.0
+        preds = []
+        cycles = []
+        for hops in range(1, self.max_length):
+            candidates = dist[:, None] + self.weights
+            sources = candidates.argmin(axis=0)
+            dist = candidates[sources, columns]
+            preds.append(sources)
+            if dist[source] + self.weights[edge] >= -EPSILON:
+                continue
+            backwards = [source]
+            for step in reversed(preds):
+                backwards.append(int(step[backwards[-1]]))
+            path = backwards[::-1]  # target ... source
+            if len(set(path)) == len(path):
+                cycles.append([source] + path[:-1])
+        return cycles
+
+    def find_cycles(
+        self,
+        min_profit_percentage: float = 0.0,
+        min_length: int = 2,
+        changed_only: bool = False,
+    ) -> List[ArbitrageCycle]:
+        """
+        Profitable cycles, best first.
+
+        Args:
+            min_profit_percentage: Minimum net gain of a cycle
+            min_length: Fewest legs a reported cycle may have
+            changed_only: Only search cycles through edges that changed since
+                the last search, instead of the whole graph
+
+        Returns:
+            Distinct cycles above the threshold
+        """
+        changed, self._changed = self._changed, set()
+        if changed_only:
+            candidates = [
+                nodes for edge in changed for nodes in self._cycles_through(edge)
+            ]
+        else:
+            candidates = self._negative_cycles()
+
+        cycles, seen = [], set()
+        for nodes in candidates:
+            # The same cycle can be reached from any of its edges
+            start = nodes.index(min(nodes))
+            key = tuple(nodes[start:] + nodes[:start])
+            if key in seen or len(nodes) < min_length:
+                continue
+            seen.add(key)
+            cycle = self._cycle(list(key))
+            if (
+                cycle is not None
+                and cycle.profit_percentage > 0
+                and cycle.profit_percentage >= min_profit_percentage
+            ):
+                cycles.append(cycle)
+
+        cycles.sort(key=lambda cycle: cycle.profit_percentage, reverse=True)
+        return cycles
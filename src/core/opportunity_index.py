@@ -0,0 +1,167 @@
+"""
+Time-bucketed view of recent opportunities for top-k queries.
+
+Queries ask for the k most profitable opportunities of the last N seconds,
+for any N up to the index horizon (longer windows are clamped to it). The
+horizon is split into fixed-width time buckets, and each bucket keeps a
+min-heap of its max_k most profitable entries: a bucket wholly inside the
+query window contributes that heap as is, and only the bucket the window
+starts in is searched entry by entry. Once a newer bucket opens, a bucket is
+pruned to the entries that can still answer such a search (those with fewer
+than max_k later, more profitable entries in the bucket). Buckets past the
+horizon are dropped whole as new opportunities arrive.
+
+Adding is O(log max_k) amortized: a heap push, an append and a share of the
+one-off prune when the bucket closes. A query is O(B * max_k + F) for the B
+buckets in its window and the F entries kept in its first bucket, however
+many opportunities the window holds.
+"""
+
+import bisect
+import heapq
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import OPPORTUNITY_INDEX_SECONDS
+
+from .data_models import ArbitrageOpportunity
+
+DEFAULT_MAX_K = 20
+DEFAULT_BUCKETS = 60
+
+# (profit, -timestamp, -sequence, opportunity): larger keys rank first, so
+# ties go to the older opportunity; the sequence keeps keys unique
+_Key = Tuple[float, float, int, ArbitrageOpportunity]
+
+
+class _Bucket:
+    """Entries of one time slice, in time order, and its top max_k keys"""
+
+    __slots__ = ("times", "keys", "top")
+
+    def __init__(self):
+        self.times: List[float] = []
+        self.keys: List[_Key] = []
+        self.top: List[_Key] = []  # Min-heap
+
+    def add(self, key: _Key, timestamp: float, max_k: int):
+        # Opportunities arrive in time order, so this is nearly always an append
+        position = bisect.bisect_right(self.times, timestamp)
+        self.times.insert(position, timestamp)
+        self.keys.insert(position, key)
+        if len(self.top) < max_k:
+            heapq.heappush(self.top, key)
+        else:
+            heapq.heappushpop(self.top, key)
+
+    def prune(self, max_k: int):
+        """Drop entries with max_k later, more profitable entries"""
+        later: List[_Key] = []  # Min-heap of the best later keys
+        kept = []
+        for timestamp, key in zip(reversed(self.times), reversed(self.keys)):
+            if len(later) < max_k:
+                heapq.heappush(later, key)
+            elif key > later[0]:
+                heapq.heapreplace(later, key)
+            else:
+                continue
+            kept.append((timestamp, key))
+        kept.reverse()
+        self.times = [timestamp for timestamp, _ in kept]
+        self.keys = [key for _, key in kept]
+
+
+class OpportunityIndex:
+    """
+    Most profitable opportunities over any recent window.
+
+    Args:
+        horizon: Seconds an opportunity stays queryable
+        max_k: Largest k a query may ask for
+        buckets: Time buckets the horizon is split into
+    """
+
+    def __init__(
+        self,
+        horizon: float = OPPORTUNITY_INDEX_SECONDS,
+        max_k: int = DEFAULT_MAX_K,
+        buckets: int = DEFAULT_BUCKETS,
+    ):
+        self.horizon = horizon
+        self.max_k = max_k
+        self.bucket_seconds = horizon / buckets
+        self._buckets: Dict[int, _Bucket] = {}
+        self._numbers: List[int] = []  # Bucket numbers, oldest first
+        self._newest = -math.inf
+        self.added = 0
+
+    def __len__(self) -> int:
+        return sum(len(bucket.keys) for bucket in self._buckets.values())
+
+    def _bucket_number(self, timestamp: float) -> int:
+        return math.floor(timestamp / self.bucket_seconds)
+
+    def add(self, opportunity: ArbitrageOpportunity):
+        """Index one opportunity; opportunities may arrive slightly out of order"""
+        self.added += 1
+        timestamp = opportunity.timestamp
+        key = (opportunity.profit_percentage, -timestamp, -self.added, opportunity)
+        number = self._bucket_number(timestamp)
+        bucket = self._buckets.get(number)
+        if bucket is None:
+            bucket = self._buckets[number] = _Bucket()
+            if not self._numbers or number > self._numbers[-1]:
+                if self._numbers:
+                    self._buckets[self._numbers[-1]].prune(self.max_k)
+                self._numbers.append(number)
+            else:
+                bisect.insort(self._numbers, number)
+        bucket.add(key, timestamp, self.max_k)
+        self._newest = max(self._newest, timestamp)
+        self.expire(self._newest)
+
+    def extend(self, opportunities: Iterable[ArbitrageOpportunity]):
+        for opportunity in opportunities:
+            self.add(opportunity)
+
+    def expire(self, now: Optional[float] = None):
+        """Drop buckets wholly older than the horizon"""
+        now = time.time() if now is None else now
+        cutoff = bisect.bisect_left(
+            self._numbers, self._bucket_number(now - self.horizon)
+        )
+        if cutoff:
+            for number in self._numbers[:cutoff]:
+                del self._buckets[number]
+            del self._numbers[:cutoff]
+
+    def best(
+        self, k: int = 5, max_age: float = 300, now: Optional[float] = None
+    ) -> List[ArbitrageOpportunity]:
+        """
+        The k most profitable opportunities of the last max_age seconds.
+
+        Ties keep the older opportunity first. A max_age beyond the horizon
+        is clamped to it, since older opportunities are no longer kept.
+
+        Raises:
+            ValueError: If k exceeds max_k
+        """
+        if k > self.max_k:
+            raise ValueError(f"k must be at most {self.max_k}")
+        now = time.time() if now is None else now
+        start = now - min(max_age, self.horizon)
+        first = self._bucket_number(start)
+
+        candidates: List[_Key] = []
+        oldest = bisect.bisect_left(self._numbers, first)
+        for number in self._numbers[oldest:]:
+            bucket = self._buckets[number]
+            if number == first:
+                # The window starts inside this bucket
+                position = bisect.bisect_left(bucket.times, start)
+                candidates += bucket.keys[position:]
+            else:
+                candidates += bucket.top
+        return [key[-1] for key in heapq.nlargest(k, candidates)]
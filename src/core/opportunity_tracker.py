@@ -0,0 +1,172 @@
+"""
+Opportunity lifecycle tracking with hysteresis.
+
+A spread that lasts for minutes is detected on every price update. Instead of
+treating each detection as a new opportunity, the tracker keys opportunities
+by (buy exchange, sell exchange, asset) and reports only transitions: an
+opportunity opens when its net profit reaches the enter threshold, is updated
+when its peak profit grows by the update step, and closes when its profit
+falls below the (lower) exit threshold or it is no longer detected. The gap
+between the thresholds keeps a spread hovering around the minimum profit
+from opening and closing on every tick.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config.settings import (
+    MIN_PROFIT_PERCENTAGE,
+    OPPORTUNITY_EXIT_PERCENTAGE,
+    OPPORTUNITY_UPDATE_STEP,
+)
+
+from ..utils.metrics import LatencyTracker
+from .data_models import ArbitrageOpportunity, OpportunityEvent, TrackedOpportunity
+
+OpportunityKey = Tuple[str, str, Optional[str]]  # (buy, sell, asset)
+
+
+def opportunity_key(opportunity: ArbitrageOpportunity) -> OpportunityKey:
+    return opportunity.buy_exchange, opportunity.sell_exchange, opportunity.asset
+
+
+class OpportunityTracker:
+    """
+    Open opportunities and the transitions between detections.
+
+    Args:
+        enter_percentage: Net profit at which an opportunity opens
+        exit_percentage: Net profit below which an open opportunity closes;
+            capped at enter_percentage
+        update_step: Percentage points the peak profit must grow by, since
+            the last reported peak, to report an update
+    """
+
+    def __init__(
+        self,
+        enter_percentage: float = MIN_PROFIT_PERCENTAGE,
+        exit_percentage: float = OPPORTUNITY_EXIT_PERCENTAGE,
+        update_step: float = OPPORTUNITY_UPDATE_STEP,
+    ):
+        self.enter_percentage = enter_percentage
+        self.exit_percentage = min(exit_percentage, enter_percentage)
+        self.update_step = update_step
+        self.open: Dict[OpportunityKey, TrackedOpportunity] = {}
+        self._reported_peak: Dict[OpportunityKey, float] = {}
+        self.opened = 0
+        self.updated = 0
+        self.closed = 0
+        self.observations = 0
+        # How long closed opportunities lasted (seconds)
+        self.durations = LatencyTracker()
+
+    def observe(
+        self,
+        opportunities: Iterable[ArbitrageOpportunity],
+        changed_exchanges: Optional[Iterable[str]] = None,
+        timestamp: Optional[float] = None,
+    ) -> List[OpportunityEvent]:
+        """
+        Apply one detection pass.
+
+        Args:
+            opportunities: Opportunities detected at or above exit_percentage
+            changed_exchanges: Exchanges the pass covered (incremental
+                detection); open opportunities on other exchange pairs are
+                left alone. None means every pair was scanned.
+            timestamp: Time of the pass (now by default)
+
+        Returns:
+            Open, update and close events, in that order
+        """
+        now = timestamp if timestamp is not None else time.time()
+        opens, updates, seen = [], [], set()
+
+        for opportunity in opportunities:
+            self.observations += 1
+            key = opportunity_key(opportunity)
+            profit = opportunity.profit_percentage
+            tracked = self.open.get(key)
+
+            if tracked is None:
+                if profit >= self.enter_percentage:
+                    tracked = TrackedOpportunity(
+                        *key, now, now, opportunity, opportunity
+                    )
+                    self.open[key] = tracked
+                    self._reported_peak[key] = profit
+                    self.opened += 1
+                    opens.append(OpportunityEvent("open", tracked, now))
+                    seen.add(key)
+                continue
+            if profit < self.exit_percentage:
+                continue
+
+            seen.add(key)
+            tracked.last = opportunity
+            tracked.updated_at = now
+            tracked.observations += 1
+            if profit > tracked.peak.profit_percentage:
+                tracked.peak = opportunity
+            if profit >= self._reported_peak[key] + self.update_step:
+                self._reported_peak[key] = profit
+                self.updated += 1
+                updates.append(OpportunityEvent("update", tracked, now))
+
+        changed = None if changed_exchanges is None else set(changed_exchanges)
+        gone = [
+            key
+            for key in self.open
+            if key not in seen
+            and (changed is None or key[0] in changed or key[1] in changed)
+        ]
+        return opens + updates + self._close(gone, now)
+
+    def expire(
+        self, max_age: float, timestamp: Optional[float] = None
+    ) -> List[OpportunityEvent]:
+        """
+        Close opportunities not observed for max_age seconds.
+
+        Incremental passes never revisit a pair whose exchanges stopped
+        updating, so their opportunities are closed here instead.
+
+        Returns:
+            Close events
+        """
+        now = timestamp if timestamp is not None else time.time()
+        stale = [
+            key
+            for key, tracked in self.open.items()
+            if now - tracked.updated_at > max_age
+        ]
+        return self._close(stale, now)
+
+    def close_all(self, timestamp: Optional[float] = None) -> List[OpportunityEvent]:
+        """Close every open opportunity (e.g. on shutdown)"""
+        now = timestamp if timestamp is not None else time.time()
+        return self._close(list(self.open), now)
+
+    def _close(
+        self, keys: List[OpportunityKey], timestamp: float
+    ) -> List[OpportunityEvent]:
+        events = []
+        for key in keys:
+            tracked = self.open.pop(key)
+            self._reported_peak.pop(key, None)
+            tracked.closed_at = timestamp
+            self.closed += 1
+            self.durations.record(tracked.duration)
+            events.append(OpportunityEvent("close", tracked, timestamp))
+        return events
+
+    def get_stats(self) -> Dict:
+        """Transition counts and the duration of closed opportunities (ms)"""
+        return {
+            "open": len(self.open),
+            "opened": self.opened,
+            "updated": self.updated,
+            "closed": self.closed,
+            "observations": self.observations,
+            "duration": self.durations.stats(),
+        }
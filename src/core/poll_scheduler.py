@@ -0,0 +1,286 @@
+"""
+Adaptive per-exchange REST polling.
+
+Each polled exchange runs in its own task with its own interval, so a slow
+response from one venue never delays another. The interval shortens as the
+exchange's best net spread approaches the profit threshold, backs off while
+the spread is idle or the exchange keeps failing, is randomised with jitter
+so polls do not synchronise, and is bounded by a per-exchange request budget.
+Every poll runs under a deadline so a stuck call cannot overrun its slot.
+While an exchange's circuit breaker is open its polls are skipped until the
+cool-down ends; skips are not failures and use none of the budget.
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional
+
+from ..utils.logging import log_with_timestamp
+from .data_models import PriceData
+
+if TYPE_CHECKING:
+    from ..services.rate_limiter import ExchangeRateLimiter, RateLimiterRegistry
+    from .exchange_monitor import ExchangeMonitor
+
+
+@dataclass
+class PollState:
+    """Scheduling state for one exchange"""
+
+    exchange: str
+    interval: float
+    budget_per_minute: Optional[int] = None
+    consecutive_errors: int = 0
+    idle_streak: int = 0
+    polls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    breaker_skips: int = 0
+    last_poll: Optional[float] = None
+    request_times: Deque[float] = field(default_factory=deque)
+
+
+class AdaptivePollScheduler:
+    """Runs each polled exchange on its own adaptive interval."""
+
+    def __init__(
+        self,
+        monitor: "ExchangeMonitor",
+        min_profit_percentage: float,
+        base_interval: float = 5.0,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        request_deadline: float = 4.0,
+        jitter: float = 0.1,
+        hot_band: float = 0.25,
+        budgets: Optional[Dict[str, int]] = None,
+        fee_percentage: float = 0.0,
+        rate_limiters: Optional["RateLimiterRegistry"] = None,
+    ):
+        """
+        Args:
+            monitor: Monitor whose fetch_price is polled
+            min_profit_percentage: Net profit threshold used by the detector
+            base_interval: Interval when nothing interesting is happening
+            min_interval: Shortest interval, used once the threshold is reached
+            max_interval: Longest interval after backing off
+            request_deadline: Seconds after which a poll is abandoned
+            jitter: Random +/- fraction applied to every interval
+            hot_band: Percentage points below the threshold where polling speeds up
+            budgets: Maximum polls per minute per exchange
+            fee_percentage: Round-trip trading fees subtracted from gross spreads
+            rate_limiters: Exchange API budgets; polls are not planned sooner
+                than the public budget allows
+        """
+        self.monitor = monitor
+        self.min_profit_percentage = min_profit_percentage
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.request_deadline = request_deadline
+        self.jitter = jitter
+        self.hot_band = hot_band
+        self.budgets = dict(budgets or {})
+        self.fee_percentage = fee_percentage
+        self.rate_limiters = rate_limiters
+        self.states: Dict[str, PollState] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def _state(self, exchange: str) -> PollState:
+        if exchange not in self.states:
+            self.states[exchange] = PollState(
+                exchange=exchange,
+                interval=self.base_interval,
+                budget_per_minute=self.budgets.get(exchange),
+            )
+        return self.states[exchange]
+
+    def best_net_edge(self, exchange: str) -> Optional[float]:
+        """
+        Best net spread (%) between this exchange and any other, either direction.
+
+        Uses the executable side of each quote (ask to buy, bid to sell) and
+        subtracts the round-trip fee estimate.
+        """
+        own = self.monitor.latest_prices.get(exchange)
+        if own is None:
+            return None
+
+        best = None
+        for name, other in self.monitor.latest_prices.items():
+            if name == exchange:
+                continue
+            for buy, sell in ((own, other), (other, own)):
+                if not buy.buy_price_usd:
+                    continue
+                edge = (sell.sell_price_usd - buy.buy_price_usd) / buy.buy_price_usd
+                edge = edge * 100 - self.fee_percentage
+                if best is None or edge > best:
+                    best = edge
+        return best
+
+    def next_interval(self, exchange: str) -> float:
+        """
+        Choose the next polling interval, before jitter.
+
+        Errors back off exponentially up to max. Otherwise the interval moves
+        linearly from base to min as the net edge climbs through the hot band
+        below the threshold, and grows geometrically while the edge stays
+        below the band.
+        """
+        state = self._state(exchange)
+
+        if state.consecutive_errors:
+            state.idle_streak = 0
+            interval = self.base_interval * 2 ** min(state.consecutive_errors, 16)
+        else:
+            edge = self.best_net_edge(exchange)
+            gap = None if edge is None else self.min_profit_percentage - edge
+
+            if gap is None:
+                state.idle_streak = 0
+                interval = self.base_interval
+            elif gap <= 0:
+                state.idle_streak = 0
+                interval = self.min_interval
+            elif self.hot_band > 0 and gap < self.hot_band:
+                state.idle_streak = 0
+                closeness = 1 - gap / self.hot_band
+                interval = self.base_interval - closeness * (
+                    self.base_interval - self.min_interval
+                )
+            else:
+                state.idle_streak += 1
+                interval = self.base_interval * 1.5 ** min(state.idle_streak, 10)
+
+        interval = max(self.min_interval, min(self.max_interval, interval))
+
+        # Never plan more polls than the budget allows on average
+        if state.budget_per_minute:
+            interval = max(interval, 60.0 / state.budget_per_minute)
+
+        limiter = self._rate_limiter(exchange)
+        if limiter is not None:
+            interval = max(interval, limiter.wait_time())
+
+        # An open breaker would skip any poll before its cool-down ends
+        interval = max(interval, self.monitor.health.get(exchange).cooldown_remaining)
+
+        state.interval = interval
+        return interval
+
+    def _rate_limiter(self, exchange: str) -> Optional["ExchangeRateLimiter"]:
+        if self.rate_limiters is None:
+            return None
+        return self.rate_limiters.get(exchange)
+
+    def _with_jitter(self, interval: float) -> float:
+        if self.jitter <= 0:
+            return interval
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def budget_delay(self, exchange: str, now: Optional[float] = None) -> float:
+        """Seconds to wait before the budget allows another poll (0 if allowed)"""
+        state = self._state(exchange)
+        if not state.budget_per_minute:
+            return 0.0
+
+        now = time.monotonic() if now is None else now
+        while state.request_times and now - state.request_times[0] >= 60.0:
+            state.request_times.popleft()
+
+        if len(state.request_times) < state.budget_per_minute:
+            return 0.0
+        return 60.0 - (now - state.request_times[0])
+
+    def remaining_budget(
+        self, exchange: str, now: Optional[float] = None
+    ) -> Optional[int]:
+        """Polls still allowed in the current minute, or None if unlimited"""
+        state = self._state(exchange)
+        if not state.budget_per_minute:
+            return None
+        self.budget_delay(exchange, now)
+        return state.budget_per_minute - len(state.request_times)
+
+    async def poll_once(self, exchange: str) -> Optional[PriceData]:
+        """Poll one exchange under the request deadline and update its state"""
+        state = self._state(exchange)
+        if self.monitor.health.get(exchange).cooldown_remaining > 0:
+            # The breaker is already holding requests back: no request is
+            # sent, so neither the budget nor the error backoff is touched
+            state.breaker_skips += 1
+            return None
+
+        now = time.monotonic()
+        state.request_times.append(now)
+        state.last_poll = now
+        state.polls += 1
+
+        # The deadline never exceeds the slot the exchange is polled in
+        deadline = min(self.request_deadline, max(state.interval, self.min_interval))
+        try:
+            price_data = await asyncio.wait_for(
+                self.monitor.fetch_price(exchange), timeout=deadline
+            )
+        except asyncio.TimeoutError:
+            state.timeouts += 1
+            price_data = None
+            log_with_timestamp(f"⚠ {exchange} poll exceeded {deadline:.1f}s deadline")
+
+        if price_data is None:
+            state.errors += 1
+            state.consecutive_errors += 1
+        else:
+            state.consecutive_errors = 0
+        return price_data
+
+    async def _run_exchange(self, exchange: str):
+        while True:
+            try:
+                delay = self.budget_delay(exchange)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                await self.poll_once(exchange)
+                await asyncio.sleep(self._with_jitter(self.next_interval(exchange)))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_with_timestamp(f"Error polling {exchange}: {e}")
+                await asyncio.sleep(self.base_interval)
+
+    def start(self, exchanges: List[str]) -> List[asyncio.Task]:
+        """Start one polling task per exchange"""
+        for exchange in exchanges:
+            self._state(exchange)
+            self._tasks.append(asyncio.create_task(self._run_exchange(exchange)))
+        return self._tasks
+
+    async def stop(self):
+        """Cancel all polling tasks"""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def get_status(self) -> Dict[str, Dict]:
+        """Current interval and counters per exchange"""
+        status = {}
+        for exchange, state in self.states.items():
+            limiter = self._rate_limiter(exchange)
+            status[exchange] = {
+                "interval": state.interval,
+                "polls": state.polls,
+                "errors": state.errors,
+                "timeouts": state.timeouts,
+                "breaker_skips": state.breaker_skips,
+                "consecutive_errors": state.consecutive_errors,
+                "remaining_budget": self.remaining_budget(exchange),
+                "rate_limit_remaining": limiter.remaining() if limiter else None,
+            }
+        return status
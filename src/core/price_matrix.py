@@ -0,0 +1,179 @@
+"""
+Dense asset×exchange matrix of the latest USD quotes.
+
+Each monitored instrument (exchange, symbol) owns one cell, addressed by its
+base asset (row) and exchange (column), so BTC/USD on Kraken and BTC/CZK on
+Coinmate land in the same row and can be compared directly in USD. Quotes
+are kept in parallel float64 arrays (NaN where nothing is known), which lets
+detection evaluate every asset and exchange pair in one vectorized pass
+instead of one Python loop per asset.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .data_models import PriceData
+
+FIELDS = ("bid", "ask", "last", "timestamp")
+
+
+def base_asset(symbol: str) -> str:
+    """Base asset of a "BASE/QUOTE" symbol"""
+    return symbol.split("/")[0].upper()
+
+
+class PriceMatrix:
+    """
+    Latest USD bid/ask/last and update time per (asset, exchange).
+
+    Only one instrument per asset and exchange takes part (the first one
+    added); e.g. with BTC/USD and BTC/EUR both monitored on Kraken, BTC/USD
+    fills the Kraken BTC cell.
+
+    Args:
+        exchanges: Exchanges to create columns for up front
+        symbols: Instruments per exchange to register up front
+    """
+
+    def __init__(
+        self,
+        exchanges: Iterable[str] = (),
+        symbols: Optional[Dict[str, Iterable[str]]] = None,
+    ):
+        self.assets: List[str] = []
+        self.exchanges: List[str] = []
+        self._asset_index: Dict[str, int] = {}
+        self._exchange_index: Dict[str, int] = {}
+        # (row, col) -> symbol filling that cell, and its latest full quote
+        self.symbols: Dict[Tuple[int, int], str] = {}
+        self.prices: Dict[Tuple[int, int], PriceData] = {}
+        self.bid = np.empty((0, 0))
+        self.ask = np.empty((0, 0))
+        self.last = np.empty((0, 0))
+        self.timestamp = np.empty((0, 0))
+
+        for exchange in exchanges:
+            self._column(exchange)
+        for exchange, exchange_symbols in (symbols or {}).items():
+            for symbol in exchange_symbols:
+                self.add_instrument(exchange, symbol)
+
+    @classmethod
+    def from_prices(cls, prices: Iterable[PriceData]) -> "PriceMatrix":
+        """Build a matrix holding the given prices"""
+        matrix = cls()
+        for price_data in prices:
+            matrix.update(price_data)
+        return matrix
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.assets), len(self.exchanges)
+
+    def _grow(self, rows: int, cols: int):
+        """Resize every field array, filling new cells with NaN"""
+        old_rows, old_cols = self.bid.shape
+        for name in FIELDS:
+            grown = np.full((rows, cols), np.nan)
+            grown[:old_rows, :old_cols] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def _row(self, asset: str) -> int:
+        row = self._asset_index.get(asset)
+        if row is None:
+            row = self._asset_index[asset] = len(self.assets)
+            self.assets.append(asset)
+            self._grow(len(self.assets), len(self.exchanges))
+        return row
+
+    def _column(self, exchange: str) -> int:
+        col = self._exchange_index.get(exchange)
+        if col is None:
+            col = self._exchange_index[exchange] = len(self.exchanges)
+            self.exchanges.append(exchange)
+            self._grow(len(self.assets), len(self.exchanges))
+        return col
+
+    def add_instrument(self, exchange: str, symbol: str) -> bool:
+        """
+        Register an instrument's cell.
+
+        Returns:
+            True if the instrument owns its cell, False if another symbol of
+            the same asset on this exchange already does
+        """
+        cell = self._row(base_asset(symbol)), self._column(exchange)
+        owner = self.symbols.setdefault(cell, symbol)
+        return owner == symbol
+
+    def cell(self, exchange: str, symbol: str) -> Optional[Tuple[int, int]]:
+        """(row, col) of an instrument if it owns a cell"""
+        row = self._asset_index.get(base_asset(symbol))
+        col = self._exchange_index.get(exchange)
+        if row is None or col is None or self.symbols.get((row, col)) != symbol:
+            return None
+        return row, col
+
+    def update(self, price_data: PriceData) -> bool:
+        """
+        Write a fresh price into its cell, registering the instrument if new.
+
+        Returns:
+            False if the instrument does not own a cell and was ignored
+        """
+        if not self.add_instrument(price_data.exchange, price_data.symbol):
+            return False
+        row, col = self.cell(price_data.exchange, price_data.symbol)
+        self.prices[(row, col)] = price_data
+        self.bid[row, col] = price_data.sell_price_usd
+        self.ask[row, col] = price_data.buy_price_usd
+        self.last[row, col] = price_data.price_usd
+        self.timestamp[row, col] = price_data.timestamp
+        return True
+
+    def clear_exchange(self, exchange: str):
+        """Blank every quote of an exchange (e.g. when its circuit opens)"""
+        col = self._exchange_index.get(exchange)
+        if col is not None:
+            for name in FIELDS:
+                getattr(self, name)[:, col] = np.nan
+            for row in range(len(self.assets)):
+                self.prices.pop((row, col), None)
+
+    def evict_older_than(self, cutoff: float) -> List[Tuple[str, str]]:
+        """
+        Blank quotes last updated before a cutoff time.
+
+        Returns:
+            (exchange, symbol) of every evicted instrument
+        """
+        stale = self.timestamp < cutoff  # NaN compares False, so empty cells stay
+        if not stale.any():
+            return []
+        for name in FIELDS:
+            getattr(self, name)[stale] = np.nan
+        evicted = []
+        for row, col in zip(*np.nonzero(stale)):
+            row, col = int(row), int(col)
+            self.prices.pop((row, col), None)
+            evicted.append((self.exchanges[col], self.symbols[(row, col)]))
+        return evicted
+
+    def age(self, now: Optional[float] = None) -> np.ndarray:
+        """Seconds since each cell was updated (NaN where empty)"""
+        return (now if now is not None else time.time()) - self.timestamp
+
+    def gross_edges(self) -> np.ndarray:
+        """
+        Gross percentage edge of buying on one exchange and selling on another,
+        for every asset at once.
+
+        Returns:
+            Array of shape (assets, exchanges, exchanges) where [a, i, j] is
+            the edge of buying asset a at exchange i's ask and selling at
+            exchange j's bid; NaN where either quote is missing
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (self.bid[:, None, :] / self.ask[:, :, None] - 1.0) * 100
@@ -0,0 +1,181 @@
+"""
+Executable-price calculations against order book depth.
+
+Quoted top-of-book prices only hold for the first few coins; anything larger
+walks down the book. These helpers compute what a market order of a given
+size would actually pay (VWAP), how far it reaches (worst price) and how much
+of it can be filled, plus the largest size at which buying on one book and
+selling on another remains profitable after fees.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+
+@dataclass
+class ExecutionEstimate:
+    """Result of walking one side of a book for a target size"""
+
+    requested_quantity: float
+    filled_quantity: float
+    vwap: float
+    worst_price: float
+    notional: float
+    levels_used: int
+
+    @property
+    def fully_filled(self) -> bool:
+        return self.filled_quantity >= self.requested_quantity
+
+
+def walk_book_many(
+    prices: np.ndarray, quantities: np.ndarray, sizes: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Walk one side of a book for several target sizes at once.
+
+    Args:
+        prices: Level prices, best first
+        quantities: Level quantities, aligned with prices
+        sizes: Target base-currency sizes
+
+    Returns:
+        (vwap, worst_price, filled_quantity, notional) arrays aligned with sizes;
+        vwap and worst_price are NaN where nothing can be filled
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    quantities = np.asarray(quantities, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+
+    if prices.size == 0:
+        nan = np.full(sizes.shape, np.nan)
+        zeros = np.zeros(sizes.shape)
+        return nan, nan.copy(), zeros, zeros.copy()
+
+    cum_qty = np.cumsum(quantities)
+    cum_notional = np.cumsum(prices * quantities)
+
+    filled = np.minimum(sizes, cum_qty[-1])
+    # Index of the level where each order stops (the last level it touches)
+    last_level = np.minimum(
+        np.searchsorted(cum_qty, filled, side="left"), prices.size - 1
+    )
+
+    qty_before = np.where(last_level > 0, cum_qty[last_level - 1], 0.0)
+    notional_before = np.where(last_level > 0, cum_notional[last_level - 1], 0.0)
+    notional = notional_before + (filled - qty_before) * prices[last_level]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.where(filled > 0, notional / filled, np.nan)
+    worst = np.where(filled > 0, prices[last_level], np.nan)
+    return vwap, worst, filled, notional
+
+
+def walk_book(
+    prices: np.ndarray, quantities: np.ndarray, size: float
+) -> ExecutionEstimate:
+    """
+    Walk one side of a book for a single target size.
+
+    Args:
+        prices: Level prices, best first
+        quantities: Level quantities, aligned with prices
+        size: Target base-currency size
+
+    Returns:
+        ExecutionEstimate for the order
+    """
+    vwap, worst, filled, notional = walk_book_many(prices, quantities, [size])
+    levels_used = int(np.searchsorted(np.cumsum(quantities), filled[0], "left")) + 1
+    return ExecutionEstimate(
+        requested_quantity=size,
+        filled_quantity=float(filled[0]),
+        vwap=float(vwap[0]),
+        worst_price=float(worst[0]),
+        notional=float(notional[0]),
+        levels_used=min(levels_used, len(prices)) if filled[0] > 0 else 0,
+    )
+
+
+def max_profitable_size(
+    ask_prices: np.ndarray,
+    ask_quantities: np.ndarray,
+    bid_prices: np.ndarray,
+    bid_quantities: np.ndarray,
+    buy_fee: float = 0.0,
+    sell_fee: float = 0.0,
+) -> Tuple[float, float]:
+    """
+    Largest size for which buying the asks and selling into the bids is profitable.
+
+    Asks only get more expensive and bids only get cheaper as size grows, so
+    the marginal edge of each extra coin is non-increasing. The cumulative
+    depth breakpoints of both books split the size axis into segments with a
+    constant marginal edge, and the last profitable segment is found by
+    binary search over those breakpoints.
+
+    Args:
+        ask_prices: Ask prices on the buy venue, best first (same currency as bids)
+        ask_quantities: Ask quantities on the buy venue
+        bid_prices: Bid prices on the sell venue, best first
+        bid_quantities: Bid quantities on the sell venue
+        buy_fee: Buy-side fee as a fraction (0.0026 for 0.26%)
+        sell_fee: Sell-side fee as a fraction
+
+    Returns:
+        (size, net_profit) in base currency and quote currency; (0.0, 0.0) if
+        not even the first coin is profitable
+    """
+    ask_prices = np.asarray(ask_prices, dtype=np.float64)
+    bid_prices = np.asarray(bid_prices, dtype=np.float64)
+    if ask_prices.size == 0 or bid_prices.size == 0:
+        return 0.0, 0.0
+
+    cum_ask = np.cumsum(np.asarray(ask_quantities, dtype=np.float64))
+    cum_bid = np.cumsum(np.asarray(bid_quantities, dtype=np.float64))
+    limit = min(cum_ask[-1], cum_bid[-1])
+
+    breakpoints = np.unique(np.concatenate([cum_ask, cum_bid]))
+    breakpoints = breakpoints[breakpoints <= limit]
+    segment_starts = np.concatenate([[0.0], breakpoints[:-1]])
+
+    def marginal_edge(segment: int) -> float:
+        start = segment_starts[segment]
+        ask = ask_prices[np.searchsorted(cum_ask, start, side="right")]
+        bid = bid_prices[np.searchsorted(cum_bid, start, side="right")]
+        return bid * (1 - sell_fee) - ask * (1 + buy_fee)
+
+    # Find the first segment with a non-positive marginal edge
+    low, high = 0, len(breakpoints)
+    while low < high:
+        mid = (low + high) // 2
+        if marginal_edge(mid) > 0:
+            low = mid + 1
+        else:
+            high = mid
+
+    if low == 0:
+        return 0.0, 0.0
+
+    size = float(breakpoints[low - 1])
+    profit = net_profit(
+        ask_prices, ask_quantities, bid_prices, bid_quantities, size, buy_fee, sell_fee
+    )
+    return size, profit
+
+
+def net_profit(
+    ask_prices: np.ndarray,
+    ask_quantities: np.ndarray,
+    bid_prices: np.ndarray,
+    bid_quantities: np.ndarray,
+    size: float,
+    buy_fee: float = 0.0,
+    sell_fee: float = 0.0,
+) -> float:
+    """Net quote-currency profit of buying and selling size across two books"""
+    _, _, _, buy_notional = walk_book_many(ask_prices, ask_quantities, [size])
+    _, _, _, sell_notional = walk_book_many(bid_prices, bid_quantities, [size])
+    return float(sell_notional[0] * (1 - sell_fee) - buy_notional[0] * (1 + buy_fee))
@@ -0,0 +1,54 @@
+"""
+Process-wide symbol table.
+
+Exchange names and instruments (an exchange's "BASE/QUOTE" symbol) are given
+small integer ids the first time they are seen. Price and opportunity models
+store these ids instead of repeating the names on every tick, and columnar
+stores use them directly as array values.
+"""
+
+from typing import Dict, List, Tuple
+
+
+class SymbolTable:
+    """Dense ids for exchange names and (exchange, symbol) instruments"""
+
+    __slots__ = (
+        "exchanges",
+        "symbols",
+        "instrument_exchanges",
+        "_exchanges",
+        "_instruments",
+    )
+
+    def __init__(self):
+        self.exchanges: List[str] = []
+        # Per instrument id: its symbol and its exchange's id
+        self.symbols: List[str] = []
+        self.instrument_exchanges: List[int] = []
+        self._exchanges: Dict[str, int] = {}
+        self._instruments: Dict[Tuple[str, str], int] = {}
+
+    def exchange_id(self, exchange: str) -> int:
+        index = self._exchanges.get(exchange)
+        if index is None:
+            index = self._exchanges[exchange] = len(self.exchanges)
+            self.exchanges.append(exchange)
+        return index
+
+    def instrument_id(self, exchange: str, symbol: str) -> int:
+        index = self._instruments.get((exchange, symbol))
+        if index is None:
+            index = self._instruments[(exchange, symbol)] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.instrument_exchanges.append(self.exchange_id(exchange))
+        return index
+
+    def instrument(self, instrument_id: int) -> Tuple[str, str]:
+        """(exchange, symbol) of an instrument id"""
+        exchange = self.exchanges[self.instrument_exchanges[instrument_id]]
+        return exchange, self.symbols[instrument_id]
+
+
+# Shared by every model in the process; ids are never reused or removed
+SYMBOLS = SymbolTable()
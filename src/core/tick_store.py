@@ -0,0 +1,162 @@
+"""
+Bounded in-memory history of prices and opportunities.
+
+Both stores keep their most recent rows in a ColumnarRingBuffer, so a
+long-running monitor holds a fixed amount of memory instead of one dataclass
+per tick. Rows are kept in arrival order; a late tick is stored at the
+newest tick's time (see ColumnarRingBuffer). Exchanges and instruments are
+stored by their ids in the process-wide symbol table; asset names are
+interned per store. Top-k queries over recent opportunities are answered by
+OpportunityIndex, not by scanning this history.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config.settings import OPPORTUNITY_HISTORY_CAPACITY, PRICE_HISTORY_CAPACITY
+
+from ..utils.ring_buffer import ColumnarRingBuffer
+from .data_models import ArbitrageOpportunity, PriceData
+from .symbols import SYMBOLS
+
+TICK_COLUMNS = {
+    "timestamp": np.float64,
+    "exchange": np.int32,
+    "instrument": np.int32,  # Tells apart the pairs quoted on one exchange
+    "price": np.float64,
+    "price_usd": np.float64,
+    "bid": np.float64,  # NaN when the source has no quote
+    "ask": np.float64,
+    "volume": np.float64,
+}
+
+OPPORTUNITY_COLUMNS = {
+    "timestamp": np.float64,
+    "buy_exchange": np.int32,
+    "sell_exchange": np.int32,
+    "asset": np.int32,
+    "buy_price": np.float64,
+    "sell_price": np.float64,
+    "profit_usd": np.float64,
+    "profit_percentage": np.float64,
+    "volume_limit": np.float64,
+}
+
+
+class NameIds:
+    """Interns names to dense integer ids"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id(self, name: str) -> int:
+        index = self._ids.get(name)
+        if index is None:
+            index = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+
+class TickStore:
+    """
+    Most recent price ticks as columns.
+
+    Args:
+        capacity: Ticks kept; older ticks are overwritten
+    """
+
+    def __init__(self, capacity: int = PRICE_HISTORY_CAPACITY):
+        self.buffer = ColumnarRingBuffer(capacity, TICK_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def append(self, price_data: PriceData):
+        self.buffer.append(
+            price_data.timestamp,
+            price_data.exchange_id,
+            price_data.instrument_id,
+            price_data.price,
+            price_data.price_usd,
+            np.nan if price_data.bid is None else price_data.bid,
+            np.nan if price_data.ask is None else price_data.ask,
+            price_data.volume,
+        )
+
+    def window(self, ticks: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """The newest ticks, oldest first; see ColumnarRingBuffer.window"""
+        return self.buffer.window(ticks)
+
+    def between(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """Ticks with start <= timestamp < end, oldest first"""
+        return self.buffer.between(start, end)
+
+    def for_exchange(
+        self,
+        exchange: str,
+        start: Optional[float] = None,
+        symbol: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        One exchange's ticks since start (copies, since they are filtered).
+
+        Args:
+            exchange: Exchange name
+            start: Oldest timestamp to include
+            symbol: If given, only this pair's ticks rather than every pair
+                quoted on the exchange
+        """
+        columns = self.buffer.between(start)
+        if symbol is None:
+            mask = columns["exchange"] == SYMBOLS.exchange_id(exchange)
+        else:
+            mask = columns["instrument"] == SYMBOLS.instrument_id(exchange, symbol)
+        return {name: column[mask] for name, column in columns.items()}
+
+
+class OpportunityStore:
+    """
+    Most recent arbitrage opportunities as columns.
+
+    Depth-aware size tiers are not kept, only the top-of-book figures.
+
+    Args:
+        capacity: Opportunities kept; older ones are overwritten
+    """
+
+    def __init__(self, capacity: int = OPPORTUNITY_HISTORY_CAPACITY):
+        self.buffer = ColumnarRingBuffer(capacity, OPPORTUNITY_COLUMNS)
+        self.assets = NameIds()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def append(self, opportunity: ArbitrageOpportunity):
+        self.buffer.append(
+            opportunity.timestamp,
+            opportunity.buy_exchange_id,
+            opportunity.sell_exchange_id,
+            self.assets.id(opportunity.asset or "BTC"),
+            opportunity.buy_price,
+            opportunity.sell_price,
+            opportunity.profit_usd,
+            opportunity.profit_percentage,
+            opportunity.volume_limit,
+        )
+
+    def extend(self, opportunities: Iterable[ArbitrageOpportunity]):
+        for opportunity in opportunities:
+            self.append(opportunity)
+
+    def clear(self):
+        self.buffer.clear()
+
+    def between(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """Opportunities with start <= timestamp < end, oldest first"""
+        return self.buffer.between(start, end)
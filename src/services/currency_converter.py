@@ -1,16 +1,19 @@
 import time
-from typing import Optional
-
-import aiohttp
+from typing import TYPE_CHECKING, Optional
 
 from ..utils.logging import log_with_timestamp
+from .session_manager import borrow_or_create_session
+
+if TYPE_CHECKING:
+    from .session_manager import SessionManager
 
 
 class CurrencyConverter:
-    def __init__(self):
+    def __init__(self, session_manager: Optional["SessionManager"] = None):
         self.exchange_rates = {}
         self.last_update = 0
         self.cache_duration = 300  # 5 minutes
+        self.session_manager = session_manager
 
     async def get_exchange_rate(
         self, from_currency: str, to_currency: str = "USD"
@@ -34,35 +37,39 @@ class CurrencyConverter:
 
     async def _update_exchange_rates(self):
         """Update exchange rates from API"""
+        session = borrow_or_create_session(self.session_manager, "fx")
         try:
-            async with aiohttp.ClientSession() as session:
-                # Using exchangerate-api.com (free tier)
-                url = "https://api.exchangerate-api.com/v4/latest/USD"
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        rates = data.get("rates", {})
+            # Using exchangerate-api.com (free tier)
+            url = "https://api.exchangerate-api.com/v4/latest/USD"
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    rates = data.get("rates", {})
 
-                        # Store USD rates
-                        for currency, rate in rates.items():
-                            self.exchange_rates[f"USD/{currency}"] = rate
-                            if rate != 0:
-                                self.exchange_rates[f"{currency}/USD"] = 1.0 / rate
+                    # Store USD rates
+                    for currency, rate in rates.items():
+                        self.exchange_rates[f"USD/{currency}"] = rate
+                        if rate != 0:
+                            self.exchange_rates[f"{currency}/USD"] = 1.0 / rate
 
-                        # Calculate cross rates for common pairs
-                        if "CZK" in rates and "EUR" in rates:
-                            czk_to_eur = rates["EUR"] / rates["CZK"]
-                            self.exchange_rates["CZK/EUR"] = czk_to_eur
-                            self.exchange_rates["EUR/CZK"] = 1.0 / czk_to_eur
+                    # Calculate cross rates for common pairs
+                    if "CZK" in rates and "EUR" in rates:
+                        czk_to_eur = rates["EUR"] / rates["CZK"]
+                        self.exchange_rates["CZK/EUR"] = czk_to_eur
+                        self.exchange_rates["EUR/CZK"] = 1.0 / czk_to_eur
 
-                        self.last_update = time.time()
-                        log_with_timestamp(
-                            f"✓ Updated exchange rates (CZK/USD: "
-                            f"{self.exchange_rates.get('CZK/USD', 'N/A'):.4f})"
-                        )
+                    self.last_update = time.time()
+                    log_with_timestamp(
+                        f"✓ Updated exchange rates (CZK/USD: "
+                        f"{self.exchange_rates.get('CZK/USD', 'N/A'):.4f})"
+                    )
 
         except Exception as e:
             log_with_timestamp(f"✗ Error updating exchange rates: {e}")
+        finally:
+            # Only close sessions we created ourselves; shared ones stay warm
+            if self.session_manager is None:
+                await session.close()
 
     async def convert_to_usd(
         self, amount: float, from_currency: str
@@ -10,12 +10,12 @@ This service handles all database operations including:
 
 import asyncio
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 
 import asyncpg
 
 from config.settings import TIMEZONE
-from ..core.data_models import ArbitrageOpportunity, PriceData
+from ..core.data_models import ArbitrageOpportunity, OpportunityEvent, PriceData
 from ..utils.logging import log_with_timestamp
 
 
@@ -54,20 +54,7 @@ class DatabaseService:
             # Retry connection with exponential backoff
             for attempt in range(self._connection_retries):
                 try:
-                    self.pool = await asyncpg.create_pool(
-                        self.database_url,
-                        min_size=2,
-                        max_size=10,
-                        command_timeout=30,
-                        server_settings={
-                            "application_name": "arbitrage_monitor",
-                            "timezone": "UTC",
-                        },
-                    )
-
-                    # Test connection
-                    async with self.pool.acquire() as conn:
-                        await conn.fetchval("SELECT 1")
+                    await self._create_pool()
 
                     log_with_timestamp(
                         "✓ Database: connection pool initialized successfully"
@@ -89,6 +76,46 @@ class DatabaseService:
             self.enabled = False
             return False
 
+    async def _create_pool(self):
+        pool = await asyncpg.create_pool(
+            self.database_url,
+            min_size=2,
+            max_size=10,
+            command_timeout=30,
+            server_settings={
+                "application_name": "arbitrage_monitor",
+                "timezone": "UTC",
+            },
+        )
+        try:
+            # Test connection
+            async with pool.acquire() as conn:
+                await conn.fetchval("SELECT 1")
+        except Exception:
+            await pool.close()
+            raise
+        self.pool = pool
+
+    async def reconnect(self) -> bool:
+        """
+        Try once to create the pool after initialize failed.
+
+        Returns:
+            True if connected, False otherwise
+        """
+        if self.pool is not None:
+            return True
+
+        try:
+            await self._create_pool()
+        except Exception as e:
+            log_with_timestamp(f"⚠ Database: still unreachable: {e}")
+            return False
+
+        self.enabled = True
+        log_with_timestamp("✓ Database: connection pool initialized after reconnect")
+        return True
+
     async def close(self):
         """Close database connection pool."""
         if self.pool:
@@ -195,6 +222,59 @@ class DatabaseService:
             )
             return False
 
+    async def store_opportunity_event(self, event: OpportunityEvent) -> bool:
+        """
+        Store an opportunity lifecycle transition.
+
+        Opened opportunities are also recorded in arbitrage_opportunities, so
+        that table holds one row per opportunity rather than per detection.
+
+        Args:
+            event: Open, update or close event from the opportunity tracker
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.enabled:
+            return True
+
+        if event.kind == "open":
+            if not await self.store_arbitrage_opportunity(event.opportunity):
+                return False
+
+        tracked = event.tracked
+        try:
+            async with self.get_connection() as conn:
+                if conn is None:
+                    return False
+
+                await conn.execute(
+                    """
+                    INSERT INTO opportunity_events
+                    (event, buy_exchange, sell_exchange, asset, profit_percentage,
+                     peak_profit_percentage, opened_at, duration_seconds, observations,
+                     timestamp)
+                    VALUES ($1, $2, $3, $4, $5, $6, to_timestamp($7) AT TIME ZONE 'UTC',
+                            $8, $9, to_timestamp($10) AT TIME ZONE 'UTC')
+                    """,
+                    event.kind,
+                    tracked.buy_exchange,
+                    tracked.sell_exchange,
+                    tracked.asset or "BTC",
+                    float(event.opportunity.profit_percentage),
+                    float(tracked.peak_profit_percentage),
+                    tracked.opened_at,
+                    float(tracked.duration),
+                    tracked.observations,
+                    event.timestamp,
+                )
+
+            return True
+
+        except Exception as e:
+            log_with_timestamp(f"✗ Database: failed to store opportunity event: {e}")
+            return False
+
     async def store_exchange_status(
         self,
         exchange_name: str,
@@ -240,6 +320,34 @@ class DatabaseService:
             log_with_timestamp(f"✗ Database: failed to store exchange status: {e}")
             return False
 
+    async def copy_records(
+        self, table: str, columns: Sequence[str], records: List[tuple]
+    ):
+        """
+        Bulk insert rows with COPY.
+
+        All rows go in one COPY command, so they are stored or rejected
+        together. Unlike the store_* methods, errors are raised: the caller
+        decides whether the rows are kept for a retry.
+
+        Args:
+            table: Target table
+            columns: Column names, in record order
+            records: Row tuples; timestamps as timezone-aware datetimes
+
+        Raises:
+            ConnectionError: If there is no connection pool
+            asyncpg.DataError, asyncpg.IntegrityConstraintViolationError: If
+                the database rejects the rows
+        """
+        async with self.get_connection() as conn:
+            if conn is None:
+                raise ConnectionError("Database is not connected")
+
+            await conn.copy_records_to_table(
+                table, records=records, columns=list(columns)
+            )
+
     async def get_latest_prices(self) -> List[Dict]:
         """
         Get latest prices for all exchanges.
@@ -0,0 +1,383 @@
+"""
+Batched background writes to TimescaleDB.
+
+Monitoring and detection hand prices, exchange statuses and opportunities to
+the DatabaseWriter, which turns each into a row tuple and queues it without
+awaiting anything. A background task flushes the queue once batch_size rows
+are waiting or every flush_interval seconds, writing each table's rows with a
+single COPY. The queue is bounded: when it is full the oldest rows are
+dropped and counted, so a slow database costs a bounded amount of memory and
+never slows detection down.
+
+With a spool directory, each table also gets a WriteSpool. Rows whose COPY
+fails because the database is unreachable (or that arrive while it is known
+to be down, or while older rows of their table are still spooled) are
+appended to the table's spool instead of being lost. Every retry_interval
+seconds the writer reconnects if needed and replays the spooled segments in
+order, one COPY per segment, deleting each once it is written. A batch the
+database rejects outright is split in halves until the rejected rows are
+isolated; only those are counted as failed and dropped.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+import asyncpg
+
+from config.settings import (
+    DB_BATCH_SIZE,
+    DB_FLUSH_INTERVAL,
+    DB_QUEUE_SIZE,
+    DB_RETRY_INTERVAL,
+)
+
+from ..core.data_models import ArbitrageOpportunity, OpportunityEvent, PriceData
+from ..utils.logging import log_with_timestamp
+from .write_spool import WriteSpool
+
+if TYPE_CHECKING:
+    from .database_service import DatabaseService
+
+# Columns written per table, in record order
+TABLE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "exchange_prices": (
+        "exchange_name",
+        "symbol",
+        "price",
+        "price_usd",
+        "original_currency",
+        "volume",
+        "timestamp",
+    ),
+    "arbitrage_opportunities": (
+        "buy_exchange",
+        "sell_exchange",
+        "buy_price",
+        "sell_price",
+        "profit_usd",
+        "profit_percentage",
+        "volume_limit",
+        "timestamp",
+    ),
+    "opportunity_events": (
+        "event",
+        "buy_exchange",
+        "sell_exchange",
+        "asset",
+        "profit_percentage",
+        "peak_profit_percentage",
+        "opened_at",
+        "duration_seconds",
+        "observations",
+        "timestamp",
+    ),
+    "exchange_status": (
+        "exchange_name",
+        "status",
+        "error_message",
+        "response_time_ms",
+        "timestamp",
+    ),
+}
+
+
+# Errors about the rows themselves; writing the same rows again cannot succeed
+REJECTED_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError)
+
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+class DatabaseWriter:
+    """
+    Queues rows for the database and writes them in batches.
+
+    Args:
+        database_service: Service whose pool the batches are written with
+        batch_size: Queued rows that trigger a flush
+        flush_interval: Seconds between flushes of a partial batch
+        max_queue: Rows kept waiting; beyond it the oldest are dropped
+        spool_dir: Directory for per-table spools of rows that could not be
+            written; without one such rows are counted as failed
+        retry_interval: Seconds between attempts to reach the database once
+            a write has failed
+    """
+
+    def __init__(
+        self,
+        database_service: "DatabaseService",
+        batch_size: int = DB_BATCH_SIZE,
+        flush_interval: float = DB_FLUSH_INTERVAL,
+        max_queue: int = DB_QUEUE_SIZE,
+        spool_dir: Optional[str] = None,
+        retry_interval: float = DB_RETRY_INTERVAL,
+    ):
+        if batch_size < 1 or max_queue < batch_size:
+            raise ValueError("Need 1 <= batch_size <= max_queue")
+        self.database_service = database_service
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: Deque[Tuple[str, tuple]] = deque(maxlen=max_queue)
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.retry_interval = retry_interval
+        self._retry_at = 0.0  # Monotonic time before which the DB is not tried
+        self.spools: Dict[str, WriteSpool] = (
+            {
+                table: WriteSpool(os.path.join(spool_dir, table))
+                for table in TABLE_COLUMNS
+            }
+            if spool_dir
+            else {}
+        )
+        self.written = 0
+        self.dropped = 0  # Evicted from a full queue
+        self.failed = 0  # Rejected, or lost by a failed COPY without a spool
+        self.spooled = 0
+        self.replayed = 0
+        self.flushes = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _enqueue(self, table: str, record: tuple):
+        if len(self._queue) == self.max_queue:
+            self.dropped += 1
+        self._queue.append((table, record))
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def write_price(self, price_data: PriceData):
+        """Queue a price tick"""
+        self._enqueue(
+            "exchange_prices",
+            (
+                price_data.exchange,
+                price_data.symbol,
+                float(price_data.price),
+                float(price_data.price_usd),
+                price_data.original_currency,
+                float(price_data.volume),
+                _utc(price_data.timestamp),
+            ),
+        )
+
+    def write_opportunity(self, opportunity: ArbitrageOpportunity):
+        """Queue a detected arbitrage opportunity"""
+        self._enqueue(
+            "arbitrage_opportunities",
+            (
+                opportunity.buy_exchange,
+                opportunity.sell_exchange,
+                float(opportunity.buy_price),
+                float(opportunity.sell_price),
+                float(opportunity.profit_usd),
+                float(opportunity.profit_percentage),
+                float(opportunity.volume_limit),
+                _utc(opportunity.timestamp),
+            ),
+        )
+
+    def write_opportunity_event(self, event: OpportunityEvent):
+        """
+        Queue an opportunity lifecycle transition.
+
+        Opened opportunities are also queued for arbitrage_opportunities, as
+        DatabaseService.store_opportunity_event does.
+        """
+        if event.kind == "open":
+            self.write_opportunity(event.opportunity)
+        tracked = event.tracked
+        self._enqueue(
+            "opportunity_events",
+            (
+                event.kind,
+                tracked.buy_exchange,
+                tracked.sell_exchange,
+                tracked.asset or "BTC",
+                float(event.opportunity.profit_percentage),
+                float(tracked.peak_profit_percentage),
+                _utc(tracked.opened_at),
+                float(tracked.duration),
+                tracked.observations,
+                _utc(event.timestamp),
+            ),
+        )
+
+    def write_exchange_status(
+        self,
+        exchange_name: str,
+        status: str,
+        error_message: Optional[str] = None,
+        response_time_ms: Optional[int] = None,
+    ):
+        """Queue an exchange health status, timestamped now"""
+        self._enqueue(
+            "exchange_status",
+            (
+                exchange_name,
+                status,
+                error_message,
+                response_time_ms,
+                _utc(time.time()),
+            ),
+        )
+
+    @property
+    def spooling(self) -> bool:
+        """Whether any spooled rows are waiting to be replayed"""
+        return any(spool.pending for spool in self.spools.values())
+
+    def _database_down(self) -> bool:
+        return self.database_service.pool is None or time.monotonic() < self._retry_at
+
+    async def _copy(self, table: str, records: List[tuple]) -> List[tuple]:
+        """
+        COPY rows into a table.
+
+        A rejected batch is bisected and each half copied again, so one bad
+        row costs O(log n) extra COPYs rather than the whole batch. Rows
+        rejected on their own count as failed, since retrying them cannot
+        succeed.
+
+        Returns:
+            Rows left unwritten because the database could not be reached
+        """
+        try:
+            await self.database_service.copy_records(
+                table, TABLE_COLUMNS[table], records
+            )
+        except REJECTED_ERRORS as e:
+            if len(records) == 1:
+                log_with_timestamp(f"✗ Database: {table} rejected a row: {e}")
+                self.failed += 1
+                return []
+            middle = len(records) // 2
+            unwritten = await self._copy(table, records[:middle])
+            if unwritten:
+                return unwritten + records[middle:]
+            return await self._copy(table, records[middle:])
+        except Exception as e:
+            log_with_timestamp(
+                f"✗ Database: failed to copy {len(records)} rows into {table}: {e}"
+            )
+            self._retry_at = time.monotonic() + self.retry_interval
+            return records
+        self.written += len(records)
+        return []
+
+    async def _spool(self, table: str, records: List[tuple]):
+        if not self.spooling:
+            log_with_timestamp("⚠ Database: unreachable, spooling rows to disk")
+        await asyncio.to_thread(self.spools[table].append, records)
+        self.spooled += len(records)
+
+    async def _replay(self):
+        """Write spooled segments, oldest first, until one fails"""
+        if time.monotonic() < self._retry_at:
+            return
+        if not await self.database_service.reconnect():
+            self._retry_at = time.monotonic() + self.retry_interval
+            return
+
+        replayed = 0
+        for table, spool in self.spools.items():
+            for segment in await asyncio.to_thread(spool.segments):
+                records = await asyncio.to_thread(spool.read, segment)
+                unwritten = await self._copy(table, records) if records else []
+                if unwritten and len(unwritten) == len(records):
+                    return
+                if unwritten:
+                    # Keep only what a split batch left unwritten
+                    await asyncio.to_thread(spool.append, unwritten)
+                await asyncio.to_thread(spool.remove, segment)
+                replayed += len(records) - len(unwritten)
+                self.replayed += len(records) - len(unwritten)
+                if unwritten:
+                    return
+        if replayed:
+            log_with_timestamp(f"✓ Database: replayed {replayed} spooled rows")
+
+    async def flush(self) -> int:
+        """
+        Write every queued row, one COPY per table, then replay the spool.
+
+        A table whose COPY fails keeps its rows in its spool if there is one
+        and loses them otherwise; the other tables are still written.
+
+        Returns:
+            Rows written, including replayed ones
+        """
+        async with self._flush_lock:
+            written = self.written
+            batches: Dict[str, List[tuple]] = {}
+            while self._queue:
+                table, record = self._queue.popleft()
+                batches.setdefault(table, []).append(record)
+
+            for table, records in batches.items():
+                spool = self.spools.get(table)
+                # Spooled rows go first, so rows of a spooling table wait too
+                if spool is not None and (spool.pending or self._database_down()):
+                    await self._spool(table, records)
+                else:
+                    unwritten = await self._copy(table, records)
+                    if not unwritten:
+                        continue
+                    if spool is not None:
+                        await self._spool(table, unwritten)
+                    else:
+                        self.failed += len(unwritten)
+
+            if self.spooling:
+                await self._replay()
+            if batches:
+                self.flushes += 1
+            return self.written - written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                log_with_timestamp(f"✗ Database: writer flush failed: {e}")
+
+    def start(self) -> asyncio.Task:
+        """Start flushing in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        """Stop the background task and write (or spool) what is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        for spool in self.spools.values():
+            spool.close()
+
+    def get_stats(self) -> Dict:
+        return {
+            "queued": len(self._queue),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "spool_bytes": sum(spool.nbytes for spool in self.spools.values()),
+            "flushes": self.flushes,
+        }
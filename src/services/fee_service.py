@@ -0,0 +1,196 @@
+"""
+Trading fees loaded ahead of detection.
+
+Detection reads fees from an immutable FeeMatrix snapshot in O(1) and never
+waits on exchange I/O. The FeeService starts from the configured fees, loads
+each exchange's maker/taker schedule once at startup when dynamic fees are
+enabled, and refreshes them on a background task; every refresh builds a new
+snapshot and swaps it in, so readers never see a half-updated matrix.
+"""
+
+import asyncio
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from config.settings import (
+    COINMATE_TRADING_FEE,
+    DEFAULT_TRADING_FEE,
+    DYNAMIC_FEES_ENABLED,
+    FEE_REFRESH_INTERVAL,
+    KRAKEN_TRADING_FEE,
+)
+
+from ..apis.payloads import FeeSchedule
+from ..utils.logging import log_with_timestamp
+
+if TYPE_CHECKING:
+    from ..apis.base_exchange import BaseExchangeAPI
+
+FeeKey = Tuple[str, str]
+
+
+class FeeMatrix:
+    """
+    Immutable maker/taker fees per (exchange, symbol).
+
+    Lookups fall back from the pair's own fees to the exchange's configured
+    fee and then to the default fee.
+
+    Args:
+        fees: Fee schedule per (exchange, "BASE/QUOTE" symbol)
+        exchange_fees: Fee schedule per exchange for pairs without their own
+        default: Fee schedule for exchanges without a configured fee
+        updated_at: When the fees were loaded
+    """
+
+    __slots__ = ("_fees", "_exchange_fees", "default", "updated_at")
+
+    def __init__(
+        self,
+        fees: Optional[Mapping[FeeKey, FeeSchedule]] = None,
+        exchange_fees: Optional[Mapping[str, FeeSchedule]] = None,
+        default: FeeSchedule = FeeSchedule(DEFAULT_TRADING_FEE, DEFAULT_TRADING_FEE),
+        updated_at: Optional[float] = None,
+    ):
+        object.__setattr__(self, "_fees", MappingProxyType(dict(fees or {})))
+        object.__setattr__(
+            self, "_exchange_fees", MappingProxyType(dict(exchange_fees or {}))
+        )
+        object.__setattr__(self, "default", default)
+        object.__setattr__(
+            self, "updated_at", updated_at if updated_at is not None else time.time()
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FeeMatrix is immutable; use with_fees for a new one")
+
+    @classmethod
+    def from_config(cls) -> "FeeMatrix":
+        """Configured fees, used for both maker and taker"""
+        return cls(
+            exchange_fees={
+                "kraken": FeeSchedule(KRAKEN_TRADING_FEE, KRAKEN_TRADING_FEE),
+                "coinmate": FeeSchedule(COINMATE_TRADING_FEE, COINMATE_TRADING_FEE),
+            }
+        )
+
+    @property
+    def fees(self) -> Mapping[FeeKey, FeeSchedule]:
+        """Read-only view of the per-pair fees"""
+        return self._fees
+
+    def get(self, exchange: str, symbol: Optional[str] = None) -> FeeSchedule:
+        """Fee schedule of a pair, or of the exchange when no symbol is given"""
+        if symbol is not None:
+            schedule = self._fees.get((exchange, symbol))
+            if schedule is not None:
+                return schedule
+        return self._exchange_fees.get(exchange, self.default)
+
+    def taker(self, exchange: str, symbol: Optional[str] = None) -> float:
+        """Taker fee in percent"""
+        return self.get(exchange, symbol).taker
+
+    def maker(self, exchange: str, symbol: Optional[str] = None) -> float:
+        """Maker fee in percent"""
+        return self.get(exchange, symbol).maker
+
+    def with_fees(self, fees: Mapping[FeeKey, FeeSchedule]) -> "FeeMatrix":
+        """New matrix with some pairs' fees replaced"""
+        return FeeMatrix(
+            {**self._fees, **fees}, self._exchange_fees, self.default, time.time()
+        )
+
+
+class FeeService:
+    """
+    Keeps a FeeMatrix current without blocking detection.
+
+    Args:
+        get_exchange_api: Returns the (cached) client of an exchange
+        pairs: Standard-format symbols per exchange to load fees for
+        dynamic: Fetch fees from exchange APIs; otherwise only configured
+            fees are served
+        refresh_interval: Seconds between background refreshes
+        fees: Starting fees (the configured fees by default)
+    """
+
+    def __init__(
+        self,
+        get_exchange_api: Callable[[str], "BaseExchangeAPI"],
+        pairs: Mapping[str, Iterable[str]],
+        dynamic: bool = DYNAMIC_FEES_ENABLED,
+        refresh_interval: float = FEE_REFRESH_INTERVAL,
+        fees: Optional[FeeMatrix] = None,
+    ):
+        self.get_exchange_api = get_exchange_api
+        self.pairs: Dict[str, list] = {name: list(p) for name, p in pairs.items()}
+        self.dynamic = dynamic
+        self.refresh_interval = refresh_interval
+        self.matrix = fees or FeeMatrix.from_config()
+        self.refreshes = 0
+        self.errors = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _fetch(self, exchange: str, pairs: list) -> Dict[str, FeeSchedule]:
+        async with self.get_exchange_api(exchange) as api:
+            return await api.fetch_fee_schedules(pairs)
+
+    async def refresh(self) -> FeeMatrix:
+        """
+        Fetch every exchange's fees and swap in a new matrix.
+
+        Exchanges that fail keep their previous fees.
+
+        Returns:
+            The current matrix
+        """
+        if not self.dynamic:
+            return self.matrix
+
+        exchanges = list(self.pairs)
+        results = await asyncio.gather(
+            *(self._fetch(name, self.pairs[name]) for name in exchanges),
+            return_exceptions=True,
+        )
+        updates = {}
+        for exchange, result in zip(exchanges, results):
+            if isinstance(result, Exception):
+                self.errors += 1
+                log_with_timestamp(f"⚠ Failed to fetch {exchange} fees: {result}")
+                continue
+            for symbol, schedule in result.items():
+                updates[(exchange, symbol)] = schedule
+                log_with_timestamp(
+                    f"📊 Dynamic fee: {exchange} {symbol} = "
+                    f"maker {schedule.maker:.2f}% / taker {schedule.taker:.2f}%"
+                )
+
+        self.matrix = self.matrix.with_fees(updates)
+        self.refreshes += 1
+        return self.matrix
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                log_with_timestamp(f"Error refreshing fees: {e}")
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Start background refreshes (dynamic fees only)"""
+        if self.dynamic and self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        """Cancel background refreshes"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -0,0 +1,264 @@
+"""
+Client-side rate limiting for exchange REST APIs.
+
+Exchanges ban clients that exceed their request limits, after which no data
+arrives at all. Every exchange client borrows a shared ExchangeRateLimiter
+with separate public and private token buckets; requests wait in line for a
+token instead of failing, and the remaining budget is exposed so schedulers
+can plan around it.
+
+Kraken's private API uses a call counter that grows by the cost of each call
+and decays at a rate set by the account verification tier; a token bucket
+with capacity = maximum counter and refill = decay rate is the same model.
+Coinmate allows a fixed number of requests per minute, modelled as a bucket
+that refills that budget evenly over the minute.
+
+Hedged duplicates of slow public requests take their token from a hedge
+bucket carved out of the public budget: it refills at REQUEST_HEDGE_PER_MINUTE
+(at most half the public rate) and the public bucket refills that much more
+slowly, so primaries and hedges together never exceed the exchange's public
+rate. A hedge fires while the primary is still in flight, just after the
+primary used a public token; Kraken's public bucket holds a single token, so
+hedges drawn from it directly would almost never be sent. Buckets cannot hold
+less than one request, so on Kraken one hedge may follow a primary at once.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from config.settings import (
+    COINMATE_PRIVATE_REQUESTS_PER_MINUTE,
+    COINMATE_PUBLIC_REQUESTS_PER_MINUTE,
+    KRAKEN_PUBLIC_REQUESTS_PER_SECOND,
+    KRAKEN_RATE_TIER,
+    REQUEST_HEDGE_BURST,
+    REQUEST_HEDGE_PER_MINUTE,
+)
+
+# Kraken private call counter per verification tier: (maximum, decay per second)
+KRAKEN_TIERS = {
+    "starter": (15, 0.33),
+    "intermediate": (20, 0.5),
+    "pro": (20, 1.0),
+}
+
+
+class TokenBucket:
+    """Token bucket whose waiters are served in arrival order."""
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_rate: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            capacity: Maximum tokens (burst size)
+            refill_rate: Tokens added per second
+            clock: Monotonic time source
+        """
+        self.capacity = float(capacity)
+        self.refill_rate = float(refill_rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waits = 0
+        self.total_wait = 0.0
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+        self._updated = now
+
+    @property
+    def remaining(self) -> float:
+        """Tokens available right now"""
+        self._refill()
+        return self._tokens
+
+    def wait_time(self, cost: float = 1.0) -> float:
+        """Seconds until cost tokens are available (0 if available now)"""
+        self._refill()
+        deficit = min(cost, self.capacity) - self._tokens
+        if deficit <= 0:
+            return 0.0
+        return deficit / self.refill_rate
+
+    def try_acquire(self, cost: float = 1.0) -> bool:
+        """Take cost tokens if available without waiting"""
+        if self.wait_time(cost) > 0:
+            return False
+        self._tokens -= min(cost, self.capacity)
+        self.acquired += 1
+        return True
+
+    async def acquire(self, cost: float = 1.0) -> float:
+        """
+        Wait until cost tokens are available and take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = self.wait_time(cost)
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+                waited += delay
+
+            self._tokens -= min(cost, self.capacity)
+            self.acquired += 1
+
+        if waited:
+            self.waits += 1
+            self.total_wait += waited
+        return waited
+
+    def drain(self):
+        """Empty the bucket, e.g. after the exchange reported a rate-limit error"""
+        self._refill()
+        self._tokens = 0.0
+
+
+class ExchangeRateLimiter:
+    """Public and private request budgets for one exchange."""
+
+    def __init__(
+        self,
+        exchange: str,
+        public: TokenBucket,
+        private: TokenBucket,
+        hedge: Optional[TokenBucket] = None,
+    ):
+        """
+        Args:
+            exchange: Exchange name
+            public: Budget for public requests
+            private: Budget for private requests
+            hedge: Allowance for hedged duplicates of public requests; without
+                one they are taken from the public budget
+        """
+        self.exchange = exchange
+        self.public = public
+        self.private = private
+        self.hedge = hedge
+
+    def bucket(self, private: bool = False) -> TokenBucket:
+        return self.private if private else self.public
+
+    async def acquire(self, private: bool = False, cost: float = 1.0) -> float:
+        """Queue for a request slot; returns seconds spent waiting"""
+        return await self.bucket(private).acquire(cost)
+
+    def try_acquire(self, private: bool = False, cost: float = 1.0) -> bool:
+        """Take a request slot only if one is free right now"""
+        return self.bucket(private).try_acquire(cost)
+
+    def try_acquire_hedge(self, cost: float = 1.0) -> bool:
+        """Take a slot for a hedged duplicate only if one is free right now"""
+        return (self.hedge or self.public).try_acquire(cost)
+
+    def remaining(self, private: bool = False) -> float:
+        """Requests that can be made right now without waiting"""
+        return self.bucket(private).remaining
+
+    def wait_time(self, private: bool = False, cost: float = 1.0) -> float:
+        """Seconds until a request of the given cost could be sent"""
+        return self.bucket(private).wait_time(cost)
+
+    def penalize(self, private: bool = False):
+        """Back off after the exchange rejected a request for exceeding its limit"""
+        self.bucket(private).drain()
+
+    def get_status(self) -> Dict[str, float]:
+        return {
+            "public_remaining": self.public.remaining,
+            "private_remaining": self.private.remaining,
+            "public_wait_total": self.public.total_wait,
+            "private_wait_total": self.private.total_wait,
+        }
+
+
+def _public_buckets(
+    capacity: float, refill_rate: float
+) -> Tuple[TokenBucket, TokenBucket]:
+    """Public and hedge buckets splitting one public rate limit between them"""
+    hedge_rate = min(REQUEST_HEDGE_PER_MINUTE / 60, refill_rate / 2)
+    hedge_capacity = max(1, min(REQUEST_HEDGE_BURST, capacity - 1))
+    public = TokenBucket(max(1, capacity - hedge_capacity), refill_rate - hedge_rate)
+    return public, TokenBucket(hedge_capacity, hedge_rate)
+
+
+def create_rate_limiter(exchange_name: str) -> ExchangeRateLimiter:
+    """
+    Build the configured rate limiter for an exchange.
+
+    Args:
+        exchange_name: Name of the exchange ("kraken", "coinmate", etc.)
+
+    Returns:
+        ExchangeRateLimiter with the exchange's public and private budgets
+
+    Raises:
+        ValueError: If the Kraken tier or the exchange is not known
+    """
+    exchange_name = exchange_name.lower()
+    if exchange_name == "kraken":
+        if KRAKEN_RATE_TIER not in KRAKEN_TIERS:
+            raise ValueError(f"Unknown Kraken rate tier: {KRAKEN_RATE_TIER}")
+        max_counter, decay = KRAKEN_TIERS[KRAKEN_RATE_TIER]
+        public, hedge = _public_buckets(1, KRAKEN_PUBLIC_REQUESTS_PER_SECOND)
+        return ExchangeRateLimiter(
+            exchange_name,
+            public=public,
+            private=TokenBucket(max_counter, decay),
+            hedge=hedge,
+        )
+    elif exchange_name == "coinmate":
+        public, hedge = _public_buckets(
+            COINMATE_PUBLIC_REQUESTS_PER_MINUTE,
+            COINMATE_PUBLIC_REQUESTS_PER_MINUTE / 60,
+        )
+        return ExchangeRateLimiter(
+            exchange_name,
+            public=public,
+            private=TokenBucket(
+                COINMATE_PRIVATE_REQUESTS_PER_MINUTE,
+                COINMATE_PRIVATE_REQUESTS_PER_MINUTE / 60,
+            ),
+            hedge=hedge,
+        )
+    else:
+        raise ValueError(f"No rate limits configured for exchange: {exchange_name}")
+
+
+class RateLimiterRegistry:
+    """Shared rate limiters keyed by exchange name."""
+
+    def __init__(self):
+        self._limiters: Dict[str, ExchangeRateLimiter] = {}
+
+    def get(self, exchange_name: str) -> Optional[ExchangeRateLimiter]:
+        """
+        Get (or lazily create) the limiter for an exchange.
+
+        Returns:
+            The shared limiter, or None for exchanges without configured limits
+        """
+        if exchange_name not in self._limiters:
+            try:
+                self._limiters[exchange_name] = create_rate_limiter(exchange_name)
+            except ValueError:
+                return None
+        return self._limiters[exchange_name]
+
+    def get_status(self) -> Dict[str, Dict[str, float]]:
+        return {name: limiter.get_status() for name, limiter in self._limiters.items()}
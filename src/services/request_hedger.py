@@ -0,0 +1,146 @@
+"""
+Tail-latency hedging for idempotent exchange requests.
+
+A small fraction of requests take several times the median to answer, and
+one of them is enough to hold back a polling round. When a request has not
+answered by a chosen percentile of recent latencies, the hedger sends a
+duplicate and takes whichever response arrives first, cancelling the other.
+Only safe, public GETs should be hedged, and a duplicate is only sent when
+the exchange's hedge allowance, a share of its public rate limit, has a
+token to spare.
+
+The hedge delay comes from the primary attempts' own latencies, not from
+what callers saw after hedging: otherwise every winning hedge would pull the
+percentile down and hedges would grow ever more frequent. A primary cancelled
+by a winning hedge is recorded at the time it was given up, a lower bound
+that is still above the hedge delay, so the percentile is unaffected.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from ..utils.metrics import LatencyTracker
+
+T = TypeVar("T")
+
+
+class RequestHedger:
+    """Latency history and hedging statistics for one exchange."""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        window: int = 200,
+    ):
+        """
+        Args:
+            percentile: Latency percentile after which a duplicate is sent
+            min_samples: Latencies needed before hedging starts
+            min_delay: Lower bound on the hedge delay in seconds
+            window: Number of recent latencies kept
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latency = LatencyTracker(window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_skips = 0
+        self.latency_saved = 0.0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while history is too short"""
+        if len(self.latency) < self.min_samples:
+            return None
+        return max(self.min_delay, self.latency.percentile(self.percentile))
+
+    async def run(
+        self,
+        send: Callable[[], Awaitable[T]],
+        reserve_hedge: Callable[[], bool] = lambda: True,
+    ) -> T:
+        """
+        Run a request, hedging it if it is slow.
+
+        Args:
+            send: Factory that starts one attempt of the request
+            reserve_hedge: Called before sending a duplicate; returns False if
+                the rate-limit budget cannot cover it
+
+        Returns:
+            The first successful response (or the last error if all fail)
+        """
+        self.requests += 1
+        delay = self.hedge_delay()
+        tail = self.latency.percentile(99) if delay is not None else None
+        start = time.perf_counter()
+        primary_ended = []
+
+        async def send_primary():
+            try:
+                return await send()
+            finally:
+                primary_ended.append(time.perf_counter())
+
+        primary = asyncio.ensure_future(send_primary())
+        tasks = {primary}
+
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    if reserve_hedge():
+                        self.hedged += 1
+                        hedge = asyncio.ensure_future(send())
+                        tasks.add(hedge)
+                    else:
+                        self.budget_skips += 1
+
+            winner = await self._first_success(tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        now = time.perf_counter()
+        # A cancelled primary has not run its finally yet; it ends now
+        self.latency.record((primary_ended[0] if primary_ended else now) - start)
+        if winner is not primary and winner.exception() is None:
+            self.hedge_wins += 1
+            # Estimated against the recent tail the primary was heading for
+            self.latency_saved += max(0.0, tail - (now - start))
+
+        return winner.result()
+
+    @staticmethod
+    async def _first_success(tasks: set) -> asyncio.Future:
+        """Wait for the first task that finishes without raising"""
+        pending = set(tasks)
+        failed = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            # Attempts finishing in the same round: any success beats a failure
+            for task in done:
+                if task.exception() is None:
+                    return task
+                failed = task
+        return failed
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        """Hedge rate, wins and estimated latency saved"""
+        delay = self.hedge_delay()
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "budget_skips": self.budget_skips,
+            "latency_saved_ms": self.latency_saved * 1000,
+            "hedge_delay_ms": delay * 1000 if delay is not None else None,
+        }
@@ -0,0 +1,133 @@
+"""
+Shared HTTP session registry for exchange and FX API clients.
+
+Creating a new aiohttp.ClientSession per request pays a fresh TCP + TLS
+handshake every polling cycle. This module keeps one long-lived session per
+named upstream (e.g. "kraken", "coinmate", "fx") with keep-alive, per-host
+connection limits and DNS caching, so clients can borrow an already warm
+connection pool instead.
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+import aiohttp
+
+from config.settings import (
+    HTTP_CONNECTION_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_REQUEST_TIMEOUT,
+)
+
+from ..utils.logging import log_with_timestamp
+
+
+class SessionManager:
+    """Registry of long-lived aiohttp sessions keyed by upstream name."""
+
+    def __init__(
+        self,
+        limit_per_host: int = HTTP_CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = HTTP_DNS_CACHE_TTL,
+        request_timeout: float = HTTP_REQUEST_TIMEOUT,
+    ):
+        """
+        Initialize the session registry.
+
+        Args:
+            limit_per_host: Maximum simultaneous connections per host
+            keepalive_timeout: Seconds an idle connection is kept open
+            dns_cache_ttl: Seconds resolved addresses are cached
+            request_timeout: Default total timeout for requests in seconds
+        """
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.request_timeout = request_timeout
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    def get_session(self, name: str) -> aiohttp.ClientSession:
+        """
+        Get (or lazily create) the shared session for an upstream.
+
+        Args:
+            name: Upstream name, usually the exchange name
+
+        Returns:
+            Open aiohttp.ClientSession owned by this registry
+        """
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+            self._sessions[name] = session
+        return session
+
+    def has_session(self, name: str) -> bool:
+        """Check whether an open session exists for an upstream"""
+        session = self._sessions.get(name)
+        return session is not None and not session.closed
+
+    async def warm_up(self, endpoints: Dict[str, str]) -> Dict[str, bool]:
+        """
+        Open connections ahead of the first poll.
+
+        Issues a lightweight HEAD request per upstream so DNS resolution and
+        the TLS handshake happen at startup instead of on the first tick.
+
+        Args:
+            endpoints: Mapping of upstream name to a URL on that host
+
+        Returns:
+            Mapping of upstream name to whether the warm-up request succeeded
+        """
+
+        async def _warm(name: str, url: str) -> bool:
+            try:
+                async with self.get_session(name).head(url) as response:
+                    await response.read()
+                return True
+            except Exception as e:
+                log_with_timestamp(f"⚠ HTTP warm-up failed for {name}: {e}")
+                return False
+
+        names = list(endpoints.keys())
+        results = await asyncio.gather(
+            *(_warm(name, endpoints[name]) for name in names)
+        )
+        warmed = dict(zip(names, results))
+        ready = [name for name, ok in warmed.items() if ok]
+        if ready:
+            log_with_timestamp(f"✓ HTTP connections warmed up: {', '.join(ready)}")
+        return warmed
+
+    async def close(self):
+        """Close all managed sessions"""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+
+def borrow_or_create_session(
+    session_manager: Optional[SessionManager], name: str, timeout: float = 10
+) -> aiohttp.ClientSession:
+    """
+    Borrow a shared session, or create a private one if no registry is given.
+
+    Callers must only close the returned session when no registry was passed.
+    """
+    if session_manager is not None:
+        return session_manager.get_session(name)
+    return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout))
@@ -83,14 +83,16 @@ class TelegramService:
         if not self.enabled:
             return False
 
+        asset = opportunity.asset or "BTC"
+
         # Format the message with arbitrage details
-        message = f"""🚨 *Arbitrage Opportunity Detected!*
+        message = f"""🚨 *{asset} Arbitrage Opportunity Detected!*
 
 💰 *Profit*: ${opportunity.profit_usd:.2f} \
 ({opportunity.profit_percentage:.2f}%)
 📈 *Buy*: {opportunity.buy_exchange} @ ${opportunity.buy_price:.2f}
 📉 *Sell*: {opportunity.sell_exchange} @ ${opportunity.sell_price:.2f}
-📊 *Volume Limit*: {opportunity.volume_limit:.4f} BTC
+📊 *Volume Limit*: {opportunity.volume_limit:.4f} {asset}
 
 ⚡ Act quickly - prices change rapidly!"""
 
@@ -0,0 +1,191 @@
+"""
+Append-only on-disk spool of database rows.
+
+While the database is unreachable the DatabaseWriter appends the rows it
+cannot write to a WriteSpool, and replays them in bulk once the database is
+back. A spool is a directory of numbered segment files; each record is a
+header (payload length, CRC32 of the payload) followed by the row as JSON,
+with datetimes stored as UTC epoch seconds. Segments are never modified once
+written: appends go to the newest segment until it reaches segment_bytes, a
+replay seals it so new rows start a fresh one, and fully replayed segments
+are deleted. A record torn by a crash fails its length or CRC check and ends
+the read of its segment; every record before it is still replayed.
+
+How often appends are fsynced is set by the fsync policy: "always" syncs
+after every append, "interval" at most every fsync_interval seconds (and
+whenever a segment is sealed), "never" leaves it to the operating system.
+"""
+
+import json
+import os
+import struct
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import BinaryIO, List, Optional
+
+from config.settings import (
+    DB_SPOOL_FSYNC,
+    DB_SPOOL_FSYNC_INTERVAL,
+    DB_SPOOL_SEGMENT_BYTES,
+)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+SEGMENT_SUFFIX = ".spool"
+
+# Payload length and CRC32, little-endian
+RECORD_HEADER = struct.Struct("<II")
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"utc": value.timestamp()}
+    raise TypeError(f"Cannot spool {type(value).__name__}")
+
+
+def _decode_value(value: dict) -> datetime:
+    return datetime.fromtimestamp(value["utc"], timezone.utc)
+
+
+def encode_record(record: tuple) -> bytes:
+    """One length-prefixed, checksummed spool record"""
+    payload = json.dumps(record, default=_encode_value, separators=(",", ":")).encode()
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_records(data: bytes) -> List[tuple]:
+    """Records of a segment, up to the first torn or corrupt one"""
+    records = []
+    offset = 0
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        end = start + length
+        payload = data[start:end]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        records.append(tuple(json.loads(payload, object_hook=_decode_value)))
+        offset = end
+    return records
+
+
+class WriteSpool:
+    """
+    Segmented append-only log of row tuples.
+
+    Segments left by a previous run are picked up on construction, so rows
+    spooled before a restart are still replayed.
+
+    Args:
+        directory: Directory holding the segment files; created if missing
+        segment_bytes: Size at which a segment is closed and a new one begun
+        fsync: Fsync policy, one of FSYNC_POLICIES
+        fsync_interval: Seconds between fsyncs for the "interval" policy
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = DB_SPOOL_SEGMENT_BYTES,
+        fsync: str = DB_SPOOL_FSYNC,
+        fsync_interval: float = DB_SPOOL_FSYNC_INTERVAL,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        os.makedirs(directory, exist_ok=True)
+        # Segment paths, oldest first; the last one is open while _file is set
+        self._segments: List[str] = sorted(
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+        self._next_sequence = (
+            int(os.path.basename(self._segments[-1])[: -len(SEGMENT_SUFFIX)]) + 1
+            if self._segments
+            else 0
+        )
+        self._file: Optional[BinaryIO] = None
+        self._size = 0
+        self._synced_at = time.monotonic()
+        self.appended = 0
+
+    @property
+    def pending(self) -> bool:
+        """Whether any spooled rows are waiting to be replayed"""
+        return bool(self._segments)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes on disk across all segments"""
+        return sum(os.path.getsize(path) for path in self._segments)
+
+    def _open_segment(self):
+        path = os.path.join(
+            self.directory, f"{self._next_sequence:012d}{SEGMENT_SUFFIX}"
+        )
+        self._next_sequence += 1
+        self._file = open(path, "ab")
+        self._size = 0
+        self._segments.append(path)
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced_at = time.monotonic()
+
+    def append(self, records: List[tuple]):
+        """Append rows, starting a new segment whenever one fills up"""
+        for record in records:
+            if self._file is None:
+                self._open_segment()
+            data = encode_record(record)
+            self._file.write(data)
+            self._size += len(data)
+            if self._size >= self.segment_bytes:
+                self.seal()
+        self.appended += len(records)
+
+        if self._file is None:
+            return
+        if self.fsync == "always" or (
+            self.fsync == "interval"
+            and time.monotonic() - self._synced_at >= self.fsync_interval
+        ):
+            self._sync()
+        else:
+            self._file.flush()
+
+    def seal(self):
+        """Close the segment being appended to; later rows start a new one"""
+        if self._file is None:
+            return
+        if self.fsync == "never":
+            self._file.flush()
+        else:
+            self._sync()
+        self._file.close()
+        self._file = None
+
+    def segments(self) -> List[str]:
+        """Every segment, oldest first, after sealing the open one"""
+        self.seal()
+        return list(self._segments)
+
+    def read(self, path: str) -> List[tuple]:
+        with open(path, "rb") as segment:
+            return decode_records(segment.read())
+
+    def remove(self, path: str):
+        """Delete a replayed segment"""
+        if path == self._segments[-1]:
+            self.seal()
+        self._segments.remove(path)
+        os.remove(path)
+
+    def close(self):
+        self.seal()
@@ -0,0 +1,32 @@
+"""
+JSON decoding with an optional fast backend.
+
+orjson parses bytes several times faster than the standard library and is
+used when installed (``pip install orjson``); otherwise the stdlib json
+module is used. Both accept bytes or str and return the same Python objects.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Parse a JSON document.
+
+    Args:
+        data: Raw response bytes or text
+
+    Returns:
+        Decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
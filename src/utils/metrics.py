@@ -0,0 +1,69 @@
+"""
+Lightweight in-process latency metrics.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+
+class LatencyTracker:
+    """Rolling window of latency samples with percentile summaries."""
+
+    def __init__(self, window: int = 1000):
+        """
+        Args:
+            window: Number of most recent samples kept for percentiles
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.last: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        """Record one latency sample in seconds"""
+        self._samples.append(seconds)
+        self.count += 1
+        self.last = seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Latency percentile over the window.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if no samples were recorded
+        """
+        if not self._samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, dtype=float), q))
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Summary in milliseconds: count, last, mean, p50, p90, p99, max"""
+        if not self._samples:
+            return {
+                "count": self.count,
+                "last_ms": None,
+                "mean_ms": None,
+                "p50_ms": None,
+                "p90_ms": None,
+                "p99_ms": None,
+                "max_ms": None,
+            }
+
+        samples = np.fromiter(self._samples, dtype=float) * 1000
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+        return {
+            "count": self.count,
+            "last_ms": self.last * 1000,
+            "mean_ms": float(samples.mean()),
+            "p50_ms": float(p50),
+            "p90_ms": float(p90),
+            "p99_ms": float(p99),
+            "max_ms": float(samples.max()),
+        }
@@ -0,0 +1,126 @@
+"""
+Fixed-capacity columnar ring buffer.
+
+Rows are stored column by column in preallocated NumPy arrays, so memory use
+is set by the capacity and never grows with uptime; once full, each append
+overwrites the oldest row. Every row is written twice, at its slot and one
+capacity further on, which keeps the newest N rows contiguous in memory for
+any N up to the capacity: windows and time ranges are returned as views,
+without copying.
+
+Time ranges are found by binary search, so the time column must never
+decrease. Rows are stamped before the awaits that lead to their append, so
+concurrent producers can append slightly out of order; such a row is kept
+but its time is raised to the newest stored time, and counted in clamped.
+"""
+
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+
+class ColumnarRingBuffer:
+    """
+    The most recent rows of a table of typed columns.
+
+    Args:
+        capacity: Rows kept; older rows are overwritten
+        columns: Column name -> NumPy dtype, in append order
+        time_column: Column that time-range queries search; a row older than
+            the newest one is stored with the newest row's time
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        columns: Mapping[str, np.dtype],
+        time_column: str = "timestamp",
+    ):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if time_column not in columns:
+            raise ValueError(f"Unknown time column: {time_column}")
+        self.capacity = capacity
+        self.time_column = time_column
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(2 * capacity, dtype=dtype) for name, dtype in columns.items()
+        }
+        self._arrays = list(self._columns.values())
+        self._time_index = list(self._columns).index(time_column)
+        self._next = 0  # Slot the next row is written to
+        self._size = 0
+        self.appended = 0
+        self.clamped = 0  # Rows whose time was raised to keep the order
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def columns(self) -> tuple:
+        return tuple(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns; fixed at construction"""
+        return sum(array.nbytes for array in self._arrays)
+
+    def append(self, *values):
+        """Add one row, given in column order; O(1)"""
+        if self._size:
+            # The newest row's mirror slot
+            newest = self._arrays[self._time_index][self._next - 1 + self.capacity]
+            if values[self._time_index] < newest:
+                values = list(values)
+                values[self._time_index] = newest
+                self.clamped += 1
+        slot = self._next
+        mirror = slot + self.capacity
+        for array, value in zip(self._arrays, values, strict=True):
+            array[slot] = value
+            array[mirror] = value
+        self._next = slot + 1 if slot + 1 < self.capacity else 0
+        if self._size < self.capacity:
+            self._size += 1
+        self.appended += 1
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
+
+    def _bounds(self, rows: int):
+        # The newest row is at mirror slot _next - 1 + capacity
+        end = self._next + self.capacity
+        return end - rows, end
+
+    def window(self, rows: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        The newest rows, oldest first, as read-only views.
+
+        Args:
+            rows: Number of rows (all kept rows by default)
+        """
+        rows = self._size if rows is None else max(0, min(rows, self._size))
+        start, end = self._bounds(rows)
+        return self._views(start, end)
+
+    def between(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Rows with start <= time < end, oldest first, as read-only views.
+
+        Found by binary search over the time column.
+        """
+        first, last = self._bounds(self._size)
+        times = self._columns[self.time_column][first:last]
+        lo = 0 if start is None else int(np.searchsorted(times, start, "left"))
+        hi = len(times) if end is None else int(np.searchsorted(times, end, "left"))
+        return self._views(first + lo, first + max(lo, hi))
+
+    def _views(self, start: int, end: int) -> Dict[str, np.ndarray]:
+        views = {}
+        for name, array in self._columns.items():
+            view = array[start:end]
+            view.flags.writeable = False
+            views[name] = view
+        return views
@@ -0,0 +1 @@
+# Micro-benchmarks (run directly, not collected by pytest)
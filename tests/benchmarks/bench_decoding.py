@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for exchange payload decoding.
+
+Compares the old path (stdlib json into dicts, then probing and float()
+conversion) with the typed decoders, per message, for the JSON backend in
+use and for the stdlib fallback.
+
+Usage:
+    uv run python -m tests.benchmarks.bench_decoding [iterations]
+"""
+
+import json
+import sys
+import timeit
+
+from src.apis.coinmate import decoding as coinmate_decoding
+from src.apis.kraken import decoding as kraken_decoding
+from src.utils import json_codec
+
+KRAKEN_TICKER = json.dumps(
+    {
+        "error": [],
+        "result": {
+            "XXBTZUSD": {
+                "a": ["64250.10000", "1", "1.000"],
+                "b": ["64250.00000", "2", "2.000"],
+                "c": ["64250.10000", "0.00150000"],
+                "v": ["1120.12345678", "2450.87654321"],
+                "p": ["64010.12345", "63950.54321"],
+                "t": [15234, 33120],
+                "l": ["63500.00000", "63100.00000"],
+                "h": ["64500.00000", "64800.00000"],
+                "o": "63900.00000",
+            }
+        },
+    }
+).encode()
+
+KRAKEN_DEPTH = json.dumps(
+    {
+        "error": [],
+        "result": {
+            "XXBTZUSD": {
+                "bids": [
+                    [f"{64250 - i}.00000", "0.500", 1700000000] for i in range(100)
+                ],
+                "asks": [
+                    [f"{64251 + i}.00000", "0.500", 1700000000] for i in range(100)
+                ],
+            }
+        },
+    }
+).encode()
+
+COINMATE_TICKER = json.dumps(
+    {
+        "error": False,
+        "errorMessage": None,
+        "data": {
+            "last": 1480000.0,
+            "high": 1500000.0,
+            "low": 1450000.0,
+            "amount": 12.345,
+            "bid": 1479900.0,
+            "ask": 1480100.0,
+            "change": 0.5,
+            "open": 1472000.0,
+            "timestamp": 1700000000000,
+        },
+    }
+).encode()
+
+
+def legacy_kraken_ticker(raw: bytes):
+    """The pre-decoder monitor path: dicts, alias probing and float()"""
+    result = json.loads(raw).get("result", {})
+    pair_data = result.get("BTCUSD") or result.get("XXBTZUSD") or result.get("XBTUSD")
+    last = pair_data.get("c", [None, None])
+    bid, ask = pair_data["b"], pair_data["a"]
+    return (
+        float(last[0]),
+        float(last[1]),
+        float(bid[0]),
+        float(bid[2]),
+        float(ask[0]),
+        float(ask[2]),
+    )
+
+
+def per_message_us(func, iterations: int) -> float:
+    return min(timeit.repeat(func, number=iterations, repeat=5)) / iterations * 1e6
+
+
+def run_cases(iterations: int):
+    cases = {
+        "kraken ticker (legacy dicts)": lambda: legacy_kraken_ticker(KRAKEN_TICKER),
+        "kraken ticker": lambda: kraken_decoding.find_pair(
+            kraken_decoding.decode_ticker(KRAKEN_TICKER), "BTCUSD"
+        ),
+        "kraken depth (100x2 levels)": lambda: kraken_decoding.decode_depth(
+            KRAKEN_DEPTH
+        ),
+        "coinmate ticker": lambda: coinmate_decoding.decode_ticker(
+            COINMATE_TICKER, "BTC_CZK"
+        ),
+    }
+    for name, func in cases.items():
+        print(f"  {name:<32} {per_message_us(func, iterations):8.2f} µs/msg")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    backend = json_codec.orjson
+
+    print(f"JSON backend: {json_codec.JSON_BACKEND}")
+    run_cases(iterations)
+
+    if backend is not None:
+        # Same decoders on the stdlib fallback for comparison
+        json_codec.orjson = None
+        try:
+            print("JSON backend: json (fallback)")
+            run_cases(iterations)
+        finally:
+            json_codec.orjson = backend
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark for arbitrage detection across many venues.
+
+Compares the previous path (an awaited per-pair calculation for every
+eligible exchange pair, kept here as a reference) with the vectorized
+detection engine, for one
+asset quoted on 2, 10 and 50 venues. Half the venues are large and half
+small; quotes are random around a common price so a few pairs cross by more
+than fees. "engine" is the whole detect_opportunities call including
+building opportunities; "scan" is the vectorized pass alone.
+
+Usage:
+    uv run python -m tests.benchmarks.bench_detection [iterations]
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import time
+import timeit
+from typing import List, Optional, Tuple
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from src.core.arbitrage_detector import ArbitrageDetector
+from src.core.data_models import ArbitrageOpportunity, PriceData
+from src.core.edge_engine import DetectionEngine
+from src.core.price_matrix import PriceMatrix
+from src.utils.logging import log_with_timestamp
+
+VENUE_COUNTS = (2, 10, 50)
+
+
+def build_detector(venues: int, seed: int = 7) -> ArbitrageDetector:
+    rng = np.random.default_rng(seed)
+    names = [f"venue{i}" for i in range(venues)]
+    prices = {}
+    for name, mid in zip(names, 100000.0 * (1 + rng.normal(0, 0.01, venues))):
+        prices[name] = PriceData(
+            name,
+            "BTC/USD",
+            mid,
+            mid,
+            "USD",
+            time.time(),
+            volume=10.0,
+            bid_usd=mid - 5,
+            ask_usd=mid + 5,
+        )
+
+    monitor = MagicMock()
+    monitor.latest_prices = prices
+    monitor.latest_books = {}
+    monitor.price_matrix = PriceMatrix.from_prices(prices.values())
+
+    detector = ArbitrageDetector(monitor, min_profit_percentage=0.1)
+    detector.large_exchanges = names[::2]
+    detector.small_exchanges = names[1::2]
+    detector.engine = DetectionEngine(
+        detector.large_exchanges, detector.small_exchanges
+    )
+    return detector
+
+
+def candidate_pairs(detector: ArbitrageDetector) -> List[Tuple[str, str]]:
+    """(buy, sell) exchange pairs the per-pair path evaluated"""
+    exchanges = list(detector.monitor.latest_prices)
+    return [
+        (buy_exchange, sell_exchange)
+        for buy_exchange in exchanges
+        for sell_exchange in exchanges
+        if buy_exchange != sell_exchange
+        and detector._is_valid_arbitrage_pair(buy_exchange, sell_exchange)
+    ]
+
+
+async def calculate_opportunity(
+    detector: ArbitrageDetector, buy_data: PriceData, sell_data: PriceData
+) -> Optional[ArbitrageOpportunity]:
+    """The per-pair calculation, with fees from the current fee snapshot"""
+    buy_price = buy_data.buy_price_usd
+    sell_price = sell_data.sell_price_usd
+    if sell_price <= buy_price:
+        return None
+
+    profit_percentage = (sell_price - buy_price) / buy_price * 100
+    fees = detector.fee_matrix
+    buy_fee = fees.taker(buy_data.exchange, buy_data.symbol)
+    sell_fee = fees.taker(sell_data.exchange, sell_data.symbol)
+    net_profit_percentage = profit_percentage - (buy_fee + sell_fee)
+    if net_profit_percentage <= 0:
+        return None
+
+    log_with_timestamp(
+        f"💰 Fee calculation: {buy_data.exchange}+{sell_data.exchange} = "
+        f"{buy_fee + sell_fee:.2f}% (gross: {profit_percentage:.2f}% → "
+        f"net: {net_profit_percentage:.2f}%)"
+    )
+    return detector._build_opportunity(buy_data, sell_data, buy_fee, sell_fee)
+
+
+async def legacy_detect(detector: ArbitrageDetector):
+    """The pre-engine path: one awaited calculation per eligible pair"""
+    prices = detector.monitor.latest_prices
+    found = []
+    for buy_exchange, sell_exchange in candidate_pairs(detector):
+        opportunity = await calculate_opportunity(
+            detector, prices[buy_exchange], prices[sell_exchange]
+        )
+        if (
+            opportunity
+            and opportunity.profit_percentage >= detector.min_profit_percentage
+        ):
+            found.append(opportunity)
+    return found
+
+
+async def per_call_us(func, iterations: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+async def run(iterations: int):
+    print(
+        f"{'venues':>6} {'pairs':>6} {'legacy µs':>12} {'engine µs':>12} "
+        f"{'scan µs':>10} {'found':>6}"
+    )
+    for venues in VENUE_COUNTS:
+        detector = build_detector(venues)
+        # The per-pair path logs every fee calculation; keep it out of the output
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy_found = await legacy_detect(detector)
+            engine_found = await detector.detect_opportunities()
+            legacy = await per_call_us(lambda: legacy_detect(detector), iterations)
+            engine = await per_call_us(detector.detect_opportunities, iterations)
+            detector.opportunities.clear()
+        matrix = detector.monitor.price_matrix
+        scan = timeit.timeit(
+            lambda: detector.engine.scan(matrix, detector.min_profit_percentage),
+            number=iterations,
+        )
+        scan = scan / iterations * 1e6
+        assert len(legacy_found) == len(engine_found)
+        pairs = len(candidate_pairs(detector))
+        print(
+            f"{venues:>6} {pairs:>6} {legacy:>12.1f} {engine:>12.1f} "
+            f"{scan:>10.1f} {len(engine_found):>6}"
+        )
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    asyncio.run(run(iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the slotted price and opportunity models.
+
+Compares the previous plain dataclasses (a __dict__ per instance, exchange
+and symbol names on every object) with the slotted models that keep
+exchange and instrument ids from the process-wide symbol table. Reports the
+memory allocated per instance, construction time, and the attribute reads
+the detection loop does for every quote (buy/sell USD price, volume,
+timestamp) and opportunity (prices, profit).
+
+Usage:
+    uv run python -m tests.benchmarks.bench_models [instances]
+"""
+
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from src.core.data_models import ArbitrageOpportunity, PriceData
+
+EXCHANGES = ("kraken", "coinmate", "bitstamp", "binance")
+
+
+@dataclass
+class LegacyPriceData:
+    exchange: str
+    symbol: str
+    price: float
+    price_usd: float
+    original_currency: str
+    timestamp: float
+    volume: float = 0.0
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    bid_size: Optional[float] = None
+    ask_size: Optional[float] = None
+    bid_usd: Optional[float] = None
+    ask_usd: Optional[float] = None
+
+    @property
+    def buy_price_usd(self) -> float:
+        return self.ask_usd if self.ask_usd is not None else self.price_usd
+
+    @property
+    def sell_price_usd(self) -> float:
+        return self.bid_usd if self.bid_usd is not None else self.price_usd
+
+
+@dataclass
+class LegacyArbitrageOpportunity:
+    buy_exchange: str
+    sell_exchange: str
+    buy_price: float
+    sell_price: float
+    profit_usd: float
+    profit_percentage: float
+    timestamp: float
+    volume_limit: float
+    size_tiers: List = field(default_factory=list)
+    max_profitable_size: Optional[float] = None
+    asset: Optional[str] = None
+
+
+def make_prices(cls, count: int) -> list:
+    return [
+        cls(
+            EXCHANGES[i % len(EXCHANGES)],
+            "BTC/USD",
+            100000.0 + i,
+            100000.0 + i,
+            "USD",
+            1700000000.0 + i,
+            volume=1.5,
+            bid=99999.0 + i,
+            ask=100001.0 + i,
+            bid_size=0.5,
+            ask_size=0.7,
+            bid_usd=99999.0 + i,
+            ask_usd=100001.0 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def make_opportunities(cls, count: int) -> list:
+    return [
+        cls(
+            EXCHANGES[i % len(EXCHANGES)],
+            EXCHANGES[(i + 1) % len(EXCHANGES)],
+            100000.0,
+            100200.0 + i,
+            200.0,
+            0.2,
+            1700000000.0 + i,
+            1.0,
+            asset="BTC",
+        )
+        for i in range(count)
+    ]
+
+
+def bytes_per_instance(factory, cls, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = factory(cls, count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before) / count
+
+
+def read_quotes(prices: list) -> float:
+    total = 0.0
+    for price_data in prices:
+        total += (
+            price_data.buy_price_usd
+            - price_data.sell_price_usd
+            + price_data.volume
+            + price_data.timestamp
+        )
+    return total
+
+
+def read_opportunities(opportunities: list) -> float:
+    total = 0.0
+    for opportunity in opportunities:
+        total += (
+            opportunity.sell_price - opportunity.buy_price
+        ) * opportunity.volume_limit + opportunity.profit_percentage
+    return total
+
+
+def construct_ns(factory, cls, count: int) -> float:
+    best = min(timeit.repeat(lambda: factory(cls, count), number=1, repeat=3))
+    return best / count * 1e9
+
+
+def per_item_ns(func, items: list, repeat: int = 5) -> float:
+    best = min(timeit.repeat(lambda: func(items), number=1, repeat=repeat))
+    return best / len(items) * 1e9
+
+
+def run(count: int):
+    print(f"{count} instances each\n")
+    print(f"{'':<34} {'legacy':>10} {'slotted':>10} {'change':>8}")
+
+    def row(label: str, legacy: float, slotted: float, unit: str):
+        change = (slotted / legacy - 1) * 100
+        print(
+            f"{label:<34} {legacy:>8.1f}{unit} {slotted:>8.1f}{unit} {change:>+7.0f}%"
+        )
+
+    for name, legacy_cls, cls, factory, reader in (
+        ("PriceData", LegacyPriceData, PriceData, make_prices, read_quotes),
+        (
+            "ArbitrageOpportunity",
+            LegacyArbitrageOpportunity,
+            ArbitrageOpportunity,
+            make_opportunities,
+            read_opportunities,
+        ),
+    ):
+        row(
+            f"{name} bytes",
+            bytes_per_instance(factory, legacy_cls, count),
+            bytes_per_instance(factory, cls, count),
+            " B",
+        )
+        legacy_items = factory(legacy_cls, count)
+        items = factory(cls, count)
+        row(
+            f"{name} construct",
+            construct_ns(factory, legacy_cls, count),
+            construct_ns(factory, cls, count),
+            "ns",
+        )
+        row(
+            f"{name} detection reads",
+            per_item_ns(reader, legacy_items),
+            per_item_ns(reader, items),
+            "ns",
+        )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    run(count)
+
+
+if __name__ == "__main__":
+    main()
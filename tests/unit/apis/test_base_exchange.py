@@ -7,6 +7,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from src.apis.base_exchange import BaseExchangeAPI, create_exchange_api
+from src.apis.payloads import PayloadError, Ticker
 
 
 class MockExchangeAPI(BaseExchangeAPI):
@@ -30,6 +31,11 @@ class MockExchangeAPI(BaseExchangeAPI):
     async def get_trading_fees(self, pair: str):
         return 0.25
 
+    def parse_ticker(self, payload, pair: str) -> Ticker:
+        if "price" not in payload:
+            raise PayloadError(f"No price for {pair}")
+        return Ticker(pair=pair, last=payload["price"], volume=payload["volume"])
+
     def normalize_pair(self, pair: str) -> str:
         return pair.replace("/", "_")
 
@@ -107,6 +113,38 @@ class TestBaseExchangeAPI:
         result = await api._make_request("test")
         assert result == {"result": "success"}
 
+    async def test_fetch_normalized_ticker(self):
+        """Test that tickers are fetched for the normalized pair and decoded"""
+        api = MockExchangeAPI()
+
+        ticker = await api.fetch_normalized_ticker("BTC/USD")
+
+        assert ticker == Ticker(pair="BTC_USD", last=50000.0, volume=1.5)
+
+    async def test_fetch_normalized_tickers_skips_failures(self):
+        """Test that the per-pair bulk default leaves out pairs that fail"""
+        api = MockExchangeAPI()
+
+        async def get_ticker(pair):
+            return {"price": 50000.0, "volume": 1.5} if pair == "BTC_USD" else {}
+
+        api.get_ticker = get_ticker
+
+        tickers = await api.fetch_normalized_tickers(["BTC/USD", "ETH/USD"])
+
+        assert list(tickers) == ["BTC/USD"]
+        assert tickers["BTC/USD"].last == 50000.0
+
+    def test_parse_tickers_decodes_each_pair(self):
+        """Test that the default multi-pair decode parses every requested pair"""
+        api = MockExchangeAPI()
+        payload = {"price": 50000.0, "volume": 1.5}
+
+        tickers = api.parse_tickers(payload, ["BTC_USD", "BTC_EUR"])
+
+        assert list(tickers) == ["BTC_USD", "BTC_EUR"]
+        assert tickers["BTC_EUR"] == Ticker(pair="BTC_EUR", last=50000.0, volume=1.5)
+
     async def test_optional_methods(self):
         """Test that optional methods return None by default"""
         api = MockExchangeAPI()
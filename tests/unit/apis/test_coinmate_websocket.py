@@ -0,0 +1,217 @@
+"""
+Tests for the Coinmate WebSocket stream, run against a local stand-in server.
+"""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
+
+from src.apis.base_stream import create_exchange_stream
+from src.apis.coinmate.websocket import CoinmateWebSocketStream
+from src.core.exchange_monitor import ExchangeMonitor
+
+BOOK_SNAPSHOT = {
+    "bids": [
+        {"price": 2449000.0, "amount": 0.5},
+        {"price": 2448000.0, "amount": 1.0},
+    ],
+    "asks": [
+        {"price": 2451000.0, "amount": 0.3},
+        {"price": 2452000.0, "amount": 0.8},
+    ],
+}
+
+BOOK_UPDATE = {
+    "bids": [
+        {"price": 2449000.0, "amount": 0.2},
+        {"price": 2448000.0, "amount": 1.0},
+    ],
+    "asks": [{"price": 2452000.0, "amount": 0.8}],
+}
+
+
+class FakeCoinmateServer:
+    """Coinmate stand-in that answers subscriptions with canned channel data"""
+
+    def __init__(self):
+        self.subscriptions = []
+        self.server = None
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json({"event": "ping"})
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            request_data = json.loads(msg.data)
+            if request_data.get("event") != "subscribe":
+                continue
+
+            channel = request_data["data"]["channel"]
+            self.subscriptions.append(channel)
+            await ws.send_json({"event": "subscribe_success", "channel": channel})
+
+            if channel.startswith("statistics-"):
+                await ws.send_json(
+                    {
+                        "event": "data",
+                        "channel": channel,
+                        "payload": {"lastRealizedTrade": 2450000.0, "volume": 12.3},
+                    }
+                )
+            elif channel.startswith("trades-"):
+                await ws.send_json(
+                    {
+                        "event": "data",
+                        "channel": channel,
+                        "payload": [
+                            {"date": 1703254800000, "price": 2450500.0, "amount": 0.1},
+                            {"date": 1703254801000, "price": 2450600.0, "amount": 0.2},
+                        ],
+                    }
+                )
+            elif channel.startswith("order_book-"):
+                for payload in (BOOK_SNAPSHOT, BOOK_UPDATE):
+                    await ws.send_json(
+                        {"event": "data", "channel": channel, "payload": payload}
+                    )
+        return ws
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/api/websocket", self.handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.server.close()
+
+    @property
+    def url(self):
+        return str(self.server.make_url("/api/websocket")).replace("http://", "ws://")
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.unit
+class TestCoinmateWebSocketStream:
+
+    def test_subscribe_messages(self):
+        """Test channel names per pair"""
+
+        async def noop(*args):
+            pass
+
+        stream = CoinmateWebSocketStream(["BTC/CZK"], on_book=noop, book_depth=5)
+
+        channels = [m["data"]["channel"] for m in stream.build_subscribe_messages()]
+        assert channels == [
+            "statistics-BTC_CZK",
+            "trades-BTC_CZK",
+            "order_book-BTC_CZK",
+        ]
+
+        # Without a book callback the order book channel is not requested
+        stream = CoinmateWebSocketStream(["BTC/CZK"], book_depth=5)
+        channels = [m["data"]["channel"] for m in stream.build_subscribe_messages()]
+        assert "order_book-BTC_CZK" not in channels
+
+    def test_factory(self):
+        """Test creating a Coinmate stream through the factory"""
+        stream = create_exchange_stream("coinmate", ["BTC/CZK"])
+        assert isinstance(stream, CoinmateWebSocketStream)
+
+    def test_book_diff(self):
+        """Test changed and removed levels between two pushes"""
+        changes = CoinmateWebSocketStream._diff(
+            {100.0: 1.0, 99.0: 2.0}, {100.0: 0.5, 98.0: 1.0}
+        )
+        assert sorted(changes) == [(98.0, 1.0), (99.0, 0.0), (100.0, 0.5)]
+
+    async def test_receives_ticker_trades_and_book(self):
+        """Test statistics, trades and book deltas from the stand-in server"""
+        tickers = []
+        trades = []
+        books = []
+
+        async def on_ticker(exchange, symbol, price, volume, **quote):
+            tickers.append((exchange, symbol, price, volume))
+
+        async def on_trade(exchange, symbol, price, amount, timestamp):
+            trades.append((price, amount, timestamp))
+
+        async def on_book(exchange, symbol, bids, asks, is_snapshot, checksum):
+            books.append((sorted(bids), sorted(asks), is_snapshot))
+
+        async with FakeCoinmateServer() as fake:
+            stream = CoinmateWebSocketStream(
+                ["BTC/CZK"],
+                on_ticker=on_ticker,
+                on_trade=on_trade,
+                on_book=on_book,
+                book_depth=10,
+                url=fake.url,
+            )
+            task = asyncio.create_task(stream.run())
+            await _wait_for(lambda: len(books) == 2 and len(trades) == 2)
+            await stream.stop()
+            await asyncio.wait_for(task, 2)
+
+        assert tickers[0] == ("coinmate", "BTC/CZK", 2450000.0, 12.3)
+        # Trades also refresh the last price with the latest trade
+        assert tickers[-1] == ("coinmate", "BTC/CZK", 2450600.0, 12.3)
+        assert trades[0] == (2450500.0, 0.1, 1703254800.0)
+
+        snapshot_bids, snapshot_asks, is_snapshot = books[0]
+        assert is_snapshot
+        assert snapshot_bids == [(2448000.0, 1.0), (2449000.0, 0.5)]
+        assert snapshot_asks == [(2451000.0, 0.3), (2452000.0, 0.8)]
+
+        delta_bids, delta_asks, is_snapshot = books[1]
+        assert not is_snapshot
+        assert delta_bids == [(2449000.0, 0.2)]
+        assert delta_asks == [(2451000.0, 0.0)]
+
+
+@pytest.mark.unit
+class TestMonitorCoinmateStreaming:
+
+    async def test_monitor_applies_book_deltas(self):
+        """Test that the monitor keeps an incrementally updated book"""
+        monitor = ExchangeMonitor(
+            ["coinmate"],
+            {"coinmate": "BTC/CZK"},
+            price_sources={"coinmate": "websocket"},
+            book_depth=10,
+        )
+        monitor.currency_converter.exchange_rates = {"CZK/USD": 0.0417}
+        monitor.currency_converter.last_update = float("inf")
+
+        async with FakeCoinmateServer() as fake:
+            monitor.start_streams()
+            monitor.streams["coinmate"].url = fake.url
+            await _wait_for(
+                lambda: "coinmate" in monitor.latest_books
+                and monitor.latest_books["coinmate"].bids.get(2449000.0) == 0.2
+            )
+            await _wait_for(lambda: len(monitor.recent_trades.get("coinmate", [])) == 2)
+            await monitor.close()
+
+        book = monitor.latest_books["coinmate"]
+        assert book.top_bids() == [(2449000.0, 0.2), (2448000.0, 1.0)]
+        assert book.top_asks() == [(2452000.0, 0.8)]
+        assert monitor.latest_prices["coinmate"].price_usd == pytest.approx(
+            2450600.0 * 0.0417
+        )
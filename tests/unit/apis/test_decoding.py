@@ -0,0 +1,211 @@
+"""
+Tests for typed exchange payload decoding.
+"""
+
+import json
+
+import pytest
+
+from src.apis.coinmate import decoding as coinmate_decoding
+from src.apis.kraken import decoding as kraken_decoding
+from src.apis.payloads import FeeSchedule, PayloadError, Ticker
+
+KRAKEN_TICKER = {
+    "error": [],
+    "result": {
+        "XXBTZUSD": {
+            "a": ["50100.0", "1", "1.500"],
+            "b": ["50000.0", "2", "2.000"],
+            "c": ["50050.0", "0.25"],
+        }
+    },
+}
+
+
+@pytest.mark.unit
+class TestKrakenDecoding:
+
+    def test_decode_ticker_from_bytes(self):
+        """Test that raw bytes decode into a typed ticker"""
+        tickers = kraken_decoding.decode_ticker(json.dumps(KRAKEN_TICKER).encode())
+
+        assert tickers["XXBTZUSD"] == Ticker(
+            pair="XXBTZUSD",
+            last=50050.0,
+            volume=0.25,
+            bid=50000.0,
+            ask=50100.0,
+            bid_size=2.0,
+            ask_size=1.5,
+        )
+
+    def test_ticker_without_last_price_skipped(self):
+        """Test that pairs with no last trade are left out"""
+        payload = {"error": [], "result": {"XXBTZUSD": {"c": ["", "0"]}}}
+
+        assert kraken_decoding.decode_ticker(payload) == {}
+
+    def test_error_raises_payload_error(self):
+        """Test that Kraken error arrays surface as PayloadError"""
+        with pytest.raises(PayloadError, match="EQuery:Unknown asset pair"):
+            kraken_decoding.decode_ticker({"error": ["EQuery:Unknown asset pair"]})
+
+    def test_find_pair_aliases(self):
+        """Test that requested pairs resolve to Kraken's own names"""
+        decoded = {"XXBTZUSD": 1, "XETHZUSD": 2}
+
+        assert kraken_decoding.find_pair(decoded, "BTCUSD") == 1
+        assert kraken_decoding.find_pair(decoded, "ETHUSD") == 2
+        assert kraken_decoding.find_pair(decoded, "SOLUSD") is None
+        assert kraken_decoding.find_pair({"SOLUSD": 3}, "SOLUSD") == 3
+
+    def test_decode_asset_pairs(self):
+        """Test that every pair name form maps to Kraken's result key"""
+        payload = {
+            "error": [],
+            "result": {"XXBTZEUR": {"altname": "XBTEUR", "wsname": "XBT/EUR"}},
+        }
+
+        names = kraken_decoding.decode_asset_pairs(payload)
+
+        assert names["BTCEUR"] == "XXBTZEUR"
+        assert names["XBTEUR"] == "XXBTZEUR"
+        assert names["XXBTZEUR"] == "XXBTZEUR"
+
+    def test_decode_fee_schedules(self):
+        """Test that the lowest tier of the taker and maker schedules is used"""
+        payload = {
+            "error": [],
+            "result": {
+                "XXBTZUSD": {
+                    "fees": [[0, 0.4], [10000, 0.35]],
+                    "fees_maker": [[0, 0.25], [10000, 0.2]],
+                },
+                "XETHZUSD": {"fees": [[0, 0.4]]},
+                "USDTZUSD": {},
+            },
+        }
+
+        schedules = kraken_decoding.decode_fee_schedules(payload)
+
+        assert schedules == {
+            "XXBTZUSD": FeeSchedule(maker=0.25, taker=0.4),
+            "XETHZUSD": FeeSchedule(maker=0.4, taker=0.4),
+        }
+
+    def test_decode_depth(self):
+        """Test that depth levels become (price, volume) floats"""
+        payload = {
+            "error": [],
+            "result": {
+                "XXBTZUSD": {
+                    "bids": [["50000.0", "1.0", 1700000000]],
+                    "asks": [["50100.0", "0.5", 1700000000]],
+                }
+            },
+        }
+
+        depth = kraken_decoding.decode_depth(payload)["XXBTZUSD"]
+
+        assert depth.bids == [(50000.0, 1.0)]
+        assert depth.asks == [(50100.0, 0.5)]
+
+    def test_decode_trades_drops_cursor(self):
+        """Test that trades decode with sides and the last cursor is dropped"""
+        payload = {
+            "error": [],
+            "result": {
+                "XXBTZUSD": [
+                    ["50000.0", "0.1", 1700000000.5, "b", "l", "", 1],
+                    ["50010.0", "0.2", 1700000001.5, "s", "m", "", 2],
+                ],
+                "last": "1700000001500000000",
+            },
+        }
+
+        trades = kraken_decoding.decode_trades(payload)
+
+        assert list(trades) == ["XXBTZUSD"]
+        assert [t.side for t in trades["XXBTZUSD"]] == ["buy", "sell"]
+        assert trades["XXBTZUSD"][1].price == 50010.0
+
+
+@pytest.mark.unit
+class TestCoinmateDecoding:
+
+    def test_decode_ticker(self):
+        """Test that a Coinmate ticker decodes without sizes"""
+        payload = json.dumps(
+            {
+                "error": False,
+                "errorMessage": None,
+                "data": {
+                    "last": 1200000.0,
+                    "amount": 3.5,
+                    "bid": 1199000.0,
+                    "ask": 1201000.0,
+                },
+            }
+        )
+
+        ticker = coinmate_decoding.decode_ticker(payload, "BTC_CZK")
+
+        assert ticker.last == 1200000.0
+        assert ticker.volume == 3.5
+        assert (ticker.bid, ticker.ask) == (1199000.0, 1201000.0)
+        assert ticker.bid_size is None
+
+    def test_error_raises_payload_error(self):
+        """Test that Coinmate errors surface as PayloadError"""
+        payload = {"error": True, "errorMessage": "Invalid currency pair", "data": None}
+
+        with pytest.raises(PayloadError, match="Invalid currency pair"):
+            coinmate_decoding.decode_ticker(payload, "BTC_XXX")
+
+    def test_missing_price_raises(self):
+        """Test that a ticker without a last price is rejected"""
+        with pytest.raises(PayloadError):
+            coinmate_decoding.decode_ticker({"error": False, "data": {}}, "BTC_CZK")
+
+    def test_decode_trader_fees(self):
+        """Test maker and taker fees, and rejection without a taker fee"""
+        fees = coinmate_decoding.decode_trader_fees(
+            {"error": False, "data": {"maker": 0.35, "taker": 0.5}}, "BTC_EUR"
+        )
+        assert fees == FeeSchedule(maker=0.35, taker=0.5)
+
+        with pytest.raises(PayloadError, match="BTC_EUR"):
+            coinmate_decoding.decode_trader_fees(
+                {"error": False, "data": {"maker": 0.35}}, "BTC_EUR"
+            )
+
+    def test_decode_order_book_and_transactions(self):
+        """Test order book levels and millisecond trade timestamps"""
+        book = coinmate_decoding.decode_order_book(
+            {
+                "error": False,
+                "data": {
+                    "bids": [{"price": 1199000.0, "amount": 0.1}],
+                    "asks": [{"price": 1201000.0, "amount": 0.2}],
+                },
+            },
+            "BTC_CZK",
+        )
+        trades = coinmate_decoding.decode_transactions(
+            {
+                "error": False,
+                "data": [
+                    {
+                        "timestamp": 1700000000500,
+                        "price": 1200000.0,
+                        "amount": 0.01,
+                        "tradeType": "BUY",
+                    }
+                ],
+            }
+        )
+
+        assert book.bids == [(1199000.0, 0.1)]
+        assert book.asks == [(1201000.0, 0.2)]
+        assert trades[0].timestamp == 1700000000.5
+        assert trades[0].side == "buy"
@@ -98,6 +98,120 @@ class TestKrakenAPI:
 
             assert result is None
 
+    async def test_fetch_normalized_ticker(self):
+        """Test that a ticker under Kraken's pair name decodes for the requested pair"""
+        mock_response = {
+            "error": [],
+            "result": {
+                "XXBTZUSD": {
+                    "a": ["102500.0", "1", "1.000"],
+                    "b": ["102499.0", "2", "2.000"],
+                    "c": ["102500.0", "0.15000000"],
+                }
+            },
+        }
+
+        with aioresponses() as m:
+            m.get(
+                "https://api.kraken.com/0/public/Ticker?pair=BTCUSD",
+                payload=mock_response,
+            )
+
+            async with KrakenAPI() as api:
+                ticker = await api.fetch_normalized_ticker("BTC/USD")
+
+        assert ticker.pair == "BTCUSD"
+        assert ticker.last == 102500.0
+        assert (ticker.bid, ticker.bid_size) == (102499.0, 2.0)
+        assert (ticker.ask, ticker.ask_size) == (102500.0, 1.0)
+
+    async def test_fetch_normalized_tickers_single_request(self):
+        """Test that several pairs are fetched with one multi-pair request"""
+        asset_pairs = {
+            "error": [],
+            "result": {
+                "XXBTZUSD": {"altname": "XBTUSD", "wsname": "XBT/USD"},
+                "XETHZUSD": {"altname": "ETHUSD", "wsname": "ETH/USD"},
+            },
+        }
+        mock_response = {
+            "error": [],
+            "result": {
+                "XXBTZUSD": {"c": ["102500.0", "0.1"]},
+                "XETHZUSD": {"c": ["3500.0", "1.0"]},
+            },
+        }
+
+        with aioresponses() as m:
+            m.get("https://api.kraken.com/0/public/AssetPairs", payload=asset_pairs)
+            m.get(
+                "https://api.kraken.com/0/public/Ticker?pair=XXBTZUSD,XETHZUSD",
+                payload=mock_response,
+                repeat=True,
+            )
+
+            async with KrakenAPI() as api:
+                pairs = ["BTC/USD", "ETH/USD", "SOL/USD"]
+                tickers = await api.fetch_normalized_tickers(pairs)
+                await api.fetch_normalized_tickers(pairs)
+
+        # AssetPairs is resolved once; unlisted SOL/USD is not sent to Kraken
+        assert [len(calls) for calls in m.requests.values()] == [1, 2]
+        assert tickers["BTC/USD"].last == 102500.0
+        assert tickers["BTC/USD"].pair == "BTCUSD"
+        assert tickers["ETH/USD"].last == 3500.0
+        assert "SOL/USD" not in tickers
+
+    async def test_fetch_fee_schedules(self):
+        """Test that fees of several pairs come from one AssetPairs request"""
+        asset_pairs = {
+            "error": [],
+            "result": {
+                "XXBTZUSD": {
+                    "altname": "XBTUSD",
+                    "wsname": "XBT/USD",
+                    "fees": [[0, 0.4]],
+                    "fees_maker": [[0, 0.25]],
+                },
+                "XETHZUSD": {
+                    "altname": "ETHUSD",
+                    "wsname": "ETH/USD",
+                    "fees": [[0, 0.4]],
+                    "fees_maker": [[0, 0.25]],
+                },
+            },
+        }
+
+        with aioresponses() as m:
+            m.get("https://api.kraken.com/0/public/AssetPairs", payload=asset_pairs)
+
+            async with KrakenAPI() as api:
+                fees = await api.fetch_fee_schedules(["BTC/USD", "ETH/USD", "SOL/USD"])
+                pair_names = await api.load_pair_names()
+
+        assert set(fees) == {"BTC/USD", "ETH/USD"}
+        assert fees["BTC/USD"].maker == 0.25
+        assert fees["BTC/USD"].taker == 0.4
+        # The same response primed the pair name cache
+        assert pair_names["BTCUSD"] == "XXBTZUSD"
+
+    async def test_fetch_normalized_tickers_without_asset_pairs(self):
+        """Test that pair aliasing falls back to known name forms"""
+        with aioresponses() as m:
+            m.get("https://api.kraken.com/0/public/AssetPairs", status=500)
+            m.get(
+                "https://api.kraken.com/0/public/Ticker?pair=BTCUSD",
+                payload={
+                    "error": [],
+                    "result": {"XXBTZUSD": {"c": ["102500.0", "0.1"]}},
+                },
+            )
+
+            async with KrakenAPI() as api:
+                tickers = await api.fetch_normalized_tickers(["BTC/USD"])
+
+        assert tickers["BTC/USD"].last == 102500.0
+
     async def test_get_ohlc_success(self):
         """Test successful OHLC retrieval"""
         mock_ohlc = {
@@ -0,0 +1,223 @@
+"""
+Tests for the Kraken WebSocket v2 stream, run against a local fake server.
+"""
+
+import asyncio
+import json
+
+import pytest
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
+
+from src.apis.base_stream import create_exchange_stream
+from src.apis.kraken.websocket import KrakenWebSocketStream
+from src.core.exchange_monitor import ExchangeMonitor
+
+TICKER_UPDATE = {
+    "channel": "ticker",
+    "type": "update",
+    "data": [
+        {
+            "symbol": "BTC/USD",
+            "bid": 102499.0,
+            "bid_qty": 0.5,
+            "ask": 102501.0,
+            "ask_qty": 0.7,
+            "last": 102500.0,
+            "volume": 150.5,
+        }
+    ],
+}
+
+
+class FakeKrakenServer:
+    """Minimal Kraken v2 stand-in that acks subscriptions and replays ticks"""
+
+    def __init__(self, drop_first_connection: bool = False):
+        self.subscriptions = []
+        self.connections = 0
+        self.drop_first_connection = drop_first_connection
+        self.server = None
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            request_data = json.loads(msg.data)
+            self.subscriptions.append(request_data)
+            await ws.send_json(
+                {
+                    "method": "subscribe",
+                    "success": True,
+                    "result": request_data["params"],
+                }
+            )
+            if request_data["params"]["channel"] == "ticker":
+                if self.drop_first_connection and self.connections == 1:
+                    await ws.close()
+                    break
+                await ws.send_json({"channel": "heartbeat"})
+                await ws.send_json(TICKER_UPDATE)
+            elif request_data["params"]["channel"] == "book":
+                await ws.send_json(
+                    {
+                        "channel": "book",
+                        "type": "snapshot",
+                        "data": [
+                            {
+                                "symbol": "BTC/USD",
+                                "bids": [{"price": 102499.0, "qty": 0.5}],
+                                "asks": [{"price": 102501.0, "qty": 0.7}],
+                                "checksum": 0,
+                            }
+                        ],
+                    }
+                )
+        return ws
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/v2", self.handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.server.close()
+
+    @property
+    def url(self):
+        return str(self.server.make_url("/v2")).replace("http://", "ws://")
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met before timeout")
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.unit
+class TestKrakenWebSocketStream:
+
+    def test_subscribe_messages(self):
+        """Test ticker and book subscription payloads"""
+
+        async def noop(*args):
+            pass
+
+        stream = KrakenWebSocketStream(["BTC/USD"], book_depth=10, on_book=noop)
+        messages = stream.build_subscribe_messages()
+
+        assert messages[0] == {
+            "method": "subscribe",
+            "params": {"channel": "ticker", "symbol": ["BTC/USD"]},
+        }
+        assert messages[1]["params"]["channel"] == "book"
+        assert messages[1]["params"]["depth"] == 10
+
+    def test_factory(self):
+        """Test creating a Kraken stream through the factory"""
+        stream = create_exchange_stream("kraken", ["BTC/USD"])
+        assert isinstance(stream, KrakenWebSocketStream)
+        assert stream.url == "wss://ws.kraken.com/v2"
+
+        with pytest.raises(ValueError, match="Streaming not supported"):
+            create_exchange_stream("binance", ["BTC/USD"])
+
+    async def test_receives_ticker_and_book(self):
+        """Test ticker and book updates from the fake server"""
+        tickers = []
+        quotes = []
+        books = []
+
+        async def on_ticker(exchange, symbol, price, volume, **quote):
+            tickers.append((exchange, symbol, price, volume))
+            quotes.append(quote)
+
+        async def on_book(exchange, symbol, bids, asks, is_snapshot, checksum):
+            books.append((symbol, bids, asks, is_snapshot))
+
+        async with FakeKrakenServer() as fake:
+            stream = KrakenWebSocketStream(
+                ["BTC/USD"],
+                book_depth=10,
+                on_ticker=on_ticker,
+                on_book=on_book,
+                url=fake.url,
+            )
+            task = asyncio.create_task(stream.run())
+            await _wait_for(lambda: tickers and books)
+            await stream.stop()
+            await asyncio.wait_for(task, 2)
+
+        assert tickers == [("kraken", "BTC/USD", 102500.0, 150.5)]
+        assert quotes == [
+            {"bid": 102499.0, "ask": 102501.0, "bid_size": 0.5, "ask_size": 0.7}
+        ]
+        assert books == [("BTC/USD", [(102499.0, 0.5)], [(102501.0, 0.7)], True)]
+
+    async def test_reconnects_and_resubscribes(self):
+        """Test that a dropped connection is re-established and resubscribed"""
+        tickers = []
+
+        async def on_ticker(exchange, symbol, price, volume, **quote):
+            tickers.append(price)
+
+        async with FakeKrakenServer(drop_first_connection=True) as fake:
+            stream = KrakenWebSocketStream(
+                ["BTC/USD"], on_ticker=on_ticker, url=fake.url, reconnect_delay=0.01
+            )
+            task = asyncio.create_task(stream.run())
+            await _wait_for(lambda: tickers)
+            await stream.stop()
+            await asyncio.wait_for(task, 2)
+
+            assert fake.connections == 2
+            assert len(fake.subscriptions) == 2
+        assert stream.connection_count == 2
+
+
+@pytest.mark.unit
+class TestMonitorStreaming:
+
+    async def test_ingest_ticker_updates_latest_prices(self):
+        """Test that pushed tickers land in latest_prices"""
+        monitor = ExchangeMonitor(
+            ["kraken", "coinmate"],
+            {"kraken": "BTC/USD", "coinmate": "BTC/CZK"},
+            price_sources={"kraken": "websocket"},
+        )
+
+        price_data = await monitor.ingest_ticker("kraken", "BTC/USD", 102500.0, 1.5)
+
+        assert monitor.latest_prices["kraken"] is price_data
+        assert price_data.price_usd == 102500.0
+        assert monitor.get_streamed_exchanges() == ["kraken"]
+        assert monitor.get_polled_exchanges() == ["coinmate"]
+
+        # Updates for pairs we do not monitor are ignored
+        assert await monitor.ingest_ticker("kraken", "ETH/USD", 3000.0, 1.0) is None
+        await monitor.close()
+
+    async def test_start_streams_feeds_monitor(self):
+        """Test the monitor wiring against the fake server"""
+        monitor = ExchangeMonitor(
+            ["kraken"], {"kraken": "BTC/USD"}, price_sources={"kraken": "websocket"}
+        )
+
+        async with FakeKrakenServer() as fake:
+            monitor.start_streams()
+            monitor.streams["kraken"].url = fake.url
+            await _wait_for(lambda: "kraken" in monitor.latest_prices)
+            await monitor.close()
+
+        assert monitor.latest_prices["kraken"].price == 102500.0
+        assert monitor.latest_prices["kraken"].bid == 102499.0
+        assert monitor.latest_prices["kraken"].ask_size == 0.7
+        assert monitor.streams == {}
@@ -0,0 +1,102 @@
+"""
+Tests for the lazily importing exchange adapter registry.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from src.apis.kraken.api import KrakenAPI
+from src.apis.registry import ExchangeRegistry, parse_adapter_list
+from tests.unit.apis.test_base_exchange import MockExchangeAPI
+
+
+@pytest.mark.unit
+class TestExchangeRegistry:
+
+    def test_builtins_not_imported_until_used(self):
+        """Test that adapters are only imported on first use"""
+        registry = ExchangeRegistry(entry_point_group=None)
+
+        assert registry.available() == ["coinmate", "kraken"]
+        assert not registry.is_loaded("kraken")
+
+        assert registry.adapter_class("Kraken") is KrakenAPI
+        assert registry.is_loaded("kraken")
+        assert not registry.is_loaded("coinmate")
+
+    def test_package_import_does_not_load_clients(self):
+        """Test that importing src.apis leaves exchange clients and aiohttp unloaded"""
+        code = (
+            "import sys, src.apis; "
+            "print('aiohttp' in sys.modules, 'src.apis.kraken.api' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.split() == ["False", "False"]
+
+    def test_configured_adapter(self):
+        """Test registering an adapter by import path"""
+        registry = ExchangeRegistry(
+            {"mock": "tests.unit.apis.test_base_exchange:MockExchangeAPI"},
+            entry_point_group=None,
+        )
+
+        api = registry.create("mock", api_key="key", api_secret="secret")
+
+        assert isinstance(api, MockExchangeAPI)
+        assert api.is_authenticated()
+
+    def test_unknown_exchange(self):
+        """Test that unknown exchanges raise ValueError"""
+        registry = ExchangeRegistry(entry_point_group=None)
+
+        with pytest.raises(ValueError, match="Unsupported exchange: binance"):
+            registry.get("binance")
+
+    def test_clients_cached_per_credentials(self):
+        """Test that get() reuses one client per exchange and credentials"""
+        registry = ExchangeRegistry(entry_point_group=None)
+
+        first = registry.get("kraken", api_key="a", api_secret="s")
+        again = registry.get("KRAKEN", api_key="a", api_secret="s")
+        other = registry.get("kraken", api_key="b", api_secret="s")
+
+        assert first is again
+        assert first is not other
+
+    def test_client_id_only_for_adapters_that_declare_it(self):
+        """Test that extra credentials are passed only where accepted"""
+        registry = ExchangeRegistry(entry_point_group=None)
+
+        coinmate = registry.create("coinmate", client_id="client")
+        kraken = registry.create("kraken", client_id="client")
+
+        assert coinmate.client_id == "client"
+        assert kraken.get_exchange_name() == "kraken"
+
+    async def test_shared_client_keeps_session_until_last_exit(self):
+        """Test that overlapping async with blocks share one session"""
+        api = MockExchangeAPI()
+
+        await api._open_session()
+        session = api.session
+        await api._open_session()
+        await api._close_session()
+
+        assert api.session is session
+
+        await api._close_session()
+        assert api.session is None
+
+    def test_parse_adapter_list(self):
+        """Test parsing of the EXCHANGE_ADAPTERS setting"""
+        assert parse_adapter_list("") == {}
+        assert parse_adapter_list(" Binance=venues.binance:BinanceAPI, ") == {
+            "binance": "venues.binance:BinanceAPI"
+        }
+        with pytest.raises(ValueError):
+            parse_adapter_list("binance")
@@ -2,11 +2,13 @@
 Tests for the arbitrage detector module.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
+from config.settings import COINMATE_TRADING_FEE, KRAKEN_TRADING_FEE
 from src.core.arbitrage_detector import ArbitrageDetector, ArbitrageOpportunity
+from src.core.opportunity_index import OpportunityIndex
 
 
 @pytest.mark.unit
@@ -21,7 +23,7 @@ class TestArbitrageDetector:
         assert detector.min_profit_percentage == 0.5
         assert detector.large_exchanges == ["kraken"]
         assert detector.small_exchanges == ["coinmate"]
-        assert detector.opportunities == []
+        assert len(detector.opportunities) == 0
 
     def test_is_valid_arbitrage_pair(self):
         """Test valid arbitrage pair checking"""
@@ -47,92 +49,62 @@ class TestArbitrageDetector:
         #     'coinmate', 'other_small'
         # ) is False
 
-    @patch("src.core.arbitrage_detector.DYNAMIC_FEES_ENABLED", False)
-    async def test_get_trading_fees(self):
-        """Test trading fee retrieval"""
-        mock_monitor = MagicMock()
-        mock_monitor.api_keys = {}
-        detector = ArbitrageDetector(mock_monitor)
-
-        # Known exchanges (using static fees when dynamic disabled)
-        kraken_coinmate_fee = await detector._get_trading_fees("kraken", "coinmate")
-        assert kraken_coinmate_fee == 0.26 + 0.6  # 0.86%
-
-        # Unknown exchange (should use default)
-        unknown_fee = await detector._get_trading_fees("unknown", "coinmate")
-        assert unknown_fee == 0.25 + 0.6  # 0.85%
-
-    def test_calculate_opportunity_valid(
+    async def test_detected_profit_net_of_fees(
         self, sample_btc_usd_price, sample_btc_czk_price
     ):
-        """Test calculation of valid arbitrage opportunity"""
+        """Test that detected profit is the spread less both taker fees"""
+        # Buy low (coinmate), sell high (kraken)
+        sample_btc_usd_price.price_usd = 103000.0
         mock_monitor = MagicMock()
+        mock_monitor.latest_prices = {
+            "kraken": sample_btc_usd_price,
+            "coinmate": sample_btc_czk_price,
+        }
+        mock_monitor.latest_books = {}
         detector = ArbitrageDetector(mock_monitor, min_profit_percentage=0.1)
 
-        # Modify prices to create profitable opportunity
-        # Buy low (coinmate), sell high (kraken)
-        buy_data = sample_btc_czk_price  # 102083.33 USD
-        sell_data = sample_btc_usd_price  # 102500.0 USD
-
-        # Make sell price higher to ensure profit after fees
-        sell_data.price_usd = 103000.0  # Higher sell price
-
-        opportunity = detector._calculate_opportunity(
-            "coinmate", buy_data, "kraken", sell_data
-        )
+        opportunities = await detector.detect_opportunities()
 
-        assert opportunity is not None
+        assert len(opportunities) == 1
+        opportunity = opportunities[0]
         assert opportunity.buy_exchange == "coinmate"
         assert opportunity.sell_exchange == "kraken"
         assert opportunity.buy_price == 102083.33
         assert opportunity.sell_price == 103000.0
         assert opportunity.profit_usd == pytest.approx(916.67, rel=1e-3)
-
-        # Profit percentage should be positive (note: sync method doesn't calculate fees)
-        expected_gross_profit = (916.67 / 102083.33) * 100  # ~0.9%
-        # Sync method returns gross profit, fees calculated separately in async context
+        gross_profit = (916.67 / 102083.33) * 100  # ~0.9%
         assert opportunity.profit_percentage == pytest.approx(
-            expected_gross_profit, rel=1e-2
+            gross_profit - (KRAKEN_TRADING_FEE + COINMATE_TRADING_FEE), rel=1e-3
         )
 
-    def test_calculate_opportunity_no_profit(
-        self, sample_btc_usd_price, sample_btc_czk_price
-    ):
-        """Test calculation when no profit exists"""
+    async def test_detect_no_profit(self, sample_btc_usd_price, sample_btc_czk_price):
+        """Test that equal prices on both venues are not an opportunity"""
+        sample_btc_usd_price.price_usd = sample_btc_czk_price.price_usd
         mock_monitor = MagicMock()
-        detector = ArbitrageDetector(mock_monitor)
-
-        # Sell price lower than buy price
-        buy_data = sample_btc_usd_price  # 102500.0 USD (higher)
-        sell_data = sample_btc_czk_price  # 102083.33 USD (lower)
-
-        opportunity = detector._calculate_opportunity(
-            "kraken", buy_data, "coinmate", sell_data
-        )
+        mock_monitor.latest_prices = {
+            "kraken": sample_btc_usd_price,
+            "coinmate": sample_btc_czk_price,
+        }
+        mock_monitor.latest_books = {}
+        detector = ArbitrageDetector(mock_monitor, min_profit_percentage=0.0)
 
-        assert opportunity is None
+        assert await detector.detect_opportunities() == []
 
-    def test_calculate_opportunity_fees_too_high(
+    async def test_detect_fees_too_high(
         self, sample_btc_usd_price, sample_btc_czk_price
     ):
-        """Test calculation when fees exceed profit"""
+        """Test that a spread smaller than the fees is not reported"""
+        # Only $116.67 profit, below the round-trip fees
+        sample_btc_usd_price.price_usd = 102200.0
         mock_monitor = MagicMock()
-        detector = ArbitrageDetector(mock_monitor, min_profit_percentage=0.1)
-
-        # Create small price difference that gets wiped out by fees
-        buy_data = sample_btc_czk_price  # 102083.33 USD
-
-        # Small price increase
-        sell_data = sample_btc_usd_price
-        sell_data.price_usd = 102200.0  # Only $116.67 profit
-
-        opportunity = detector._calculate_opportunity(
-            "coinmate", buy_data, "kraken", sell_data
-        )
+        mock_monitor.latest_prices = {
+            "kraken": sample_btc_usd_price,
+            "coinmate": sample_btc_czk_price,
+        }
+        mock_monitor.latest_books = {}
+        detector = ArbitrageDetector(mock_monitor, min_profit_percentage=0.0)
 
-        # Sync method doesn't account for fees, so this will not be None
-        # Fees are only applied in async detect_opportunities method
-        assert opportunity is not None
+        assert await detector.detect_opportunities() == []
 
     async def test_detect_opportunities_empty_prices(self):
         """Test opportunity detection with no price data"""
@@ -145,7 +117,6 @@ class TestArbitrageDetector:
 
         assert opportunities == []
 
-    @patch("src.core.arbitrage_detector.DYNAMIC_FEES_ENABLED", False)
     async def test_detect_opportunities_with_data(
         self, sample_btc_usd_price, sample_btc_czk_price
     ):
@@ -174,7 +145,6 @@ class TestArbitrageDetector:
         assert opp.sell_exchange == "kraken"
         assert opp.profit_usd > 0
 
-    @patch("src.core.arbitrage_detector.DYNAMIC_FEES_ENABLED", False)
     async def test_detect_opportunities_filters_by_min_profit(
         self, sample_btc_usd_price, sample_btc_czk_price
     ):
@@ -194,6 +164,38 @@ class TestArbitrageDetector:
         # Should find no opportunities due to high threshold
         assert len(opportunities) == 0
 
+    async def test_detect_uses_bid_ask_not_last(
+        self, sample_btc_usd_price, sample_btc_czk_price
+    ):
+        """Test that a last-trade spread closed by the quotes is not reported"""
+        # Last trades show a 1.9% spread...
+        sample_btc_usd_price.price_usd = 104000.0
+        # ...but the executable quotes are much closer together
+        sample_btc_czk_price.ask_usd = 103000.0
+        sample_btc_usd_price.bid_usd = 103600.0
+
+        mock_monitor = MagicMock()
+        mock_monitor.latest_prices = {
+            "kraken": sample_btc_usd_price,
+            "coinmate": sample_btc_czk_price,
+        }
+        mock_monitor.latest_books = {}
+        mock_monitor.api_keys = {}
+
+        detector = ArbitrageDetector(mock_monitor, min_profit_percentage=0.1)
+        assert await detector.detect_opportunities() == []
+
+        # Widen the quotes and the opportunity is priced at ask/bid
+        sample_btc_usd_price.bid_usd = 104000.0
+        sample_btc_czk_price.ask_size = 0.3
+        sample_btc_usd_price.bid_size = 0.2
+        opportunities = await detector.detect_opportunities()
+
+        assert len(opportunities) == 1
+        assert opportunities[0].buy_price == 103000.0
+        assert opportunities[0].sell_price == 104000.0
+        assert opportunities[0].volume_limit == 0.2
+
     def test_get_best_opportunities(self):
         """Test getting best opportunities from history"""
         import time
@@ -226,13 +228,31 @@ class TestArbitrageDetector:
             volume_limit=5,  # 30 seconds ago
         )
 
-        detector.opportunities = [opp1, opp2]
+        detector.record_opportunities([opp1, opp2])
 
         best = detector.get_best_opportunities(limit=1)
 
         assert len(best) == 1
         assert best[0].profit_percentage == 1.5  # Higher profit percentage
 
+    def test_get_best_opportunities_short_horizon(self):
+        """Test that the default window is clamped to a shorter index horizon"""
+        import time
+
+        detector = ArbitrageDetector(MagicMock())
+        detector.recent_opportunities = OpportunityIndex(horizon=120)
+        detector.record_opportunities(
+            [
+                ArbitrageOpportunity(
+                    "coinmate", "kraken", 1.0, 2.0, 1.0, 0.5, time.time() - 30, 1.0
+                )
+            ]
+        )
+
+        best = detector.get_best_opportunities()
+
+        assert [opp.profit_percentage for opp in best] == [0.5]
+
 
 @pytest.mark.unit
 class TestArbitrageOpportunity:
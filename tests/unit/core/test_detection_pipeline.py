@@ -0,0 +1,187 @@
+"""
+Tests for the event-driven detection pipeline.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.arbitrage_detector import ArbitrageDetector
+from src.core.data_models import PriceData
+from src.core.detection_pipeline import DetectionPipeline, PriceUpdateBus
+from src.core.exchange_monitor import ExchangeMonitor
+from src.utils.metrics import LatencyTracker
+
+
+def make_price(exchange: str, price_usd: float = 100000.0) -> PriceData:
+    return PriceData(exchange, "BTC/USD", price_usd, price_usd, "USD", 0.0)
+
+
+@pytest.mark.unit
+class TestPriceUpdateBus:
+
+    async def test_batch_drains_queue(self):
+        """Test that a batch contains everything queued so far"""
+        bus = PriceUpdateBus()
+        bus.publish(make_price("kraken"))
+        bus.publish(make_price("coinmate"))
+
+        batch = await bus.get_batch()
+
+        assert [u.price_data.exchange for u in batch] == ["kraken", "coinmate"]
+        assert bus.qsize() == 0
+
+    async def test_full_bus_drops_oldest(self):
+        """Test that a full bus drops the oldest update instead of blocking"""
+        bus = PriceUpdateBus(maxsize=2)
+        for price in (1.0, 2.0, 3.0):
+            bus.publish(make_price("kraken", price))
+
+        batch = await bus.get_batch()
+
+        assert [u.price_data.price for u in batch] == [2.0, 3.0]
+        assert bus.dropped == 1
+
+    async def test_monitor_publishes_recorded_prices(self, trading_pairs):
+        """Test that every recorded price reaches the bus"""
+        bus = PriceUpdateBus()
+        monitor = ExchangeMonitor(["kraken"], trading_pairs, update_bus=bus)
+
+        await monitor._record_price(make_price("kraken"))
+        await monitor.close()
+
+        assert bus.published == 1
+
+
+@pytest.mark.unit
+class TestDetectionPipeline:
+
+    async def test_batch_coalesced_per_exchange(self):
+        """Test that detection runs once for the exchanges in a burst"""
+        detector = MagicMock()
+        detector.detect_opportunities = AsyncMock(return_value=[])
+        bus = PriceUpdateBus()
+        pipeline = DetectionPipeline(detector, bus)
+
+        for _ in range(3):
+            bus.publish(make_price("kraken"))
+        await pipeline.process_batch(await bus.get_batch())
+
+        detector.detect_opportunities.assert_awaited_once_with(
+            changed_exchanges=["kraken"]
+        )
+        stats = pipeline.get_latency_stats()
+        assert stats["detection"]["count"] == 1
+        assert stats["signal"]["count"] == 0
+        assert stats["updates"] == 3
+
+    async def test_opportunities_signalled(self):
+        """Test that results are passed to the callback and timed"""
+        opportunity = MagicMock()
+        detector = MagicMock()
+        detector.detect_opportunities = AsyncMock(return_value=[opportunity])
+        on_opportunities = AsyncMock()
+        bus = PriceUpdateBus()
+        pipeline = DetectionPipeline(detector, bus, on_opportunities)
+
+        task = asyncio.create_task(pipeline.run())
+        bus.publish(make_price("coinmate"))
+        for _ in range(50):
+            if on_opportunities.await_count:
+                break
+            await asyncio.sleep(0.01)
+        pipeline.stop()
+        task.cancel()
+
+        on_opportunities.assert_awaited_once_with([opportunity])
+        assert pipeline.signal_latency.last >= 0
+
+    async def test_cycles_signalled(self):
+        """Test that cycles through changed quotes are searched when a callback is set"""
+        cycle = MagicMock()
+        detector = MagicMock()
+        detector.detect_opportunities = AsyncMock(return_value=[])
+        detector.detect_cycles.return_value = [cycle]
+        on_cycles = AsyncMock()
+        bus = PriceUpdateBus()
+        pipeline = DetectionPipeline(detector, bus, on_cycles=on_cycles)
+
+        bus.publish(make_price("kraken"))
+        await pipeline.process_batch(await bus.get_batch())
+
+        detector.detect_cycles.assert_called_once_with(changed_only=True)
+        on_cycles.assert_awaited_once_with([cycle])
+
+    async def test_events_signalled(self):
+        """Test that with an event callback only lifecycle transitions are signalled"""
+        opened, closed = MagicMock(kind="open"), MagicMock(kind="close")
+        detector = MagicMock()
+        detector.track_opportunities = AsyncMock(return_value=[opened, closed])
+        detector.detect_opportunities = AsyncMock()
+        on_opportunities, on_events = AsyncMock(), AsyncMock()
+        bus = PriceUpdateBus()
+        pipeline = DetectionPipeline(
+            detector, bus, on_opportunities, on_events=on_events
+        )
+
+        bus.publish(make_price("kraken"))
+        opportunities = await pipeline.process_batch(await bus.get_batch())
+
+        detector.detect_opportunities.assert_not_awaited()
+        detector.track_opportunities.assert_awaited_once_with(
+            changed_exchanges=["kraken"]
+        )
+        on_events.assert_awaited_once_with([opened, closed])
+        on_opportunities.assert_awaited_once_with([opened.opportunity])
+        assert opportunities == [opened.opportunity]
+
+    @patch("src.core.arbitrage_detector.LARGE_EXCHANGES", ["kraken", "bitstamp"])
+    @patch("src.core.arbitrage_detector.SMALL_EXCHANGES", ["coinmate", "anycoin"])
+    async def test_detection_limited_to_changed(self):
+        """Test that incremental detection only pairs the changed exchange"""
+        monitor = MagicMock()
+        monitor.latest_prices = {
+            name: make_price(name, price_usd)
+            for name, price_usd in (
+                ("kraken", 100000.0),
+                ("bitstamp", 100000.0),
+                ("coinmate", 110000.0),
+                ("anycoin", 90000.0),
+            )
+        }
+        monitor.latest_books = {}
+        detector = ArbitrageDetector(monitor)
+
+        def pairs(opportunities):
+            return sorted((o.buy_exchange, o.sell_exchange) for o in opportunities)
+
+        assert len(await detector.detect_opportunities()) == 4
+        assert pairs(await detector.detect_opportunities(["coinmate"])) == [
+            ("bitstamp", "coinmate"),
+            ("kraken", "coinmate"),
+        ]
+
+
+@pytest.mark.unit
+class TestLatencyTracker:
+
+    def test_stats(self):
+        """Test percentile summaries in milliseconds"""
+        tracker = LatencyTracker(window=100)
+        for i in range(1, 101):
+            tracker.record(i / 1000)
+
+        stats = tracker.stats()
+
+        assert stats["count"] == 100
+        assert stats["last_ms"] == pytest.approx(100.0)
+        assert stats["p50_ms"] == pytest.approx(50.5)
+        assert stats["max_ms"] == pytest.approx(100.0)
+
+    def test_empty(self):
+        """Test that an empty tracker reports no latency"""
+        tracker = LatencyTracker()
+
+        assert tracker.percentile(99) is None
+        assert tracker.stats()["p99_ms"] is None
@@ -0,0 +1,157 @@
+"""
+Tests for the vectorized net-edge detection engine.
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.apis.payloads import FeeSchedule
+from src.core.arbitrage_detector import ArbitrageDetector
+from src.core.data_models import PriceData
+from src.core.edge_engine import DetectionEngine
+from src.core.price_matrix import PriceMatrix
+from src.services.fee_service import FeeMatrix
+
+
+def taker_fees(**fees: float) -> FeeMatrix:
+    return FeeMatrix(
+        exchange_fees={name: FeeSchedule(fee, fee) for name, fee in fees.items()},
+        default=FeeSchedule(0.25, 0.25),
+    )
+
+
+def quote(exchange: str, bid: float, ask: float, symbol: str = "BTC/USD") -> PriceData:
+    mid = (bid + ask) / 2
+    return PriceData(
+        exchange,
+        symbol,
+        mid,
+        mid,
+        "USD",
+        0.0,
+        volume=10.0,
+        bid=bid,
+        ask=ask,
+        bid_usd=bid,
+        ask_usd=ask,
+    )
+
+
+@pytest.mark.unit
+class TestDetectionEngine:
+
+    def test_eligibility_mask(self):
+        """Test that only large/small pairs are eligible"""
+        engine = DetectionEngine(["kraken", "binance"], ["coinmate"])
+
+        mask = engine.eligibility(["kraken", "binance", "coinmate"])
+
+        expected = np.array(
+            [
+                [False, False, True],
+                [False, False, True],
+                [True, True, False],
+            ]
+        )
+        assert (mask == expected).all()
+
+    def test_net_edges_subtract_both_fees(self):
+        """Test that net edges are gross minus buy and sell fees, masked by eligibility"""
+        engine = DetectionEngine(
+            ["kraken", "binance"], ["coinmate"], taker_fees(kraken=0.2, coinmate=0.5)
+        )
+        matrix = PriceMatrix.from_prices(
+            [
+                quote("coinmate", 99.0, 100.0),
+                quote("kraken", 102.0, 103.0),
+                quote("binance", 104.0, 105.0),
+            ]
+        )
+
+        net = engine.net_edges(matrix)
+        coinmate, kraken, binance = (
+            matrix.exchanges.index(name) for name in ("coinmate", "kraken", "binance")
+        )
+
+        assert net[0, coinmate, kraken] == pytest.approx(2.0 - 0.7)
+        # binance falls back to the default fee
+        assert net[0, coinmate, binance] == pytest.approx(4.0 - 0.5 - 0.25)
+        assert np.isnan(net[0, kraken, binance])
+
+    def test_scan_threshold_and_order(self):
+        """Test that scan returns only cells above threshold, best first"""
+        engine = DetectionEngine(
+            ["kraken", "binance"],
+            ["coinmate"],
+            taker_fees(kraken=0.0, binance=0.0, coinmate=0.0),
+        )
+        matrix = PriceMatrix.from_prices(
+            [
+                quote("coinmate", 99.0, 100.0),
+                quote("kraken", 100.5, 101.0),
+                quote("binance", 102.0, 103.0),
+            ]
+        )
+
+        edges = engine.scan(matrix, 0.1)
+        assert [
+            (matrix.exchanges[e.buy_col], matrix.exchanges[e.sell_col]) for e in edges
+        ] == [
+            ("coinmate", "binance"),
+            ("coinmate", "kraken"),
+        ]
+        assert edges[0].net == pytest.approx(2.0)
+
+        assert len(engine.scan(matrix, 1.0)) == 1
+        assert engine.scan(matrix, 0.1, changed_exchanges=["kraken"])[0].net == (
+            pytest.approx(0.5)
+        )
+
+    def test_fee_grid_uses_pair_fees(self):
+        """Test that each cell takes its own pair's fee and new snapshots rebuild the grid"""
+        fees = taker_fees(kraken=0.26, coinmate=0.35)
+        engine = DetectionEngine(["kraken"], ["coinmate"], fees)
+        matrix = PriceMatrix(
+            ["kraken", "coinmate"],
+            {"kraken": ["BTC/USD", "ETH/USD"], "coinmate": ["BTC/CZK"]},
+        )
+
+        grid = engine.fee_grid(matrix)
+        assert engine.fee_grid(matrix) is grid
+        assert grid.tolist() == [[0.26, 0.35], [0.26, 0.35]]
+
+        engine.set_fees(fees.with_fees({("kraken", "ETH/USD"): FeeSchedule(0.1, 0.2)}))
+        assert engine.fee_grid(matrix).tolist() == [[0.26, 0.35], [0.2, 0.35]]
+
+    def test_empty_matrix(self):
+        """Test that an empty matrix yields no edges"""
+        engine = DetectionEngine(["kraken"], ["coinmate"])
+        assert engine.scan(PriceMatrix(["kraken", "coinmate"]), 0.1) == []
+
+    async def test_detector_reads_fee_snapshot(self):
+        """Test that detection uses the fee service's current snapshot"""
+        mock_monitor = MagicMock()
+        mock_monitor.latest_prices = {
+            "kraken": quote("kraken", 104000.0, 104100.0),
+            "coinmate": quote("coinmate", 102000.0, 102100.0),
+        }
+        mock_monitor.latest_books = {}
+        fee_service = MagicMock()
+        fee_service.matrix = taker_fees(kraken=0.26, coinmate=2.0)
+        detector = ArbitrageDetector(
+            mock_monitor, min_profit_percentage=0.1, fee_service=fee_service
+        )
+
+        # 1.86% gross does not cover 2.26% of fees
+        assert await detector.detect_opportunities() == []
+
+        fee_service.matrix = taker_fees(kraken=0.26, coinmate=0.35)
+        opportunities = await detector.detect_opportunities()
+
+        assert len(opportunities) == 1
+        assert opportunities[0].buy_exchange == "coinmate"
+        assert opportunities[0].asset == "BTC"
+        gross = (104000.0 / 102100.0 - 1) * 100
+        assert opportunities[0].profit_percentage == pytest.approx(gross - 0.61)
@@ -0,0 +1,154 @@
+"""
+Tests for exchange health tracking and the circuit breaker.
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.data_models import PriceData
+from src.core.exchange_health import CLOSED, HALF_OPEN, OPEN, ExchangeHealth
+from src.core.exchange_monitor import ExchangeMonitor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_health(clock, **kwargs) -> ExchangeHealth:
+    options = dict(
+        failure_threshold=3,
+        error_rate_threshold=0.5,
+        window_seconds=60,
+        min_calls=4,
+        open_seconds=30,
+        clock=clock,
+    )
+    options.update(kwargs)
+    return ExchangeHealth("kraken", **options)
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+
+    def test_consecutive_failures_open(self):
+        """Test that a run of failures opens the breaker and skips requests"""
+        clock = FakeClock()
+        health = make_health(clock)
+
+        assert health.record_failure(0.1, "boom") is None
+        assert health.record_failure(0.1, "boom") is None
+        assert health.record_failure(0.1, "boom") == OPEN
+
+        assert not health.is_healthy
+        assert not health.allow_request()
+        assert health.skipped == 1
+
+    def test_error_rate_opens(self):
+        """Test that a high error rate opens the breaker without a long streak"""
+        clock = FakeClock()
+        health = make_health(clock, failure_threshold=10)
+
+        health.record_success(0.1)
+        health.record_failure(0.1, "boom")
+        health.record_success(0.1)
+
+        assert health.record_failure(0.1, "boom") == OPEN
+        assert health.error_rate == 0.5
+
+    def test_old_errors_leave_window(self):
+        """Test that errors outside the window no longer count"""
+        clock = FakeClock()
+        health = make_health(clock, failure_threshold=10)
+        health.record_failure(0.1, "boom")
+        health.record_failure(0.1, "boom")
+
+        clock.now += 61
+        health.record_success(0.1)
+
+        assert health.error_rate == 0.0
+
+    def test_half_open_probe_success_closes(self):
+        """Test that one probe is allowed after the cool-down and closes on success"""
+        clock = FakeClock()
+        health = make_health(clock, failure_threshold=1)
+        health.record_failure(0.1, "boom")
+
+        clock.now += 30
+        assert health.allow_request()
+        assert health.state == HALF_OPEN
+        assert not health.allow_request()
+
+        assert health.record_success(0.1) == CLOSED
+        assert health.allow_request()
+
+    def test_half_open_probe_failure_reopens(self):
+        """Test that a failed probe opens the breaker for another cool-down"""
+        clock = FakeClock()
+        health = make_health(clock, failure_threshold=1)
+        health.record_failure(0.1, "boom")
+
+        clock.now += 30
+        health.allow_request()
+
+        assert health.record_failure(0.1, "still down") == OPEN
+        assert not health.allow_request()
+
+    def test_latency_percentiles(self):
+        """Test that call latencies are summarised"""
+        health = make_health(FakeClock())
+        for latency in (0.1, 0.2, 0.3, 0.4, 1.0):
+            health.record_success(latency)
+
+        status = health.get_status()
+
+        assert status["latency_p50_ms"] == pytest.approx(300.0)
+        assert status["latency_p99_ms"] > 900.0
+        assert status["state"] == CLOSED
+
+
+@pytest.mark.unit
+class TestMonitorHealth:
+
+    async def test_open_breaker_evicts_and_skips(self, trading_pairs):
+        """Test that failures evict the price and stop further requests"""
+        monitor = ExchangeMonitor(["kraken"], trading_pairs)
+        monitor.database_writer = MagicMock()
+        monitor.latest_prices["kraken"] = PriceData(
+            "kraken", "BTC/USD", 1.0, 1.0, "USD", time.time()
+        )
+
+        with patch.object(
+            monitor,
+            "_fetch_prices_generic",
+            AsyncMock(side_effect=RuntimeError("down")),
+        ) as fetch:
+            for _ in range(5):
+                await monitor.fetch_price("kraken")
+        await monitor.close()
+
+        assert fetch.await_count == 3
+        assert "kraken" not in monitor.latest_prices
+        assert monitor.health.get("kraken").state == OPEN
+        # Only the first failure and the trip are stored, not every retry
+        assert monitor.database_writer.write_exchange_status.call_count == 2
+
+    async def test_stale_prices_evicted(self, trading_pairs):
+        """Test that an update drops other exchanges' stale prices"""
+        monitor = ExchangeMonitor(["kraken", "coinmate"], trading_pairs, stale_after=10)
+        now = time.time()
+        monitor.latest_prices["coinmate"] = PriceData(
+            "coinmate", "BTC/CZK", 1.0, 1.0, "CZK", now - 30
+        )
+
+        await monitor._record_price(
+            PriceData("kraken", "BTC/USD", 1.0, 1.0, "USD", now)
+        )
+        await monitor.close()
+
+        assert list(monitor.latest_prices) == ["kraken"]
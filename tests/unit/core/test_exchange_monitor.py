@@ -0,0 +1,107 @@
+"""
+Tests for the exchange monitor's REST price parsing.
+"""
+
+import pytest
+from aioresponses import aioresponses
+
+from src.core.exchange_monitor import ExchangeMonitor
+from src.core.order_book import OrderBook
+
+
+@pytest.fixture
+def monitor(trading_pairs, mock_exchange_rates):
+    """Monitor with fixed FX rates so no conversion request is made"""
+    monitor = ExchangeMonitor(["kraken", "coinmate"], trading_pairs)
+    monitor.currency_converter.exchange_rates = mock_exchange_rates
+    monitor.currency_converter.last_update = float("inf")
+    return monitor
+
+
+@pytest.mark.unit
+class TestRestPriceParsing:
+
+    async def test_kraken_bid_ask(self, monitor):
+        """Test that Kraken ticker bid/ask and sizes are kept"""
+        with aioresponses() as m:
+            m.get(
+                "https://api.kraken.com/0/public/Ticker?pair=BTCUSD",
+                payload={
+                    "error": [],
+                    "result": {
+                        "XXBTZUSD": {
+                            "a": ["102501.0", "1", "1.500"],
+                            "b": ["102499.0", "2", "2.000"],
+                            "c": ["102500.0", "0.15000000"],
+                        }
+                    },
+                },
+            )
+            price_data = await monitor.fetch_price("kraken")
+        await monitor.close()
+
+        assert price_data.price == 102500.0
+        assert price_data.bid == 102499.0
+        assert price_data.ask == 102501.0
+        assert price_data.bid_size == 2.0
+        assert price_data.ask_size == 1.5
+        assert price_data.buy_price_usd == 102501.0
+        assert price_data.sell_price_usd == 102499.0
+
+    async def test_coinmate_bid_ask_converted(
+        self, monitor, mock_coinmate_ticker_response
+    ):
+        """Test that Coinmate bid/ask are converted with the last price's rate"""
+        with aioresponses() as m:
+            m.get(
+                "https://coinmate.io/api/ticker?currencyPair=BTC_CZK",
+                payload=mock_coinmate_ticker_response,
+            )
+            price_data = await monitor.fetch_price("coinmate")
+        await monitor.close()
+
+        assert price_data.bid == 2449000.0
+        assert price_data.ask == 2451000.0
+        assert price_data.bid_size is None
+        assert price_data.bid_usd == pytest.approx(2449000.0 * 0.0417)
+        assert price_data.ask_usd == pytest.approx(2451000.0 * 0.0417)
+
+    async def test_multiple_pairs_batched(self, trading_pairs, mock_exchange_rates):
+        """Test that extra pairs share one request and stay out of detection"""
+        monitor = ExchangeMonitor(
+            ["kraken"], trading_pairs, monitored_pairs={"kraken": ["ETH/USD"]}
+        )
+        monitor.currency_converter.exchange_rates = mock_exchange_rates
+        monitor.currency_converter.last_update = float("inf")
+
+        with aioresponses() as m:
+            m.get("https://api.kraken.com/0/public/AssetPairs", status=500)
+            m.get(
+                "https://api.kraken.com/0/public/Ticker?pair=BTCUSD,ETHUSD",
+                payload={
+                    "error": [],
+                    "result": {
+                        "XXBTZUSD": {"c": ["102500.0", "0.1"]},
+                        "XETHZUSD": {"c": ["3500.0", "1.0"]},
+                    },
+                },
+            )
+            price_data = await monitor.fetch_price("kraken")
+        await monitor.close()
+
+        assert monitor.monitored_pairs["kraken"] == ["BTC/USD", "ETH/USD"]
+        assert price_data.symbol == "BTC/USD"
+        assert monitor.latest_prices["kraken"] is price_data
+        assert monitor.pair_prices["kraken"]["ETH/USD"].price == 3500.0
+
+    async def test_ticker_quote_falls_back_to_book(self, monitor):
+        """Test that streamed tickers without a quote use the book top"""
+        book = OrderBook("BTC/CZK")
+        book.apply_snapshot([(2449000.0, 0.4)], [(2451000.0, 0.6)])
+        monitor.latest_books["coinmate"] = book
+
+        price_data = await monitor.ingest_ticker("coinmate", "BTC/CZK", 2450000.0, 1)
+        await monitor.close()
+
+        assert (price_data.bid, price_data.bid_size) == (2449000.0, 0.4)
+        assert (price_data.ask, price_data.ask_size) == (2451000.0, 0.6)
@@ -0,0 +1,185 @@
+"""
+Tests for the currency market graph and cycle search.
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from src.apis.payloads import FeeSchedule
+from src.core.arbitrage_detector import ArbitrageDetector
+from src.core.data_models import PriceData
+from src.core.market_graph import MarketGraph
+from src.services.fee_service import FeeMatrix
+
+NO_FEES = FeeMatrix(default=FeeSchedule(0.0, 0.0))
+
+
+def euro_cycle_graph(fees: FeeMatrix = NO_FEES) -> MarketGraph:
+    """BTC is 1.2% dearer in EUR on Coinmate than in USD on Kraken"""
+    graph = MarketGraph(fees)
+    graph.update_quote("kraken", "BTC/USD", 100000.0, 100010.0)
+    graph.update_quote("kraken", "EUR/USD", 1.10, 1.1001)
+    graph.update_quote("coinmate", "BTC/EUR", 92000.0, 92010.0)
+    return graph
+
+
+@pytest.mark.unit
+class TestMarketGraph:
+
+    def test_edges_from_quotes(self):
+        """Test that a quote adds a sell edge at the bid and a buy edge at the ask"""
+        graph = MarketGraph(FeeMatrix(default=FeeSchedule(0.1, 0.2)))
+        graph.update_quote("kraken", "BTC/USD", 100.0, 101.0, timestamp=5.0)
+
+        btc, usd = graph.currencies.index("BTC"), graph.currencies.index("USD")
+        sell, buy = graph.best[(btc, usd)], graph.best[(usd, btc)]
+        assert (sell.side, sell.price) == ("sell", 100.0)
+        assert sell.rate == pytest.approx(100.0 * 0.998)
+        assert (buy.side, buy.price) == ("buy", 101.0)
+        assert buy.rate == pytest.approx(0.998 / 101.0)
+        assert graph.weights[btc, usd] == pytest.approx(-np.log(sell.rate))
+        assert np.isinf(graph.weights[btc, btc])
+
+    def test_best_rate_across_exchanges(self):
+        """Test that each edge keeps the best exchange and falls back when it leaves"""
+        graph = MarketGraph(NO_FEES)
+        graph.update_quote("kraken", "BTC/USD", 100.0, 101.0)
+        graph.update_quote("bitstamp", "BTC/USD", 100.5, 101.5)
+        btc, usd = graph.currencies.index("BTC"), graph.currencies.index("USD")
+
+        assert graph.best[(btc, usd)].exchange == "bitstamp"
+        assert graph.best[(usd, btc)].exchange == "kraken"
+
+        graph.remove_exchange("bitstamp")
+        assert graph.best[(btc, usd)].exchange == "kraken"
+
+        graph.remove_quote("kraken", "BTC/USD")
+        assert graph.best == {}
+        assert np.isinf(graph.weights).all()
+
+    def test_update_touches_only_its_edges(self):
+        """Test that a ticker change only marks its own pair's two edges"""
+        graph = euro_cycle_graph()
+        graph.find_cycles()
+
+        graph.update_quote("kraken", "EUR/USD", 1.11, 1.1101)
+
+        eur, usd = graph.currencies.index("EUR"), graph.currencies.index("USD")
+        assert graph._changed == {(eur, usd), (usd, eur)}
+
+        # Re-sending the same quote changes no rate
+        graph.find_cycles()
+        graph.update_quote("kraken", "EUR/USD", 1.11, 1.1101)
+        assert graph._changed == set()
+
+    def test_triangular_cycle(self):
+        """Test that USD -> BTC -> EUR -> USD is found net of fees"""
+        cycles = euro_cycle_graph().find_cycles()
+
+        assert len(cycles) == 1
+        cycle = cycles[0]
+        assert set(cycle.currencies) == {"USD", "BTC", "EUR"}
+        assert len(cycle.legs) == 3
+        assert cycle.profit_percentage == pytest.approx(
+            (92000.0 * 1.10 / 100010.0 - 1) * 100
+        )
+
+        # 0.5% per leg eats the 1.2% edge
+        fees = FeeMatrix(default=FeeSchedule(0.5, 0.5))
+        assert euro_cycle_graph(fees).find_cycles() == []
+
+    def test_incremental_search(self):
+        """Test that only cycles through changed quotes are searched"""
+        graph = euro_cycle_graph()
+        assert len(graph.find_cycles(changed_only=True)) == 1
+
+        # Nothing changed since the last search
+        assert graph.find_cycles(changed_only=True) == []
+
+        # An unrelated pair changes
+        graph.update_quote("kraken", "ETH/USD", 3000.0, 3001.0)
+        assert graph.find_cycles(changed_only=True) == []
+
+        # A leg of the cycle changes
+        graph.update_quote("coinmate", "BTC/EUR", 92100.0, 92110.0)
+        cycles = graph.find_cycles(changed_only=True)
+        assert len(cycles) == 1
+        assert cycles[0].profit_percentage == pytest.approx(
+            (92100.0 * 1.10 / 100010.0 - 1) * 100
+        )
+
+    def test_threshold_and_length(self):
+        """Test minimum profit and cycle length filters"""
+        assert euro_cycle_graph().find_cycles(min_profit_percentage=5.0) == []
+
+        found = {}
+        for min_length in (2, 3):
+            graph = euro_cycle_graph()
+            graph.find_cycles()
+            # Buying on Kraken and selling on Bitstamp is a two-leg cycle
+            graph.update_quote("bitstamp", "BTC/USD", 100100.0, 100110.0)
+            found[min_length] = graph.find_cycles(
+                min_length=min_length, changed_only=True
+            )
+
+        assert [len(cycle.legs) for cycle in found[2]] == [2]
+        assert sorted(leg.exchange for leg in found[2][0].legs) == [
+            "bitstamp",
+            "kraken",
+        ]
+        assert found[3] == []
+
+    def test_set_fees_reprices(self):
+        """Test that a new fee snapshot re-prices existing edges"""
+        graph = euro_cycle_graph()
+        graph.set_fees(FeeMatrix(default=FeeSchedule(0.5, 0.5)))
+
+        assert graph.find_cycles() == []
+
+    def test_evict_older_than(self):
+        """Test that stale quotes leave the graph"""
+        graph = MarketGraph(NO_FEES)
+        graph.update_quote("kraken", "BTC/USD", 100.0, 101.0, timestamp=10.0)
+        graph.update_quote("kraken", "EUR/USD", 1.1, 1.2, timestamp=20.0)
+
+        assert graph.evict_older_than(15.0) == [("kraken", "BTC/USD")]
+        assert len(graph.best) == 2
+
+    def test_invalid_symbol(self):
+        """Test that symbols without a quote currency are rejected"""
+        with pytest.raises(ValueError, match="Invalid symbol"):
+            MarketGraph().update_quote("kraken", "BTCUSD", 1.0, 1.0)
+
+    def test_detector_reports_multi_leg_cycles(self):
+        """Test that the detector searches the monitor's graph with its fees"""
+        monitor = MagicMock()
+        monitor.market_graph = MarketGraph()
+        for exchange, symbol, bid, ask in (
+            ("kraken", "BTC/USD", 100000.0, 100010.0),
+            ("kraken", "EUR/USD", 1.10, 1.1001),
+            ("coinmate", "BTC/EUR", 92000.0, 92010.0),
+        ):
+            monitor.market_graph.update_price(
+                PriceData(
+                    exchange,
+                    symbol,
+                    bid,
+                    bid,
+                    symbol.split("/")[1],
+                    0.0,
+                    bid=bid,
+                    ask=ask,
+                )
+            )
+        detector = ArbitrageDetector(monitor, min_profit_percentage=0.1)
+
+        cycles = detector.detect_cycles()
+
+        # Net of configured fees (0.26% Kraken x2, 0.35% Coinmate)
+        assert len(cycles) == 1
+        gross = 92000.0 * 1.10 / 100010.0
+        expected = gross * (1 - 0.0026) ** 2 * (1 - 0.0035)
+        assert cycles[0].profit_percentage == pytest.approx((expected - 1) * 100)
+        assert detector.detect_cycles() == []
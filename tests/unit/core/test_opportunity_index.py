@@ -0,0 +1,88 @@
+"""
+Tests for the time-indexed recent-best opportunity index.
+"""
+
+import random
+
+import pytest
+
+from src.core.data_models import ArbitrageOpportunity
+from src.core.opportunity_index import OpportunityIndex
+
+
+def opportunity(timestamp: float, profit: float) -> ArbitrageOpportunity:
+    return ArbitrageOpportunity(
+        "coinmate", "kraken", 100.0, 100.0 + profit, profit, profit, timestamp, 1.0
+    )
+
+
+def brute_force(opportunities, k: int, start: float):
+    recent = [opp for opp in opportunities if opp.timestamp >= start]
+    recent.sort(key=lambda opp: opp.profit_percentage, reverse=True)
+    return recent[:k]
+
+
+@pytest.mark.unit
+class TestOpportunityIndex:
+
+    def test_best_in_window(self):
+        """Test top-k over different recent windows, older first on ties"""
+        index = OpportunityIndex(horizon=1000)
+        for timestamp, profit in ((0, 3.0), (10, 1.0), (20, 2.0), (30, 1.0)):
+            index.add(opportunity(timestamp, profit))
+
+        def profits(k, max_age):
+            return [
+                (opp.timestamp, opp.profit_percentage)
+                for opp in index.best(k, max_age, now=30)
+            ]
+
+        assert profits(2, 1000) == [(0, 3.0), (20, 2.0)]
+        assert profits(5, 15) == [(20, 2.0), (30, 1.0)]
+        assert profits(5, 25) == [(20, 2.0), (10, 1.0), (30, 1.0)]
+
+    def test_matches_brute_force(self):
+        """Test that the pruned frontier answers like a full sort"""
+        rng = random.Random(3)
+        index = OpportunityIndex(horizon=10000, max_k=5)
+        history = []
+        for timestamp in range(2000):
+            opp = opportunity(float(timestamp), round(rng.uniform(0, 2), 2))
+            history.append(opp)
+            index.add(opp)
+
+        # Closed buckets keep only entries that can still be in a top 5
+        assert len(index) < len(history) // 2
+        for k, max_age in ((1, 10), (3, 150), (5, 5000)):
+            assert index.best(k, max_age, now=1999) == brute_force(
+                history, k, 1999 - max_age
+            )
+
+    def test_expiry(self):
+        """Test that entries older than the horizon are evicted"""
+        index = OpportunityIndex(horizon=60)
+        index.add(opportunity(0, 5.0))
+        index.add(opportunity(61, 1.0))
+
+        assert len(index) == 1
+        assert index.best(5, 60, now=61)[0].profit_percentage == 1.0
+
+    def test_out_of_order(self):
+        """Test that a late opportunity is placed by its timestamp"""
+        index = OpportunityIndex(horizon=1000)
+        index.add(opportunity(10, 1.0))
+        index.add(opportunity(5, 2.0))
+
+        assert [opp.timestamp for opp in index.best(5, 3, now=10)] == [10]
+        assert index.best(1, 10, now=10)[0].timestamp == 5
+
+    def test_limits(self):
+        """Test that k beyond max_k is rejected and max_age clamped to the horizon"""
+        index = OpportunityIndex(horizon=60, max_k=3)
+        index.add(opportunity(0, 5.0))
+        index.add(opportunity(50, 1.0))
+
+        with pytest.raises(ValueError):
+            index.best(4)
+        assert index.best(3, max_age=120, now=100) == index.best(3, 60, now=100)
+        assert [opp.timestamp for opp in index.best(3, 120, now=100)] == [50]
@@ -0,0 +1,135 @@
+"""
+Tests for opportunity lifecycle tracking.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.arbitrage_detector import ArbitrageDetector
+from src.core.data_models import ArbitrageOpportunity, PriceData
+from src.core.opportunity_tracker import OpportunityTracker
+
+
+def opportunity(
+    profit: float, buy: str = "coinmate", sell: str = "kraken", asset: str = "BTC"
+) -> ArbitrageOpportunity:
+    return ArbitrageOpportunity(
+        buy,
+        sell,
+        100000.0,
+        100000.0 * (1 + profit / 100),
+        0.0,
+        profit,
+        0.0,
+        0.0,
+        asset=asset,
+    )
+
+
+def kinds(events) -> list:
+    return [event.kind for event in events]
+
+
+@pytest.mark.unit
+class TestOpportunityTracker:
+
+    def test_open_only_once(self):
+        """Test that a lasting spread opens once instead of on every detection"""
+        tracker = OpportunityTracker(0.1, 0.05, update_step=1.0)
+
+        assert kinds(tracker.observe([opportunity(0.2)], timestamp=0.0)) == ["open"]
+        for t in range(1, 10):
+            assert tracker.observe([opportunity(0.2)], timestamp=float(t)) == []
+
+        tracked = tracker.open[("coinmate", "kraken", "BTC")]
+        assert tracked.observations == 10
+        assert tracked.duration == 9.0
+
+    def test_hysteresis(self):
+        """Test that profit between the thresholds neither opens nor closes"""
+        tracker = OpportunityTracker(0.1, 0.05)
+
+        assert tracker.observe([opportunity(0.07)]) == []
+        assert kinds(tracker.observe([opportunity(0.12)])) == ["open"]
+        assert tracker.observe([opportunity(0.07)]) == []
+        assert kinds(tracker.observe([opportunity(0.04)])) == ["close"]
+        assert tracker.open == {}
+
+    def test_update_on_new_peak(self):
+        """Test that updates are reported only when the peak grows by the step"""
+        tracker = OpportunityTracker(0.1, 0.05, update_step=0.1)
+
+        tracker.observe([opportunity(0.2)])
+        assert tracker.observe([opportunity(0.25)]) == []
+        events = tracker.observe([opportunity(0.31)])
+        assert kinds(events) == ["update"]
+        assert events[0].tracked.peak_profit_percentage == pytest.approx(0.31)
+
+        # Falling back keeps the peak
+        tracker.observe([opportunity(0.15)])
+        tracked = tracker.open[("coinmate", "kraken", "BTC")]
+        assert tracked.last.profit_percentage == pytest.approx(0.15)
+        assert tracked.peak_profit_percentage == pytest.approx(0.31)
+
+    def test_close_when_missing_from_scanned_pairs(self):
+        """Test that only opportunities on scanned exchanges close when undetected"""
+        tracker = OpportunityTracker(0.1, 0.05)
+        tracker.observe(
+            [opportunity(0.2), opportunity(0.2, buy="anycoin", sell="bitstamp")],
+            timestamp=0.0,
+        )
+
+        events = tracker.observe([], changed_exchanges=["coinmate"], timestamp=2.0)
+        assert kinds(events) == ["close"]
+        assert list(tracker.open) == [("anycoin", "bitstamp", "BTC")]
+
+        events = tracker.observe([], timestamp=4.0)
+        assert kinds(events) == ["close"]
+        assert events[0].tracked.closed_at == 4.0
+        assert tracker.get_stats()["closed"] == 2
+        assert tracker.get_stats()["duration"]["count"] == 2
+
+    def test_expire(self):
+        """Test that opportunities not observed for too long are closed"""
+        tracker = OpportunityTracker(0.1, 0.05)
+        tracker.observe([opportunity(0.2)], timestamp=0.0)
+
+        assert tracker.expire(60, timestamp=30.0) == []
+        assert kinds(tracker.expire(60, timestamp=61.0)) == ["close"]
+
+    def test_exit_capped_at_enter(self):
+        """Test that the exit threshold never exceeds the enter threshold"""
+        assert OpportunityTracker(0.03, 0.05).exit_percentage == 0.03
+
+
+@pytest.mark.unit
+class TestDetectorTracking:
+
+    async def test_only_transitions_stored(self):
+        """Test that repeated detections store only lifecycle transitions"""
+        prices = {
+            "kraken": PriceData(
+                "kraken", "BTC/USD", 104000.0, 104000.0, "USD", 0.0, volume=10.0
+            ),
+            "coinmate": PriceData(
+                "coinmate", "BTC/USD", 102000.0, 102000.0, "USD", 0.0, volume=10.0
+            ),
+        }
+        monitor = MagicMock()
+        monitor.latest_prices = prices
+        monitor.latest_books = {}
+        database_writer = MagicMock()
+        detector = ArbitrageDetector(monitor, 0.1, database_writer)
+
+        for _ in range(5):
+            events = await detector.track_opportunities()
+        assert events == []
+        assert database_writer.write_opportunity_event.call_count == 1
+        assert len(detector.opportunities) == 1
+
+        prices["kraken"].price_usd = 102100.0
+        events = await detector.track_opportunities(changed_exchanges=["kraken"])
+
+        assert kinds(events) == ["close"]
+        assert database_writer.write_opportunity_event.call_count == 2
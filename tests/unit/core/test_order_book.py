@@ -0,0 +1,167 @@
+"""
+Tests for the in-memory L2 order book.
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+
+from src.core.order_book import BookSide, OrderBook
+
+
+@pytest.mark.unit
+class TestBookSide:
+
+    def test_bids_sorted_best_first(self):
+        """Test that bids are ordered by descending price"""
+        side = BookSide(is_bid=True)
+        for price in (100.0, 102.0, 101.0):
+            side.set(price, 1.0)
+
+        assert [p for p, _ in side.top()] == [102.0, 101.0, 100.0]
+        assert side.best() == (102.0, 1.0)
+
+    def test_asks_sorted_best_first(self):
+        """Test that asks are ordered by ascending price"""
+        side = BookSide(is_bid=False)
+        for price in (101.0, 100.0, 102.0):
+            side.set(price, 1.0)
+
+        assert [p for p, _ in side.top()] == [100.0, 101.0, 102.0]
+
+    def test_update_and_remove_level(self):
+        """Test updating an existing level and removing with quantity 0"""
+        side = BookSide(is_bid=False)
+        side.set(100.0, 1.0)
+        side.set(100.0, 2.5)
+        assert side.get(100.0) == 2.5
+        assert len(side) == 1
+
+        side.set(100.0, 0)
+        assert side.get(100.0) is None
+        assert side.best() is None
+
+        # Removing a missing level is a no-op
+        side.set(99.0, 0)
+        assert len(side) == 0
+
+    def test_to_arrays(self):
+        """Test NumPy export of the top levels"""
+        side = BookSide(is_bid=True)
+        side.set(100.0, 1.0)
+        side.set(101.0, 2.0)
+
+        prices, quantities = side.to_arrays(1)
+        np.testing.assert_array_equal(prices, [101.0])
+        np.testing.assert_array_equal(quantities, [2.0])
+
+
+@pytest.mark.unit
+class TestOrderBook:
+
+    def test_snapshot_and_delta(self):
+        """Test snapshot replacement followed by a delta"""
+        book = OrderBook("BTC/USD")
+        book.apply_snapshot([(100.0, 1.0), (99.0, 2.0)], [(101.0, 1.5)])
+
+        assert book.best_bid == (100.0, 1.0)
+        assert book.best_ask == (101.0, 1.5)
+        assert book.mid_price() == 100.5
+        assert book.spread() == 1.0
+
+        book.apply_delta([(100.0, 0), (99.5, 3.0)], [(100.8, 0.2)])
+        assert book.top_bids() == [(99.5, 3.0), (99.0, 2.0)]
+        assert book.top_asks() == [(100.8, 0.2), (101.0, 1.5)]
+
+        book.apply_snapshot([(90.0, 1.0)], [])
+        assert book.top_bids() == [(90.0, 1.0)]
+        assert book.best_ask is None
+        assert book.mid_price() is None
+
+    def test_max_depth_truncation(self):
+        """Test that the book keeps only max_depth levels per side"""
+        book = OrderBook("BTC/USD", max_depth=2)
+        book.apply_snapshot([(100.0, 1.0), (99.0, 1.0), (98.0, 1.0)], [])
+        assert book.top_bids() == [(100.0, 1.0), (99.0, 1.0)]
+
+        book.apply_delta([(101.0, 1.0)], [])
+        assert book.top_bids() == [(101.0, 1.0), (100.0, 1.0)]
+
+    def test_top_n(self):
+        """Test top-N queries"""
+        book = OrderBook("BTC/USD")
+        book.apply_snapshot([(100.0 - i, 1.0) for i in range(20)], [])
+        assert len(book.top_bids(5)) == 5
+        assert book.top_bids(1) == [(100.0, 1.0)]
+
+    def test_is_crossed(self):
+        """Test crossed book detection"""
+        book = OrderBook("BTC/USD")
+        book.apply_snapshot([(101.0, 1.0)], [(100.0, 1.0)])
+        assert book.is_crossed()
+
+    def test_kraken_checksum(self):
+        """Test checksum string construction and CRC32"""
+        book = OrderBook("BTC/USD", price_precision=1, qty_precision=8)
+        book.apply_snapshot(
+            [(45283.5, 0.1), (45283.4, 1.5)],
+            [(45285.2, 0.001), (45286.4, 1.0)],
+        )
+
+        expected_string = (
+            "452852" + "100000"  # ask 45285.2 / 0.00100000
+            "452864" + "100000000"  # ask 45286.4 / 1.00000000
+            "452835" + "10000000"  # bid 45283.5 / 0.10000000
+            "452834" + "150000000"  # bid 45283.4 / 1.50000000
+        )
+        expected = zlib.crc32(expected_string.encode("ascii"))
+
+        assert book.kraken_checksum() == expected
+        assert book.verify_checksum(expected)
+        assert not book.verify_checksum(expected + 1)
+
+    def test_checksum_uses_top_ten_levels(self):
+        """Test that only the top 10 levels per side enter the checksum"""
+        book = OrderBook("BTC/USD", price_precision=1, qty_precision=8)
+        book.apply_snapshot([(100.0 - i, 1.0) for i in range(10)], [])
+        checksum = book.kraken_checksum()
+
+        book.apply_delta([(50.0, 1.0)], [])
+        assert book.kraken_checksum() == checksum
+
+    def test_checksum_requires_precision(self):
+        """Test that checksums need known precision"""
+        book = OrderBook("BTC/USD")
+        with pytest.raises(ValueError, match="Precision unknown"):
+            book.kraken_checksum()
+
+
+@pytest.mark.unit
+class TestMonitorBookChecksum:
+
+    async def test_checksum_mismatch_drops_book(self):
+        """Test that a mismatching book is dropped and resynced"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        from src.core.exchange_monitor import ExchangeMonitor
+
+        monitor = ExchangeMonitor(["kraken"], {"kraken": "BTC/USD"})
+        stream = MagicMock()
+        stream.book_precision.return_value = (1, 8)
+        stream.resync_book = AsyncMock()
+        monitor.streams["kraken"] = stream
+
+        bids, asks = [(100.0, 1.0)], [(101.0, 1.0)]
+        good = OrderBook("BTC/USD", price_precision=1, qty_precision=8)
+        good.apply_snapshot(bids, asks)
+
+        await monitor.ingest_book(
+            "kraken", "BTC/USD", bids, asks, True, good.kraken_checksum()
+        )
+        assert monitor.latest_books["kraken"].best_bid == (100.0, 1.0)
+        stream.resync_book.assert_not_awaited()
+
+        await monitor.ingest_book("kraken", "BTC/USD", [(100.5, 1.0)], [], False, 1)
+        assert "kraken" not in monitor.latest_books
+        stream.resync_book.assert_awaited_once()
@@ -0,0 +1,192 @@
+"""
+Tests for the adaptive polling scheduler.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.data_models import PriceData
+from src.core.exchange_health import HealthRegistry
+from src.core.poll_scheduler import AdaptivePollScheduler
+
+
+def make_price(exchange: str, bid: float, ask: float) -> PriceData:
+    mid = (bid + ask) / 2
+    return PriceData(
+        exchange, "BTC/USD", mid, mid, "USD", 0.0, bid_usd=bid, ask_usd=ask
+    )
+
+
+def make_scheduler(latest_prices=None, **kwargs) -> AdaptivePollScheduler:
+    monitor = MagicMock()
+    monitor.latest_prices = latest_prices or {}
+    monitor.health = HealthRegistry()
+    options = dict(
+        base_interval=5.0,
+        min_interval=1.0,
+        max_interval=30.0,
+        jitter=0.0,
+        hot_band=0.5,
+    )
+    options.update(kwargs)
+    return AdaptivePollScheduler(monitor, 0.1, **options)
+
+
+@pytest.mark.unit
+class TestNextInterval:
+
+    def test_no_prices_uses_base(self):
+        """Test the base interval before any price is known"""
+        scheduler = make_scheduler()
+        assert scheduler.next_interval("kraken") == 5.0
+
+    def test_profitable_spread_polls_fastest(self):
+        """Test that a spread at the threshold uses the minimum interval"""
+        scheduler = make_scheduler(
+            {
+                "kraken": make_price("kraken", 100.0, 100.0),
+                "coinmate": make_price("coinmate", 100.5, 100.5),
+            }
+        )
+        assert scheduler.next_interval("kraken") == 1.0
+
+    def test_approaching_threshold_shortens_interval(self):
+        """Test linear speed-up inside the hot band"""
+        # 0.2% gross - 0.2% fees = 0.0% net: half-way through a 0.2 band
+        scheduler = make_scheduler(
+            {
+                "kraken": make_price("kraken", 100.0, 100.0),
+                "coinmate": make_price("coinmate", 100.2, 100.2),
+            },
+            hot_band=0.2,
+            fee_percentage=0.2,
+        )
+        assert scheduler.next_interval("kraken") == pytest.approx(3.0)
+
+    def test_idle_spread_backs_off(self):
+        """Test geometric back-off while the spread stays far from the threshold"""
+        scheduler = make_scheduler(
+            {
+                "kraken": make_price("kraken", 100.0, 100.0),
+                "coinmate": make_price("coinmate", 100.0, 100.0),
+            },
+            fee_percentage=0.6,
+        )
+        intervals = [scheduler.next_interval("kraken") for _ in range(6)]
+
+        assert intervals[0] == 7.5
+        assert intervals == sorted(intervals)
+        assert intervals[-1] == 30.0
+
+    def test_errors_back_off(self):
+        """Test exponential back-off on consecutive errors"""
+        scheduler = make_scheduler()
+        scheduler._state("kraken").consecutive_errors = 2
+        assert scheduler.next_interval("kraken") == 20.0
+
+    def test_long_error_streak_stays_at_max(self):
+        """Test that a very long error streak backs off to max without overflowing"""
+        scheduler = make_scheduler()
+        scheduler._state("kraken").consecutive_errors = 5000
+        assert scheduler.next_interval("kraken") == 30.0
+
+    def test_budget_bounds_interval(self):
+        """Test that the interval never plans more polls than the budget"""
+        scheduler = make_scheduler(
+            {
+                "kraken": make_price("kraken", 100.0, 100.0),
+                "coinmate": make_price("coinmate", 101.0, 101.0),
+            },
+            budgets={"kraken": 20},
+        )
+        assert scheduler.next_interval("kraken") == 3.0
+
+
+@pytest.mark.unit
+class TestBudgetAndDeadline:
+
+    def test_budget_delay(self):
+        """Test waiting until the oldest poll leaves the one-minute window"""
+        scheduler = make_scheduler(budgets={"kraken": 2})
+        state = scheduler._state("kraken")
+        state.request_times.extend([100.0, 110.0])
+
+        assert scheduler.remaining_budget("kraken", now=120.0) == 0
+        assert scheduler.budget_delay("kraken", now=120.0) == pytest.approx(40.0)
+        assert scheduler.budget_delay("kraken", now=160.0) == 0.0
+        assert scheduler.remaining_budget("kraken", now=160.0) == 1
+
+    async def test_stuck_poll_hits_deadline(self):
+        """Test that a poll over the deadline is abandoned and counted as an error"""
+
+        async def stuck_fetch(exchange):
+            await asyncio.sleep(10)
+
+        scheduler = make_scheduler(request_deadline=0.05)
+        scheduler.monitor.fetch_price = stuck_fetch
+
+        result = await scheduler.poll_once("kraken")
+
+        state = scheduler.states["kraken"]
+        assert result is None
+        assert state.timeouts == 1
+        assert state.consecutive_errors == 1
+
+    async def test_success_resets_errors(self):
+        """Test that a successful poll clears the error streak"""
+        scheduler = make_scheduler()
+        scheduler.monitor.fetch_price = AsyncMock(
+            return_value=make_price("kraken", 100.0, 100.0)
+        )
+        scheduler._state("kraken").consecutive_errors = 3
+
+        await scheduler.poll_once("kraken")
+
+        assert scheduler.states["kraken"].consecutive_errors == 0
+        assert scheduler.states["kraken"].polls == 1
+
+    async def test_open_breaker_skip_is_not_an_error(self):
+        """Test that a poll skipped by an open breaker uses no budget or backoff"""
+        scheduler = make_scheduler(budgets={"kraken": 10})
+        scheduler.monitor.fetch_price = AsyncMock()
+        health = scheduler.monitor.health.get("kraken")
+        for _ in range(health.failure_threshold):
+            health.record_failure(0.1, "down")
+        state = scheduler._state("kraken")
+        state.consecutive_errors = 1
+
+        assert await scheduler.poll_once("kraken") is None
+
+        scheduler.monitor.fetch_price.assert_not_called()
+        assert state.breaker_skips == 1
+        assert state.errors == 0
+        assert state.consecutive_errors == 1
+        assert scheduler.remaining_budget("kraken") == 10
+        # The next poll waits out the cool-down instead of backing off further
+        assert scheduler.next_interval("kraken") == pytest.approx(
+            health.open_seconds, rel=0.01
+        )
+
+    async def test_exchanges_polled_independently(self):
+        """Test that a slow exchange does not delay another one"""
+        polled = []
+
+        async def fetch(exchange):
+            if exchange == "kraken":
+                await asyncio.sleep(10)
+            polled.append(exchange)
+            return make_price(exchange, 100.0, 100.0)
+
+        scheduler = make_scheduler(
+            base_interval=0.01, min_interval=0.01, request_deadline=5.0
+        )
+        scheduler.monitor.fetch_price = fetch
+
+        scheduler.start(["kraken", "coinmate"])
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+
+        assert polled.count("coinmate") >= 2
+        assert "kraken" not in polled
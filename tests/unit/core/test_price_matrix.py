@@ -0,0 +1,134 @@
+"""
+Tests for the asset x exchange price matrix and multi-asset detection.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.core.arbitrage_detector import ArbitrageDetector
+from src.core.data_models import PriceData
+from src.core.exchange_monitor import ExchangeMonitor
+from src.core.price_matrix import PriceMatrix
+
+
+def quote(
+    exchange: str,
+    symbol: str,
+    bid: float,
+    ask: float,
+    timestamp: float = 0.0,
+) -> PriceData:
+    mid = (bid + ask) / 2
+    return PriceData(
+        exchange,
+        symbol,
+        mid,
+        mid,
+        symbol.split("/")[1],
+        timestamp,
+        volume=10.0,
+        bid=bid,
+        ask=ask,
+        bid_usd=bid,
+        ask_usd=ask,
+    )
+
+
+@pytest.mark.unit
+class TestPriceMatrix:
+
+    def test_cells_by_asset_and_exchange(self):
+        """Test that instruments of one asset share a row across quote currencies"""
+        matrix = PriceMatrix(
+            ["kraken", "coinmate"],
+            {"kraken": ["BTC/USD", "ETH/USD"], "coinmate": ["BTC/CZK", "ETH/CZK"]},
+        )
+
+        assert matrix.assets == ["BTC", "ETH"]
+        assert matrix.shape == (2, 2)
+        assert matrix.cell("coinmate", "ETH/CZK") == (1, 1)
+        assert np.isnan(matrix.bid).all()
+
+    def test_first_instrument_owns_cell(self):
+        """Test that a second quote of the same asset on an exchange is ignored"""
+        matrix = PriceMatrix(["kraken"], {"kraken": ["BTC/USD", "BTC/EUR"]})
+
+        assert matrix.update(quote("kraken", "BTC/USD", 100.0, 101.0))
+        assert not matrix.update(quote("kraken", "BTC/EUR", 90.0, 91.0))
+        assert matrix.bid[0, 0] == 100.0
+
+    def test_update_grows_matrix(self):
+        """Test that unknown instruments get a new row and column"""
+        matrix = PriceMatrix()
+        matrix.update(quote("kraken", "BTC/USD", 100.0, 101.0))
+        matrix.update(quote("coinmate", "LTC/CZK", 80.0, 81.0))
+
+        assert matrix.shape == (2, 2)
+        assert matrix.ask[1, 1] == 81.0
+        assert np.isnan(matrix.ask[0, 1])
+
+    def test_gross_edges(self):
+        """Test the buy x sell edge tensor for every asset"""
+        matrix = PriceMatrix.from_prices(
+            [
+                quote("kraken", "BTC/USD", 100.0, 100.0),
+                quote("coinmate", "BTC/CZK", 102.0, 103.0),
+            ]
+        )
+
+        edges = matrix.gross_edges()
+
+        assert edges.shape == (1, 2, 2)
+        # Buy on Kraken at 100, sell on Coinmate at 102
+        assert edges[0, 0, 1] == pytest.approx(2.0)
+        assert edges[0, 1, 0] < 0
+
+    def test_eviction(self):
+        """Test that stale and unreachable quotes are blanked"""
+        matrix = PriceMatrix.from_prices(
+            [
+                quote("kraken", "BTC/USD", 100.0, 101.0, timestamp=10.0),
+                quote("coinmate", "BTC/CZK", 100.0, 101.0, timestamp=50.0),
+                quote("coinmate", "ETH/CZK", 10.0, 11.0, timestamp=50.0),
+            ]
+        )
+
+        assert matrix.evict_older_than(20.0) == [("kraken", "BTC/USD")]
+        assert np.isnan(matrix.last[0, 0])
+
+        matrix.clear_exchange("coinmate")
+        assert np.isnan(matrix.last).all()
+        assert matrix.prices == {}
+
+
+@pytest.mark.unit
+class TestMultiAssetDetection:
+
+    async def test_every_asset_scanned(self, trading_pairs):
+        """Test that detection covers all assets held by the monitor"""
+        monitor = ExchangeMonitor(
+            ["kraken", "coinmate"],
+            trading_pairs,
+            monitored_pairs={"kraken": ["ETH/USD"], "coinmate": ["ETH/CZK"]},
+        )
+        now = time.time()
+        for price_data in (
+            quote("kraken", "BTC/USD", 100000.0, 100010.0, now),
+            quote("coinmate", "BTC/CZK", 100005.0, 100020.0, now),
+            quote("kraken", "ETH/USD", 3000.0, 3001.0, now),
+            quote("coinmate", "ETH/CZK", 3100.0, 3105.0, now),
+        ):
+            await monitor._record_price(price_data)
+        await monitor.close()
+
+        detector = ArbitrageDetector(monitor, min_profit_percentage=0.5)
+        opportunities = await detector.detect_opportunities()
+
+        # BTC quotes overlap; ETH is 3.3% gross, 2.7% after fees
+        assert len(opportunities) == 1
+        assert opportunities[0].asset == "ETH"
+        assert opportunities[0].buy_exchange == "kraken"
+        assert opportunities[0].sell_exchange == "coinmate"
+        assert monitor.latest_prices["kraken"].symbol == "BTC/USD"
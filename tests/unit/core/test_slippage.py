@@ -0,0 +1,175 @@
+"""
+Tests for depth-aware executable pricing.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.core.arbitrage_detector import ArbitrageDetector
+from src.core.data_models import PriceData
+from src.core.order_book import OrderBook
+from src.core.slippage import (
+    max_profitable_size,
+    net_profit,
+    walk_book,
+    walk_book_many,
+)
+
+ASK_PRICES = np.array([100.0, 101.0, 102.0])
+ASK_QUANTITIES = np.array([1.0, 1.0, 1.0])
+
+
+@pytest.mark.unit
+class TestWalkBook:
+
+    def test_within_first_level(self):
+        """Test an order that fits in the best level"""
+        estimate = walk_book(ASK_PRICES, ASK_QUANTITIES, 0.5)
+
+        assert estimate.vwap == 100.0
+        assert estimate.worst_price == 100.0
+        assert estimate.filled_quantity == 0.5
+        assert estimate.levels_used == 1
+        assert estimate.fully_filled
+
+    def test_across_levels(self):
+        """Test VWAP and worst price across several levels"""
+        estimate = walk_book(ASK_PRICES, ASK_QUANTITIES, 2.5)
+
+        assert estimate.notional == pytest.approx(100 + 101 + 0.5 * 102)
+        assert estimate.vwap == pytest.approx(252.0 / 2.5)
+        assert estimate.worst_price == 102.0
+        assert estimate.levels_used == 3
+
+    def test_exceeds_depth(self):
+        """Test partial fill when the book is too thin"""
+        estimate = walk_book(ASK_PRICES, ASK_QUANTITIES, 5.0)
+
+        assert estimate.filled_quantity == 3.0
+        assert not estimate.fully_filled
+        assert estimate.vwap == pytest.approx(101.0)
+
+    def test_many_sizes(self):
+        """Test the vectorized multi-size walk"""
+        vwap, worst, filled, notional = walk_book_many(
+            ASK_PRICES, ASK_QUANTITIES, [1.0, 2.0, 3.0]
+        )
+
+        np.testing.assert_allclose(vwap, [100.0, 100.5, 101.0])
+        np.testing.assert_allclose(worst, [100.0, 101.0, 102.0])
+        np.testing.assert_allclose(filled, [1.0, 2.0, 3.0])
+        np.testing.assert_allclose(notional, [100.0, 201.0, 303.0])
+
+    def test_empty_book(self):
+        """Test that an empty book fills nothing"""
+        vwap, worst, filled, _ = walk_book_many([], [], [1.0])
+
+        assert np.isnan(vwap[0])
+        assert np.isnan(worst[0])
+        assert filled[0] == 0.0
+
+
+@pytest.mark.unit
+class TestMaxProfitableSize:
+
+    def test_max_size(self):
+        """Test the break-even size across both books"""
+        bid_prices = np.array([103.0, 101.5, 100.0])
+        bid_quantities = np.array([0.5, 1.0, 5.0])
+
+        size, profit = max_profitable_size(
+            ASK_PRICES, ASK_QUANTITIES, bid_prices, bid_quantities
+        )
+
+        # Buying past 1.5 BTC costs 101 while the next bid is only 100
+        assert size == 1.5
+        assert profit == pytest.approx((0.5 * 103 + 101.5) - (100 + 0.5 * 101))
+
+    def test_fees_shrink_size(self):
+        """Test that fees reduce the profitable size"""
+        bid_prices = np.array([103.0, 101.5, 100.0])
+        bid_quantities = np.array([0.5, 1.0, 5.0])
+
+        size, _ = max_profitable_size(
+            ASK_PRICES,
+            ASK_QUANTITIES,
+            bid_prices,
+            bid_quantities,
+            buy_fee=0.003,
+            sell_fee=0.003,
+        )
+
+        # 101.5 * 0.997 < 101 * 1.003, so only the first 1 BTC is worth it
+        assert size == 1.0
+
+    def test_not_profitable(self):
+        """Test that a crossed-the-wrong-way market gives zero size"""
+        size, profit = max_profitable_size(ASK_PRICES, ASK_QUANTITIES, [99.0], [1.0])
+
+        assert size == 0.0
+        assert profit == 0.0
+
+    def test_net_profit(self):
+        """Test net profit at a fixed size"""
+        profit = net_profit(ASK_PRICES, ASK_QUANTITIES, [110.0], [10.0], 2.0)
+        assert profit == pytest.approx(220.0 - 201.0)
+
+
+@pytest.mark.unit
+class TestDetectorDepthPricing:
+
+    @patch("src.core.arbitrage_detector.SLIPPAGE_SIZE_TIERS", [0.5, 2.0])
+    async def test_opportunity_priced_against_books(self):
+        """Test that streamed books add size tiers and a max size"""
+        buy_book = OrderBook("BTC/CZK")
+        buy_book.apply_snapshot([], [(2400000.0, 1.0), (2500000.0, 1.0)])
+        sell_book = OrderBook("BTC/USD")
+        sell_book.apply_snapshot([(104000.0, 1.0), (100000.0, 5.0)], [])
+
+        monitor = MagicMock()
+        monitor.api_keys = {}
+        monitor.latest_books = {"coinmate": buy_book, "kraken": sell_book}
+        detector = ArbitrageDetector(monitor)
+
+        monitor.latest_prices = {
+            "coinmate": PriceData(
+                "coinmate", "BTC/CZK", 2400000.0, 100000.0, "CZK", 0.0
+            ),
+            "kraken": PriceData("kraken", "BTC/USD", 104000.0, 104000.0, "USD", 0.0),
+        }
+
+        (opportunity,) = await detector.detect_opportunities()
+
+        assert [tier.size for tier in opportunity.size_tiers] == [0.5, 2.0]
+        first, second = opportunity.size_tiers
+        assert first.buy_vwap == pytest.approx(100000.0)
+        assert first.sell_vwap == pytest.approx(104000.0)
+        assert first.profit_usd > 0
+        # 2 BTC walks into the 104166 USD ask and the 100000 USD bid
+        assert second.profit_usd < 0
+        assert opportunity.max_profitable_size == 1.0
+        assert opportunity.volume_limit == 1.0
+
+    async def test_no_books_keeps_volume_limit(self):
+        """Test that opportunities without depth keep the volume heuristic"""
+        monitor = MagicMock()
+        monitor.api_keys = {}
+        monitor.latest_books = {}
+        detector = ArbitrageDetector(monitor)
+
+        monitor.latest_prices = {
+            "coinmate": PriceData(
+                "coinmate", "BTC/CZK", 2400000.0, 100000.0, "CZK", 0.0, 10
+            ),
+            "kraken": PriceData(
+                "kraken", "BTC/USD", 104000.0, 104000.0, "USD", 0.0, 20
+            ),
+        }
+
+        (opportunity,) = await detector.detect_opportunities()
+
+        assert opportunity.size_tiers == []
+        assert opportunity.max_profitable_size is None
+        assert opportunity.volume_limit == 1.0
@@ -0,0 +1,61 @@
+"""
+Tests for the symbol table and the slotted models that use it.
+"""
+
+import pytest
+
+from src.core.data_models import ArbitrageOpportunity, PriceData
+from src.core.symbols import SYMBOLS, SymbolTable
+
+
+@pytest.mark.unit
+class TestSymbolTable:
+
+    def test_ids_are_dense_and_stable(self):
+        """Test that names get consecutive ids that never change"""
+        table = SymbolTable()
+
+        assert table.exchange_id("kraken") == 0
+        assert table.instrument_id("coinmate", "BTC/CZK") == 0
+        assert table.instrument_id("kraken", "BTC/USD") == 1
+        assert table.exchange_id("coinmate") == 1
+        assert table.instrument_id("coinmate", "BTC/CZK") == 0
+        assert table.instrument(1) == ("kraken", "BTC/USD")
+
+
+@pytest.mark.unit
+class TestSlottedModels:
+
+    def test_price_data_keeps_ids(self):
+        """Test that PriceData takes names but stores ids and has no __dict__"""
+        price_data = PriceData(
+            exchange="kraken",
+            symbol="BTC/USD",
+            price=1.0,
+            price_usd=1.0,
+            original_currency="USD",
+            timestamp=0.0,
+        )
+
+        assert price_data.exchange == "kraken"
+        assert price_data.symbol == "BTC/USD"
+        assert price_data.exchange_id == SYMBOLS.exchange_id("kraken")
+        assert not hasattr(price_data, "__dict__")
+        assert repr(price_data).startswith(
+            "PriceData(exchange='kraken', symbol='BTC/USD', price=1.0"
+        )
+        assert price_data == PriceData("kraken", "BTC/USD", 1.0, 1.0, "USD", 0.0)
+
+    def test_opportunity_keeps_ids(self):
+        """Test that opportunities store exchange ids and stay mutable"""
+        opportunity = ArbitrageOpportunity(
+            "coinmate", "kraken", 100.0, 101.0, 1.0, 1.0, 0.0, 0.5
+        )
+        opportunity.asset = "BTC"
+
+        assert opportunity.buy_exchange == "coinmate"
+        assert opportunity.sell_exchange_id == SYMBOLS.exchange_id("kraken")
+        assert opportunity.size_tiers == []
+        assert not hasattr(opportunity, "__dict__")
+        with pytest.raises(AttributeError):
+            opportunity.note = "x"
@@ -0,0 +1,138 @@
+"""
+Tests for the bounded columnar price and opportunity history.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.data_models import ArbitrageOpportunity, PriceData
+from src.core.symbols import SYMBOLS
+from src.core.tick_store import OpportunityStore, TickStore
+from src.utils.ring_buffer import ColumnarRingBuffer
+
+
+def ring(capacity: int) -> ColumnarRingBuffer:
+    return ColumnarRingBuffer(capacity, {"timestamp": np.float64, "value": np.int64})
+
+
+@pytest.mark.unit
+class TestColumnarRingBuffer:
+
+    def test_overwrites_oldest(self):
+        """Test that a full buffer keeps only the newest rows, oldest first"""
+        buffer = ring(4)
+        nbytes = buffer.nbytes
+        for i in range(10):
+            buffer.append(float(i), i)
+
+        assert len(buffer) == 4
+        assert buffer.appended == 10
+        assert buffer.window()["value"].tolist() == [6, 7, 8, 9]
+        assert buffer.window(2)["value"].tolist() == [8, 9]
+        assert buffer.nbytes == nbytes
+
+    def test_window_is_a_view(self):
+        """Test that windows share memory with the buffer and are read-only"""
+        buffer = ring(4)
+        for i in range(6):
+            buffer.append(float(i), i)
+
+        values = buffer.window()["value"]
+        assert np.shares_memory(values, buffer._columns["value"])
+        with pytest.raises(ValueError):
+            values[0] = 0
+
+    def test_between(self):
+        """Test time-range slicing across the wrap-around point"""
+        buffer = ring(5)
+        for i in range(8):
+            buffer.append(float(i), i)
+
+        assert buffer.between(4.0, 6.0)["value"].tolist() == [4, 5]
+        assert buffer.between(start=6.0)["value"].tolist() == [6, 7]
+        assert buffer.between(end=1.0)["value"].tolist() == []
+        assert buffer.between(6.0, 2.0)["value"].tolist() == []
+
+    def test_out_of_order_append_clamped(self):
+        """Test that a late row takes the newest time so ranges stay sorted"""
+        buffer = ring(5)
+        for timestamp, value in ((1.0, 1), (3.0, 2), (2.0, 3), (4.0, 4)):
+            buffer.append(timestamp, value)
+
+        assert buffer.window()["timestamp"].tolist() == [1.0, 3.0, 3.0, 4.0]
+        assert buffer.clamped == 1
+        assert buffer.between(2.0, 4.0)["value"].tolist() == [2, 3]
+        assert buffer.between(start=4.0)["value"].tolist() == [4]
+
+    def test_partial_and_empty(self):
+        """Test a buffer that has not wrapped yet"""
+        buffer = ring(5)
+        assert buffer.window()["value"].tolist() == []
+
+        buffer.append(1.0, 1)
+        buffer.append(2.0, 2)
+        assert buffer.window(10)["value"].tolist() == [1, 2]
+
+    def test_row_must_match_columns(self):
+        """Test that rows with the wrong number of values are rejected"""
+        with pytest.raises(ValueError):
+            ring(2).append(1.0)
+
+
+@pytest.mark.unit
+class TestStores:
+
+    def test_tick_store(self):
+        """Test that ticks keep their exchange id and missing quotes become NaN"""
+        store = TickStore(capacity=3)
+        store.append(PriceData("kraken", "BTC/USD", 1.0, 1.0, "USD", 10.0))
+        store.append(PriceData("coinmate", "BTC/CZK", 25.0, 1.1, "CZK", 11.0, bid=24.0))
+
+        columns = store.window()
+        assert columns["exchange"].tolist() == [
+            SYMBOLS.exchange_id("kraken"),
+            SYMBOLS.exchange_id("coinmate"),
+        ]
+        assert columns["bid"][1] == 24.0
+        assert np.isnan(columns["ask"][1])
+        assert store.for_exchange("coinmate")["price_usd"].tolist() == [1.1]
+
+    def test_late_tick_kept_in_range(self):
+        """Test that a tick recorded after a newer one is still found by time"""
+        store = TickStore(capacity=4)
+        store.append(PriceData("kraken", "BTC/USD", 100.0, 100.0, "USD", 12.0))
+        # Stamped at 11.0, but its exchange task recorded it later
+        store.append(PriceData("coinmate", "BTC/CZK", 25.0, 1.1, "CZK", 11.0))
+        store.append(PriceData("kraken", "BTC/USD", 101.0, 101.0, "USD", 13.0))
+
+        assert store.between(12.0)["price"].tolist() == [100.0, 25.0, 101.0]
+        assert store.for_exchange("coinmate", start=12.0)["price"].tolist() == [25.0]
+
+    def test_for_exchange_by_pair(self):
+        """Test that ticks of different pairs on one exchange are told apart"""
+        store = TickStore(capacity=4)
+        store.append(PriceData("kraken", "BTC/USD", 100.0, 100.0, "USD", 10.0))
+        store.append(PriceData("kraken", "ETH/USD", 5.0, 5.0, "USD", 11.0))
+        store.append(PriceData("kraken", "BTC/USD", 101.0, 101.0, "USD", 12.0))
+
+        assert len(store.for_exchange("kraken")["price"]) == 3
+        btc = store.for_exchange("kraken", symbol="BTC/USD")
+        assert btc["price"].tolist() == [100.0, 101.0]
+        assert store.window()["instrument"][1] == SYMBOLS.instrument_id(
+            "kraken", "ETH/USD"
+        )
+
+    def test_opportunity_store(self):
+        """Test that opportunities keep their exchange ids and interned asset"""
+        store = OpportunityStore(capacity=2)
+        for timestamp, profit in ((0.0, 3.0), (100.0, 0.5), (150.0, 1.5)):
+            store.append(
+                ArbitrageOpportunity(
+                    "coinmate", "kraken", 1.0, 2.0, 1.0, profit, timestamp, 0.1
+                )
+            )
+
+        columns = store.between(50.0)
+        assert columns["profit_percentage"].tolist() == [0.5, 1.5]
+        assert columns["buy_exchange"][0] == SYMBOLS.exchange_id("coinmate")
+        assert store.assets.names == ["BTC"]
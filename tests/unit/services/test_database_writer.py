@@ -0,0 +1,296 @@
+"""
+Tests for the batched background database writer.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import asyncpg
+import pytest
+
+from src.core.data_models import (
+    ArbitrageOpportunity,
+    OpportunityEvent,
+    PriceData,
+    TrackedOpportunity,
+)
+from src.services.database_writer import TABLE_COLUMNS, DatabaseWriter
+
+
+def database_service(error: Exception = None) -> MagicMock:
+    service = MagicMock()
+    service.copy_records = AsyncMock(side_effect=error)
+    service.reconnect = AsyncMock(return_value=True)
+    return service
+
+
+def make_price(exchange: str = "kraken", timestamp: float = 0.0) -> PriceData:
+    return PriceData(
+        exchange, "BTC/USD", 100000.0, 100000.0, "USD", timestamp, volume=1.5
+    )
+
+
+def make_opportunity() -> ArbitrageOpportunity:
+    return ArbitrageOpportunity(
+        "coinmate", "kraken", 100000.0, 100500.0, 500.0, 0.5, 10.0, 1.0, asset="BTC"
+    )
+
+
+def copied(service: MagicMock) -> dict:
+    """Rows copied per table, over all flushes"""
+    rows = {}
+    for call in service.copy_records.await_args_list:
+        table, columns, records = call.args
+        assert columns == TABLE_COLUMNS[table]
+        rows.setdefault(table, []).extend(records)
+    return rows
+
+
+@pytest.mark.unit
+class TestDatabaseWriter:
+
+    def test_writes_are_queued(self):
+        """Test that writes only queue rows, without touching the database"""
+        service = database_service()
+        writer = DatabaseWriter(service, batch_size=10, max_queue=100)
+
+        writer.write_price(make_price())
+        writer.write_opportunity(make_opportunity())
+        writer.write_exchange_status("kraken", "active", None, 120)
+
+        assert len(writer) == 3
+        service.copy_records.assert_not_called()
+
+    async def test_flush_copies_per_table(self):
+        """Test that a flush writes each table's rows with one COPY"""
+        service = database_service()
+        writer = DatabaseWriter(service, batch_size=10, max_queue=100)
+        writer.write_price(make_price("kraken", 10.0))
+        writer.write_price(make_price("coinmate", 11.0))
+        writer.write_exchange_status("kraken", "error", "timeout", 5000)
+
+        assert await writer.flush() == 3
+
+        assert service.copy_records.await_count == 2
+        rows = copied(service)
+        assert [row[0] for row in rows["exchange_prices"]] == ["kraken", "coinmate"]
+        assert rows["exchange_prices"][0][-1] == datetime.fromtimestamp(
+            10.0, timezone.utc
+        )
+        assert rows["exchange_status"][0][:4] == ("kraken", "error", "timeout", 5000)
+        assert len(writer) == 0
+        assert writer.get_stats()["written"] == 3
+
+    async def test_open_event_writes_opportunity(self):
+        """Test that an open event also writes the opportunity itself"""
+        service = database_service()
+        writer = DatabaseWriter(service, batch_size=10, max_queue=100)
+        opportunity = make_opportunity()
+        tracked = TrackedOpportunity(
+            "coinmate", "kraken", "BTC", 1.0, 1.0, opportunity, opportunity
+        )
+
+        writer.write_opportunity_event(OpportunityEvent("open", tracked, 1.0))
+        writer.write_opportunity_event(OpportunityEvent("close", tracked, 3.0))
+        await writer.flush()
+
+        rows = copied(service)
+        assert len(rows["arbitrage_opportunities"]) == 1
+        assert [row[0] for row in rows["opportunity_events"]] == ["open", "close"]
+
+    def test_full_queue_drops_oldest(self):
+        """Test that a full queue drops its oldest rows and counts them"""
+        writer = DatabaseWriter(database_service(), batch_size=2, max_queue=3)
+
+        for second in range(5):
+            writer.write_price(make_price(timestamp=float(second)))
+
+        assert len(writer) == 3
+        assert writer.get_stats()["dropped"] == 2
+        oldest = writer._queue[0][1]
+        assert oldest[-1] == datetime.fromtimestamp(2.0, timezone.utc)
+
+    async def test_failed_copy_is_counted(self):
+        """Test that without a spool, rows of a failed COPY are counted"""
+        writer = DatabaseWriter(
+            database_service(ConnectionError("down")), batch_size=10, max_queue=100
+        )
+        writer.write_price(make_price())
+
+        assert await writer.flush() == 0
+
+        stats = writer.get_stats()
+        assert stats["failed"] == 1
+        assert stats["queued"] == 0
+
+    async def test_rejected_row_does_not_drop_batch(self):
+        """Test that only the row the database rejects is lost from a batch"""
+        service = database_service()
+        written = []
+
+        async def copy_records(table, columns, records):
+            if any(record[2] <= 0 for record in records):
+                raise asyncpg.CheckViolationError("price > 0")
+            written.extend(record[2] for record in records)
+
+        service.copy_records.side_effect = copy_records
+        writer = DatabaseWriter(service, batch_size=10, max_queue=100)
+        for price in (1.0, 2.0, -1.0, 3.0, 4.0):
+            writer.write_price(PriceData("kraken", "BTC/USD", price, price, "USD", 0.0))
+
+        assert await writer.flush() == 4
+
+        assert sorted(written) == [1.0, 2.0, 3.0, 4.0]
+        assert writer.get_stats()["failed"] == 1
+
+    async def test_full_batch_flushes(self):
+        """Test that the background task flushes as soon as a batch is full"""
+        service = database_service()
+        writer = DatabaseWriter(service, batch_size=2, flush_interval=60, max_queue=10)
+        writer.start()
+        await asyncio.sleep(0)
+
+        writer.write_price(make_price())
+        writer.write_price(make_price())
+        await asyncio.sleep(0.01)
+
+        assert service.copy_records.await_count == 1
+        await writer.stop()
+
+    async def test_interval_flushes_partial_batch(self):
+        """Test that a partial batch is flushed after the interval"""
+        service = database_service()
+        writer = DatabaseWriter(
+            service, batch_size=100, flush_interval=0.01, max_queue=100
+        )
+        writer.start()
+
+        writer.write_price(make_price())
+        await asyncio.sleep(0.05)
+
+        assert len(copied(service)["exchange_prices"]) == 1
+        await writer.stop()
+
+    async def test_stop_flushes_remaining(self):
+        """Test that stopping writes the rows still queued"""
+        service = database_service()
+        writer = DatabaseWriter(service, batch_size=100, flush_interval=60)
+        writer.start()
+        writer.write_price(make_price())
+
+        await writer.stop()
+
+        assert len(copied(service)["exchange_prices"]) == 1
+        assert len(writer) == 0
+
+    def test_invalid_sizes(self):
+        """Test that the queue must hold at least one batch"""
+        with pytest.raises(ValueError):
+            DatabaseWriter(database_service(), batch_size=10, max_queue=5)
+
+
+@pytest.mark.unit
+class TestDatabaseWriterSpool:
+
+    async def test_unreachable_rows_spooled_and_replayed(self, tmp_path):
+        """Test that rows are spooled while the DB is down and replayed in order"""
+        service = database_service(ConnectionError("down"))
+        writer = DatabaseWriter(
+            service, batch_size=10, spool_dir=str(tmp_path), retry_interval=60
+        )
+        writer.write_price(make_price(timestamp=1.0))
+        await writer.flush()
+        writer.write_price(make_price(timestamp=2.0))
+        await writer.flush()
+
+        # The second flush is spooled without trying the database
+        assert service.copy_records.await_count == 1
+        assert writer.spooling
+        assert writer.get_stats()["spooled"] == 2
+
+        service.copy_records.side_effect = None
+        writer._retry_at = 0.0
+        writer.write_price(make_price(timestamp=3.0))
+        assert await writer.flush() == 3
+
+        assert not writer.spooling
+        rows = service.copy_records.await_args_list[-1].args[2]
+        assert [row[-1].timestamp() for row in rows] == [1.0, 2.0, 3.0]
+        assert list(tmp_path.glob("*/*.spool")) == []
+
+    async def test_spool_survives_restart(self, tmp_path):
+        """Test that rows spooled before a restart are replayed by a new writer"""
+        writer = DatabaseWriter(
+            database_service(ConnectionError("down")),
+            spool_dir=str(tmp_path),
+            retry_interval=60,
+        )
+        writer.write_exchange_status("kraken", "error", "timeout", 5000)
+        await writer.stop()
+
+        service = database_service()
+        restarted = DatabaseWriter(service, spool_dir=str(tmp_path))
+        assert restarted.spooling
+        await restarted.flush()
+
+        table, _, rows = service.copy_records.await_args.args
+        assert table == "exchange_status"
+        assert rows[0][:4] == ("kraken", "error", "timeout", 5000)
+        assert not restarted.spooling
+
+    async def test_unconnected_service_reconnects(self, tmp_path):
+        """Test that a service that never connected is retried before replay"""
+        service = database_service()
+        service.pool = None
+        service.reconnect.return_value = False
+        writer = DatabaseWriter(service, spool_dir=str(tmp_path), retry_interval=60)
+        writer.write_price(make_price())
+
+        await writer.flush()
+
+        service.copy_records.assert_not_called()
+        assert service.reconnect.await_count == 1
+        assert writer.spooling
+
+        service.reconnect.return_value = True
+        writer._retry_at = 0.0
+        await writer.flush()
+
+        assert service.copy_records.await_count == 1
+        assert writer.get_stats()["replayed"] == 1
+
+    async def test_outage_during_split_spools_rest(self, tmp_path):
+        """Test that rows a split batch could not reach the DB with are spooled"""
+        service = database_service()
+
+        async def copy_records(table, columns, records):
+            if len(records) > 1:
+                raise asyncpg.DataError("bad row")
+            if records[0][2] == 2.0:
+                raise ConnectionError("down")
+
+        service.copy_records.side_effect = copy_records
+        writer = DatabaseWriter(
+            service, batch_size=10, spool_dir=str(tmp_path), retry_interval=60
+        )
+        for price in (1.0, 2.0, 3.0):
+            writer.write_price(PriceData("kraken", "BTC/USD", price, price, "USD", 0.0))
+
+        assert await writer.flush() == 1
+
+        spool = writer.spools["exchange_prices"]
+        rows = [row for path in spool.segments() for row in spool.read(path)]
+        assert [row[2] for row in rows] == [2.0, 3.0]
+        assert writer.get_stats()["failed"] == 0
+
+    async def test_rejected_rows_not_spooled(self, tmp_path):
+        """Test that rows the database rejects are counted, not spooled"""
+        service = database_service(asyncpg.DataError("bad row"))
+        writer = DatabaseWriter(service, spool_dir=str(tmp_path))
+        writer.write_price(make_price())
+
+        await writer.flush()
+
+        assert writer.get_stats()["failed"] == 1
+        assert not writer.spooling
@@ -0,0 +1,112 @@
+"""
+Tests for the fee matrix and background fee service.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.apis.payloads import FeeSchedule
+from src.services.fee_service import FeeMatrix, FeeService
+
+
+def exchange_api(fees=None, error=None) -> MagicMock:
+    api = MagicMock()
+    api.__aenter__ = AsyncMock(return_value=api)
+    api.__aexit__ = AsyncMock(return_value=None)
+    api.fetch_fee_schedules = AsyncMock(return_value=fees or {}, side_effect=error)
+    return api
+
+
+@pytest.mark.unit
+class TestFeeMatrix:
+
+    def test_lookup_fallbacks(self):
+        """Test pair fees, then exchange fees, then the default"""
+        fees = FeeMatrix(
+            {("kraken", "BTC/USD"): FeeSchedule(0.16, 0.26)},
+            {"kraken": FeeSchedule(0.4, 0.4)},
+            default=FeeSchedule(0.25, 0.25),
+        )
+
+        assert fees.maker("kraken", "BTC/USD") == 0.16
+        assert fees.taker("kraken", "BTC/USD") == 0.26
+        assert fees.taker("kraken", "ETH/USD") == 0.4
+        assert fees.taker("kraken") == 0.4
+        assert fees.taker("unknown", "BTC/USD") == 0.25
+
+    def test_from_config(self):
+        """Test configured fees"""
+        fees = FeeMatrix.from_config()
+
+        assert fees.taker("kraken") == 0.26
+        assert fees.maker("kraken") == 0.26
+        assert fees.taker("unknown") == 0.25
+
+    def test_immutable(self):
+        """Test that a matrix cannot change; with_fees returns a new one"""
+        fees = FeeMatrix.from_config()
+
+        with pytest.raises(AttributeError):
+            fees.default = FeeSchedule(0.0, 0.0)
+        with pytest.raises(TypeError):
+            fees.fees[("kraken", "BTC/USD")] = FeeSchedule(0.0, 0.0)
+
+        updated = fees.with_fees({("kraken", "BTC/USD"): FeeSchedule(0.1, 0.2)})
+        assert updated is not fees
+        assert updated.taker("kraken", "BTC/USD") == 0.2
+        assert fees.taker("kraken", "BTC/USD") == 0.26
+
+
+@pytest.mark.unit
+class TestFeeService:
+
+    async def test_static_fees_never_fetch(self):
+        """Test that without dynamic fees no exchange is contacted"""
+        get_api = MagicMock()
+        service = FeeService(get_api, {"kraken": ["BTC/USD"]}, dynamic=False)
+
+        matrix = await service.refresh()
+
+        assert matrix is service.matrix
+        assert service.start() is None
+        get_api.assert_not_called()
+
+    async def test_refresh_swaps_snapshot(self):
+        """Test that fetched fees replace the snapshot and failures keep old fees"""
+        apis = {
+            "kraken": exchange_api({"BTC/USD": FeeSchedule(0.16, 0.26)}),
+            "coinmate": exchange_api(error=RuntimeError("down")),
+        }
+        service = FeeService(
+            apis.__getitem__,
+            {"kraken": ["BTC/USD"], "coinmate": ["BTC/CZK"]},
+            dynamic=True,
+        )
+        before = service.matrix
+
+        matrix = await service.refresh()
+
+        assert matrix is service.matrix
+        assert matrix is not before
+        assert matrix.taker("kraken", "BTC/USD") == 0.26
+        assert matrix.taker("coinmate", "BTC/CZK") == 0.35
+        assert service.errors == 1
+        apis["kraken"].fetch_fee_schedules.assert_awaited_once_with(["BTC/USD"])
+
+    async def test_background_refresh(self):
+        """Test that the background task keeps refreshing until stopped"""
+        api = exchange_api({"BTC/USD": FeeSchedule(0.16, 0.26)})
+        service = FeeService(
+            lambda name: api, {"kraken": ["BTC/USD"]}, True, refresh_interval=0.01
+        )
+
+        service.start()
+        await asyncio.sleep(0.05)
+        await service.stop()
+        refreshes = service.refreshes
+        await asyncio.sleep(0.03)
+
+        assert refreshes >= 2
+        assert service.refreshes == refreshes
@@ -0,0 +1,150 @@
+"""
+Tests for client-side exchange rate limiting.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from aioresponses import aioresponses
+
+from config.settings import (
+    COINMATE_PUBLIC_REQUESTS_PER_MINUTE,
+    KRAKEN_PUBLIC_REQUESTS_PER_SECOND,
+    REQUEST_HEDGE_PER_MINUTE,
+)
+from src.apis.kraken.api import KrakenAPI
+from src.services.rate_limiter import (
+    ExchangeRateLimiter,
+    RateLimiterRegistry,
+    TokenBucket,
+    create_rate_limiter,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+
+    def test_burst_then_refill(self):
+        """Test that the bucket allows a burst and refills at its rate"""
+        clock = FakeClock()
+        bucket = TokenBucket(3, 0.5, clock=clock)
+
+        assert all(bucket.try_acquire() for _ in range(3))
+        assert not bucket.try_acquire()
+        assert bucket.wait_time() == pytest.approx(2.0)
+
+        clock.now = 2.0
+        assert bucket.remaining == pytest.approx(1.0)
+        assert bucket.try_acquire()
+
+    def test_refill_capped_at_capacity(self):
+        """Test that idle time does not accumulate beyond capacity"""
+        clock = FakeClock()
+        bucket = TokenBucket(2, 1.0, clock=clock)
+        clock.now = 100.0
+
+        assert bucket.remaining == 2.0
+
+    def test_drain(self):
+        """Test that a drained bucket must refill before the next request"""
+        clock = FakeClock()
+        bucket = TokenBucket(15, 0.33, clock=clock)
+        bucket.drain()
+
+        assert bucket.remaining == 0.0
+        assert bucket.wait_time() == pytest.approx(1 / 0.33)
+
+    async def test_acquire_queues_instead_of_failing(self):
+        """Test that requests over the budget wait for a token"""
+        bucket = TokenBucket(1, 20.0)
+
+        waits = await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+
+        assert waits[0] == 0.0
+        assert sum(waits) == pytest.approx(0.1, abs=0.02)
+        assert bucket.acquired == 3
+        assert bucket.waits == 2
+
+
+@pytest.mark.unit
+class TestExchangeRateLimiter:
+
+    @patch("src.services.rate_limiter.KRAKEN_RATE_TIER", "intermediate")
+    def test_kraken_tier(self):
+        """Test that the Kraken private budget follows the verification tier"""
+        limiter = create_rate_limiter("kraken")
+
+        assert limiter.private.capacity == 20
+        assert limiter.private.refill_rate == 0.5
+        assert limiter.public.capacity == 1
+
+    def test_coinmate_per_minute(self):
+        """Test that Coinmate budgets refill evenly over a minute"""
+        limiter = create_rate_limiter("coinmate")
+
+        # The hedge allowance is a share of the public budget
+        assert limiter.public.capacity + limiter.hedge.capacity == (
+            COINMATE_PUBLIC_REQUESTS_PER_MINUTE
+        )
+        assert limiter.public.refill_rate + limiter.hedge.refill_rate == pytest.approx(
+            COINMATE_PUBLIC_REQUESTS_PER_MINUTE / 60
+        )
+        assert limiter.remaining(private=True) == limiter.private.capacity
+
+    def test_hedges_within_kraken_public_rate(self):
+        """Test that primaries and hedges together refill at Kraken's public rate"""
+        limiter = create_rate_limiter("kraken")
+
+        assert limiter.hedge.refill_rate == pytest.approx(REQUEST_HEDGE_PER_MINUTE / 60)
+        assert limiter.public.refill_rate + limiter.hedge.refill_rate == pytest.approx(
+            KRAKEN_PUBLIC_REQUESTS_PER_SECOND
+        )
+
+    def test_public_private_independent(self):
+        """Test that public requests do not consume the private budget"""
+        limiter = ExchangeRateLimiter("x", TokenBucket(1, 1), TokenBucket(5, 1))
+
+        limiter.public.try_acquire()
+
+        assert limiter.remaining() == pytest.approx(0.0, abs=1e-3)
+        assert limiter.remaining(private=True) == pytest.approx(5.0)
+
+    def test_registry_shares_limiters(self):
+        """Test that every client of an exchange shares one limiter"""
+        registry = RateLimiterRegistry()
+
+        assert registry.get("kraken") is registry.get("kraken")
+        assert registry.get("binance") is None
+
+    def test_kraken_endpoint_costs(self):
+        """Test Kraken call-counter costs per endpoint"""
+        api = KrakenAPI()
+
+        assert api._request_cost("0/public/Ticker") == 1.0
+        assert api._request_cost("0/private/Balance") == 1.0
+        assert api._request_cost("0/private/TradesHistory") == 2.0
+        assert api._request_cost("0/private/AddOrder") == 0.0
+
+    async def test_kraken_rate_limit_error_drains_budget(self):
+        """Test that a Kraken rate-limit error empties the bucket"""
+        limiter = ExchangeRateLimiter("kraken", TokenBucket(5, 1), TokenBucket(5, 1))
+
+        with aioresponses() as m:
+            m.get(
+                "https://api.kraken.com/0/public/Ticker?pair=BTCUSD",
+                payload={"error": ["EAPI:Rate limit exceeded"], "result": {}},
+            )
+            async with KrakenAPI(rate_limiter=limiter) as api:
+                await api.get_ticker("BTCUSD")
+
+        assert limiter.remaining() < 1
+        assert limiter.public.acquired == 1
@@ -0,0 +1,218 @@
+"""
+Tests for tail-latency request hedging.
+"""
+
+import asyncio
+
+import pytest
+from aioresponses import CallbackResult, aioresponses
+
+from src.apis.kraken.api import KrakenAPI
+from src.services.rate_limiter import (
+    ExchangeRateLimiter,
+    TokenBucket,
+    create_rate_limiter,
+)
+from src.services.request_hedger import RequestHedger
+
+
+def warmed_hedger(latency: float = 0.01, samples: int = 5) -> RequestHedger:
+    hedger = RequestHedger(percentile=95, min_samples=samples, min_delay=0.01)
+    for _ in range(samples):
+        hedger.latency.record(latency)
+    return hedger
+
+
+class SlowThenFast:
+    """Request factory whose first attempt hangs and later attempts answer"""
+
+    def __init__(self):
+        self.attempts = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        self.attempts += 1
+        if self.attempts == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        return f"attempt {self.attempts}"
+
+
+@pytest.mark.unit
+class TestRequestHedger:
+
+    async def test_no_hedge_without_history(self):
+        """Test that requests are not hedged before enough latencies are known"""
+        hedger = RequestHedger(min_samples=5)
+
+        async def send():
+            return "ok"
+
+        assert await hedger.run(send) == "ok"
+        assert hedger.hedge_delay() is None
+        assert hedger.hedged == 0
+        assert len(hedger.latency) == 1
+
+    async def test_fast_request_not_hedged(self):
+        """Test that a request answering before the delay is not duplicated"""
+        hedger = warmed_hedger(latency=0.5)
+        calls = []
+
+        async def send():
+            calls.append(1)
+            return "ok"
+
+        assert await hedger.run(send) == "ok"
+        assert len(calls) == 1
+
+    async def test_slow_request_hedged_and_cancelled(self):
+        """Test that the duplicate wins and the slow attempt is cancelled"""
+        hedger = warmed_hedger()
+        send = SlowThenFast()
+
+        result = await hedger.run(send)
+        await asyncio.sleep(0)
+
+        assert result == "attempt 2"
+        assert send.cancelled == 1
+        stats = hedger.get_stats()
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+        assert stats["hedge_rate"] == 1.0
+
+    async def test_hedge_needs_budget(self):
+        """Test that no duplicate is sent when the rate budget is exhausted"""
+        hedger = warmed_hedger()
+        attempts = []
+
+        async def send():
+            attempts.append(1)
+            await asyncio.sleep(0.05)
+            return "slow"
+
+        result = await hedger.run(send, reserve_hedge=lambda: False)
+
+        assert result == "slow"
+        assert len(attempts) == 1
+        assert hedger.budget_skips == 1
+
+    async def test_failed_attempt_falls_back_to_other(self):
+        """Test that an error from the first finisher does not win"""
+        hedger = warmed_hedger()
+        attempts = []
+
+        async def send():
+            attempts.append(1)
+            if len(attempts) == 1:
+                await asyncio.sleep(0.03)
+                raise RuntimeError("reset")
+            await asyncio.sleep(0.06)
+            return "ok"
+
+        assert await hedger.run(send) == "ok"
+
+    async def test_success_beats_failure_in_same_round(self):
+        """Test that a success is preferred when both attempts finish together"""
+        loop = asyncio.get_running_loop()
+        failed = loop.create_future()
+        failed.set_exception(RuntimeError("reset"))
+        succeeded = loop.create_future()
+        succeeded.set_result("ok")
+
+        for tasks in ([failed, succeeded], [succeeded, failed]):
+            assert await RequestHedger._first_success(set(tasks)) is succeeded
+
+    async def test_hedge_win_records_primary_latency(self):
+        """Test that a hedge win records the primary's latency, not the caller's"""
+        hedger = warmed_hedger(latency=0.05)
+        attempts = []
+
+        async def send():
+            attempts.append(1)
+            if len(attempts) == 1:
+                await asyncio.sleep(0.3)
+                return "primary"
+            return "hedge"
+
+        assert await hedger.run(send) == "hedge"
+        # Still in flight past the 50ms delay: above the percentile it extends
+        assert hedger.latency._samples[-1] >= 0.05
+
+        attempts.clear()
+        hedged = warmed_hedger(latency=0.05)
+
+        async def send_both_slow():
+            attempts.append(1)
+            await asyncio.sleep(0.1 if len(attempts) == 1 else 0.2)
+            return "ok"
+
+        await hedged.run(send_both_slow)
+        # The primary answered first and its own latency is recorded
+        assert hedged.hedge_wins == 0
+        assert hedged.latency._samples[-1] == pytest.approx(0.1, abs=0.05)
+
+    async def test_failed_hedge_is_not_a_win(self):
+        """Test that a hedge failing after the primary does not count as a win"""
+        hedger = warmed_hedger()
+        attempts = []
+
+        async def send():
+            attempts.append(1)
+            await asyncio.sleep(0.03 if len(attempts) == 1 else 0.05)
+            raise RuntimeError("reset")
+
+        with pytest.raises(RuntimeError):
+            await hedger.run(send)
+
+        assert hedger.hedged == 1
+        assert hedger.hedge_wins == 0
+
+    async def test_kraken_ticker_hedge_uses_rate_budget(self):
+        """Test that a hedged Kraken ticker takes its duplicate from the public budget"""
+        hedger = warmed_hedger()
+        limiter = ExchangeRateLimiter("kraken", TokenBucket(5, 1), TokenBucket(5, 1))
+        url = "https://api.kraken.com/0/public/Ticker?pair=BTCUSD"
+        attempts = []
+
+        async def callback(url, **kwargs):
+            attempts.append(1)
+            if len(attempts) == 1:
+                await asyncio.sleep(0.2)
+                return CallbackResult(payload={"error": [], "result": {"slow": True}})
+            return CallbackResult(payload={"error": [], "result": {"fast": True}})
+
+        with aioresponses() as m:
+            m.get(url, callback=callback, repeat=True)
+            async with KrakenAPI(rate_limiter=limiter, hedger=hedger) as api:
+                result = await api.get_ticker("BTCUSD")
+
+        assert result["result"] == {"fast": True}
+        assert hedger.hedge_wins == 1
+        assert limiter.public.acquired == 2
+
+    async def test_kraken_hedge_fires_under_default_limits(self):
+        """Test that Kraken's hedge allowance lets a duplicate through"""
+        hedger = warmed_hedger()
+        limiter = create_rate_limiter("kraken")
+        url = "https://api.kraken.com/0/public/Ticker?pair=BTCUSD"
+        attempts = []
+
+        async def callback(url, **kwargs):
+            attempts.append(1)
+            if len(attempts) == 1:
+                await asyncio.sleep(0.2)
+                return CallbackResult(payload={"error": [], "result": {"slow": True}})
+            return CallbackResult(payload={"error": [], "result": {"fast": True}})
+
+        with aioresponses() as m:
+            m.get(url, callback=callback, repeat=True)
+            async with KrakenAPI(rate_limiter=limiter, hedger=hedger) as api:
+                result = await api.get_ticker("BTCUSD")
+
+        assert result["result"] == {"fast": True}
+        assert hedger.hedge_wins == 1
+        assert limiter.public.acquired == 1
+        assert limiter.hedge.acquired == 1
@@ -0,0 +1,129 @@
+"""
+Tests for the shared HTTP session manager.
+"""
+
+import pytest
+from aioresponses import aioresponses
+
+from src.apis.coinmate.api import CoinmateAPI
+from src.apis.kraken.api import KrakenAPI
+from src.services.currency_converter import CurrencyConverter
+from src.services.session_manager import SessionManager
+
+
+@pytest.mark.unit
+class TestSessionManager:
+
+    async def test_get_session_reuses_session(self):
+        """Test that the same upstream name returns the same session"""
+        manager = SessionManager()
+        try:
+            first = manager.get_session("kraken")
+            second = manager.get_session("kraken")
+            other = manager.get_session("coinmate")
+
+            assert first is second
+            assert first is not other
+            assert manager.has_session("kraken")
+        finally:
+            await manager.close()
+
+    async def test_connector_settings(self):
+        """Test that pooling settings are applied to the connector"""
+        manager = SessionManager(limit_per_host=2, dns_cache_ttl=60)
+        try:
+            session = manager.get_session("kraken")
+            assert session.connector.limit_per_host == 2
+            assert session.connector.use_dns_cache is True
+        finally:
+            await manager.close()
+
+    async def test_close_closes_all_sessions(self):
+        """Test that closing the manager closes every session"""
+        manager = SessionManager()
+        kraken = manager.get_session("kraken")
+        coinmate = manager.get_session("coinmate")
+
+        await manager.close()
+
+        assert kraken.closed
+        assert coinmate.closed
+        assert not manager.has_session("kraken")
+
+    async def test_recreates_closed_session(self):
+        """Test that a closed session is replaced on next use"""
+        manager = SessionManager()
+        try:
+            session = manager.get_session("kraken")
+            await session.close()
+
+            replacement = manager.get_session("kraken")
+            assert replacement is not session
+            assert not replacement.closed
+        finally:
+            await manager.close()
+
+    async def test_warm_up(self):
+        """Test warm-up reports success per upstream"""
+        manager = SessionManager()
+        try:
+            with aioresponses() as m:
+                m.head("https://api.kraken.com", status=200)
+                m.head("https://coinmate.io/api", exception=Exception("down"))
+
+                result = await manager.warm_up(
+                    {
+                        "kraken": "https://api.kraken.com",
+                        "coinmate": "https://coinmate.io/api",
+                    }
+                )
+
+            assert result == {"kraken": True, "coinmate": False}
+        finally:
+            await manager.close()
+
+
+@pytest.mark.unit
+class TestSessionBorrowing:
+
+    async def test_exchange_borrows_shared_session(self):
+        """Test that exchange clients do not close a borrowed session"""
+        manager = SessionManager()
+        try:
+            async with KrakenAPI(session_manager=manager) as api:
+                borrowed = api.session
+                assert borrowed is manager.get_session("kraken")
+
+            assert not borrowed.closed
+            assert api.session is None
+
+            # Next client reuses the same warm session
+            async with KrakenAPI(session_manager=manager) as api:
+                assert api.session is borrowed
+        finally:
+            await manager.close()
+
+    async def test_exchange_without_manager_owns_session(self):
+        """Test that clients without a manager close their private session"""
+        async with CoinmateAPI() as api:
+            session = api.session
+            assert not session.closed
+
+        assert session.closed
+
+    async def test_currency_converter_uses_shared_session(self):
+        """Test that FX rate updates borrow the shared session"""
+        manager = SessionManager()
+        try:
+            converter = CurrencyConverter(manager)
+            with aioresponses() as m:
+                m.get(
+                    "https://api.exchangerate-api.com/v4/latest/USD",
+                    payload={"rates": {"USD": 1.0, "CZK": 24.0, "EUR": 0.9}},
+                )
+                await converter._update_exchange_rates()
+
+            assert converter.exchange_rates["USD/CZK"] == 24.0
+            assert manager.has_session("fx")
+        finally:
+            await manager.close()
@@ -0,0 +1,80 @@
+"""
+Tests for the on-disk write spool.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.services.write_spool import WriteSpool, decode_records, encode_record
+
+
+def row(second: int) -> tuple:
+    return (
+        "kraken",
+        "BTC/USD",
+        100000.5,
+        None,
+        datetime.fromtimestamp(second, timezone.utc),
+    )
+
+
+@pytest.mark.unit
+class TestWriteSpool:
+
+    def test_records_round_trip(self):
+        """Test that records decode to the tuples that were encoded"""
+        data = encode_record(row(1)) + encode_record(row(2))
+
+        assert decode_records(data) == [row(1), row(2)]
+
+    def test_torn_record_ends_segment(self):
+        """Test that a truncated or corrupt record stops the read"""
+        data = encode_record(row(1)) + encode_record(row(2))
+
+        assert decode_records(data[:-3]) == [row(1)]
+        corrupt = bytearray(data)
+        corrupt[-1] ^= 0xFF
+        assert decode_records(bytes(corrupt)) == [row(1)]
+
+    def test_segments_rotate(self, tmp_path):
+        """Test that a full segment is sealed and appends start a new one"""
+        spool = WriteSpool(str(tmp_path), segment_bytes=100, fsync="never")
+
+        spool.append([row(second) for second in range(5)])
+        segments = spool.segments()
+
+        assert len(segments) > 1
+        assert sorted(segments) == segments
+        records = [record for path in segments for record in spool.read(path)]
+        assert records == [row(second) for second in range(5)]
+
+    def test_remove_replayed(self, tmp_path):
+        """Test that removed segments are deleted and no longer pending"""
+        spool = WriteSpool(str(tmp_path), fsync="always")
+        spool.append([row(1)])
+        assert spool.pending
+
+        for path in spool.segments():
+            spool.remove(path)
+
+        assert not spool.pending
+        assert list(tmp_path.iterdir()) == []
+
+    def test_reopen_continues_sequence(self, tmp_path):
+        """Test that a reopened spool keeps old segments and appends after them"""
+        spool = WriteSpool(str(tmp_path), fsync="interval")
+        spool.append([row(1)])
+        spool.close()
+
+        reopened = WriteSpool(str(tmp_path), fsync="interval")
+        reopened.append([row(2)])
+        segments = reopened.segments()
+
+        assert len(segments) == 2
+        assert [reopened.read(path) for path in segments] == [[row(1)], [row(2)]]
+
+    def test_invalid_fsync_policy(self, tmp_path):
+        """Test that unknown fsync policies are refused"""
+        with pytest.raises(ValueError):
+            WriteSpool(str(tmp_path), fsync="sometimes")